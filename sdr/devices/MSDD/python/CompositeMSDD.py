@@ -63,6 +63,7 @@ class CompositeMSDD_i(MSDD_i):
 
     Frontend allocation and tuner control methods handle via MSDD.py 
     MSDD::_allocate_frontend_tuner_allocation - handle tuner allocation requests
+    MSDD::allocateCapacity - allocate a request of several tuner allocations as one group
     MSDD::deviceEnable  - enable tuner output during allocation
     MSDD::deviceDisable  - disable tuner output durin deallocation
     MSDD::deviceDeleteTuning - finish deallocation process
@@ -101,7 +102,7 @@ class CompositeMSDD_i(MSDD_i):
         we need our properties initialized first before we can proceed.  the postContructor method is called
         by MSDD_Controller after launch and property initialization.
         """
-        self.msdd_lock=threading.Lock()
+        self.reset_locks()
         self.MSDD = None                     # provided by MSDD_Controller
         self.msdd_console = None             # resolved when self.MSDD is assigned
         self.device_rf_flow = ""             # flow id assigned to this device
@@ -113,9 +114,14 @@ class CompositeMSDD_i(MSDD_i):
         self.frontend_tuner_status = []      # frontend tuner status structure for allocations
         self.tuner_allocation_ids = []       # allocation ids for all tuner allocation requests
         self.rx_channel_tuner_status={}      # reverse lookup of MSDD rx_channel to frontend_tuner_status object
+        self.reset_tuner_status_tracking()   # dirty tuners refreshed by update_tuner_status
+        self.reset_status_poller()           # snapshots published by the status poller
         self.receiver_identifier=None        # assigned receiver identifier RCV:1, etc..
         self._enableTimeChecks=False          # process method is auto started.. disable time variance checks until time of day module is configured
         self._nextTimeCheck=None
+        self.setPropertyQueryImpl("control_plane_stats",self.get_control_plane_stats)
+        self.setPropertyQueryImpl("FRONTEND::tuner_status",self.get_frontend_tuner_status)
+        self.setPropertyQueryImpl("msdd_status",self.get_msdd_status)
 
     def postConstructor(self):
         """
@@ -149,6 +155,9 @@ class CompositeMSDD_i(MSDD_i):
             except:
                 self.warn_msg("Disabling tuner {0} failed. ",tuner_num)
 
+        # refresh status in the background, property queries and tuner getters use the snapshots
+        self.start_status_poller(self.advanced.status_poll_interval)
+
         # property changes will be handled by base classes
 
     def disconnect_from_msdd(self):
@@ -159,6 +168,7 @@ class CompositeMSDD_i(MSDD_i):
         if self.MSDD != None:
 
             self.info_msg('Performing tuner disconnect')
+            self.stop_status_poller()
 
             # disable all tuner status and purge and listeners
             for t in range(0,len(self.frontend_tuner_status)):
@@ -47,6 +47,11 @@ from msddcontroller import ConnectionFailure
 from msddcontroller import TransmitFailure
 from msddcontroller import EchoFailure
 from msddcontroller import MSDDRadio
+from msddcontroller import TunerIndex
+from msddcontroller import LockOrder
+from msddcontroller import OrderedLock
+from msddcontroller import ReadWriteLock
+from msddcontroller import lock_monitor
 from msddcontroller import create_csv
 
 
@@ -111,6 +116,78 @@ class output_config(object):
                                                                                                       self.protocol, 
                                                                                                       self.endianess,
                                                                                                       self.mfp_flush)
+
+
+class status_snapshot(object):
+    """
+    Immutable copy of frontend_tuner_status, msdd_status and the network utilization published
+    by the status poller. Readers take the reference once and never wait on the radio, a new
+    snapshot replaces the previous one.
+
+    timestamp   - time the snapshot was published
+    tuners      - tuple of frontend_tuner_status entries, status_timestamp is the time the tuner was read from the radio
+    msdd_status - msdd_status
+    network     - tuple of (interface, bit_rate, total) network rates in bps
+    """
+    __slots__ = ('timestamp', 'tuners', 'msdd_status', 'network')
+
+    def __init__(self, timestamp, tuners, msdd_status, network):
+        object.__setattr__(self, 'timestamp', timestamp)
+        object.__setattr__(self, 'tuners', tuple([ status_snapshot.copy_struct(x) for x in tuners ]))
+        object.__setattr__(self, 'msdd_status', status_snapshot.copy_struct(msdd_status))
+        object.__setattr__(self, 'network', tuple(network))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("status_snapshot is read only")
+
+    @staticmethod
+    def copy_struct(struct):
+        """
+        Copy of a property structure, list members are copied so later changes are not seen
+        """
+        c = copy.copy(struct)
+        for k, v in c.__dict__.items():
+            if isinstance(v, list):
+                c.__dict__[k] = v[:]
+        return c
+
+
+class bulk_allocation(object):
+    """
+    Plan and progress of a group of frontend_tuner_allocation requests handled together by
+    allocate_frontend_tuner_allocations or deallocate_frontend_tuner_allocations.
+
+    allocations      - requests in the order they are configured, control requests of tuners
+                       without a parent first, then the other control requests, then listeners
+    planned          - allocation_id to the tuner number reserved for the request by the plan
+    completed        - requests that were allocated
+    outputs          - (tuner number, output module) to enable when every request is allocated
+    disabled_outputs - tuner numbers whose output module was disabled with the group
+    restatus         - tuner numbers to refresh once the group is released
+    thread           - thread handling the group, other threads handle one request at a time
+    """
+    def __init__(self, allocations):
+        self.allocations = allocations
+        self.planned = {}
+        self.completed = []
+        self.outputs = []
+        self.disabled_outputs = set()
+        self.restatus = set()
+        self.thread = threading.current_thread()
+
+    def order_candidates(self, allocation_id, candidates):
+        """
+        Returns candidates with the tuner planned for allocation_id first and without the tuners
+        planned for the other requests
+        """
+        planned = self.planned.get(allocation_id)
+        reserved = set(self.planned.values())
+        ordered = [ x for x in candidates if x not in reserved ]
+        if planned in candidates:
+            ordered.insert(0, planned)
+        return ordered
+
+
 class MSDD_i(MSDD_base):
     FE_TYPE_RECEIVER="RX"
     FE_TYPE_RXDIG="RX_DIGITIZER"
@@ -221,7 +298,8 @@ class MSDD_i(MSDD_base):
 
     def constructor(self):
         _stime_ctor=time.time()
-        self.msdd_lock=threading.Lock()
+        self.reset_locks()
+        self.set_lock_debug(self.advanced.lock_debug)
         self.MSDD = None
         self.msdd_console = None
         self.device_rf_flow = ""
@@ -233,6 +311,8 @@ class MSDD_i(MSDD_base):
         self.frontend_tuner_status = []
         self.tuner_allocation_ids = []
         self.rx_channel_tuner_status={}
+        self.reset_tuner_status_tracking()
+        self.reset_status_poller()
         self.receiver_identifier=None            # set in connect_to_msdd, allow for filtering of rx_channels with multi-channel radios
         self._enableTimeChecks=False             # process method is auto started.. disable time variance checks until time of day module is configured
         self._nextTimeCheck=None
@@ -285,6 +365,9 @@ class MSDD_i(MSDD_base):
         self.info_msg("Disabled all tuner hardware and output, {:.7f}",_etime )
         
         self.addPropertyChangeListener("advanced",self.advanced_changed)
+        self.setPropertyQueryImpl("control_plane_stats",self.get_control_plane_stats)
+        self.setPropertyQueryImpl("FRONTEND::tuner_status",self.get_frontend_tuner_status)
+        self.setPropertyQueryImpl("msdd_status",self.get_msdd_status)
 
         # initialize time of day module with TimeOfDay class
         self._time_of_day=TimeOfDay(self.MSDD.get_timeofday_module(),
@@ -296,7 +379,10 @@ class MSDD_i(MSDD_base):
 
         # Set connection timeout
         if self.MSDD:
-            self.MSDD.connection.set_timeout(self.msdd.timeout)
+            self.MSDD.connection_pool.set_timeout(self.msdd.timeout)
+
+        # refresh status in the background, property queries and tuner getters use the snapshots
+        self.start_status_poller(self.advanced.status_poll_interval)
             
         _etime=time.time()-_stime_ctor
         self.info_msg("Completed MSDD initialization {:.7f}",_etime )            
@@ -318,6 +404,12 @@ class MSDD_i(MSDD_base):
         try:
             state =  FrontendTunerDevice.updateUsageState(self)
             self.debug_msg("updateUsageStat device state: {0}",state)
+            # publish allocation changes, otherwise published by the tuner update holding the lock
+            if self.allocation_id_mapping_lock.acquire(False):
+                try:
+                    self.publish_status_snapshot()
+                finally:
+                    self.allocation_id_mapping_lock.release()
             if state != CF.Device.BUSY:
                 try:
                     # check cpu usage of radio and network utilization
@@ -338,6 +430,15 @@ class MSDD_i(MSDD_base):
         """
         Get the current cpu load on radio and check if limit is within specified load maximum
         """
+        # status poller refreshes the load, do not wait on the radio
+        snapshot = self._status_snapshot
+        if snapshot and snapshot.msdd_status.cpu_load:
+            load=float(snapshot.msdd_status.cpu_load)
+            self.info_msg('Check CPU Load, polled load {0} max {1}',load, max_cpu_load)
+            if load > max_cpu_load:
+                self.warn_msg('CPU exceeds maximum load setting {0}',max_cpu_load)
+                return False
+            return True
         try:
             self.msdd_lock.acquire()
             load=0.0
@@ -389,6 +490,72 @@ class MSDD_i(MSDD_base):
         return pkt_bit_rate, inf
 
 
+    def calcNetworkUtilization(self, additional_rate=0.0, out_module=None):
+        """
+        Determine the network output rate of each network interface on the radio from the
+        tuners with digital and fft output, callers hold the radio's resource_lock
+
+        additional_rate = include this specific sample rate for the out_module parameter
+        out_module = include the output module's bit rate if the module is disable
+
+        Returns:
+        --------
+        list of { 'interface', 'total', 'bit_rate' } for each network interface, number of enabled modules
+        """
+        # hold calculated totals for all the network interfaces on the radio
+        netstat=[]
+        enabled_modules=0
+
+        # seed netstat like list for each defined network interface
+        for  n in self.MSDD.network_modules:
+            try:
+                idx=self.MSDD.network_modules.index(n)
+                netstat.append( { 'interface' : idx,
+                                  'total' : 0.0,
+                                  'bit_rate' : n.object.bit_rate*1e6
+                              })
+            except:
+                if logging.NOTSET < self._baseLog.level < logging.INFO:
+                    traceback.print_exc()
+
+        self.debug_msg('checkReceiverNetworkOutput receiver interfaces {0}', netstat)
+
+        #
+        # Determine network output rate based on tuners with
+        # digital output.
+        #
+        for tuner in self.frontend_tuner_status:
+            pkt_bit_rate=0
+            inf=0
+            if tuner.rx_object.output_object and \
+                tuner.rx_object.output_object == out_module:
+                pkt_bit_rate, inf = self.calcModuleBitRate(tuner.digital_output_info,additional_rate)
+                enabled_modules+=1
+
+            if tuner.digital_output:
+                pkt_bit_rate, inf = self.calcModuleBitRate(tuner.digital_output_info)
+                enabled_modules+=1
+
+            cid="--missing--"
+            if tuner.digital_output_info:
+                cid=tuner.digital_output_info.channel_number
+
+            self.debug_msg("Check network output: " \
+                           "interface {} out module {} pkt_bit_rate {} total netstat {} ",
+                           inf,
+                           cid,
+                           pkt_bit_rate,
+                           netstat[inf])
+
+            netstat[inf]['total'] += pkt_bit_rate
+
+            # Add in FFT output for channel if enabled
+            if tuner.fft_output and tuner.fft_output_info:
+                pkt_bit_rate, inf = self.calcModuleBitRate(tuner.fft_output_info)
+                netstat[inf]['total'] += pkt_bit_rate
+
+        return netstat, enabled_modules
+
     def checkNetworkOutput(self, additional_rate=None, out_module=None ):
         """
         check all enabled output modules if they are within the recommend rate for the radio's network interface.
@@ -397,10 +564,10 @@ class MSDD_i(MSDD_base):
         additional_rate = include this specific sample rate for the out_module parameter
         out_module = include the output module's bit rate if the module is disable
         """
+        if not self.MSDD:
+            return True
         try:
-            self.msdd_lock.acquire()
-            # hold calculated totals for all the network interfaces on the radio
-            netstat=[]
+            self.MSDD.resource_lock.acquire()
             netstat_fail=False
             enabled_modules=0
             if additional_rate is None:
@@ -408,54 +575,7 @@ class MSDD_i(MSDD_base):
 
             if self.MSDD:
                 try:
-                    # seed netstat like list for each defined network interface
-                    for  n in self.MSDD.network_modules:
-                        try:
-                            idx=self.MSDD.network_modules.index(n)
-                            netstat.append( { 'interface' : idx,
-                                              'total' : 0.0,
-                                              'bit_rate' : n.object.bit_rate*1e6
-                                          })
-                        except:
-                            if logging.NOTSET < self._baseLog.level < logging.INFO:
-                                traceback.print_exc()
-
-                    self.debug_msg('checkReceiverNetworkOutput receiver interfaces {0}', netstat)
-
-                    #
-                    # Determine network output rate based on tuners with
-                    # digital output.
-                    #
-                    for tuner in self.frontend_tuner_status:
-                        pkt_bit_rate=0
-                        inf=0
-                        if tuner.rx_object.output_object and \
-                            tuner.rx_object.output_object == out_module:
-                            pkt_bit_rate, inf = self.calcModuleBitRate(tuner.digital_output_info,additional_rate)
-                            enabled_modules+=1
-
-                        if tuner.digital_output:
-                            pkt_bit_rate, inf = self.calcModuleBitRate(tuner.digital_output_info)
-                            enabled_modules+=1
-                            
-                        cid="--missing--"
-                        if tuner.digital_output_info:
-                            cid=tuner.digital_output_info.channel_number
-                        
-                        self.debug_msg("Check network output: " \
-                                       "interface {} out module {} pkt_bit_rate {} total netstat {} ",
-                                       inf,
-                                       cid,
-                                       pkt_bit_rate, 
-                                       netstat[inf])
-                        
-                        netstat[inf]['total'] += pkt_bit_rate
-
-                        # Add in FFT output for channel if enabled
-                        if tuner.fft_output and tuner.fft_output_info:
-                            pkt_bit_rate, inf = self.calcModuleBitRate(tuner.fft_output_info)
-                            netstat[inf]['total'] += pkt_bit_rate
-
+                    netstat, enabled_modules = self.calcNetworkUtilization(additional_rate, out_module)
 
                     # check all netstats
                     for n in netstat:
@@ -487,7 +607,7 @@ class MSDD_i(MSDD_base):
                 return False
 
         finally:
-            self.msdd_lock.release()
+            self.MSDD.resource_lock.release()
 
         return True
     
@@ -496,6 +616,7 @@ class MSDD_i(MSDD_base):
         if self.MSDD != None:
 
             self.info_msg('Disconnecting from radio')
+            self.stop_status_poller()
 
             #Need to tear down old devices here if needed
             for t in range(0,len(self.frontend_tuner_status)):
@@ -506,6 +627,8 @@ class MSDD_i(MSDD_base):
                 except IndexError:
                     self.warn_msg('Disconnect failed, Missing tuner {0}',t)
                     break
+            self.MSDD.stop_shadow_reconcile()
+            self.MSDD.connection.stop_capture()
 
         # reset context to device
         self.MSDD=None
@@ -523,9 +646,16 @@ class MSDD_i(MSDD_base):
                                       self.msdd.port,
                                       udp_timeout=min(0.2,self.msdd.timeout),
                                       enable_fft_channels=self.advanced.enable_fft_channels,
+                                      echoless_mode=self.advanced.echoless_mode,
+                                      capture_file=self.advanced.capture_file,
+                                      control_sockets=self.advanced.control_sockets,
+                                      shadow_reconcile_interval=self.advanced.shadow_reconcile_interval,
+                                      capability_cache_file=self.advanced.capability_cache_file,
+                                      startup_profile=self.advanced.startup_profile,
+                                      breaker_failures=self.advanced.breaker_failures,
                                       radio_debug=False)
+                self.log_startup_timing()
 
-                
                 rate_failure = None
                 for net_mods in self.MSDD.network_modules:
                     connected_rate = net_mods.object.bit_rate
@@ -562,6 +692,18 @@ class MSDD_i(MSDD_base):
 
         return True    
 
+    def log_startup_timing(self):
+        """
+        Logs the total startup time of the radio connection, and the duration and radio
+        commands of each startup phase at debug level
+        """
+        timing=self.MSDD.startup_timing
+        self.info_msg("Finished setting up radio, duration {0:.4f} s, {1} rx channels, {2} fft channels",
+                      timing.get_total(),
+                      len(self.MSDD.rx_channels),
+                      len(self.MSDD.fft_channels))
+        self.debug_msg("Startup phases:\n{0}", timing.format())
+
     def enable_time_checks(self, time_was_set=False):
         """
         Callback provided to TimeHelper to signal that initial time synchronization has completed
@@ -587,6 +729,32 @@ class MSDD_i(MSDD_base):
         """
         self.msdd_status.ntp_running = is_running
 
+    def get_control_plane_stats(self):
+        """
+        Query callback for control_plane_stats, collects the current telemetry from the radio connection
+        """
+        if self.MSDD == None:
+            return []
+        return [ MSDD_base.control_plane_stats_struct(**row) for row in self.MSDD.connection_pool.getCommandStatsSummary() ]
+
+    def get_frontend_tuner_status(self):
+        """
+        Query callback for frontend_tuner_status, the last snapshot when the status poller is running
+        """
+        snapshot = self._status_snapshot
+        if snapshot:
+            return list(snapshot.tuners)
+        return self.frontend_tuner_status
+
+    def get_msdd_status(self):
+        """
+        Query callback for msdd_status, the last snapshot when the status poller is running
+        """
+        snapshot = self._status_snapshot
+        if snapshot:
+            return snapshot.msdd_status
+        return self.msdd_status
+
 
     def determine_output_protocol(self, default_proto='sdds'):
         """
@@ -647,54 +815,67 @@ class MSDD_i(MSDD_base):
             self.msdd_status=MSDD_base.msdd_status_struct() #Reset to defaults
             return
         try:
-            self.device_model=str(self.msdd_console.model)
+            # query the console configuration as a single batch, typed as by the console accessors
+            cfg = self.msdd_console.getCfgValues([ 'MODEL', 'SERIAL', 'RF_BRD_TYPE', 'FPGA_TYPE', 'DSP_BRD_TYPE',
+                                                   'MIN_FREQ', 'MAX_FREQ', 'DSP_REF', 'ADC_CLK', 'IF_PORTS',
+                                                   'ETHR_PORTS', 'CPU_TYPE', 'CPU_FREQ', '1PPS_TERM', '1PPS_VOLTAGE',
+                                                   'FPGA_WBDDC_CHANNELS', 'FPGA_NBDDC_CHANNELS',
+                                                   'FILE_NAME_APP', 'FILE_NAME_FPGA', 'FILE_NAME_BATCH', 'FILE_NAME_BOOT',
+                                                   'FILE_NAME_LOADER', 'FILE_NAME_CONFIG', 'FILE_NAME_CAL' ])
+            self.device_model=str(cfg['MODEL'])
             self.device_address = self.msdd_console.address
             self.msdd_status.connected = True
             self.msdd_status.ip_address = str(self.msdd.ip_address)
             self.msdd_status.port = str(self.msdd.port)
             self.msdd_status.control_host = str(self.msdd_console.ip_address)
             self.msdd_status.control_host_port = str(self.msdd_console.ip_port)
-            self.msdd_status.model = str(self.msdd_console.model)
-            self.msdd_status.serial = str(self.msdd_console.serial)
+            self.msdd_status.model = str(cfg['MODEL'])
+            self.msdd_status.serial = str(cfg['SERIAL'])
             self.msdd_status.software_part_number = str(self.msdd_console.sw_part_number)
-            self.msdd_status.rf_board_type = str(self.msdd_console.rf_board_type)
-            self.msdd_status.fpga_type = str(self.msdd_console.fpga_type)
-            self.msdd_status.dsp_type = str(self.msdd_console.dsp_type)
-            self.msdd_status.minimum_frequency_hz = str(self.msdd_console.minFreq_Hz)
-            self.msdd_status.maximum_frequency_hz = str(self.msdd_console.maxFreq_Hz)
-            self.msdd_status.dsp_reference_frequency_hz = str(self.msdd_console.dspRef_Hz)
-            self.msdd_status.adc_clock_frequency_hz = str(self.msdd_console.adcClk_Hz)
-            self.msdd_status.num_if_ports = str(self.msdd_console.num_if_ports)
-            self.msdd_status.num_eth_ports = str(self.msdd_console.num_eth_ports)
-            self.msdd_status.cpu_type = str(self.msdd_console.cpu_type)
-            self.msdd_status.cpu_rate = str(self.msdd_console.cpu_rate)
+            self.msdd_status.rf_board_type = str(cfg['RF_BRD_TYPE'])
+            self.msdd_status.fpga_type = str(cfg['FPGA_TYPE'])
+            self.msdd_status.dsp_type = str(cfg['DSP_BRD_TYPE'])
+            self.msdd_status.minimum_frequency_hz = str(cfg['MIN_FREQ'])
+            self.msdd_status.maximum_frequency_hz = str(cfg['MAX_FREQ'])
+            self.msdd_status.dsp_reference_frequency_hz = str(cfg['DSP_REF'])
+            self.msdd_status.adc_clock_frequency_hz = str(cfg['ADC_CLK'])
+            self.msdd_status.num_if_ports = str(cfg['IF_PORTS'])
+            self.msdd_status.num_eth_ports = str(cfg['ETHR_PORTS'])
+            self.msdd_status.cpu_type = str(cfg['CPU_TYPE'])
+            self.msdd_status.cpu_rate = str(cfg['CPU_FREQ'])
             self.msdd_status.cpu_load = str(self.msdd_console.cpu_load)
-            self.msdd_status.pps_termination = str(self.msdd_console.pps_termination)
-            self.msdd_status.pps_voltage = str(self.msdd_console.pps_voltage)
-            self.msdd_status.number_wb_ddc_channels = str(self.msdd_console.num_wb_channels)
-            self.msdd_status.number_nb_ddc_channels = str(self.msdd_console.num_nb_channels)
-            self.msdd_status.filename_app = str(self.msdd_console.filename_app)
-            self.msdd_status.filename_fpga = str(self.msdd_console.filename_fpga)
-            self.msdd_status.filename_batch = str(self.msdd_console.filename_batch)
-            self.msdd_status.filename_boot = str(self.msdd_console.filename_boot)
-            self.msdd_status.filename_loader = str(self.msdd_console.filename_loader)
-            self.msdd_status.filename_config = str(self.msdd_console.filename_config)
-            self.msdd_status.filename_cal = str(self.msdd_console.filename_cal)
-            tod = self.MSDD.get_timeofday_module()
-            if tod:
-                self.msdd_status.tod_module = tod.mode_readable
-                self.msdd_status.tod_available_module = tod.available_modes
-                self.msdd_status.tod_meter_list = tod.meter_readable
-                self.msdd_status.tod_tod_reference_adjust = str(tod.ref_adjust)
-                self.msdd_status.tod_track_mode_state = str(tod.ref_track)
-                self.msdd_status.tod_bit_state = tod.getBITStr(None)
-                self.msdd_status.tod_toy = str(tod.toy)
+            self.msdd_status.pps_termination = str(cfg['1PPS_TERM'])
+            self.msdd_status.pps_voltage = str(cfg['1PPS_VOLTAGE'])
+            self.msdd_status.number_wb_ddc_channels = str(cfg['FPGA_WBDDC_CHANNELS'])
+            self.msdd_status.number_nb_ddc_channels = str(cfg['FPGA_NBDDC_CHANNELS'])
+            self.msdd_status.filename_app = str(cfg['FILE_NAME_APP'])
+            self.msdd_status.filename_fpga = str(cfg['FILE_NAME_FPGA'])
+            self.msdd_status.filename_batch = str(cfg['FILE_NAME_BATCH'])
+            self.msdd_status.filename_boot = str(cfg['FILE_NAME_BOOT'])
+            self.msdd_status.filename_loader = str(cfg['FILE_NAME_LOADER'])
+            self.msdd_status.filename_config = str(cfg['FILE_NAME_CONFIG'])
+            self.msdd_status.filename_cal = str(cfg['FILE_NAME_CAL'])
+            self.update_tod_status()
 
             self.trace_msg("Completed update msdd_status")
         except:
             if logging.NOTSET < self._baseLog.level < logging.INFO:
                 traceback.print_exc()
             self.error_msg("Unable to update msdd_status property")
+
+    def update_tod_status(self):
+        """
+        Update the time of day members of the MSDD status structure
+        """
+        tod = self.MSDD.get_timeofday_module()
+        if tod:
+            self.msdd_status.tod_module = tod.mode_readable
+            self.msdd_status.tod_available_module = tod.available_modes
+            self.msdd_status.tod_meter_list = tod.meter_readable
+            self.msdd_status.tod_tod_reference_adjust = str(tod.ref_adjust)
+            self.msdd_status.tod_track_mode_state = str(tod.ref_track)
+            self.msdd_status.tod_bit_state = tod.getBITStr(None)
+            self.msdd_status.tod_toy = str(tod.toy)
     
 
     def getTunerTypeList(self,type_mode):
@@ -811,16 +992,444 @@ class MSDD_i(MSDD_base):
             self.frontend_tuner_status.append(tuner_struct)
             fe_tuner_num += 1
 
-    def update_tuner_status(self, tuner_range=[]):
+    def reset_locks(self):
+        """
+        Create the device locks. Locks are taken in this order, a thread may skip locks but
+        never takes a lock while holding one that comes after it (see LockOrder):
+
+          _bulk_allocation_lock       group allocations and deallocations
+          allocation_id_mapping_lock  allocation maps, read/write lock. Allocations, deallocations,
+                                      property changes and storing refreshed tuner status take it
+                                      for write, the tuner settings take it for read
+          tuner_locks[n]              settings and status of tuner n, taken in increasing tuner number.
+                                      Setters hold the allocation maps for read, an allocation holds
+                                      no map lock while it tunes its claimed tuner and status reads
+                                      hold only the tuner lock
+          MSDD.resource_lock          output, software DDC and FFT pools, stream router links and
+                                      network output rate, shared by the devices of a radio
+          msdd_lock                   msdd_status, CPU load and time of day
+          _tracking_lock              dirty tuner tracking and status snapshots
+
+        An allocation claims its tuner and releases the allocation maps while it tunes it, holding
+        only the tuner lock, so allocations and settings of independent tuners run at the same
+        time. Claimed tuners are skipped by other allocations and by the refresh of changed
+        tuners.  Set advanced::lock_debug to check the order and report long waits.
+        """
+        self._bulk_allocation_lock=OrderedLock("bulk allocation", LockOrder.BULK_ALLOCATION)
+        self._bulk_allocation=None
+        # replaces the lock of the frontend device, acquire and release take it for write
+        self.allocation_id_mapping_lock=ReadWriteLock("allocation maps", LockOrder.ALLOCATIONS)
+        self.msdd_lock=OrderedLock("msdd status", LockOrder.STATUS)
+        self._tracking_lock=OrderedLock("status tracking", LockOrder.TRACKING)
+
+    def set_lock_debug(self, enable):
+        """
+        Enable the lock order checks and long wait reports of the process lock monitor
+        """
+        if enable:
+            lock_monitor.report=self.report_lock_debug
+        lock_monitor.enabled=enable
+
+    def report_lock_debug(self, msg):
+        self.warn_msg("{0}", msg)
+
+    def reset_tuner_locks(self):
+        self.tuner_locks=[ OrderedLock("tuner {0}".format(tuner_num), LockOrder.TUNER, tuner_num)
+                           for tuner_num in range(0,len(self.frontend_tuner_status)) ]
+        self._tuner_status_reads=[0]*len(self.frontend_tuner_status)
+        self._tuner_status_stored=[0]*len(self.frontend_tuner_status)
+
+    def acquire_tuner_locks(self, tuner_nums):
+        """
+        Acquire the locks of tuner_nums in increasing tuner number, None entries are ignored
+
+        Returns:
+        --------
+        the locks acquired, pass to release_tuner_locks
+        """
+        tuner_locks=[]
+        for tuner_num in sorted(set([ x for x in tuner_nums if x is not None ])):
+            try:
+                self.tuner_locks[tuner_num].acquire()
+            except:
+                self.release_tuner_locks(tuner_locks)
+                raise
+            tuner_locks.append(self.tuner_locks[tuner_num])
+        return tuner_locks
+
+    def release_tuner_locks(self, tuner_locks):
+        for tuner_lock in reversed(tuner_locks):
+            tuner_lock.release()
+
+    def release_maps_for_tuners(self, tuner_nums):
+        """
+        Exchange allocation_id_mapping_lock held for write for the locks of tuner_nums, so
+        commands to these tuners do not block allocations and settings of other tuners. The
+        allocation maps can change until reacquire_maps
+
+        Returns:
+        --------
+        the locks acquired, pass to reacquire_maps
+        """
+        self.allocation_id_mapping_lock.release()
+        try:
+            return self.acquire_tuner_locks(tuner_nums)
+        except:
+            self.allocation_id_mapping_lock.acquire()
+            raise
+
+    def reacquire_maps(self, tuner_locks):
+        self.release_tuner_locks(tuner_locks)
+        self.allocation_id_mapping_lock.acquire()
+
+    def lock_tuners(self, tuner_nums):
+        """
+        Hold allocation_id_mapping_lock for read and the locks of tuner_nums, used to change
+        the settings of allocated tuners
+
+        Returns:
+        --------
+        the locks acquired, pass to unlock_tuners
+        """
+        self.allocation_id_mapping_lock.acquire_read()
+        try:
+            return self.acquire_tuner_locks(tuner_nums)
+        except:
+            self.allocation_id_mapping_lock.release_read()
+            raise
+
+    def unlock_tuners(self, tuner_locks):
+        self.release_tuner_locks(tuner_locks)
+        self.allocation_id_mapping_lock.release_read()
+
+    def get_related_tuner_nums(self, tuner_num):
+        """
+        Returns:
+        --------
+        tuner_num, the tuner number of its parent and of its children, a frequency change can
+        retune all of them
+        """
+        rx_object=self.frontend_tuner_status[tuner_num].rx_object
+        tuner_nums=[tuner_num]
+        if self.rx_channel_tuner_status.has_key(rx_object.rx_parent_object):
+            tuner_nums.append(self.rx_channel_tuner_status[rx_object.rx_parent_object])
+        for child in rx_object.getChildChannels():
+            if self.rx_channel_tuner_status.has_key(child):
+                tuner_nums.append(self.rx_channel_tuner_status[child])
+        return tuner_nums
+
+    def reset_tuner_status_tracking(self):
+        """
+        Clear the dirty tuner tracking used by update_tuner_status
+        """
+        self._dirty_tuners=set()                 # tuners whose status must be read from the radio
+        self._tuner_status_generation=0          # incremented each time tuners are marked dirty
+        self._tuner_status_refreshed=0           # generation of the last refresh of the dirty tuners
+        self._radio_status_epoch=None            # MSDDRadio.get_status_epoch at the last refresh
+        self.tuner_index=TunerIndex()            # candidate tuners for allocations by type and frequency range
+        self.tuner_locks=[]                      # lock for each tuner, see reset_locks
+        self._tuner_status_reads=[]              # number of the last status read of each tuner
+        self._tuner_status_stored=[]             # number of the status read stored for each tuner
+        self._claimed_tuners=set()               # tuners being tuned by an allocation, see claim_tuner
+
+    def claim_tuner(self, tuner_num):
+        """
+        Keep other allocations and the status poller off a tuner being tuned by an allocation,
+        callers hold the allocation maps for write. The claimed tuners are changed holding the
+        tracking lock too, the status poller reads them holding only the tracking lock
+        """
+        self._tracking_lock.acquire()
+        try:
+            self._claimed_tuners.add(tuner_num)
+        finally:
+            self._tracking_lock.release()
+
+    def release_tuner(self, tuner_num):
+        """
+        Release a tuner claimed with claim_tuner, callers hold the allocation maps for write
+        """
+        self._tracking_lock.acquire()
+        try:
+            self._claimed_tuners.discard(tuner_num)
+        finally:
+            self._tracking_lock.release()
+
+    def mark_tuner_status_dirty(self, tuner_range=None):
+        """
+        Mark tuners whose status changed (set, allocate, deallocate, retune or changed on the
+        radio), the next update_tuner_status without a tuner range refreshes them
+
+        Parameters:
+        -----------
+        tuner_range : list of tuner numbers, None for all tuners
+        """
+        self._tracking_lock.acquire()
+        try:
+            self._mark_tuner_status_dirty(tuner_range)
+        finally:
+            self._tracking_lock.release()
+
+    def _mark_tuner_status_dirty(self, tuner_range=None):
+        if tuner_range is None:
+            tuner_range = range(0,len(self.frontend_tuner_status))
+            self.tuner_index.invalidate()
+        else:
+            self.tuner_index.invalidate(self.get_tuner_nums_with_children(tuner_range))
+        self._dirty_tuners.update(tuner_range)
+        self._tuner_status_generation += 1
+
+    def get_tuner_nums_with_children(self, tuner_range):
+        """
+        Returns the tuner numbers in tuner_range and the tuner numbers of their child tuners
+        """
+        tuner_nums=set(tuner_range)
+        for tuner_num in tuner_range:
+            for child in self.frontend_tuner_status[tuner_num].rx_object.rx_child_objects:
+                if self.rx_channel_tuner_status.has_key(child):
+                    tuner_nums.add(self.rx_channel_tuner_status[child])
+        return tuner_nums
+
+    def reset_tuner_index(self):
+        """
+        Index the tuners by their tuner types, called when the tuners or their types change
+        """
+        self.tuner_index.reset([ (tuner_num, self.frontend_tuner_status[tuner_num].tuner_types, self.frontend_tuner_status[tuner_num].rx_object)
+                                 for tuner_num in range(0,len(self.frontend_tuner_status)) ])
+
+    def get_allocation_candidates(self, frontend_tuner_allocation, if_freq):
+        """
+        Determine the tuners to try for an allocation. Listener allocations try every tuner of
+        the requested type. Control allocations try the unallocated tuners of the requested
+        type that can tune to the frequency, ranked by get_allocation_fit
+
+        Returns:
+        --------
+        list of tuner numbers
+        """
+        if not frontend_tuner_allocation.device_control:
+            return self.tuner_index.get_tuners(frontend_tuner_allocation.tuner_type)
+
+        ranked=[]
+        for tuner_num in self.tuner_index.find(frontend_tuner_allocation.tuner_type, if_freq):
+            if self.frontend_tuner_status[tuner_num].allocated or tuner_num in self._claimed_tuners:
+                continue
+            fit = self.get_allocation_fit(frontend_tuner_allocation, tuner_num)
+            if fit is None:
+                self.trace_msg(" Skipping tuner {0}, sample rate or bandwidth not supported", tuner_num)
+                continue
+            ranked.append((fit, tuner_num))
+        ranked.sort()
+        self.debug_msg("Allocation candidates (fit, tuner) {0}", ranked)
+        return [ tuner_num for fit, tuner_num in ranked ]
+
+    def get_allocation_fit(self, frontend_tuner_allocation, tuner_num):
+        """
+        Check the sample rate and bandwidth of an allocation against the capability table
+        of the tuner, using the same rules as the allocation
+
+        Returns:
+        --------
+        how far the selected sample rate (or bandwidth) is above the request (0.0 is an exact
+        fit), None if the tuner can not provide the request
+        """
+        rx_object=self.frontend_tuner_status[tuner_num].rx_object
+        srate=frontend_tuner_allocation.sample_rate
+        bw=frontend_tuner_allocation.bandwidth
+        try:
+            if srate!=0 and bw!=0:
+                request = max(bw,srate)
+                valid = rx_object.get_valid_sample_rate(request, frontend_tuner_allocation.sample_rate_tolerance)
+                other = rx_object.get_valid_bandwidth(bw, frontend_tuner_allocation.bandwidth_tolerance)
+            elif srate!=0:
+                request = srate
+                valid = rx_object.get_valid_sample_rate(srate, frontend_tuner_allocation.sample_rate_tolerance)
+                other = rx_object.get_bandwidth_for_sample_rate(valid)
+            elif bw!=0:
+                request = bw
+                valid = rx_object.get_valid_bandwidth(bw, frontend_tuner_allocation.bandwidth_tolerance)
+                other = rx_object.get_sample_rate_for_bandwidth(valid)
+            else:
+                request = None
+                valid = rx_object.get_valid_bandwidth(None)
+                other = rx_object.get_sample_rate_for_bandwidth(valid)
+        except InvalidValue:
+            return None
+        except Exception:
+            # capabilities could not be read, leave it to the allocation to try the tuner
+            if logging.NOTSET < self._baseLog.level < logging.INFO:
+                traceback.print_exc()
+            return float('inf')
+        if valid is None or other is None:
+            return None
+        if not request:
+            return 0.0
+        return float(valid)/request - 1.0
+
+    def reset_status_poller(self):
+        """
+        Clear the status poller state, no snapshot is published until the poller is started
+        """
+        self._status_snapshot=None               # last status_snapshot, None when the poller is not running
+        self._status_poll_thread=None
+        self._status_poll_event=threading.Event()
+        self._network_status=()                  # (interface, bit_rate, total) from the last poll
+
+    def start_status_poller(self, interval):
+        """
+        Start a background thread that refreshes the tuner status, msdd_status and network
+        utilization every interval seconds and publishes them as a status_snapshot
+
+        Parameters:
+        -----------
+        interval : seconds between refreshes, 0 disables the poller
+        """
+        if self._status_poll_thread or interval <= 0 or self.MSDD == None:
+            return
+        self.info_msg("Starting status poller, interval {0} seconds",interval)
+        self._status_poll_event.clear()
+        self._status_poll_thread = threading.Thread(target=self._status_poll_loop,
+                                                    args=(interval,),
+                                                    name="MSDD-STATUS-{0}".format(self.receiver_identifier))
+        self._status_poll_thread.setDaemon(True)
         try:
             self.allocation_id_mapping_lock.acquire()
-            self._update_tuner_status(tuner_range)
+            self.publish_status_snapshot()
         finally:
             self.allocation_id_mapping_lock.release()
+        self._status_poll_thread.start()
+
+    def stop_status_poller(self):
+        if self._status_poll_thread is None:
+            return
+        self._status_poll_event.set()
+        self._status_poll_thread.join()
+        self._status_poll_thread = None
+        self._status_snapshot = None
+
+    def _status_poll_loop(self, interval):
+        while not self._status_poll_event.is_set():
+            self._status_poll_event.wait(interval)
+            if self._status_poll_event.is_set():
+                break
+            try:
+                self.poll_status()
+            except Exception as e:
+                if logging.NOTSET < self._baseLog.level < logging.INFO:
+                    traceback.print_exc()
+                self.warn_msg("Status poll failed, reason {0}",e)
 
-    def _update_tuner_status(self, tuner_range=[]):
+    def poll_status(self):
+        """
+        Refresh msdd_status, the network utilization and all the tuners from the radio, and
+        publish a new status snapshot. The tuners are read holding only their tuner locks
+        """
+        if self.MSDD == None:
+            return
+        _stime=time.time()
+        try:
+            self.MSDD.resource_lock.acquire()
+            netstat, enabled_modules = self.calcNetworkUtilization()
+            self._network_status = tuple([ (n['interface'], n['bit_rate'], n['total']) for n in netstat ])
+        finally:
+            self.MSDD.resource_lock.release()
+
+        try:
+            self.msdd_lock.acquire()
+            self.msdd_status.cpu_load = str(self.msdd_console.cpu_load)
+            self.update_tod_status()
+        finally:
+            self.msdd_lock.release()
+
+        self.update_tuner_status(sri_on_change=True, all_tuners=True)
+        _etime=time.time()-_stime
+        self.trace_msg("Polled radio status, {:.7f}",_etime)
+
+    def publish_status_snapshot(self):
+        """
+        Publish a status_snapshot of the current frontend_tuner_status and msdd_status when the
+        status poller is running, callers hold allocation_id_mapping_lock
+        """
+        if self._status_poll_thread is None:
+            return
+        self._tracking_lock.acquire()
+        try:
+            self._status_snapshot = status_snapshot(time.time(),
+                                                    self.frontend_tuner_status,
+                                                    self.msdd_status,
+                                                    self._network_status)
+        finally:
+            self._tracking_lock.release()
+
+    def get_status_snapshot(self):
+        """
+        Returns:
+        --------
+        the last status_snapshot, None when the status poller is not running
+        """
+        return self._status_snapshot
+
+    def get_tuner_status(self, tuner_num):
+        """
+        Returns:
+        --------
+        the status of the tuner from the last status_snapshot when the status poller is running,
+        otherwise the frontend_tuner_status entry
+        """
+        snapshot = self._status_snapshot
+        if snapshot and tuner_num < len(snapshot.tuners):
+            return snapshot.tuners[tuner_num]
+        return self.frontend_tuner_status[tuner_num]
+
+    def get_tuner_status_age(self, tuner_num):
+        """
+        Returns:
+        --------
+        seconds since the status of the tuner was read from the radio
+        """
+        return time.time() - self.get_tuner_status(tuner_num).status_timestamp
+
+    def update_tuner_status(self, tuner_range=[], sri_on_change=False, all_tuners=False):
+        """
+        Refresh the tuners in tuner_range, or the changed tuners when no range is provided, or
+        every tuner not claimed by an allocation with all_tuners (the status poller).
+        The status of each tuner is read from the radio holding only its tuner lock, the
+        allocation maps are held for write only to store the results and publish the status
+        snapshot. Callers with a tuner range hold no allocation map or tuner locks, a caller
+        holding the allocation maps for write can refresh the changed tuners since they do
+        not include the tuners claimed by an allocation.
+        """
+        if self.MSDD == None or len(self.frontend_tuner_status) <= 0 or \
+           len(self.tuner_locks) != len(self.frontend_tuner_status):
+            try:
+                self.allocation_id_mapping_lock.acquire()
+                self._update_tuner_status(tuner_range, sri_on_change, all_tuners)
+            finally:
+                self.allocation_id_mapping_lock.release()
+            return
+
+        results=[]
+        for tuner_num in self.take_tuner_status_range(tuner_range, all_tuners):
+            tuner_locks=self.acquire_tuner_locks([tuner_num])
+            try:
+                results.append((tuner_num, self.read_tuner_status(tuner_num)))
+            finally:
+                self.release_tuner_locks(tuner_locks)
+
+        try:
+            self.allocation_id_mapping_lock.acquire()
+            self.store_tuner_status(results, sri_on_change)
+        finally:
+            self.allocation_id_mapping_lock.release()
+
+    def _update_tuner_status(self, tuner_range=[], sri_on_change=False, all_tuners=False):
+        """
+        Refresh the frontend_tuner_status of the tuners in tuner_range, or of the dirty tuners
+        when no range is provided, callers hold the allocation maps for write. Creates the
+        tuner status structure after connecting, and clears it after disconnecting
+        """
         if self.MSDD == None:
             self.frontend_tuner_status = []
+            self.reset_tuner_status_tracking()
             return True
 
         #
@@ -829,109 +1438,201 @@ class MSDD_i(MSDD_base):
         if len(self.frontend_tuner_status) <= 0:
             _stime=time.time()
             self._initialize_tuners()
+            self.reset_tuner_index()
+            self.reset_tuner_locks()
+            self.mark_tuner_status_dirty()
             _etime=time.time()-_stime
             self.debug_msg("Initialized tuner status structure {:.7f}",_etime)
 
-        # Update list base on provide set of tuner or all of them
-        if len(tuner_range) <= 0:
-            tuner_range = range(0,len(self.frontend_tuner_status))
-            self.trace_msg("No tuner range provided, updating all {0} tuners",len(tuner_range))
+        results=[ (tuner_num, self.read_tuner_status(tuner_num))
+                  for tuner_num in self.take_tuner_status_range(tuner_range, all_tuners) ]
+        self.store_tuner_status(results, sri_on_change)
 
-        for tuner_num in tuner_range:
-            _stime=time.time()
-            try:
-                data_port = True
-                fft_port = False
-                #for just analog tuners
-                status = self.frontend_tuner_status[tuner_num].rx_object.getStatus()
-                if self.frontend_tuner_status[tuner_num].rx_object.is_analog() and not self.frontend_tuner_status[tuner_num].rx_object.is_digital():
-                    self.trace_msg("update_tuner_status update ANALOG tuner settings for tuner {0}",
-                                   tuner_num)
-                    self.frontend_tuner_status[tuner_num].center_frequency = self.convert_if_to_rf(status.center_frequency)
-                    self.frontend_tuner_status[tuner_num].available_frequency = status.available_frequency
-                    self.frontend_tuner_status[tuner_num].gain = status.gain
-                    self.frontend_tuner_status[tuner_num].available_gain = status.available_gain
-                    self.frontend_tuner_status[tuner_num].attenuation = status.attenuation
-                    self.frontend_tuner_status[tuner_num].available_attenuation = status.available_attenuation
-                    self.frontend_tuner_status[tuner_num].adc_meter_values = status.adc_meter_values;
-                    self.frontend_tuner_status[tuner_num].bandwidth = status.bandwidthd
-                    self.frontend_tuner_status[tuner_num].available_bandwidth = status.available_bandwidth
-                    self.frontend_tuner_status[tuner_num].rcvr_gain = status.gain
-                #for just digital tuners
-                elif self.frontend_tuner_status[tuner_num].rx_object.is_digital() and not self.frontend_tuner_status[tuner_num].rx_object.is_analog():
-                    self.trace_msg("update_tuner_status update DIGITAL tuner settings for tuner {0}",
-                                   tuner_num)
-                    self.frontend_tuner_status[tuner_num].enabled = status.enabled
-                    self.frontend_tuner_status[tuner_num].decimation = status.decimation
-                    self.frontend_tuner_status[tuner_num].available_decimation = status.available_decimation
-                    self.frontend_tuner_status[tuner_num].attenuation = status.attenuation
-                    self.frontend_tuner_status[tuner_num].available_attenuation = status.available_attenuation
-                    self.frontend_tuner_status[tuner_num].gain = status.gain
-                    self.frontend_tuner_status[tuner_num].available_gain = status.available_gain
-                    self.frontend_tuner_status[tuner_num].input_sample_rate = status.input_sample_rate
-                    self.frontend_tuner_status[tuner_num].sample_rate = status.sample_rate
-                    self.frontend_tuner_status[tuner_num].available_sample_rate = status.available_sample_rate
-                    self.frontend_tuner_status[tuner_num].bandwidth = status.bandwidth
-                    self.frontend_tuner_status[tuner_num].available_bandwidth = status.available_bandwidth
-                    self.frontend_tuner_status[tuner_num].center_frequency = self.convert_if_to_rf(status.center_frequency)
-                    self.frontend_tuner_status[tuner_num].available_frequency = status.available_frequency
-                    self.frontend_tuner_status[tuner_num].ddc_gain = status.gain
-                    self.frontend_tuner_status[tuner_num].complex = True
-                #if the tuner is both analog and digital (usually rx_digitizer mode)
-                elif self.frontend_tuner_status[tuner_num].rx_object.is_digital() and  self.frontend_tuner_status[tuner_num].rx_object.is_analog():
-                    self.trace_msg("update_tuner_status update ANALOG/DIGITAL tuner settings for tuner {0}",
-                                   tuner_num,)
-                    self.frontend_tuner_status[tuner_num].enabled = status.enabled
-                    self.frontend_tuner_status[tuner_num].decimation = status.decimation
-                    self.frontend_tuner_status[tuner_num].available_decimation = status.available_decimation
-                    self.frontend_tuner_status[tuner_num].attenuation = status.attenuation
-                    self.frontend_tuner_status[tuner_num].available_attenuation = status.available_attenuation
-                    self.frontend_tuner_status[tuner_num].gain = status.gain
-                    self.frontend_tuner_status[tuner_num].available_gain = status.available_gain
-                    self.frontend_tuner_status[tuner_num].input_sample_rate = status.input_sample_rate
-                    self.frontend_tuner_status[tuner_num].sample_rate = status.sample_rate
-                    self.frontend_tuner_status[tuner_num].available_sample_rate = status.available_sample_rate
-                    self.frontend_tuner_status[tuner_num].bandwidth = status.bandwidth
-                    self.frontend_tuner_status[tuner_num].available_bandwidth = status.available_bandwidth
-                    self.frontend_tuner_status[tuner_num].center_frequency = self.convert_if_to_rf(status.center_frequency)
-                    self.frontend_tuner_status[tuner_num].available_frequency = status.available_frequency
-                    self.frontend_tuner_status[tuner_num].ddc_gain = status.gain
-                    self.frontend_tuner_status[tuner_num].complex = True
-                #if the tuner has streaming output
-                if self.frontend_tuner_status[tuner_num].rx_object.has_streaming_output():
-                    status = self.frontend_tuner_status[tuner_num].rx_object.getOutputStatus()
-                    self.trace_msg("update_tuner_status update STREAMING context for tuner {0}", tuner_num)
-                    if status:
-                        self.frontend_tuner_status[tuner_num].output_format = "CI"
-                        self.frontend_tuner_status[tuner_num].output_multicast = status.output_multicast
-                        self.frontend_tuner_status[tuner_num].output_port = status.output_port
-                        self.frontend_tuner_status[tuner_num].output_enabled = status.output_enabled
-                        self.frontend_tuner_status[tuner_num].output_protocol = status.output_protocol
-                        self.frontend_tuner_status[tuner_num].output_vlan_enabled = status.output_vlan_enabled
-                        self.frontend_tuner_status[tuner_num].output_vlan = status.output_vlan
-                        self.frontend_tuner_status[tuner_num].output_flow = status.output_flow
-                        self.frontend_tuner_status[tuner_num].output_timestamp_offset = str(status.output_timestamp_offset)
-                        self.frontend_tuner_status[tuner_num].output_channel = str(status.output_channel)
-                        self.frontend_tuner_status[tuner_num].output_endianess = status.output_endianess
-                        self.frontend_tuner_status[tuner_num].output_mfp_flush = status.output_mfp_flush
-                if self.frontend_tuner_status[tuner_num].rx_object.hasFFTChannel():
-                    status = self.frontend_tuner_status[tuner_num].rx_object.getFFTStatus()
-                    if status:
-                        fft_port = True
-                        self.frontend_tuner_status[tuner_num].psd_fft_size = status.fftSize
-                        self.frontend_tuner_status[tuner_num].psd_averages = status.num_averages
-                        self.frontend_tuner_status[tuner_num].psd_time_between_ffts = status.time_between_fft_ms
-                        self.frontend_tuner_status[tuner_num].psd_output_bin_size = status.outputBins
-                        self.frontend_tuner_status[tuner_num].psd_window_type = status.window_type_str
-                        self.frontend_tuner_status[tuner_num].psd_peak_mode = status.peak_mode_str
-                self.SRIchanged(tuner_num, data_port, fft_port )
-                self.trace_msg("update_tuner_status, completed tuner status update for tuner {0}",
+    def take_tuner_status_range(self, tuner_range=[], all_tuners=False):
+        """
+        Determine the tuners to refresh and remove them from the dirty tuners
+
+        Returns:
+        --------
+        tuner_range, or the dirty tuners that are not claimed by an allocation when no range is
+        provided, or every tuner that is not claimed by an allocation with all_tuners
+        """
+        self._tracking_lock.acquire()
+        try:
+            # register values may have changed outside of the device, refresh all tuners
+            radio_status_epoch = self.MSDD.get_status_epoch()
+            if radio_status_epoch != self._radio_status_epoch:
+                if self._radio_status_epoch is not None:
+                    self.debug_msg("Radio register state changed, refreshing all tuners")
+                    self._mark_tuner_status_dirty()
+                self._radio_status_epoch = radio_status_epoch
+
+            # Update list base on provide set of tuner or the tuners that changed
+            if all_tuners:
+                tuner_range = [ tuner_num for tuner_num in range(0,len(self.frontend_tuner_status))
+                                if tuner_num not in self._claimed_tuners ]
+                if not self._dirty_tuners.difference(tuner_range):
+                    self._tuner_status_refreshed = self._tuner_status_generation
+            elif len(tuner_range) <= 0:
+                if self._tuner_status_generation == self._tuner_status_refreshed:
+                    self.trace_msg("No tuner range provided, all tuners are up to date")
+                    return []
+                # tuners being tuned by an allocation stay dirty until the allocation completes
+                tuner_range = sorted(self._dirty_tuners.difference(self._claimed_tuners))
+                if len(tuner_range) == len(self._dirty_tuners):
+                    self._tuner_status_refreshed = self._tuner_status_generation
+                self.trace_msg("No tuner range provided, updating {0} changed tuners",len(tuner_range))
+            self._dirty_tuners.difference_update(tuner_range)
+            return tuner_range
+        finally:
+            self._tracking_lock.release()
+
+    def read_tuner_status(self, tuner_num):
+        """
+        Read the status of a tuner from the radio, callers hold the tuner lock or the allocation
+        maps for write. The frontend_tuner_status is not changed, see store_tuner_status
+
+        Returns:
+        --------
+        (read number, dictionary of frontend_tuner_status member to value, fft_port), the read
+        number orders the reads of the tuner and is None when the tuner could not be read completely
+        """
+        _stime=time.time()
+        values={}
+        fft_port = False
+        read_num = None
+        try:
+            # reads of a tuner are numbered in the order they are made
+            self._tuner_status_reads[tuner_num] += 1
+            read_num = self._tuner_status_reads[tuner_num]
+            rx_object = self.frontend_tuner_status[tuner_num].rx_object
+            #for just analog tuners
+            status = rx_object.getStatus()
+            if rx_object.is_analog() and not rx_object.is_digital():
+                self.trace_msg("update_tuner_status update ANALOG tuner settings for tuner {0}",
                                tuner_num)
-            except Exception, e:
-                self.error_msg("Error updating Tuner status {0}, exception {1}", tuner_num,e)
-            _etime=time.time()-_stime
-            self.trace_msg("Updated tuner {} status, {:.7f}",tuner_num, _etime)            
+                values['center_frequency'] = self.convert_if_to_rf(status.center_frequency)
+                values['available_frequency'] = status.available_frequency
+                values['gain'] = status.gain
+                values['available_gain'] = status.available_gain
+                values['attenuation'] = status.attenuation
+                values['available_attenuation'] = status.available_attenuation
+                values['adc_meter_values'] = status.adc_meter_values
+                values['bandwidth'] = status.bandwidthd
+                values['available_bandwidth'] = status.available_bandwidth
+                values['rcvr_gain'] = status.gain
+            #for just digital tuners
+            elif rx_object.is_digital() and not rx_object.is_analog():
+                self.trace_msg("update_tuner_status update DIGITAL tuner settings for tuner {0}",
+                               tuner_num)
+                values['enabled'] = status.enabled
+                values['decimation'] = status.decimation
+                values['available_decimation'] = status.available_decimation
+                values['attenuation'] = status.attenuation
+                values['available_attenuation'] = status.available_attenuation
+                values['gain'] = status.gain
+                values['available_gain'] = status.available_gain
+                values['input_sample_rate'] = status.input_sample_rate
+                values['sample_rate'] = status.sample_rate
+                values['available_sample_rate'] = status.available_sample_rate
+                values['bandwidth'] = status.bandwidth
+                values['available_bandwidth'] = status.available_bandwidth
+                values['center_frequency'] = self.convert_if_to_rf(status.center_frequency)
+                values['available_frequency'] = status.available_frequency
+                values['ddc_gain'] = status.gain
+                values['complex'] = True
+            #if the tuner is both analog and digital (usually rx_digitizer mode)
+            elif rx_object.is_digital() and  rx_object.is_analog():
+                self.trace_msg("update_tuner_status update ANALOG/DIGITAL tuner settings for tuner {0}",
+                               tuner_num,)
+                values['enabled'] = status.enabled
+                values['decimation'] = status.decimation
+                values['available_decimation'] = status.available_decimation
+                values['attenuation'] = status.attenuation
+                values['available_attenuation'] = status.available_attenuation
+                values['gain'] = status.gain
+                values['available_gain'] = status.available_gain
+                values['input_sample_rate'] = status.input_sample_rate
+                values['sample_rate'] = status.sample_rate
+                values['available_sample_rate'] = status.available_sample_rate
+                values['bandwidth'] = status.bandwidth
+                values['available_bandwidth'] = status.available_bandwidth
+                values['center_frequency'] = self.convert_if_to_rf(status.center_frequency)
+                values['available_frequency'] = status.available_frequency
+                values['ddc_gain'] = status.gain
+                values['complex'] = True
+            #if the tuner has streaming output
+            if rx_object.has_streaming_output():
+                status = rx_object.getOutputStatus()
+                self.trace_msg("update_tuner_status update STREAMING context for tuner {0}", tuner_num)
+                if status:
+                    values['output_format'] = "CI"
+                    values['output_multicast'] = status.output_multicast
+                    values['output_port'] = status.output_port
+                    values['output_enabled'] = status.output_enabled
+                    values['output_protocol'] = status.output_protocol
+                    values['output_vlan_enabled'] = status.output_vlan_enabled
+                    values['output_vlan'] = status.output_vlan
+                    values['output_flow'] = status.output_flow
+                    values['output_timestamp_offset'] = str(status.output_timestamp_offset)
+                    values['output_channel'] = str(status.output_channel)
+                    values['output_endianess'] = status.output_endianess
+                    values['output_mfp_flush'] = status.output_mfp_flush
+            if rx_object.hasFFTChannel():
+                status = rx_object.getFFTStatus()
+                if status:
+                    fft_port = True
+                    values['psd_fft_size'] = status.fftSize
+                    values['psd_averages'] = status.num_averages
+                    values['psd_time_between_ffts'] = status.time_between_fft_ms
+                    values['psd_output_bin_size'] = status.outputBins
+                    values['psd_window_type'] = status.window_type_str
+                    values['psd_peak_mode'] = status.peak_mode_str
+            values['status_timestamp'] = time.time()
+            self.trace_msg("update_tuner_status, completed tuner status update for tuner {0}",
+                           tuner_num)
+        except Exception, e:
+            self.error_msg("Error updating Tuner status {0}, exception {1}", tuner_num,e)
+            read_num = None
+        _etime=time.time()-_stime
+        self.trace_msg("Updated tuner {} status, {:.7f}",tuner_num, _etime)
+        return (read_num, values, fft_port)
+
+    def store_tuner_status(self, results, sri_on_change=False):
+        """
+        Store the results of read_tuner_status in frontend_tuner_status, push SRI for the tuners
+        and publish the status snapshot, callers hold the allocation maps for write. With
+        sri_on_change, SRI is only pushed for tuners whose frequency, bandwidth or sample rate
+        changed. The tuner index ranges of the tuners whose frequency, bandwidth or enable
+        state changed, and of their child tuners, are invalidated
+
+        Parameters:
+        -----------
+        results : list of (tuner number, result of read_tuner_status)
+        """
+        retuned=[]
+        for tuner_num, (read_num, values, fft_port) in results:
+            if tuner_num >= len(self.frontend_tuner_status):
+                continue
+            fts = self.frontend_tuner_status[tuner_num]
+            if read_num is not None and read_num < self._tuner_status_stored[tuner_num]:
+                self.trace_msg("Skipping status of tuner {0}, a later read was stored", tuner_num)
+                continue
+            sri_status = (fts.center_frequency, fts.bandwidth, fts.sample_rate)
+            range_status = (fts.center_frequency, fts.bandwidth, fts.enabled)
+            for name, value in values.items():
+                setattr(fts, name, value)
+            if read_num is None or range_status != (fts.center_frequency, fts.bandwidth, fts.enabled):
+                retuned.append(tuner_num)
+            if read_num is None:
+                continue
+            self._tuner_status_stored[tuner_num] = read_num
+            if not sri_on_change or sri_status != (fts.center_frequency, fts.bandwidth, fts.sample_rate):
+                self.SRIchanged(tuner_num, True, fft_port)
 
+        if retuned:
+            self.tuner_index.invalidate(self.get_tuner_nums_with_children(retuned))
+        self.publish_status_snapshot()
 
     def create_output_configuration(self):
         """
@@ -1068,6 +1769,7 @@ class MSDD_i(MSDD_base):
                                               self.tuner_output_configuration[tuner_num].mfp_flush)
 
                 # prefetch module info
+                self.mark_tuner_status_dirty([tuner_num])
                 self.frontend_tuner_status[tuner_num].digital_output_info=_output_mod.getInfo()
                 self.frontend_tuner_status[tuner_num].digital_output=False
 
@@ -1224,6 +1926,7 @@ class MSDD_i(MSDD_base):
             self.allocation_id_mapping_lock.acquire()
 
             self.advanced = newval
+            self.set_lock_debug(self.advanced.lock_debug)
 
             # for each tuner, update tuner types from advanced property settings. Change
             # will only affect new allocations and not existing allocations
@@ -1240,6 +1943,7 @@ class MSDD_i(MSDD_base):
                     raise ValueError(self.format_msg_with_radio("Unknown tuner type for MSDD channel {0}",
                                                      self.MSDD.rx_channels[tuner_num].msdd_channel_id()))
                 self.frontend_tuner_status[tuner_num].tuner_types = tuner_types
+            self.reset_tuner_index()
         finally:
             self.allocation_id_mapping_lock.release()
                 
@@ -1542,6 +2246,13 @@ class MSDD_i(MSDD_base):
         
         if tuner_num is None or tuner_num < 0: return
 
+        try:
+            self.MSDD.resource_lock.acquire()
+            self._enableFFT(alloc_id, tuner_num)
+        finally:
+            self.MSDD.resource_lock.release()
+
+    def _enableFFT(self, alloc_id, tuner_num):
         fft_channel = self.MSDD.get_fft_channel()
         
         if fft_channel is None:
@@ -1615,6 +2326,7 @@ class MSDD_i(MSDD_base):
         if tuner_num is None or tuner_num < 0: return
 
         fft_channel=None
+        self.MSDD.resource_lock.acquire()
         try:
             fft_channel=self.frontend_tuner_status[tuner_num].rx_object.removeFFTChannel()
             self.frontend_tuner_status[tuner_num].fft_output_info = None
@@ -1628,8 +2340,9 @@ class MSDD_i(MSDD_base):
         except:
             pass
         finally:
-            self.sendDetach(alloc_id, data_port=False, fft_port=True)
             self.MSDD.save_fft_channel(fft_channel)
+            self.MSDD.resource_lock.release()
+            self.sendDetach(alloc_id, data_port=False, fft_port=True)
             
 
     def _allocate_frontend_tuner_allocation(self, frontend_tuner_allocation, scanner_props=None ):
@@ -1639,7 +2352,14 @@ class MSDD_i(MSDD_base):
         self.trace_msg("Received a tuner allocation: {0} ", str(frontend_tuner_allocation))
         _stime_alloc=time.time()
 
-        if self._usageState == CF.Device.BUSY:
+        # reject right away while the radio is known to be unresponsive
+        if self.MSDD and self.MSDD.connection.isCircuitOpen():
+            self.warn_msg("Rejecting allocation {0}, radio is not responding", frontend_tuner_allocation.allocation_id)
+            raise CF.Device.InvalidState(self.format_msg_with_radio("Cannot perform allocation, radio is not responding"))
+
+        # a group checks the usage state once before its first request
+        bulk = self.get_bulk_allocation()
+        if self._usageState == CF.Device.BUSY and not bulk:
             #
             # recheck cpu and network state since the radio could have failed to provide status
             # during an allocation
@@ -1696,7 +2416,17 @@ class MSDD_i(MSDD_base):
                 for idx in range(len(self.frontend_tuner_status)-len(self.tuner_allocation_ids)):
                     self.tuner_allocation_ids.append(tuner_allocation_ids_struct())
 
-            for tuner_num in range(len(self.tuner_allocation_ids)):
+            # Calculate IF Offset if there is one
+            if_freq = self.convert_rf_to_if(frontend_tuner_allocation.center_frequency)
+
+            # only try tuners of the requested type that can provide the request, best fit first
+            candidates = self.get_allocation_candidates(frontend_tuner_allocation, if_freq)
+            if bulk and frontend_tuner_allocation.device_control:
+                candidates = bulk.order_candidates(frontend_tuner_allocation.allocation_id, candidates)
+            if not candidates:
+                emsg = "No {0} tuners can provide the request".format(frontend_tuner_allocation.tuner_type)
+
+            for tuner_num in candidates:
                 self.debug_msg("--- Attempting allocation on Tuner {0}:"\
                                " Type: {1} Request: {2} ",
                                tuner_num,
@@ -1749,10 +2479,6 @@ class MSDD_i(MSDD_base):
                         self.info_msg("ValidateRequestVsRFInfo Failed: reason {0}",e)
                         raise
 
-
-                # Calculate IF Offset if there is one
-                if_freq = self.convert_rf_to_if(frontend_tuner_allocation.center_frequency)
-
                 ########## LISTENER ALLOCATION - IE - DEVICE CONTROL IS FALSE ##########
                 if not frontend_tuner_allocation.device_control:
                     if not self.frontend_tuner_status[tuner_num].allocated:
@@ -1798,7 +2524,7 @@ class MSDD_i(MSDD_base):
 
 
                 ########## CONTROLLER ALLOCATION - IE - DEVICE CONTROL IS TRUE ##########
-                if self.frontend_tuner_status[tuner_num].allocated:
+                if self.frontend_tuner_status[tuner_num].allocated or tuner_num in self._claimed_tuners:
                     self.debug_msg(" Control allocation failed because given tuner {0} was already allocated",
                                    tuner_num)
                     continue
@@ -1832,95 +2558,110 @@ class MSDD_i(MSDD_base):
                     valid_bw = None
                     success = True
 
+                    # tune holding only the tuner lock, so allocations and settings of other tuners
+                    # proceed, the claim keeps other allocations off the tuner. A retune of the parent
+                    # locks its children and waits for the tuning to complete
+                    self.claim_tuner(tuner_num)
+                    tuner_locks=self.release_maps_for_tuners([tuner_num])
                     try:
-                        valid_cf = self.frontend_tuner_status[tuner_num].rx_object.get_valid_frequency(if_freq)
-                        success &= self.frontend_tuner_status[tuner_num].rx_object.setFrequency_Hz(valid_cf)
-
-                        _etime=time.time()-_stime_alloc
-                        self.debug_msg("allocate candidate tuner {} duration:{:.7f} (before sr/bw check) "\
-                                    ", cf success {} "\
-                                    ", if freq {} "\
-                                    ", freq {} "\
-                                    ", sample rate {}"\
-                                    ", bandwidth {}",
-                                       tuner_num,
-                                       _etime,
-                                       success,
-                                       if_freq,
-                                       valid_cf,
-                                       valid_sr,
-                                       valid_bw)
-
-                        if frontend_tuner_allocation.sample_rate!=0 and frontend_tuner_allocation.bandwidth!=0:
-                            #Specify a SR and BW
-                            sr = max(frontend_tuner_allocation.bandwidth,frontend_tuner_allocation.sample_rate) #Ask for enough sr to satisfy the bw request
-                            valid_bw = self.frontend_tuner_status[tuner_num].rx_object.get_valid_bandwidth(frontend_tuner_allocation.bandwidth, frontend_tuner_allocation.bandwidth_tolerance)
-                            success &= self.frontend_tuner_status[tuner_num].rx_object.setBandwidth_Hz(valid_bw)
-                            valid_sr = self.frontend_tuner_status[tuner_num].rx_object.get_valid_sample_rate(sr, frontend_tuner_allocation.sample_rate_tolerance)
-                            success &= self.frontend_tuner_status[tuner_num].rx_object.setSampleRate(valid_sr)
-                            self.trace_msg( " SRATE and BW, valid bw {0} valid srate {1} success {2}",
-                                            valid_bw,
-                                            valid_sr,
-                                            success)
-                        elif frontend_tuner_allocation.sample_rate!=0 and frontend_tuner_allocation.bandwidth==0:
-                            #Specify only SR
-                            valid_sr = self.frontend_tuner_status[tuner_num].rx_object.get_valid_sample_rate(frontend_tuner_allocation.sample_rate, frontend_tuner_allocation.sample_rate_tolerance)
-                            success &= self.frontend_tuner_status[tuner_num].rx_object.setSampleRate(valid_sr)
-                            valid_bw =  self.frontend_tuner_status[tuner_num].rx_object.get_bandwidth_for_sample_rate(valid_sr)
-                            success &= self.frontend_tuner_status[tuner_num].rx_object.setBandwidth_Hz(valid_bw)
-                            self.trace_msg( " SRATE only, valid bw {0} valid srate {1} success {2}",
-                                            valid_bw,
-                                            valid_sr,
-                                            success)
-                        elif frontend_tuner_allocation.sample_rate==0 and frontend_tuner_allocation.bandwidth!=0:
-                            #specify only BW so use it for requested SR with a large tolerance because sample rate is 'don't care'
-                            valid_bw = self.frontend_tuner_status[tuner_num].rx_object.get_valid_bandwidth(frontend_tuner_allocation.bandwidth, frontend_tuner_allocation.bandwidth_tolerance)
-                            success &= self.frontend_tuner_status[tuner_num].rx_object.setBandwidth_Hz(valid_bw)
-                            valid_sr = self.frontend_tuner_status[tuner_num].rx_object.get_sample_rate_for_bandwidth(valid_bw)
-                            success &= self.frontend_tuner_status[tuner_num].rx_object.setSampleRate(valid_sr)
-                            self.trace_msg( " BW only, valid bw {0} valid srate {1} success {2}",
-                                            valid_bw,
-                                            valid_sr,
-                                            success)
-                        elif frontend_tuner_allocation.sample_rate==0 and frontend_tuner_allocation.bandwidth==0:
-                            #Don't care for both sample_rate and # bandwidth so find any valid value and use it
-                            valid_bw =  self.frontend_tuner_status[tuner_num].rx_object.get_valid_bandwidth(valid_bw)
-                            success &= self.frontend_tuner_status[tuner_num].rx_object.setBandwidth_Hz(valid_bw)
-                            valid_sr = self.frontend_tuner_status[tuner_num].rx_object.get_sample_rate_for_bandwidth(valid_bw)
-                            success &= self.frontend_tuner_status[tuner_num].rx_object.setSampleRate(valid_sr)
-                            self.trace_msg( " Don't care, valid bw {0} valid srate {1} success {2}",
-                                            valid_bw,
-                                            valid_sr,
-                                            success)
-                        else:
-                            self.error_msg( "Allocation failed against tuner {0} for unknown reason",
-                                            tuner_num)
-                            success = False
-
-                        _etime=time.time()-_stime_alloc
-                        self.debug_msg("allocate results, tuner {} duration:{:.7f} success {}"\
-                                        ", if freq {}"\
-                                        ", freq {}"\
+                        try:
+                            valid_cf = self.frontend_tuner_status[tuner_num].rx_object.get_valid_frequency(if_freq)
+                            success &= self.frontend_tuner_status[tuner_num].rx_object.setFrequency_Hz(valid_cf)
+
+                            _etime=time.time()-_stime_alloc
+                            self.debug_msg("allocate candidate tuner {} duration:{:.7f} (before sr/bw check) "\
+                                        ", cf success {} "\
+                                        ", if freq {} "\
+                                        ", freq {} "\
                                         ", sample rate {}"\
                                         ", bandwidth {}",
-                                       tuner_num,
-                                       _etime,
-                                       success,
-                                       if_freq,
-                                       valid_cf,
-                                       valid_sr,
-                                       valid_bw)
+                                           tuner_num,
+                                           _etime,
+                                           success,
+                                           if_freq,
+                                           valid_cf,
+                                           valid_sr,
+                                           valid_bw)
+
+                            if frontend_tuner_allocation.sample_rate!=0 and frontend_tuner_allocation.bandwidth!=0:
+                                #Specify a SR and BW
+                                sr = max(frontend_tuner_allocation.bandwidth,frontend_tuner_allocation.sample_rate) #Ask for enough sr to satisfy the bw request
+                                valid_bw = self.frontend_tuner_status[tuner_num].rx_object.get_valid_bandwidth(frontend_tuner_allocation.bandwidth, frontend_tuner_allocation.bandwidth_tolerance)
+                                success &= self.frontend_tuner_status[tuner_num].rx_object.setBandwidth_Hz(valid_bw)
+                                valid_sr = self.frontend_tuner_status[tuner_num].rx_object.get_valid_sample_rate(sr, frontend_tuner_allocation.sample_rate_tolerance)
+                                success &= self.frontend_tuner_status[tuner_num].rx_object.setSampleRate(valid_sr)
+                                self.trace_msg( " SRATE and BW, valid bw {0} valid srate {1} success {2}",
+                                                valid_bw,
+                                                valid_sr,
+                                                success)
+                            elif frontend_tuner_allocation.sample_rate!=0 and frontend_tuner_allocation.bandwidth==0:
+                                #Specify only SR
+                                valid_sr = self.frontend_tuner_status[tuner_num].rx_object.get_valid_sample_rate(frontend_tuner_allocation.sample_rate, frontend_tuner_allocation.sample_rate_tolerance)
+                                success &= self.frontend_tuner_status[tuner_num].rx_object.setSampleRate(valid_sr)
+                                valid_bw =  self.frontend_tuner_status[tuner_num].rx_object.get_bandwidth_for_sample_rate(valid_sr)
+                                success &= self.frontend_tuner_status[tuner_num].rx_object.setBandwidth_Hz(valid_bw)
+                                self.trace_msg( " SRATE only, valid bw {0} valid srate {1} success {2}",
+                                                valid_bw,
+                                                valid_sr,
+                                                success)
+                            elif frontend_tuner_allocation.sample_rate==0 and frontend_tuner_allocation.bandwidth!=0:
+                                #specify only BW so use it for requested SR with a large tolerance because sample rate is 'don't care'
+                                valid_bw = self.frontend_tuner_status[tuner_num].rx_object.get_valid_bandwidth(frontend_tuner_allocation.bandwidth, frontend_tuner_allocation.bandwidth_tolerance)
+                                success &= self.frontend_tuner_status[tuner_num].rx_object.setBandwidth_Hz(valid_bw)
+                                valid_sr = self.frontend_tuner_status[tuner_num].rx_object.get_sample_rate_for_bandwidth(valid_bw)
+                                success &= self.frontend_tuner_status[tuner_num].rx_object.setSampleRate(valid_sr)
+                                self.trace_msg( " BW only, valid bw {0} valid srate {1} success {2}",
+                                                valid_bw,
+                                                valid_sr,
+                                                success)
+                            elif frontend_tuner_allocation.sample_rate==0 and frontend_tuner_allocation.bandwidth==0:
+                                #Don't care for both sample_rate and # bandwidth so find any valid value and use it
+                                valid_bw =  self.frontend_tuner_status[tuner_num].rx_object.get_valid_bandwidth(valid_bw)
+                                success &= self.frontend_tuner_status[tuner_num].rx_object.setBandwidth_Hz(valid_bw)
+                                valid_sr = self.frontend_tuner_status[tuner_num].rx_object.get_sample_rate_for_bandwidth(valid_bw)
+                                success &= self.frontend_tuner_status[tuner_num].rx_object.setSampleRate(valid_sr)
+                                self.trace_msg( " Don't care, valid bw {0} valid srate {1} success {2}",
+                                                valid_bw,
+                                                valid_sr,
+                                                success)
+                            else:
+                                self.error_msg( "Allocation failed against tuner {0} for unknown reason",
+                                                tuner_num)
+                                success = False
+
+                            _etime=time.time()-_stime_alloc
+                            self.debug_msg("allocate results, tuner {} duration:{:.7f} success {}"\
+                                            ", if freq {}"\
+                                            ", freq {}"\
+                                            ", sample rate {}"\
+                                            ", bandwidth {}",
+                                           tuner_num,
+                                           _etime,
+                                           success,
+                                           if_freq,
+                                           valid_cf,
+                                           valid_sr,
+                                           valid_bw)
+
+                        except (CommandException, InvalidValue), e:
+                            if logging.NOTSET < self._baseLog.level < logging.INFO:
+                                traceback.print_exc()
+                            success = False
+                            msg=self.format_msg_with_radio("Allocation failed, Tuner {0} exception {1} allocation request {2}",
+                                                tuner_num, 
+                                                e, 
+                                                cfg_values)
+                            self.debug_msg(msg)
+                            raise MsddException(msg)
+                    finally:
+                        self.reacquire_maps(tuner_locks)
+                        self.release_tuner(tuner_num)
 
-                    except (CommandException, InvalidValue), e:
-                        if logging.NOTSET < self._baseLog.level < logging.INFO:
-                            traceback.print_exc()
-                        success = False
-                        msg=self.format_msg_with_radio("Allocation failed, Tuner {0} exception {1} allocation request {2}",
-                                            tuner_num, 
-                                            e, 
-                                            cfg_values)
-                        self.debug_msg(msg)
-                        raise MsddException(msg)
+                    # the parent could have been deallocated while the allocation maps were released
+                    if parent_tuner != None and not self.frontend_tuner_status[parent_tuner].allocated:
+                        raise Exception(self.format_msg_with_radio("Tuner {0} parent tuner {1} was deallocated",
+                                                        tuner_num,
+                                                        parent_tuner))
 
                     allocated_values=self.format_msg("cf:{0} bw:{1} srate:{2} ",
                                                      valid_cf, 
@@ -1948,8 +2689,9 @@ class MSDD_i(MSDD_base):
                                        srate, 
                                        self.tuner_output_configuration[tuner_num].enabled,
                                        protocol)
+                    # a group checks the network output of all its tuners once at the end
                     if self.tuner_output_configuration.has_key(tuner_num) and \
-                       self.tuner_output_configuration[tuner_num].enabled:
+                       self.tuner_output_configuration[tuner_num].enabled and not bulk:
                         if not self.checkNetworkOutput(additional_rate=srate,
                                                                out_module=self.frontend_tuner_status[tuner_num].rx_object.output_object):
                             raise BusyException(self.format_msg_with_radio("Network output rate would exceed network interface, tuner: {0} adding sample rate {1}",
@@ -2020,8 +2762,9 @@ class MSDD_i(MSDD_base):
                             traceback.print_exc()
                         raise AllocationFailure("Error completing allocation {0}".format(frontend_tuner_allocation.allocation_id))
 
-                    # update usage state
-                    self._usageState = self.updateUsageState()
+                    # update usage state, once at the end for a group
+                    if not bulk:
+                        self._usageState = self.updateUsageState()
 
 
                     _etime=time.time()-_stime_alloc
@@ -2039,6 +2782,7 @@ class MSDD_i(MSDD_base):
                     if logging.NOTSET < self._baseLog.level < logging.INFO:
                         traceback.print_exc()
                     self.frontend_tuner_status[tuner_num].rx_object.setEnable(False)
+                    self.mark_tuner_status_dirty([tuner_num])
                     emsg = "{}".format(e)
                     self.debug_msg("--- Allocation Failed, Reason {0} "\
                                    " Tuner: {1} "\
@@ -2056,6 +2800,9 @@ class MSDD_i(MSDD_base):
         finally:
             self.trace_msg("Releasing lock for tuner allocation: {0} ", str(frontend_tuner_allocation))                                    
             self.allocation_id_mapping_lock.release()
+            # refresh the tuners changed by the allocation, once at the end for a group
+            if not bulk:
+                self.update_tuner_status()
 
 
         # check if an allocation was completed or registered
@@ -2074,19 +2821,294 @@ class MSDD_i(MSDD_base):
                       emsg,
                       str(frontend_tuner_allocation))
 
+        if not bulk:
+            try:
+                self._usageState = self.updateUsageState()
+            except:
+                pass
+
+        return False
+
+
+    def get_bulk_allocation(self):
+        """
+        Returns the bulk_allocation handled by the calling thread, None for single requests
+        """
+        bulk = self._bulk_allocation
+        if bulk and bulk.thread is threading.current_thread():
+            return bulk
+        return None
+
+    def plan_frontend_tuner_allocations(self, frontend_tuner_allocations):
+        """
+        Check the allocation ids of a group of requests, order the requests so parent tuners are
+        allocated before their DDCs and listeners after the control allocations, and reserve a
+        tuner for each control request of a tuner without a parent, best fit first. Callers hold
+        allocation_id_mapping_lock
+
+        Returns:
+        --------
+        bulk_allocation with the plan, raises CF.Device.InvalidCapacity if a request can not be provided
+        """
+        if len(self.tuner_allocation_ids) != len(self.frontend_tuner_status):
+            for idx in range(len(self.frontend_tuner_status)-len(self.tuner_allocation_ids)):
+                self.tuner_allocation_ids.append(tuner_allocation_ids_struct())
+
+        allocation_ids=set()
+        ranked=[]
+        for order, alloc in enumerate(frontend_tuner_allocations):
+            if alloc.allocation_id in ("",None):
+                raise CF.Device.InvalidCapacity(self.format_msg_with_radio("Missing Allocation ID"),
+                                                properties.struct_to_props(alloc))
+            if alloc.allocation_id in allocation_ids or \
+               self.allocation_id_to_tuner_id.has_key(alloc.allocation_id):
+                raise CF.Device.InvalidCapacity(self.format_msg_with_radio("Allocation ID {0} already in use.",
+                                                                           alloc.allocation_id),
+                                                properties.struct_to_props(alloc))
+            allocation_ids.add(alloc.allocation_id)
+
+            candidates=[]
+            rank=2
+            if alloc.device_control:
+                # the frequency range of a DDC follows its parent, which can be tuned by the group
+                rank=0
+                for tuner_num in self.tuner_index.get_tuners(alloc.tuner_type):
+                    if self.MSDD.get_parent_tuner_num(self.frontend_tuner_status[tuner_num].rx_object) != None:
+                        rank=1
+                        break
+                if rank == 0:
+                    candidates=self.get_allocation_candidates(alloc, self.convert_rf_to_if(alloc.center_frequency))
+            ranked.append((rank, order, alloc, candidates))
+        ranked.sort(key=lambda x : x[:2])
+
+        bulk=bulk_allocation([ x[2] for x in ranked ])
+        reserved=set()
+        for rank, order, alloc, candidates in ranked:
+            if rank != 0:
+                continue
+            for tuner_num in candidates:
+                if tuner_num not in reserved:
+                    reserved.add(tuner_num)
+                    bulk.planned[alloc.allocation_id]=tuner_num
+                    break
+            else:
+                raise CF.Device.InvalidCapacity(self.format_msg_with_radio("No {0} tuners can provide the request, Allocation ID {1}",
+                                                                           alloc.tuner_type,
+                                                                           alloc.allocation_id),
+                                                properties.struct_to_props(alloc))
+        self.debug_msg("Planned {0} allocations, reserved tuners {1}", len(bulk.allocations), bulk.planned)
+        return bulk
+
+    def get_tuner_allocations(self, props):
+        """
+        Returns the frontend_tuner_allocation structures of an allocateCapacity or
+        deallocateCapacity request with more than one FRONTEND::tuner_allocation property and no
+        other properties, None for the requests the frontend base handles one at a time
+        """
+        if len(props) < 2:
+            return None
+        allocations=[]
+        for prop in props:
+            if prop.id != "FRONTEND::tuner_allocation":
+                return None
+            alloc=frontend_tuner_allocation()
+            for member_id, value in properties.props_to_dict([prop])[prop.id].items():
+                name=member_id.split('::')[-1]
+                if hasattr(alloc, name):
+                    setattr(alloc, name, value)
+            allocations.append(alloc)
+        return allocations
+
+    def allocateCapacity(self, props):
+        """
+        A request of several FRONTEND::tuner_allocation structures, e.g. the DDCs of a waveform,
+        is allocated as one group by allocate_frontend_tuner_allocations, other requests are
+        handled by the frontend base
+        """
+        allocations=self.get_tuner_allocations(props)
+        if allocations is None:
+            return MSDD_base.allocateCapacity(self, props)
+        if self._adminState != CF.Device.UNLOCKED or self._operationalState == CF.Device.DISABLED:
+            raise CF.Device.InvalidState(self.format_msg_with_radio("Cannot perform allocation, device is locked or disabled"))
+        return self.allocate_frontend_tuner_allocations(allocations)
+
+    def deallocateCapacity(self, props):
+        """
+        A request of several FRONTEND::tuner_allocation structures is released as one group by
+        deallocate_frontend_tuner_allocations, other requests are handled by the frontend base
+        """
+        deallocations=self.get_tuner_allocations(props)
+        if deallocations is None:
+            return MSDD_base.deallocateCapacity(self, props)
+        self.deallocate_frontend_tuner_allocations(deallocations)
+
+    def allocate_frontend_tuner_allocations(self, frontend_tuner_allocations):
+        """
+        Allocate a group of FRONTEND tuner allocations together, e.g. the DDCs of a waveform.
+        The requests are planned as a group, the output modules of the tuners are enabled as
+        one batch of commands, and the network output, cpu load and usage state are checked once
+        at the end. Either every request is allocated or none, the allocations already made are
+        released when a request fails.
+
+        Parameters:
+        -----------
+        frontend_tuner_allocations : list of frontend_tuner_allocation structures
+
+        Returns:
+        --------
+        True when every request was allocated, False when the group was released
+        """
+        _stime_alloc=time.time()
+        allocations=list(frontend_tuner_allocations)
+        if not allocations:
+            return True
+
+        if self.MSDD and self.MSDD.connection.isCircuitOpen():
+            self.warn_msg("Rejecting {0} allocations, radio is not responding", len(allocations))
+            raise CF.Device.InvalidState(self.format_msg_with_radio("Cannot perform allocation, radio is not responding"))
+
+        self._bulk_allocation_lock.acquire()
         try:
+            self.allocation_id_mapping_lock.acquire()
+            try:
+                if self._usageState == CF.Device.BUSY:
+                    self._usageState = self.updateUsageState()
+                    if self._usageState == CF.Device.BUSY:
+                        raise CF.Device.InvalidState(self.format_msg_with_radio("Cannot perform allocation, device is busy"))
+                bulk=self.plan_frontend_tuner_allocations(allocations)
+            finally:
+                self.allocation_id_mapping_lock.release()
+
+            success=False
+            self._bulk_allocation=bulk
+            try:
+                for alloc in bulk.allocations:
+                    if not self._allocate_frontend_tuner_allocation(alloc):
+                        self.warn_msg("Failed allocation {0}, releasing {1} allocations of the group",
+                                      alloc.allocation_id,
+                                      len(bulk.completed))
+                        break
+                    bulk.completed.append(alloc)
+                else:
+                    success=self._enable_bulk_allocation(bulk)
+            finally:
+                self._bulk_allocation=None
+                if not success:
+                    try:
+                        self._deallocate_frontend_tuner_allocations(bulk.completed, bulk.restatus)
+                    except:
+                        self.exception_msg("Error releasing allocations {0}",
+                                           [ x.allocation_id for x in bulk.completed ])
+        finally:
+            self._bulk_allocation_lock.release()
+
+        self.update_tuner_status()
+        if success:
             self._usageState = self.updateUsageState()
-        except:
-            pass
+        _etime=time.time()-_stime_alloc
+        self.info_msg("Allocation time {:.7f} for {} allocations, success {}", _etime, len(allocations), success)
+        return success
 
-        return False
+    def _enable_bulk_allocation(self, bulk):
+        """
+        Check the network output of the allocated group and enable the output modules of its tuners
+        """
+        if not self.checkNetworkOutput():
+            self.warn_msg("Network output rate would exceed network interface, releasing {0} allocations",
+                          len(bulk.completed))
+            return False
+        if bulk.outputs:
+            failed=self.MSDD.set_output_enables([ x[1] for x in bulk.outputs ], True)
+            if failed:
+                self.error_msg("Unable to enable output modules {0}, releasing {1} allocations",
+                               [ x.full_reg_name for x in failed ],
+                               len(bulk.completed))
+                return False
+        return True
+
+    def deallocate_frontend_tuner_allocations(self, frontend_tuner_deallocations):
+        """
+        Release a group of FRONTEND tuner allocations. The output modules of the control
+        allocations are disabled as one batch of commands, and the tuner status and usage state
+        are updated once at the end. Every allocation is released, the first error is raised
+        after the group
+
+        Parameters:
+        -----------
+        frontend_tuner_deallocations : list of frontend_tuner_allocation structures
+        """
+        self._bulk_allocation_lock.acquire()
+        try:
+            self._deallocate_frontend_tuner_allocations(list(frontend_tuner_deallocations))
+        finally:
+            self._bulk_allocation_lock.release()
+
+    def deallocate_frontend_tuner_allocation(self, frontend_tuner_deallocation):
+        """
+        Release an allocation, then refresh the tuners it changed holding only their tuner
+        locks. A group refreshes its tuners once when the group is released
+        """
+        try:
+            return MSDD_base.deallocate_frontend_tuner_allocation(self, frontend_tuner_deallocation)
+        finally:
+            if not self.get_bulk_allocation():
+                self.update_tuner_status()
+
+    def _deallocate_frontend_tuner_allocations(self, deallocations, restatus=()):
+        """
+        Release a group of allocations, callers hold _bulk_allocation_lock. restatus are other
+        tuner numbers to refresh with the group
+        """
+        bulk=bulk_allocation(deallocations)
+        bulk.restatus.update(restatus)
+        modules=[]
+        for dealloc in deallocations:
+            tuner_num=self.getTunerMapping(dealloc.allocation_id)
+            if tuner_num < 0 or self.frontend_tuner_status[tuner_num].allocation_id_control != dealloc.allocation_id:
+                continue
+            rx_object=self.frontend_tuner_status[tuner_num].rx_object
+            if rx_object.has_streaming_output():
+                modules.append(rx_object.output_object.object)
+                bulk.disabled_outputs.add(tuner_num)
+        if modules and self.MSDD:
+            failed=self.MSDD.set_output_enables(modules, False, verify=False)
+            if failed:
+                # deviceDisable disables these modules one at a time
+                self.warn_msg("Unable to disable output modules {0}", [ x.full_reg_name for x in failed ])
+                for tuner_num in list(bulk.disabled_outputs):
+                    if self.frontend_tuner_status[tuner_num].rx_object.output_object.object in failed:
+                        bulk.disabled_outputs.discard(tuner_num)
+
+        error=None
+        self._bulk_allocation=bulk
+        try:
+            for dealloc in deallocations:
+                try:
+                    self.deallocate_frontend_tuner_allocation(dealloc)
+                except Exception, e:
+                    if logging.NOTSET < self._baseLog.level < logging.INFO:
+                        traceback.print_exc()
+                    self.error_msg("Error releasing allocation {0}, reason {1}", dealloc.allocation_id, e)
+                    if error is None:
+                        error=e
+        finally:
+            self._bulk_allocation=None
+
+        if bulk.restatus:
+            self.update_tuner_status(sorted(bulk.restatus))
+        self._usageState = self.updateUsageState()
+        if error is not None:
+            raise error
 
 
     def enableDigitalOutput(self, tuner_num ):
         try:
             _rx_object = self.frontend_tuner_status[tuner_num].rx_object
             _output_mod = _rx_object.output_object.object
-            _output_mod.enable = False
+            bulk = self.get_bulk_allocation()
+            found, enabled = _output_mod.peek_cached_query(_output_mod.getEnable)
+            if not bulk or not found or enabled:
+                _output_mod.enable = False
             if not _rx_object.has_streaming_output():
                 self.trace_msg("Tuner {0} does not have digital output", tuner_num)
                 return
@@ -2125,16 +3147,20 @@ class MSDD_i(MSDD_base):
                     self.frontend_tuner_status[tuner_num].digital_output_info=_output_mod.getInfo()
 
                     # relink output module to source if it was lost
-                    if self.MSDD.get_corresponding_output_module_object(_rx_object.digital_rx_object) == None:
-                        self.MSDD.stream_router.linkModules(
-                            _rx_object.digital_rx_object.object.full_reg_name,
-                            _output_mod.full_reg_name)
-                        self.debug_msg("enableDigitalOutput, tuner {0}"\
-                                       " relinking src: {1}"
-                                       " dest: {2}",
-                                       tuner_num,
-                                       _rx_object.digital_rx_object.object.full_reg_name,
-                                       _output_mod.full_reg_name)
+                    try:
+                        self.MSDD.resource_lock.acquire()
+                        if self.MSDD.get_corresponding_output_module_object(_rx_object.digital_rx_object) == None:
+                            self.MSDD.stream_router.linkModules(
+                                _rx_object.digital_rx_object.object.full_reg_name,
+                                _output_mod.full_reg_name)
+                            self.debug_msg("enableDigitalOutput, tuner {0}"\
+                                           " relinking src: {1}"
+                                           " dest: {2}",
+                                           tuner_num,
+                                           _rx_object.digital_rx_object.object.full_reg_name,
+                                           _output_mod.full_reg_name)
+                    finally:
+                        self.MSDD.resource_lock.release()
 
                 success=True
             except:
@@ -2169,7 +3195,11 @@ class MSDD_i(MSDD_base):
                     self.info_msg("Disabling digital output for CHANNELIZER only request, tuner {0}",tuner_num)
                     outcfg_enabled=False
 
-            success&= _rx_object.set_output_enable(outcfg_enabled)
+            if bulk and outcfg_enabled and _rx_object.has_streaming_output():
+                # enabled with the output modules of the other requests of the group
+                bulk.outputs.append((tuner_num, _output_mod))
+            else:
+                success&= _rx_object.set_output_enable(outcfg_enabled)
             self.debug_msg("enableDigitalOutput, tuner {0}"\
                             " enabled_output: {1}"\
                             " return from set enable {2}",
@@ -2240,21 +3270,31 @@ class MSDD_i(MSDD_base):
 
 
         fts.enabled=enable
-        self._update_tuner_status([tuner_id])
+        # refreshed once the allocation releases the allocation maps
+        self.mark_tuner_status_dirty([tuner_id])
         return
 
     def deviceDisable(self,fts, tuner_id):
 
         restatus_tuners=[tuner_id]
+        bulk = self.get_bulk_allocation()
         try:
             # Check if tuner_id has secondary allocations associated with it
             # if so, only turn of output and leave hardware nbddc tuner enabled
             self.debug_msg("deviceDisable,  disable tuner/output for tuner {0}",tuner_id)
+            # output module may already be disabled with the other tuners of a group
+            output_disabled = bulk and tuner_id in bulk.disabled_outputs
             if not self.checkSecondaryAllocations(tuner_id):
-                self.frontend_tuner_status[tuner_id].rx_object.setEnable(False)
+                if output_disabled:
+                    self.frontend_tuner_status[tuner_id].rx_object.set_tuner_enable(False)
+                else:
+                    self.frontend_tuner_status[tuner_id].rx_object.setEnable(False)
             else:
                 self.debug_msg("Tuner {0} has secondary allocations active, retain nbddc enable state.", tuner_id)
-                self.frontend_tuner_status[tuner_id].rx_object.setEnable(False,enabled_secondary=True)
+                if output_disabled:
+                    self.frontend_tuner_status[tuner_id].rx_object.set_tuner_enable(False,enabled_secondary=True)
+                else:
+                    self.frontend_tuner_status[tuner_id].rx_object.setEnable(False,enabled_secondary=True)
 
             # Check this tuner is the last tuner allocated for a non-allocated parent.
             # if so, we can disable the parent's hardware tuner
@@ -2276,7 +3316,10 @@ class MSDD_i(MSDD_base):
 
         fts.enabled=False
         fts.digital_output=False
-        self._update_tuner_status(restatus_tuners)
+        # refreshed once the deallocation, or the group, releases the allocation maps
+        if bulk:
+            bulk.restatus.update(restatus_tuners)
+        self.mark_tuner_status_dirty(restatus_tuners)
 
     def deviceDeleteTuning(self,fts,tuner_id):
         
@@ -2295,6 +3338,8 @@ class MSDD_i(MSDD_base):
 
         self.frontend_tuner_status[tuner_id].allocation_id_control = ""
         self.frontend_tuner_status[tuner_id].allocated = False
+        self.mark_tuner_status_dirty([tuner_id])
+        self.publish_status_snapshot()
         self.info_msg("Deallocated Allocation ID: {0} Tuner: {1} Type: {2}",
                       control_aid,
                       tuner_id,
@@ -2319,7 +3364,7 @@ class MSDD_i(MSDD_base):
             # reverse lookup tuner
             if self.rx_channel_tuner_status.has_key(child):
                 child_idx=self.rx_channel_tuner_status[child]
-                if self.frontend_tuner_status[child_idx].allocated:
+                if self.frontend_tuner_status[child_idx].allocated or child_idx in self._claimed_tuners:
                     return True
 
     def countSecondaryAllocations(self, tuner_id ):
@@ -2338,7 +3383,7 @@ class MSDD_i(MSDD_base):
         for child in self.frontend_tuner_status[tuner_id].rx_object.rx_child_objects:
             if self.rx_channel_tuner_status.has_key(child):
                 child_idx=self.rx_channel_tuner_status[child]
-                if self.frontend_tuner_status[child_idx].allocated:
+                if self.frontend_tuner_status[child_idx].allocated or child_idx in self._claimed_tuners:
                     count += 1
         return count
 
@@ -2443,7 +3488,7 @@ class MSDD_i(MSDD_base):
     def getTunerType(self,allocation_id):
         idx = self.getTunerMapping(allocation_id)
         if idx < 0: raise FRONTEND.FrontendException("Invalid Allocation ID {0}".format(allocation_id))
-        return self.frontend_tuner_status[idx].tuner_type
+        return self.get_tuner_status(idx).tuner_type
 
     def getTunerDeviceControl(self,allocation_id):
         idx = self.getTunerMapping(allocation_id)
@@ -2455,12 +3500,12 @@ class MSDD_i(MSDD_base):
     def getTunerGroupId(self,allocation_id):
         idx = self.getTunerMapping(allocation_id)
         if idx < 0: raise FRONTEND.FrontendException("Invalid Allocation ID {0}".format(allocation_id))
-        return self.frontend_tuner_status[idx].group_id
+        return self.get_tuner_status(idx).group_id
 
     def getTunerRfFlowId(self,allocation_id):
         idx = self.getTunerMapping(allocation_id)
         if idx < 0: raise FRONTEND.FrontendException("Invalid Allocation ID {0}".format(allocation_id))
-        return self.frontend_tuner_status[idx].rf_flow_id
+        return self.get_tuner_status(idx).rf_flow_id
 
     def setTunerCenterFrequency(self,allocation_id, freq):
         tuner_num = self.getTunerMapping(allocation_id)
@@ -2472,8 +3517,8 @@ class MSDD_i(MSDD_base):
         if_freq = self.convert_rf_to_if(freq)
         valid_cf = None
         changed_child_numbers = []
+        tuner_locks=self.lock_tuners(self.get_related_tuner_nums(tuner_num))
         try:
-            self.allocation_id_mapping_lock.acquire()
             #check this tuner is the only allocation left for a non-allocated parent
             parent_rx_channel = self.frontend_tuner_status[tuner_num].rx_object.rx_parent_object
             if self.checkLastSecondaryAllocation(tuner_num):
@@ -2524,14 +3569,14 @@ class MSDD_i(MSDD_base):
             self.exception_msg(error_string)
             raise FRONTEND.BadParameterException(error_string)
         finally:
-            self.allocation_id_mapping_lock.release()
+            self.unlock_tuners(tuner_locks)
             self.debug_msg("setTunerCenterFrequency update status for {0}", ",".join([ str(x) for x in [tuner_num]+changed_child_numbers]))
             self.update_tuner_status([tuner_num]+changed_child_numbers)
 
     def getTunerCenterFrequency(self,allocation_id):
         idx = self.getTunerMapping(allocation_id)
         if idx < 0: raise FRONTEND.FrontendException("Invalid Allocation ID {0}".format(allocation_id))
-        return self.frontend_tuner_status[idx].center_frequency
+        return self.get_tuner_status(idx).center_frequency
 
     def setTunerBandwidth(self,allocation_id, bw):
         tuner_num = self.getTunerMapping(allocation_id)
@@ -2540,8 +3585,8 @@ class MSDD_i(MSDD_base):
             raise FRONTEND.FrontendException("Allocation ID {0} is not authorized to modify the tuner's bandwidth.".format(allocation_id))
         if bw<0: raise FRONTEND.BadParameterException()
         
+        tuner_locks=self.lock_tuners([tuner_num])
         try:
-            self.allocation_id_mapping_lock.acquire()
             self.frontend_tuner_status[tuner_num].rx_object.validate_bandwidth(bw)
             self.debug_msg("Setting bandwidth to {0} on tuner {1} for Allocation ID {2}",
                            bw,
@@ -2556,13 +3601,13 @@ class MSDD_i(MSDD_base):
             self.exception_msg(error_string)
             raise FRONTEND.BadParameterException(error_string)
         finally:
-            self.allocation_id_mapping_lock.release()
+            self.unlock_tuners(tuner_locks)
         self.update_tuner_status([tuner_num])
 
     def getTunerBandwidth(self,allocation_id):
         idx = self.getTunerMapping(allocation_id)
         if idx < 0: raise FRONTEND.FrontendException("Invalid Allocation ID {0}".format(allocation_id))
-        return self.frontend_tuner_status[idx].bandwidth
+        return self.get_tuner_status(idx).bandwidth
 
     def setTunerAgcEnable(self,allocation_id, enable):
         raise FRONTEND.NotSupportedException("setTunerAgcEnable not supported")
@@ -2577,8 +3622,8 @@ class MSDD_i(MSDD_base):
             raise FRONTEND.FrontendException("Allocation ID {0} is not authorized to modify the tuner's gain.".format(allocation_id))
     
         valid_gain = None
+        tuner_locks=self.lock_tuners([tuner_num])
         try:
-            self.allocation_id_mapping_lock.acquire()
             if self.frontend_tuner_status[tuner_num].rx_object.is_analog():
                 valid_gain = self.frontend_tuner_status[tuner_num].rx_object.analog_rx_object.object.get_valid_gain(gain)
                 self.frontend_tuner_status[tuner_num].rx_object.analog_rx_object.object.setGain(valid_gain)
@@ -2592,13 +3637,13 @@ class MSDD_i(MSDD_base):
             self.exception_msg(error_string)
             raise FRONTEND.BadParameterException(error_string)
         finally:
-            self.allocation_id_mapping_lock.release()
+            self.unlock_tuners(tuner_locks)
         self.update_tuner_status([tuner_num])
 
     def getTunerGain(self,allocation_id):
         idx = self.getTunerMapping(allocation_id)
         if idx < 0: raise FRONTEND.FrontendException("Invalid Allocation ID {0}".format(allocation_id))
-        return self.frontend_tuner_status[idx].gain
+        return self.get_tuner_status(idx).gain
 
     def setTunerReferenceSource(self,allocation_id, source):
         raise FRONTEND.NotSupportedException("Can not change 10MHz reference")
@@ -2612,18 +3657,21 @@ class MSDD_i(MSDD_base):
         if allocation_id != self.getControlAllocationId(tuner_num):
             raise FRONTEND.FrontendException("Allocation ID {0} is not authorized to disable/enable the tuner.".format(allocation_id))
     
+        tuner_locks=self.lock_tuners([tuner_num])
         try:
             self.frontend_tuner_status[tuner_num].enabled=enable
             self.frontend_tuner_status[tuner_num].rx_object.setEnable(enable)
         except Exception, e:
             msg="Exception when modifing tuner's enable state for Allocation ID {0}, reason {1} ".format(allocation_id,e)
             self.exception_msg(msg)
+        finally:
+            self.unlock_tuners(tuner_locks)
         self.update_tuner_status([tuner_num])
 
     def getTunerEnable(self,allocation_id):
         idx = self.getTunerMapping(allocation_id)
         if idx < 0: raise FRONTEND.FrontendException("Invalid Allocation ID {0}".format(allocation_id))
-        return self.frontend_tuner_status[idx].enabled
+        return self.get_tuner_status(idx).enabled
 
 
     def setTunerOutputSampleRate(self,allocation_id, sr):
@@ -2632,8 +3680,8 @@ class MSDD_i(MSDD_base):
         if allocation_id != self.getControlAllocationId(tuner_num):
             raise FRONTEND.FrontendException("Allocation ID {0} is not authorized to modify the tuner's sample rate.".format(allocation_id))
         if sr<0: raise FRONTEND.BadParameterException()
+        tuner_locks=self.lock_tuners([tuner_num])
         try:
-            self.allocation_id_mapping_lock.acquire()
             self.frontend_tuner_status[tuner_num].rx_object.validate_sample_rate(sr)
             self.debug_msg("Setting sample rate to {0} for tuner {1}", sr, tuner_num)
             self.frontend_tuner_status[tuner_num].rx_object.setSampleRate(sr)
@@ -2642,13 +3690,13 @@ class MSDD_i(MSDD_base):
             self.exception_msg(error_string)
             raise FRONTEND.BadParameterException(error_string)
         finally:
-            self.allocation_id_mapping_lock.release()
+            self.unlock_tuners(tuner_locks)
         self.update_tuner_status([tuner_num])
 
     def getTunerOutputSampleRate(self,allocation_id):
         idx = self.getTunerMapping(allocation_id)
         if idx < 0: raise FRONTEND.FrontendException("Invalid Allocation ID {0}".format(allocation_id))
-        return self.frontend_tuner_status[idx].sample_rate
+        return self.get_tuner_status(idx).sample_rate
 
     '''
     *************************************************************
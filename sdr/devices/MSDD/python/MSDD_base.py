@@ -423,6 +423,78 @@ class MSDD_base(CF__POA.Device, FrontendTunerDevice, digital_tuner_delegation, r
                                                          defvalue=1000.0
                                                          )
         
+            echoless_mode = simple_property(
+                                            id_="advanced::echoless_mode",
+                                            
+                                            name="echoless_mode",
+                                            type_="boolean",
+                                            defvalue=False
+                                            )
+        
+            capture_file = simple_property(
+                                           id_="advanced::capture_file",
+                                           
+                                           name="capture_file",
+                                           type_="string",
+                                           defvalue=""
+                                           )
+        
+            control_sockets = simple_property(
+                                              id_="advanced::control_sockets",
+                                              
+                                              name="control_sockets",
+                                              type_="ushort",
+                                              defvalue=1
+                                              )
+        
+            shadow_reconcile_interval = simple_property(
+                                                        id_="advanced::shadow_reconcile_interval",
+                                                        
+                                                        name="shadow_reconcile_interval",
+                                                        type_="double",
+                                                        defvalue=0.0
+                                                        )
+        
+            capability_cache_file = simple_property(
+                                                    id_="advanced::capability_cache_file",
+                                                    
+                                                    name="capability_cache_file",
+                                                    type_="string",
+                                                    defvalue=""
+                                                    )
+        
+            startup_profile = simple_property(
+                                              id_="advanced::startup_profile",
+                                              
+                                              name="startup_profile",
+                                              type_="string",
+                                              defvalue=""
+                                              )
+        
+            status_poll_interval = simple_property(
+                                                   id_="advanced::status_poll_interval",
+                                                   
+                                                   name="status_poll_interval",
+                                                   type_="double",
+                                                   defvalue=0.0
+                                                   )
+        
+            lock_debug = simple_property(
+                                         id_="advanced::lock_debug",
+                                         
+                                         name="lock_debug",
+                                         type_="boolean",
+                                         defvalue=False
+                                         )
+        
+            breaker_failures = simple_property(
+                                               id_="advanced::breaker_failures",
+                                               
+                                               name="breaker_failures",
+                                               type_="ushort",
+                                               defvalue=4
+                                               )
+        
             def __init__(self, **kw):
                 """Construct an initialized instance of this struct definition"""
                 for classattr in type(self).__dict__.itervalues():
@@ -441,6 +513,15 @@ class MSDD_base(CF__POA.Device, FrontendTunerDevice, digital_tuner_delegation, r
                 d["max_cpu_load"] = self.max_cpu_load
                 d["max_nic_percentage"] = self.max_nic_percentage
                 d["minimum_connected_nic_rate"] = self.minimum_connected_nic_rate
+                d["echoless_mode"] = self.echoless_mode
+                d["capture_file"] = self.capture_file
+                d["control_sockets"] = self.control_sockets
+                d["shadow_reconcile_interval"] = self.shadow_reconcile_interval
+                d["capability_cache_file"] = self.capability_cache_file
+                d["startup_profile"] = self.startup_profile
+                d["status_poll_interval"] = self.status_poll_interval
+                d["lock_debug"] = self.lock_debug
+                d["breaker_failures"] = self.breaker_failures
                 return str(d)
         
             @classmethod
@@ -452,7 +533,7 @@ class MSDD_base(CF__POA.Device, FrontendTunerDevice, digital_tuner_delegation, r
                 return True
         
             def getMembers(self):
-                return [("rcvr_mode",self.rcvr_mode),("wb_ddc_mode",self.wb_ddc_mode),("hw_ddc_mode",self.hw_ddc_mode),("enable_fft_channels",self.enable_fft_channels),("max_cpu_load",self.max_cpu_load),("max_nic_percentage",self.max_nic_percentage),("minimum_connected_nic_rate",self.minimum_connected_nic_rate)]
+                return [("rcvr_mode",self.rcvr_mode),("wb_ddc_mode",self.wb_ddc_mode),("hw_ddc_mode",self.hw_ddc_mode),("enable_fft_channels",self.enable_fft_channels),("max_cpu_load",self.max_cpu_load),("max_nic_percentage",self.max_nic_percentage),("minimum_connected_nic_rate",self.minimum_connected_nic_rate),("echoless_mode",self.echoless_mode),("capture_file",self.capture_file),("control_sockets",self.control_sockets),("shadow_reconcile_interval",self.shadow_reconcile_interval),("capability_cache_file",self.capability_cache_file),("startup_profile",self.startup_profile),("status_poll_interval",self.status_poll_interval),("lock_debug",self.lock_debug),("breaker_failures",self.breaker_failures)]
 
         advanced = struct_property(id_="advanced",
                                    name="advanced",
@@ -1490,6 +1571,174 @@ class MSDD_base(CF__POA.Device, FrontendTunerDevice, digital_tuner_delegation, r
                                               description="""Define the output configuration for each FFT channel.
 Allow for blocks of output configuration applied to FFT channels. These properties are similar to block_output_configuration and tuner_output_configuration, except this configuration is only applied to output modules assigned to allocated FFT channels.""")
 
+        class control_plane_stats_struct(object):
+            mnemonic = simple_property(
+                                       id_="control_plane_stats::mnemonic",
+                                       
+                                       name="mnemonic",
+                                       type_="string",
+                                       defvalue=""
+                                       )
+        
+            count = simple_property(
+                                    id_="control_plane_stats::count",
+                                    
+                                    name="count",
+                                    type_="ulong",
+                                    defvalue=0
+                                    )
+        
+            timeouts = simple_property(
+                                       id_="control_plane_stats::timeouts",
+                                       
+                                       name="timeouts",
+                                       type_="ulong",
+                                       defvalue=0
+                                       )
+        
+            retries = simple_property(
+                                      id_="control_plane_stats::retries",
+                                      
+                                      name="retries",
+                                      type_="ulong",
+                                      defvalue=0
+                                      )
+        
+            errors = simple_property(
+                                     id_="control_plane_stats::errors",
+                                     
+                                     name="errors",
+                                     type_="ulong",
+                                     defvalue=0
+                                     )
+        
+            latency_avg_ms = simple_property(
+                                             id_="control_plane_stats::latency_avg_ms",
+                                             
+                                             name="latency_avg_ms",
+                                             type_="double",
+                                             defvalue=0.0
+                                             )
+        
+            latency_min_ms = simple_property(
+                                             id_="control_plane_stats::latency_min_ms",
+                                             
+                                             name="latency_min_ms",
+                                             type_="double",
+                                             defvalue=0.0
+                                             )
+        
+            latency_max_ms = simple_property(
+                                             id_="control_plane_stats::latency_max_ms",
+                                             
+                                             name="latency_max_ms",
+                                             type_="double",
+                                             defvalue=0.0
+                                             )
+        
+            latency_p95_ms = simple_property(
+                                             id_="control_plane_stats::latency_p95_ms",
+                                             
+                                             name="latency_p95_ms",
+                                             type_="double",
+                                             defvalue=0.0
+                                             )
+        
+            echo_wait_avg_ms = simple_property(
+                                               id_="control_plane_stats::echo_wait_avg_ms",
+                                               
+                                               name="echo_wait_avg_ms",
+                                               type_="double",
+                                               defvalue=0.0
+                                               )
+        
+            response_wait_avg_ms = simple_property(
+                                                   id_="control_plane_stats::response_wait_avg_ms",
+                                                   
+                                                   name="response_wait_avg_ms",
+                                                   type_="double",
+                                                   defvalue=0.0
+                                                   )
+        
+            bytes_sent = simple_property(
+                                         id_="control_plane_stats::bytes_sent",
+                                         
+                                         name="bytes_sent",
+                                         type_="ulonglong",
+                                         defvalue=0
+                                         )
+        
+            bytes_received = simple_property(
+                                             id_="control_plane_stats::bytes_received",
+                                             
+                                             name="bytes_received",
+                                             type_="ulonglong",
+                                             defvalue=0
+                                             )
+        
+            latency_histogram = simple_property(
+                                                id_="control_plane_stats::latency_histogram",
+                                                
+                                                name="latency_histogram",
+                                                type_="string",
+                                                defvalue=""
+                                                )
+        
+            def __init__(self, mnemonic="", count=0, timeouts=0, retries=0, errors=0, latency_avg_ms=0.0, latency_min_ms=0.0, latency_max_ms=0.0, latency_p95_ms=0.0, echo_wait_avg_ms=0.0, response_wait_avg_ms=0.0, bytes_sent=0, bytes_received=0, latency_histogram=""):
+                self.mnemonic = mnemonic
+                self.count = count
+                self.timeouts = timeouts
+                self.retries = retries
+                self.errors = errors
+                self.latency_avg_ms = latency_avg_ms
+                self.latency_min_ms = latency_min_ms
+                self.latency_max_ms = latency_max_ms
+                self.latency_p95_ms = latency_p95_ms
+                self.echo_wait_avg_ms = echo_wait_avg_ms
+                self.response_wait_avg_ms = response_wait_avg_ms
+                self.bytes_sent = bytes_sent
+                self.bytes_received = bytes_received
+                self.latency_histogram = latency_histogram
+        
+            def __str__(self):
+                """Return a string representation of this structure"""
+                d = {}
+                d["mnemonic"] = self.mnemonic
+                d["count"] = self.count
+                d["timeouts"] = self.timeouts
+                d["retries"] = self.retries
+                d["errors"] = self.errors
+                d["latency_avg_ms"] = self.latency_avg_ms
+                d["latency_min_ms"] = self.latency_min_ms
+                d["latency_max_ms"] = self.latency_max_ms
+                d["latency_p95_ms"] = self.latency_p95_ms
+                d["echo_wait_avg_ms"] = self.echo_wait_avg_ms
+                d["response_wait_avg_ms"] = self.response_wait_avg_ms
+                d["bytes_sent"] = self.bytes_sent
+                d["bytes_received"] = self.bytes_received
+                d["latency_histogram"] = self.latency_histogram
+                return str(d)
+        
+            @classmethod
+            def getId(cls):
+                return "control_plane_stats::command_stats"
+        
+            @classmethod
+            def isStruct(cls):
+                return True
+        
+            def getMembers(self):
+                return [("mnemonic",self.mnemonic),("count",self.count),("timeouts",self.timeouts),("retries",self.retries),("errors",self.errors),("latency_avg_ms",self.latency_avg_ms),("latency_min_ms",self.latency_min_ms),("latency_max_ms",self.latency_max_ms),("latency_p95_ms",self.latency_p95_ms),("echo_wait_avg_ms",self.echo_wait_avg_ms),("response_wait_avg_ms",self.response_wait_avg_ms),("bytes_sent",self.bytes_sent),("bytes_received",self.bytes_received),("latency_histogram",self.latency_histogram)]
+
+        control_plane_stats = structseq_property(id_="control_plane_stats",
+                                                 name="control_plane_stats",
+                                                 structdef=control_plane_stats_struct,
+                                                 defvalue=[],
+                                                 configurationkind=("property",),
+                                                 mode="readonly",
+                                                 description="""Control plane telemetry for the connection to the radio, one entry per command mnemonic. The first entry (mnemonic TOTAL) holds the counters for the entire connection. Latency is measured from the first send of a command until it completes.""")
+
+
 
         class frontend_tuner_status_struct_struct(frontend.default_frontend_tuner_status_struct_struct):
             available_bandwidth = simple_property(
@@ -1710,13 +1959,19 @@ Allow for blocks of output configuration applied to FFT channels. These properti
                                             name="psd_peak_mode",
                                             type_="string")
         
+            status_timestamp = simple_property(
+                                               id_="FRONTEND::tuner_status::status_timestamp",
+                                               
+                                               name="status_timestamp",
+                                               type_="double")
+        
             available_tuner_type = simple_property(
                                                    id_="FRONTEND::tuner_status::available_tuner_type",
                                                    
                                                    name="available_tuner_type",
                                                    type_="string")
         
-            def __init__(self, allocation_id_csv="", available_bandwidth="", available_frequency="", available_gain="", available_sample_rate="", bandwidth=0.0, center_frequency=0.0, complex=False, decimation=0, enabled=False, gain=0.0, group_id="", output_format="", output_multicast="", output_port=0, output_vlan=0, rf_flow_id="", sample_rate=0.0, tuner_number=0, tuner_type="", available_decimation="", msdd_channel_type="", msdd_installation_name_csv="", msdd_registration_name_csv="", bits_per_sample=0, adc_meter_values="", rcvr_gain=0.0, ddc_gain=0.0, allocated=False, input_sample_rate=0.0, output_channel="", output_enabled=False, output_protocol="", output_vlan_enabled=False, output_flow="", output_timestamp_offset="", output_endianess=1, output_mfp_flush=0, psd_fft_size=0.0, psd_averages=0.0, psd_time_between_ffts=0.0, psd_output_bin_size=0.0, psd_window_type="", psd_peak_mode="", available_tuner_type=""):
+            def __init__(self, allocation_id_csv="", available_bandwidth="", available_frequency="", available_gain="", available_sample_rate="", bandwidth=0.0, center_frequency=0.0, complex=False, decimation=0, enabled=False, gain=0.0, group_id="", output_format="", output_multicast="", output_port=0, output_vlan=0, rf_flow_id="", sample_rate=0.0, tuner_number=0, tuner_type="", available_decimation="", msdd_channel_type="", msdd_installation_name_csv="", msdd_registration_name_csv="", bits_per_sample=0, adc_meter_values="", rcvr_gain=0.0, ddc_gain=0.0, allocated=False, input_sample_rate=0.0, output_channel="", output_enabled=False, output_protocol="", output_vlan_enabled=False, output_flow="", output_timestamp_offset="", output_endianess=1, output_mfp_flush=0, psd_fft_size=0.0, psd_averages=0.0, psd_time_between_ffts=0.0, psd_output_bin_size=0.0, psd_window_type="", psd_peak_mode="", status_timestamp=0.0, available_tuner_type=""):
                 frontend.default_frontend_tuner_status_struct_struct.__init__(self, allocation_id_csv=allocation_id_csv, bandwidth=bandwidth, center_frequency=center_frequency, enabled=enabled, group_id=group_id, rf_flow_id=rf_flow_id, sample_rate=sample_rate, tuner_type=tuner_type)
                 self.available_bandwidth = available_bandwidth
                 self.available_frequency = available_frequency
@@ -1754,6 +2009,7 @@ Allow for blocks of output configuration applied to FFT channels. These properti
                 self.psd_output_bin_size = psd_output_bin_size
                 self.psd_window_type = psd_window_type
                 self.psd_peak_mode = psd_peak_mode
+                self.status_timestamp = status_timestamp
                 self.available_tuner_type = available_tuner_type
         
             def __str__(self):
@@ -1803,6 +2059,7 @@ Allow for blocks of output configuration applied to FFT channels. These properti
                 d["psd_output_bin_size"] = self.psd_output_bin_size
                 d["psd_window_type"] = self.psd_window_type
                 d["psd_peak_mode"] = self.psd_peak_mode
+                d["status_timestamp"] = self.status_timestamp
                 d["available_tuner_type"] = self.available_tuner_type
                 return str(d)
         
@@ -1815,7 +2072,7 @@ Allow for blocks of output configuration applied to FFT channels. These properti
                 return True
         
             def getMembers(self):
-                return frontend.default_frontend_tuner_status_struct_struct.getMembers(self) + [("available_bandwidth",self.available_bandwidth),("available_frequency",self.available_frequency),("available_gain",self.available_gain),("available_sample_rate",self.available_sample_rate),("complex",self.complex),("decimation",self.decimation),("gain",self.gain),("output_format",self.output_format),("output_multicast",self.output_multicast),("output_port",self.output_port),("output_vlan",self.output_vlan),("tuner_number",self.tuner_number),("available_decimation",self.available_decimation),("msdd_channel_type",self.msdd_channel_type),("msdd_installation_name_csv",self.msdd_installation_name_csv),("msdd_registration_name_csv",self.msdd_registration_name_csv),("bits_per_sample",self.bits_per_sample),("adc_meter_values",self.adc_meter_values),("rcvr_gain",self.rcvr_gain),("ddc_gain",self.ddc_gain),("allocated",self.allocated),("input_sample_rate",self.input_sample_rate),("output_channel",self.output_channel),("output_enabled",self.output_enabled),("output_protocol",self.output_protocol),("output_vlan_enabled",self.output_vlan_enabled),("output_flow",self.output_flow),("output_timestamp_offset",self.output_timestamp_offset),("output_endianess",self.output_endianess),("output_mfp_flush",self.output_mfp_flush),("psd_fft_size",self.psd_fft_size),("psd_averages",self.psd_averages),("psd_time_between_ffts",self.psd_time_between_ffts),("psd_output_bin_size",self.psd_output_bin_size),("psd_window_type",self.psd_window_type),("psd_peak_mode",self.psd_peak_mode),("available_tuner_type",self.available_tuner_type)]
+                return frontend.default_frontend_tuner_status_struct_struct.getMembers(self) + [("available_bandwidth",self.available_bandwidth),("available_frequency",self.available_frequency),("available_gain",self.available_gain),("available_sample_rate",self.available_sample_rate),("complex",self.complex),("decimation",self.decimation),("gain",self.gain),("output_format",self.output_format),("output_multicast",self.output_multicast),("output_port",self.output_port),("output_vlan",self.output_vlan),("tuner_number",self.tuner_number),("available_decimation",self.available_decimation),("msdd_channel_type",self.msdd_channel_type),("msdd_installation_name_csv",self.msdd_installation_name_csv),("msdd_registration_name_csv",self.msdd_registration_name_csv),("bits_per_sample",self.bits_per_sample),("adc_meter_values",self.adc_meter_values),("rcvr_gain",self.rcvr_gain),("ddc_gain",self.ddc_gain),("allocated",self.allocated),("input_sample_rate",self.input_sample_rate),("output_channel",self.output_channel),("output_enabled",self.output_enabled),("output_protocol",self.output_protocol),("output_vlan_enabled",self.output_vlan_enabled),("output_flow",self.output_flow),("output_timestamp_offset",self.output_timestamp_offset),("output_endianess",self.output_endianess),("output_mfp_flush",self.output_mfp_flush),("psd_fft_size",self.psd_fft_size),("psd_averages",self.psd_averages),("psd_time_between_ffts",self.psd_time_between_ffts),("psd_output_bin_size",self.psd_output_bin_size),("psd_window_type",self.psd_window_type),("psd_peak_mode",self.psd_peak_mode),("status_timestamp",self.status_timestamp),("available_tuner_type",self.available_tuner_type)]
 
         connectionTable = structseq_property(id_="connectionTable",
                                              structdef=bulkio.connection_descriptor_struct,
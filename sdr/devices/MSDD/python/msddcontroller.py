@@ -34,7 +34,9 @@ __author__ = 'REDHAWK'
 __version__= '2.0'
 
 
+import os
 import sys
+import ast
 import copy
 import socket
 import select
@@ -50,10 +52,16 @@ import time
 import traceback
 import threading
 import datetime
+import collections
+import bisect
+import types
 
 class ConnectionFailure(Exception):
     pass
 
+class CircuitOpen(ConnectionFailure):
+    pass
+
 class CommandException(Exception):
     pass
 
@@ -83,6 +91,15 @@ def create_csv(val_list):
     """
     return ','.join([ str(x) for x in val_list])
 
+def command_mnemonic(command):
+    """
+    Returns the mnemonic of a console command, queries keep the ? (e.g. FRQ?)
+    """
+    tokens=command.split(None,2)
+    if len(tokens) < 2:
+        return tokens[0] if len(tokens) else ""
+    return tokens[1].rstrip(';')
+
 def expand_bitmask(bit_mask, lsb=True, ltype=int):
     """
     expand a bit mask value into a list of 1 and 0. ltype
@@ -112,26 +129,70 @@ def get_value_valid_list(value,value_tolerance_perc, values, return_max=None):
     throws InvalidValue exception
     If no value provided returns minimum or maximum in list of values
     """
-    sorted_list = sorted(values)
-    idx=0
-    if return_max: idx=-1
+    return get_value_valid_sorted(value, value_tolerance_perc, sorted(values), return_max)
+
+
+def get_value_valid_sorted(value,value_tolerance_perc, sorted_values, return_max=None):
+    """
+    Same as get_value_valid_list for a list of values that is sorted in ascending order,
+    the closest value is found with a binary search
+
+    Parameters:
+    value : value to search for
+    value_tolerance_perc : percentage tolerance to use when searching 0..100
+    sorted_values : list of valid values, sorted in ascending order
+    return_max: if no search value give returns min (None/False) or max (True) value
+    """
     # just return minimum value or maximum value in the list
     if value == None or value <= 0.0:
-        if len(sorted_list) > 0:
-            return sorted_list[idx]
+        if len(sorted_values) > 0:
+            if return_max:
+                return sorted_values[-1]
+            return sorted_values[0]
         raise InvalidValue("Valid value not found! Requested Value was %s" %value)
     max_tolerance_val=None
     if value_tolerance_perc and value_tolerance_perc > 0.0:
         max_tolerance_val = value + value*(value_tolerance_perc/100.0)
-    for num in range(0,len(sorted_list)):
-        if sorted_list[num] < value:
-            continue
-        if sorted_list[num] >= value and ( max_tolerance_val is None or sorted_list[num] <= max_tolerance_val):
-            return sorted_list[num]
-        if sorted_list[num] > max_tolerance_val:
-            continue
+    idx=bisect.bisect_left(sorted_values, value)
+    if idx < len(sorted_values) and ( max_tolerance_val is None or sorted_values[idx] <= max_tolerance_val):
+        return sorted_values[idx]
+
+    raise InvalidValue("Invalid value, requested value: %s (tolerance:%s%%) not in range: %s " % (value,value_tolerance_perc,','.join([str(x) for x in sorted_values])))
+
 
-    raise InvalidValue("Invalid value, requested value: %s (tolerance:%s%%) not in range: %s " % (value,value_tolerance_perc,','.join([str(x) for x in values])))
+def get_value_valid_range(value, tolerance_perc, min_val, max_val, step_val=1, closest_ceil=False):
+    """
+    Find the first value on the min_val:max_val:step_val grid that is equal to or above value
+    and within the tolerance, computed directly from the grid
+
+    Parameters:
+    value : value to search for
+    tolerance_perc : percentage tolerance above value 0..100
+    min_val, max_val, step_val : range of valid values, a step of 0 or less uses 0.25
+    closest_ceil : if no value is within tolerance return the next highest value on the grid
+
+    Returns:
+    --------
+    matching value or throws InvalidValue exception
+    """
+    if step_val <= 0:
+        step_val = 0.25
+    try:
+        next_highest_valid = max(min_val,min(max_val,math.ceil((value-min_val)/step_val) * step_val+min_val))
+        max_tolerance_val = value + value*(tolerance_perc/100.0)
+        max_valid_val = math.ceil((max_tolerance_val-min_val)/step_val) * step_val+min_val
+        val = next_highest_valid
+        if val < value:
+            # rounding (or integer division) left the grid point just below value
+            val += step_val
+        valid = (val >= value and val >= min_val and val <= max_val and val <= max_valid_val)
+        if not valid and closest_ceil:
+            return next_highest_valid
+    except TypeError:
+        raise InvalidValue("Missing min/max values, Requested Value was %s" %value)
+    if not valid:
+        raise InvalidValue("Valid value not found! Requested Value was %s (max/min) %s/%s" % (value,max_val,min_val))
+    return val
 
 
 def check_value_from_values( value, _get_values_list):
@@ -158,315 +219,2419 @@ def check_value_from_values( value, _get_values_list):
         raise InvalidValue("Item not found in list, item <" + str(value) + "> list " + ",".join([ str(x) for x in vlist]) )
     return True
 
-class Connection(object):
-    """Class to actually communicate with the radio, NB there should only be one of these per radio"""
+class ResponseDecoder(object):
+    """
+    Decodes response messages from the radio, "MOD:CH CMD value". Patterns are compiled once,
+    non-ascii characters are only replaced when present and the value token is found with a
+    single split from the right. The typed methods return the value of the last token directly.
+    Error responses (" ERR ") raise CommandException.
+    """
+    NonAscii=re.compile(r'[^\x00-\x7F]+')
 
-    Success=0
-    TimeOut=-1
-    Error=-2
-    MsgEnd='\n'
+    def clean(self, msg):
+        """
+        Returns message with non-ascii characters and newlines replaced by spaces, trailing whitespace removed
+        """
+        if type(msg) is not str:
+            msg=str(msg)
+        if self.NonAscii.search(msg):
+            msg=self.NonAscii.sub(' ', msg)
+        return msg.replace('\n',' ').rstrip()
 
-    def __init__(self, address, timeout=0.25,enable_trace=False):
+    def token(self, resp):
         """
-        Attributes:
-        ----------
-        _debug : turn on print statements
-        __mutexLock : synchronize access to the device
-        radioAddress : (ip, port) tuple
-        radioSocket : socket to write and read messages
+        Returns the last token of a response message
+        """
+        if type(resp) is not str:
+            resp=str(resp)
+        if self.NonAscii.search(resp):
+            resp=self.NonAscii.sub(' ', resp)
+        resp=resp.strip()
+        if ' ERR ' in resp:
+            raise CommandException("Error condition returned, message " + resp)
+        tokens=resp.rsplit(None,1)
+        if len(tokens) < 2:
+            raise CommandException("Invalid response detected: " + resp)
+        return tokens[1]
+
+    def values(self, resp, items=-1, sep=','):
+        """
+        Returns the last token split on sep, items is the number of expected values (-1 == don't care)
+        """
+        values=self.token(resp).rsplit(sep,items)
+        if items >= 0 and len(values) != items:
+            raise CommandException("Could not parse reponse message for item check " + str(items) + " response \"" + str(resp).strip() + "\" AS DESIRED.")
+        return values
 
-        Parameters:
-        ----------
-        address: tuple (ip, port)
-        timeout: default time in seconds to wait when receiving a message
+    def _single(self, resp):
+        value=self.token(resp)
+        if ',' in value:
+            raise CommandException("Could not parse reponse message for item check 1 response \"" + str(resp).strip() + "\" AS DESIRED.")
+        return value
+
+    def int_value(self, resp):
+        return int(self._single(resp))
+
+    def float_value(self, resp):
+        return float(self._single(resp))
+
+    def bool_value(self, resp):
         """
-	self._debug=False
-        self.__mutexLock = threading.Lock()
-        self.radioAddress = address
-        self.radioSocket=None
-        self.trace_on_comm_failure=enable_trace
-        self.pause=False
-        self.connect(timeout)
+        Returns True if the first ':' separated value is 1
+        """
+        return int(self.token(resp).split(':',1)[0]) == 1
 
-    def set_trace_failure(self, onoff):
-        self.trace_on_comm_failure=onoff
+    def range_value(self, resp, rtype=float):
+        """
+        Returns [min, max, step] from a min:max:step response
+        """
+        values=self.values(resp, 3, ':')
+        return [ rtype(values[0]), rtype(values[1]), rtype(values[2]) ]
 
-    def connect(self, timeout):
+    def list_value(self, resp, rtype=None, sep=','):
         """
-        Open a UDP socket connection for communicating to the radio. If the socket was
-        open then close and reset.
+        Returns the comma separated values of the last token
+        """
+        values=self.token(resp).split(sep)
+        if rtype:
+            return [ rtype(x) for x in values ]
+        return values
 
-        Parameters:
-        ----------
-        timeout : timeout in seconds when receiving messages from the radio
 
+class CachedQuery(object):
+    """
+    Descriptor for a module getter whose result is kept in the module's QueryCache, use the
+    cached_query decorator. The policy controls how long a result is used:
+
+    STATIC : until the caches are invalidated (reconnect, firmware change, MSDDRadio.invalidate_caches)
+    TTL : for ttl seconds
+    LIVE : never cached, calls are only counted for the hit rate report
+    SHADOW : shadow copy of a register, the value read back after a set is kept until the
+             register is set again, a command to the radio fails (shadow_epoch) or the
+             module is refreshed
+
+    A set command sent by the module for a mnemonic in invalidated_by clears the cached
+    result.  Results are cached per argument list, lists are copied so callers can modify them.
+    """
+    STATIC='static'
+    TTL='ttl'
+    LIVE='live'
+    SHADOW='shadow'
+
+    def __init__(self, fget, policy=STATIC, ttl=None, invalidated_by=()):
+        self.fget=fget
+        self.policy=policy
+        self.ttl=ttl
+        self.invalidated_by=frozenset(invalidated_by)
+        self.__name__=fget.__name__
+        self.__doc__=fget.__doc__
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return types.MethodType(self, obj, objtype)
+
+    def __call__(self, obj, *args, **kwargs):
+        cache=obj.query_cache
+        if self.policy == self.LIVE:
+            cache.count(self)
+            return self.fget(obj, *args, **kwargs)
+        key=(self, args, tuple(sorted(kwargs.items()))) if kwargs else (self, args)
+        epoch=self.epoch(obj)
+        found, value, version = cache.lookup(key, self, epoch)
+        if not found:
+            value=self.fget(obj, *args, **kwargs)
+            cache.store(key, value, epoch, version)
+        if type(value) is list:
+            return value[:]
+        return value
+
+    def epoch(self, obj):
         """
-        self.timeout=timeout
-        if self.radioSocket:
-            self.radioSocket.close()
-            self.radioSocket = None
+        Returns the connection epoch a result is tagged with
+        """
+        if self.policy == self.SHADOW:
+            return (obj.connection.cache_epoch, obj.connection.shadow_epoch)
+        return obj.connection.cache_epoch
 
-        #generate socket for sending/receiving UDP packets to/from radio
+
+def cached_query(policy=CachedQuery.STATIC, ttl=None, invalidated_by=()):
+    """
+    Decorator for module getters, see CachedQuery
+    """
+    def _wrap(fget):
+        return CachedQuery(fget, policy, ttl, invalidated_by)
+    return _wrap
+
+
+class QueryCache(object):
+    """
+    Results of the cached queries of one module and hit/miss counters for each query.
+    Entries are tagged with the connection's cache_epoch, when the epoch changes the
+    entries are stale.
+    """
+
+    def __init__(self):
+        self._lock=threading.Lock()
+        self._entries={}          # (query, args) -> (value, store time, epoch)
+        self._version=0           # bumped by invalidate, a result fetched across an invalidate is not stored
+        self._query_version={}    # query -> version, bumped when the entries of the query are invalidated
+        self._mnemonics={}        # set command -> queries it invalidates
+        self._stats={}            # query name -> [ policy, hits, misses ]
+
+    def _stat(self, query):
+        stat=self._stats.get(query.__name__)
+        if stat is None:
+            stat=self._stats[query.__name__]=[ query.policy, 0, 0 ]
+            for mnemonic in query.invalidated_by:
+                self._mnemonics.setdefault(mnemonic, set()).add(query)
+        return stat
+
+    def _invalidate_queries(self, queries):
+        for key in [ k for k in self._entries if k[0] in queries ]:
+            del self._entries[key]
+        for query in queries:
+            self._query_version[query]=self._query_version.get(query, 0)+1
+
+    def count(self, query):
+        self._lock.acquire()
         try:
-            self.__mutexLock.acquire()
-            if self._debug:
-                self.log_msg("Opening connection to {}".format(self.radioAddress))
-            self.radioSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        except:
-            traceback.print_exc()
-            self.radioSocket=None
+            self._stat(query)[2]+=1
         finally:
-            self.__mutexLock.release()
+            self._lock.release()
 
-
-    def _reconnect(self):
+    def lookup(self, key, query, epoch):
         """
-        Perform close/open operation on the socket, does not lock access
+        Returns (found, value, version), version is passed to store
         """
-        if self.radioSocket:
-            self.radioSocket.close()
-            self.radioSocket = None
-
-        #generate socket for sending/receiving UDP packets to/from radio
+        self._lock.acquire()
         try:
-            self.radioSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        except:
-            self.radioSocket=None
+            stat=self._stat(query)
+            entry=self._entries.get(key)
+            if entry is not None and entry[2] == epoch and \
+               (query.ttl is None or time.time()-entry[1] < query.ttl):
+                stat[1]+=1
+                return True, entry[0], self.get_version(query)
+            stat[2]+=1
+            return False, None, self.get_version(query)
+        finally:
+            self._lock.release()
 
+    def get_version(self, query):
+        return (self._version, self._query_version.get(query, 0))
 
-    def disconnect(self):
+    def peek(self, key, query, epoch):
         """
-        Close the socket connection to the radio.
-
+        Returns (found, value) like lookup, without counting a hit or miss
         """
+        self._lock.acquire()
         try:
-            self.__mutexLock.acquire()
-            if self.radioSocket:
-                self.radioSocket.close()
-                self.radioSocket = None
+            entry=self._entries.get(key)
+            if entry is not None and entry[2] == epoch and \
+               (query.ttl is None or time.time()-entry[1] < query.ttl):
+                return True, entry[0]
+            return False, None
         finally:
-            self.radioSocket=None
-            self.__mutexLock.release()
+            self._lock.release()
 
-    def set_timeout(self, timeout):
+    def get_entries(self, policy):
         """
-        Sets the timeout attribute
-
-        Parameters:
-        -----------
-        timeout - new timeout value
+        Returns list of (key, value) for the entries of queries with the policy
         """
-        self.__mutexLock.acquire()
-        self.timeout=timeout
-        self.radioSocket.settimeout(timeout)
-        self.__mutexLock.release()
-        
-    def flush(self, retries=None):
-        self.__mutexLock.acquire()
+        self._lock.acquire()
         try:
-            self._flush(retries)
+            return [ (key, entry[0]) for key, entry in self._entries.items() if key[0].policy == policy ]
         finally:
-            self.__mutexLock.release()
-            return
+            self._lock.release()
 
-    def _flush(self, retries=None):
-        ret=False
-        if retries is None: retries=1
-        self.radioSocket.sendto("\n", self.radioAddress)
-        while retries != 0:
-            self.radioSocket.settimeout(self.timeout/10.0)
-            rmsg=self.radioSocket.recv(65535)
-            if len(rmsg) > 0 : ret=True
-            retries-=1
-        return ret
+    def store(self, key, value, epoch, version):
+        self._lock.acquire()
+        try:
+            if version == self.get_version(key[0]):
+                self._entries[key]=(value, time.time(), epoch)
+        finally:
+            self._lock.release()
 
-    def log_msg(self,msg):
-        print timestamp_msg(msg)
+    def invalidate(self, mnemonic=None, policy=None):
+        """
+        Clear all entries, the entries of queries invalidated by a set command mnemonic, or
+        the entries of queries with the policy
+        """
+        self._lock.acquire()
+        try:
+            if policy is not None:
+                self._invalidate_queries(set([ k[0] for k in self._entries if k[0].policy == policy ]))
+            elif mnemonic is None:
+                self._entries.clear()
+                self._version+=1
+            elif mnemonic in self._mnemonics:
+                self._invalidate_queries(self._mnemonics[mnemonic])
+        finally:
+            self._lock.release()
 
-    def sendStringCommand(self, command, check_for_output=True, expect_output=True):
+    def get_stats(self):
         """
-        Sends command to the radio and return response
+        Returns list of dictionaries with name, policy, hits, misses for each query used
+        """
+        self._lock.acquire()
+        try:
+            return [ { 'name' : name, 'policy' : stat[0], 'hits' : stat[1], 'misses' : stat[2] }
+                     for name, stat in sorted(self._stats.items()) ]
+        finally:
+            self._lock.release()
 
-        Parameters:
-        -----------
-        command : command string to send to radio
-        check_for_output : check for output after command echo is processed
-        expect_output : when checking for output that we expected reply message
-                        if not, then raise CommandException
+    def reset_stats(self):
+        self._lock.acquire()
+        try:
+            for stat in self._stats.values():
+                stat[1]=0
+                stat[2]=0
+        finally:
+            self._lock.release()
 
-        Returns:
-        --------
-        resp : response string from radio
-        """
-        self.__mutexLock.acquire()            # synchronize access to the radio
 
-        _timeout=self.timeout                 # configured timeout
-        _echo_timeout=_timeout/5.0            # partial wait for echo response
-        _debug=self._debug                    # turn on debug messages
+class RttEstimator(object):
+    """
+    Jacobson/Karels smoothed round trip time estimator (RFC 6298) used to derive
+    the time to wait for messages from the radio.
 
-        _cmd=command.replace('\n',' ').strip()   # remove newlines for debug messaging
-        retries=3                                # retries controls send/echo sequence if timeout occurs
-        returnMsg=None
-        try:
-            #
-            # performing retry method for badly behaving radios
-            #
-            while retries > 0:
-                try:  
-                    
-                    if self._debug:
-                        self.log_msg("--SEND-- cmd <{}> radio ({}) timeout({}) echo({}) check({}) expect({}) retries({}) orig debug({}) ".format(_cmd,self.radioAddress,_timeout,_echo_timeout,check_for_output, expect_output,retries,_debug))                        
-                    returnMsg = self._sendStringCommand(command, _timeout, _echo_timeout, check_for_output, expect_output)
-                    return returnMsg
-                except (TransmitFailure, EchoFailure) as e :
-                    
-                    #
-                    # Radio is not responding to commands increase timeout and try again
-                    #
-                    
-                    #
-                    # turn on debug messages for diagnostic purposes
-                    #
-                    self._debug=True
+    Attributes:
+    ----------
+    srtt : smoothed round trip time in seconds, None until the first sample
+    rttvar : round trip time variation in seconds
+    initial_rto : timeout to use before any samples are taken
+    min_rto, max_rto : limits for the derived timeout
+    """
+    Alpha=0.125
+    Beta=0.25
+    K=4.0
 
-                    #
-                    # double the default timeouts for send/recv sequence of a command
-                    #
-                    _timeout=_timeout*2
-                    _echo_timeout=_timeout/2.0
-                    retries-=1 
+    def __init__(self, initial_rto, min_rto=0.005, max_rto=2.0):
+        self._lock=threading.Lock()
+        self.initial_rto=initial_rto
+        self.min_rto=min_rto
+        self.max_rto=max_rto
+        self.reset()
 
-                    _e_msg="Echo"
-                    if type(e) == TransmitFailure : _e_msg = "Transmit"
-                    
-                    if self._debug:
-                       self.log_msg("--WARN-- {} Error, Radio not responsive, cmd <{}> radio ({}) timeout ({}) echo({}) check({}) expect({}) retries({}) ".format(_e_msg, _cmd,self.radioAddress,_timeout,_echo_timeout,check_for_output, expect_output,retries))
-                    time.sleep(0.09)
-                    try:
-                        self._flush()
-                    except socket.timeout:
-                        pass
-                    if retries == 0:
-                        self.log_msg("--WARN-- {} Error, Radio not responsive, (cmd failure <{}> radio ({}) check({}) expect({}) ex({}))".format(_e_msg,_cmd,self.radioAddress,check_for_output, expect_output,type(e)))
-                        raise ConnectionFailure("Command IO ({}) failure, cmd <{}> radio ({})".format(_e_msg,_cmd,self.radioAddress))
-            
-        except socket.timeout as e :
-            if expect_output:
-                if self._debug:
-                    self.log_msg("Socket timed out, processing cmd <{}> radio ({}) may not be responsive. (check:{} expect:{})".format(_cmd,self.radioAddress,check_for_output,expect_output))
-                raise ConnectionFailure(self._except_msg)
-        except socket.error as e :
-            self.log_msg("Socket error, cmd {} radio({}) may not be responsive, reconnect".format(_cmd,self.radioAddress))
-            self._reconnect()
-            raise e
+    def reset(self):
+        self._lock.acquire()
+        try:
+            self.srtt=None
+            self.rttvar=None
+            self.last_rtt=None
+            self.samples=0
+            self.backoffs=0
+            self._backoff=1
         finally:
-            # reset initial values for timeout and debug
-            self._debug=_debug
-            self.__mutexLock.release()
-            
-        return returnMsg
+            self._lock.release()
 
+    def update(self, rtt):
+        """
+        Add a round trip time sample, samples should not be taken from retransmitted commands (Karn's rule)
+        """
+        self._lock.acquire()
+        try:
+            if self.srtt is None:
+                self.srtt=rtt
+                self.rttvar=rtt/2.0
+            else:
+                self.rttvar=(1.0-self.Beta)*self.rttvar + self.Beta*abs(self.srtt-rtt)
+                self.srtt=(1.0-self.Alpha)*self.srtt + self.Alpha*rtt
+            self.last_rtt=rtt
+            self.samples+=1
+            self._backoff=1
+        finally:
+            self._lock.release()
 
-    
-    def _sendStringCommand(self, command, timeout, echo_timeout, check_for_output=True, expect_output=True):
-        """Sends command to the radio and process response
+    def backoff(self):
+        """
+        Double the derived timeout after a timeout, cleared by the next sample
+        """
+        self._lock.acquire()
+        try:
+            if self.rto() < self.max_rto:
+                self._backoff*=2
+            self.backoffs+=1
+        finally:
+            self._lock.release()
 
-        Parameters:
-        -----------
-        command : command string to send to radio
-        check_for_output : check for output after command echo is processed
-        expect_output : when checking for output that we expected reply message
-                        if not, then raise CommandException
+    def rto(self):
+        """
+        Returns the current timeout in seconds, srtt + K*rttvar with backoff applied
+        """
+        if self.srtt is None:
+            _rto=self.initial_rto
+        else:
+            _rto=self.srtt + self.K*self.rttvar
+        return min(max(_rto, self.min_rto)*self._backoff, self.max_rto)
 
-        Returns:
-        --------
-        resp : response string from radio
+    def get_state(self):
         """
-        self._except_msg=""
-        _cmd=command.replace('\n',' ').strip()
-        _timeout=timeout
+        Returns dictionary of the estimator state
+        """
+        self._lock.acquire()
+        try:
+            return { 'srtt' : self.srtt,
+                     'rttvar' : self.rttvar,
+                     'rto' : self.rto(),
+                     'last_rtt' : self.last_rtt,
+                     'samples' : self.samples,
+                     'backoffs' : self.backoffs }
+        finally:
+            self._lock.release()
 
-        if self._debug:
-            self.log_msg("--DEBUG-- Sending to radio:{0} command <{1}> timeout:{2} check:{3} expect:{4}".format(self.radioAddress,_cmd,timeout,check_for_output,expect_output))
+
+class CircuitBreaker(object):
+    """
+    Tracks recent command failures for a connection. When consecutive_failures commands in
+    a row fail, or at least min_failures of the last Window commands failed and the failures
+    make up FailureRate of them, the breaker opens and commands are rejected right away. While
+    open the radio is probed in the background, a probe moves the breaker to half-open, a successful probe closes it and
+    a failed probe reopens it with the probe interval doubled.
+
+    Attributes:
+    ----------
+    state : CLOSED, OPEN or HALF_OPEN
+    consecutive_failures : failed commands in a row that open the breaker
+    min_failures : failed commands of the last Window that open the breaker, at least MinFailures
+    probe_interval : seconds between recovery probes
+    opened : number of times the breaker opened
+    rejected : commands rejected while the breaker was not closed
+    probes : recovery probes sent to the radio
+    """
+    CLOSED='closed'
+    OPEN='open'
+    HALF_OPEN='half-open'
+    Window=8
+    ConsecutiveFailures=4
+    MinFailures=3
+    FailureRate=0.5
+
+    def __init__(self, probe_interval=1.0, max_probe_interval=30.0, consecutive_failures=None):
+        self._lock=threading.Lock()
+        self.initial_probe_interval=probe_interval
+        self.max_probe_interval=max_probe_interval
+        if consecutive_failures is None:
+            consecutive_failures=self.ConsecutiveFailures
+        # each failed command already failed every resend, a lossy link needs a higher limit
+        self.consecutive_failures=max(1, consecutive_failures)
+        self.min_failures=max(self.MinFailures, self.consecutive_failures)
+        self.reset()
+
+    def reset(self):
+        self._lock.acquire()
+        try:
+            self.state=self.CLOSED
+            self.probe_interval=self.initial_probe_interval
+            self.opened=0
+            self.opened_time=None
+            self.rejected=0
+            self.probes=0
+            self._consecutive=0
+            self._outcomes=collections.deque(maxlen=self.Window)
+        finally:
+            self._lock.release()
+
+    def record(self, success):
+        """
+        Add the outcome of a command sent to the radio
+
+        Returns:
+        --------
+        True if the breaker opened
+        """
+        self._lock.acquire()
+        try:
+            if self.state != self.CLOSED:
+                return False
+            self._outcomes.append(success)
+            if success:
+                self._consecutive=0
+                return False
+            self._consecutive+=1
+            failures=self._outcomes.count(False)
+            if self._consecutive >= self.consecutive_failures or \
+               (failures >= self.min_failures and failures >= self.FailureRate*len(self._outcomes)):
+                self.state=self.OPEN
+                self.opened+=1
+                self.opened_time=time.time()
+                self._consecutive=0
+                self._outcomes.clear()
+                return True
+            return False
+        finally:
+            self._lock.release()
+
+    def allow(self, commands=1):
+        """
+        Returns True if commands can be sent to the radio, otherwise counts them as rejected
+        """
+        if self.state == self.CLOSED:
+            return True
+        self._lock.acquire()
+        try:
+            self.rejected+=commands
+        finally:
+            self._lock.release()
+        return False
+
+    def begin_probe(self):
+        self._lock.acquire()
+        try:
+            self.state=self.HALF_OPEN
+            self.probes+=1
+        finally:
+            self._lock.release()
+
+    def probe_result(self, success):
+        """
+        Close the breaker after a successful probe, otherwise reopen and back off the probe interval
+        """
+        self._lock.acquire()
+        try:
+            if success:
+                self._close()
+            else:
+                self.state=self.OPEN
+                self.probe_interval=min(self.probe_interval*2.0, self.max_probe_interval)
+        finally:
+            self._lock.release()
+
+    def close(self):
+        """
+        Close the breaker and forget the recent outcomes, the counters are kept. Used when
+        the connection is re-established
+        """
+        self._lock.acquire()
+        try:
+            self._close()
+        finally:
+            self._lock.release()
+
+    def _close(self):
+        self.state=self.CLOSED
+        self.probe_interval=self.initial_probe_interval
+        self._consecutive=0
+        self._outcomes.clear()
+
+    def get_state(self):
+        """
+        Returns dictionary of the breaker state
+        """
+        self._lock.acquire()
+        try:
+            return { 'state' : self.state,
+                     'probe_interval' : self.probe_interval,
+                     'opened' : self.opened,
+                     'opened_time' : self.opened_time,
+                     'rejected' : self.rejected,
+                     'probes' : self.probes,
+                     'recent_failures' : self._outcomes.count(False) }
+        finally:
+            self._lock.release()
+
+
+class CommandStats(object):
+    """
+    Control plane telemetry for a connection. Latency histograms, echo/response wait times,
+    timeout, retry and error counts are kept per command mnemonic (FRQ?, ENB, ...) along
+    with connection wide byte counters. Recording is a dictionary lookup and a few additions
+    so it is always enabled.
+
+    Attributes:
+    ----------
+    LatencyBins : upper bound in seconds of each histogram bin, the last bin holds anything larger
+    bytes_sent, bytes_received : connection wide byte counters, includes flush/drain traffic
+    batches : number of pipelined batches sent
+    batch_resyncs : batches that lost track of the radio and were flushed
+    """
+    LatencyBins=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+
+    class _entry(object):
+        __slots__=('count','total','min','max','echo_wait','echo_count','response_wait','response_count',
+                   'timeouts','retries','errors','bytes_sent','bytes_received','histogram')
+
+        def __init__(self, bins):
+            self.count=0
+            self.total=0.0
+            self.min=None
+            self.max=None
+            self.echo_wait=0.0
+            self.echo_count=0
+            self.response_wait=0.0
+            self.response_count=0
+            self.timeouts=0
+            self.retries=0
+            self.errors=0
+            self.bytes_sent=0
+            self.bytes_received=0
+            self.histogram=[0]*bins
+
+    def __init__(self):
+        self._lock=threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self._lock.acquire()
+        try:
+            self._entries={}
+            self.bytes_sent=0
+            self.bytes_received=0
+            self.batches=0
+            self.batch_resyncs=0
+            self.start_time=time.time()
+        finally:
+            self._lock.release()
+
+    def record(self, mnemonic, latency, echo_wait=None, response_wait=None, sent=0, received=0,
+               retries=0, timeout=False, error=False):
+        """
+        Add the results of one command, latency is only sampled for commands that completed
+
+        Parameters:
+        -----------
+        mnemonic : command mnemonic, see command_mnemonic
+        latency : seconds from the first send until the command completed
+        echo_wait : seconds from send until the echo was received, None if not measured
+        response_wait : seconds from send until the response was received, None if not measured
+        sent, received : bytes attributed to the command
+        retries : number of times the command was resent
+        timeout : command failed waiting on the radio
+        error : command returned unexpected output
+        """
+        self._lock.acquire()
+        try:
+            e=self._entries.get(mnemonic)
+            if e is None:
+                e=self._entries[mnemonic]=self._entry(len(self.LatencyBins)+1)
+            e.bytes_sent+=sent
+            e.bytes_received+=received
+            e.retries+=retries
+            if timeout:
+                e.timeouts+=1
+                return
+            if error:
+                e.errors+=1
+                return
+            e.count+=1
+            e.total+=latency
+            if e.min is None or latency < e.min: e.min=latency
+            if e.max is None or latency > e.max: e.max=latency
+            e.histogram[bisect.bisect_left(self.LatencyBins, latency)]+=1
+            if echo_wait is not None:
+                e.echo_wait+=echo_wait
+                e.echo_count+=1
+            if response_wait is not None:
+                e.response_wait+=response_wait
+                e.response_count+=1
+        finally:
+            self._lock.release()
+
+    def merge(self, other):
+        """
+        Add the counters of another CommandStats, used to report a pool of connections as one
+        """
+        other._lock.acquire()
+        self._lock.acquire()
+        try:
+            self.bytes_sent+=other.bytes_sent
+            self.bytes_received+=other.bytes_received
+            self.batches+=other.batches
+            self.batch_resyncs+=other.batch_resyncs
+            self.start_time=min(self.start_time, other.start_time)
+            for mnemonic, o in other._entries.items():
+                e=self._entries.get(mnemonic)
+                if e is None:
+                    e=self._entries[mnemonic]=self._entry(len(self.LatencyBins)+1)
+                for attr in [ 'count', 'total', 'echo_wait', 'echo_count', 'response_wait', 'response_count',
+                              'timeouts', 'retries', 'errors', 'bytes_sent', 'bytes_received' ]:
+                    setattr(e, attr, getattr(e, attr)+getattr(o, attr))
+                if o.min is not None and (e.min is None or o.min < e.min): e.min=o.min
+                if o.max is not None and (e.max is None or o.max > e.max): e.max=o.max
+                e.histogram=[ a+b for a, b in zip(e.histogram, o.histogram) ]
+        finally:
+            self._lock.release()
+            other._lock.release()
+
+    def _percentile(self, histogram, count, pct, max_value):
+        """
+        Upper bound of the histogram bin that holds the requested percentile
+        """
+        if count == 0:
+            return None
+        limit=count*pct
+        total=0
+        for bound, hits in zip(self.LatencyBins, histogram):
+            total+=hits
+            if total >= limit:
+                return min(bound, max_value)
+        return max_value
+
+    def get_stats(self):
+        """
+        Returns dictionary with the connection counters and a dictionary of per mnemonic
+        statistics (times in seconds)
+        """
+        self._lock.acquire()
+        try:
+            commands={}
+            for mnemonic, e in self._entries.items():
+                commands[mnemonic] = { 'count' : e.count,
+                                       'timeouts' : e.timeouts,
+                                       'retries' : e.retries,
+                                       'errors' : e.errors,
+                                       'latency_avg' : e.total/e.count if e.count else None,
+                                       'latency_min' : e.min,
+                                       'latency_max' : e.max,
+                                       'latency_p50' : self._percentile(e.histogram, e.count, 0.50, e.max),
+                                       'latency_p95' : self._percentile(e.histogram, e.count, 0.95, e.max),
+                                       'echo_wait_avg' : e.echo_wait/e.echo_count if e.echo_count else None,
+                                       'response_wait_avg' : e.response_wait/e.response_count if e.response_count else None,
+                                       'bytes_sent' : e.bytes_sent,
+                                       'bytes_received' : e.bytes_received,
+                                       'histogram' : zip(list(self.LatencyBins)+[None], e.histogram) }
+            return { 'elapsed' : time.time()-self.start_time,
+                     'bytes_sent' : self.bytes_sent,
+                     'bytes_received' : self.bytes_received,
+                     'batches' : self.batches,
+                     'batch_resyncs' : self.batch_resyncs,
+                     'commands' : commands }
+        finally:
+            self._lock.release()
+
+    def get_command_count(self):
+        """
+        Returns the number of commands recorded
+        """
+        self._lock.acquire()
+        try:
+            return sum([ e.count for e in self._entries.values() ])
+        finally:
+            self._lock.release()
+
+    def get_summary(self):
+        """
+        Returns list of dictionaries, one per mnemonic, with times in milliseconds. The first
+        entry (mnemonic TOTAL) holds the counters for the entire connection.
+        """
+        def _ms(value):
+            if value is None: return 0.0
+            return value*1000.0
+        stats=self.get_stats()
+        rows=[]
+        total={ 'mnemonic' : 'TOTAL', 'count' : 0, 'timeouts' : 0, 'retries' : 0, 'errors' : 0,
+                'latency_avg_ms' : 0.0, 'latency_min_ms' : 0.0, 'latency_max_ms' : 0.0, 'latency_p95_ms' : 0.0,
+                'echo_wait_avg_ms' : 0.0, 'response_wait_avg_ms' : 0.0,
+                'bytes_sent' : stats['bytes_sent'], 'bytes_received' : stats['bytes_received'],
+                'latency_histogram' : '' }
+        _latency=0.0
+        _echo=[0.0, 0]
+        _response=[0.0, 0]
+        _min=None
+        _max=None
+        _histogram=[0]*(len(self.LatencyBins)+1)
+        for mnemonic in sorted(stats['commands'].keys()):
+            c=stats['commands'][mnemonic]
+            rows.append({ 'mnemonic' : mnemonic,
+                          'count' : c['count'],
+                          'timeouts' : c['timeouts'],
+                          'retries' : c['retries'],
+                          'errors' : c['errors'],
+                          'latency_avg_ms' : _ms(c['latency_avg']),
+                          'latency_min_ms' : _ms(c['latency_min']),
+                          'latency_max_ms' : _ms(c['latency_max']),
+                          'latency_p95_ms' : _ms(c['latency_p95']),
+                          'echo_wait_avg_ms' : _ms(c['echo_wait_avg']),
+                          'response_wait_avg_ms' : _ms(c['response_wait_avg']),
+                          'bytes_sent' : c['bytes_sent'],
+                          'bytes_received' : c['bytes_received'],
+                          'latency_histogram' : ','.join([ "{}:{}".format(_ms(bound) if bound else 'inf', hits)
+                                                           for bound, hits in c['histogram'] ]) })
+            for key in [ 'count', 'timeouts', 'retries', 'errors' ]:
+                total[key]+=c[key]
+            if c['count'] == 0:
+                continue
+            _latency+=c['latency_avg']*c['count']
+            if _min is None or c['latency_min'] < _min: _min=c['latency_min']
+            if _max is None or c['latency_max'] > _max: _max=c['latency_max']
+            for idx, (bound, hits) in enumerate(c['histogram']):
+                _histogram[idx]+=hits
+            if c['echo_wait_avg'] is not None:
+                _echo[0]+=c['echo_wait_avg']*c['count']
+                _echo[1]+=c['count']
+            if c['response_wait_avg'] is not None:
+                _response[0]+=c['response_wait_avg']*c['count']
+                _response[1]+=c['count']
+        if total['count']:
+            total['latency_avg_ms']=_ms(_latency/total['count'])
+            total['latency_min_ms']=_ms(_min)
+            total['latency_max_ms']=_ms(_max)
+            total['latency_p95_ms']=_ms(self._percentile(_histogram, total['count'], 0.95, _max))
+            total['latency_histogram']=','.join([ "{}:{}".format(_ms(bound) if bound else 'inf', hits)
+                                                  for bound, hits in zip(list(self.LatencyBins)+[None], _histogram) ])
+        if _echo[1]:
+            total['echo_wait_avg_ms']=_ms(_echo[0]/_echo[1])
+        if _response[1]:
+            total['response_wait_avg_ms']=_ms(_response[0]/_response[1])
+        return [ total ] + rows
+
+
+class CommandCapture(object):
+    """
+    Capture of the control traffic for a connection. Every datagram sent to or received
+    from the radio is written as one line "<seconds since start> <S|R> <escaped message>"
+    after a header line with the radio address and start time. Use read_capture to load
+    a capture and tests/msdd_replay.py to play it back.
+    """
+    Version=1
+    Send='S'
+    Recv='R'
+
+    def __init__(self, filename, address):
+        self.filename=filename
+        self.records=0
+        self._lock=threading.Lock()
+        self._file=open(filename, 'w', 1)
+        self.start_time=time.time()
+        self._file.write("# msdd-capture {} {}:{} {:.6f}\n".format(self.Version, address[0], address[1], self.start_time))
+
+    def record(self, direction, msg):
+        self._lock.acquire()
+        try:
+            if self._file:
+                self._file.write("{:.6f} {} {}\n".format(time.time()-self.start_time, direction, msg.encode('string_escape')))
+                self.records+=1
+        finally:
+            self._lock.release()
+
+    def close(self):
+        self._lock.acquire()
+        try:
+            if self._file:
+                self._file.close()
+                self._file=None
+        finally:
+            self._lock.release()
+
+
+def read_capture(filename):
+    """
+    Load a capture written by CommandCapture
+
+    Returns:
+    --------
+    header : dictionary with version, address (ip, port) and start_time
+    records : list of (offset, direction, message) tuples in capture order
+    """
+    header=None
+    records=[]
+    with open(filename) as f:
+        for line in f:
+            line=line.rstrip('\n')
+            if line.startswith('#'):
+                if header is None:
+                    tokens=line.split()
+                    ip, port = tokens[3].rsplit(':',1)
+                    header={ 'version' : int(tokens[2]), 'address' : (ip, int(port)), 'start_time' : float(tokens[4]) }
+                continue
+            if len(line) == 0:
+                continue
+            offset, direction, msg = line.split(' ',2)
+            records.append((float(offset), direction, msg.decode('string_escape')))
+    if header is None:
+        raise ValueError("{} is not a MSDD capture file".format(filename))
+    return header, records
+
+
+class StartupTiming(object):
+    """
+    Duration and number of radio commands of each phase of MSDDRadio startup. A phase
+    runs from start until stop or the start of the next phase, stop takes the counts
+    to report for the phase as keyword arguments.
+
+    phases : list of dictionaries with phase, duration (seconds), commands and details
+    """
+    def __init__(self, stats):
+        self._stats=stats
+        self.start_time=time.time()
+        self.end_time=None
+        self.phases=[]
+        self._current=None
+
+    def start(self, name):
+        self.stop()
+        self._current=(name, time.time(), self._stats.get_command_count())
+
+    def stop(self, **details):
+        if self._current is None:
+            return
+        name, start_time, commands = self._current
+        self._current=None
+        self.phases.append({ 'phase' : name,
+                             'duration' : time.time()-start_time,
+                             'commands' : self._stats.get_command_count()-commands,
+                             'details' : details })
+
+    def finish(self):
+        """
+        Stops the current phase and ends the total startup time
+        """
+        self.stop()
+        self.end_time=time.time()
+
+    def get_total(self):
+        """
+        Returns seconds from the creation of the timing until finish, or until now
+        if startup has not finished
+        """
+        if self.end_time is None:
+            return time.time()-self.start_time
+        return self.end_time-self.start_time
+
+    def format(self):
+        """
+        Returns the phases as text, one line per phase
+        """
+        lines=[]
+        for phase in self.phases:
+            details=' '.join([ '{}={}'.format(k, v) for k, v in sorted(phase['details'].items()) ])
+            lines.append("  {:<24} {:8.4f} s {:6d} cmds  {}".format(phase['phase'], phase['duration'], phase['commands'], details).rstrip())
+        return '\n'.join(lines)
+
+
+class CapabilityCache(object):
+    """
+    File that keeps the STATIC cached query results of the modules of a radio between
+    restarts.  The header holds the identity of the radio (model, serial, software part
+    number and firmware files), the results are only used for a radio with the same
+    identity.  Each line after the header holds the results of one module:
+
+        <full reg name> <list of (query id, args, value)>
+
+    Values are written as python literals, results that are not literals are skipped.
+    """
+    Version=1
+
+    def __init__(self, filename):
+        self.filename=filename
+        self.loaded=False
+
+    @classmethod
+    def is_literal(cls, value):
+        if value is None or type(value) in (bool, int, long, str, unicode):
+            return True
+        if type(value) is float:
+            return not (math.isinf(value) or math.isnan(value))
+        if type(value) in (list, tuple):
+            return all([ cls.is_literal(x) for x in value ])
+        if type(value) is dict:
+            return all([ cls.is_literal(k) and cls.is_literal(v) for k, v in value.items() ])
+        return False
+
+    def load(self, identity):
+        """
+        Read the cache file
+
+        Returns:
+        --------
+        dictionary of full reg name to list of (query id, args, value), empty when the file
+        does not exist, cannot be parsed or was written for a different radio identity
+        """
+        self.loaded=False
+        modules={}
+        try:
+            with open(self.filename) as f:
+                header=f.readline().split(None,3)
+                if len(header) < 4 or header[1] != 'msdd-capability-cache' or int(header[2]) != self.Version:
+                    return {}
+                if ast.literal_eval(header[3]) != identity:
+                    return {}
+                for line in f:
+                    line=line.strip()
+                    if len(line) == 0:
+                        continue
+                    full_reg_name, entries = line.split(' ',1)
+                    modules[full_reg_name]=ast.literal_eval(entries)
+        except (IOError, ValueError, SyntaxError):
+            return {}
+        self.loaded=True
+        return modules
+
+    def save(self, identity, modules):
+        """
+        Write the cache file, modules is a dictionary of full reg name to list of
+        (query id, args, value).  Returns True if the file was written
+        """
+        tmp_name=self.filename + '.tmp'
+        try:
+            with open(tmp_name, 'w') as f:
+                f.write("# msdd-capability-cache {} {!r}\n".format(self.Version, identity))
+                for full_reg_name in sorted(modules):
+                    entries=[ entry for entry in modules[full_reg_name] if self.is_literal(entry) ]
+                    f.write("{} {!r}\n".format(full_reg_name, entries))
+            os.rename(tmp_name, self.filename)
+        except (IOError, OSError), e:
+            self.log_msg("--WARN-- MSDD unable to write capability cache {}: {}".format(self.filename, e))
+            return False
+        return True
+
+    def log_msg(self,msg):
+        print timestamp_msg(msg)
+
+
+class CommandFuture(object):
+    """
+    Pending result of a command submitted to a Connection, completed by the connection's IO thread
+
+    Attributes:
+    ----------
+    command : command string sent to the radio
+    check_for_output : check for output after command echo is processed
+    expect_output : when checking for output that we expected reply message
+    wait_timeout : default time in seconds to wait for the result, None waits until completed
+    canceller : called with the future when it is cancelled, removes it from the queue
+    """
+
+    def __init__(self, command, check_for_output=True, expect_output=True, wait_timeout=None, canceller=None):
+        self.command=command
+        self.check_for_output=check_for_output
+        self.expect_output=expect_output
+        self.wait_timeout=wait_timeout
+        self._canceller=canceller
+        self._result=None
+        self._exception=None
+        self._running=False
+        self._cancelled=False
+        self._callbacks=[]
+        self._lock=threading.Lock()
+        self._event=threading.Event()
+
+    def done(self):
+        return self._event.isSet()
+
+    def cancelled(self):
+        return self._cancelled
+
+    def cancel(self):
+        """
+        Cancel the command if the IO thread has not started sending it
+
+        Returns:
+        --------
+        True if the command was cancelled and will not be sent to the radio
+        """
+        self._lock.acquire()
+        try:
+            if self._running or self._event.isSet():
+                return False
+            self._cancelled=True
+        finally:
+            self._lock.release()
+        if self._canceller:
+            self._canceller(self)
+        self.set_exception(ConnectionFailure("Timed out waiting for command <{}>, command was not sent".format(self.command.replace('\n',' ').strip())))
+        return True
+
+    def set_running(self):
+        """
+        Called by the IO thread before sending the command
+
+        Returns:
+        --------
+        False if the command was cancelled and must not be sent
+        """
+        self._lock.acquire()
+        try:
+            if self._cancelled:
+                return False
+            self._running=True
+            return True
+        finally:
+            self._lock.release()
+
+    def set_result(self, result):
+        self._result=result
+        self._complete()
+
+    def set_exception(self, exception):
+        self._exception=exception
+        self._complete()
+
+    def _complete(self):
+        self._lock.acquire()
+        try:
+            self._event.set()
+            callbacks=self._callbacks
+            self._callbacks=[]
+        finally:
+            self._lock.release()
+        for cb in callbacks:
+            try:
+                cb(self)
+            except:
+                traceback.print_exc()
+
+    def add_done_callback(self, fn):
+        """
+        Call fn(future) when the command completes, called immediately if already completed
+        """
+        self._lock.acquire()
+        try:
+            if not self._event.isSet():
+                self._callbacks.append(fn)
+                return
+        finally:
+            self._lock.release()
+        fn(self)
+
+    def exception(self, timeout=None):
+        if timeout is None:
+            timeout=self.wait_timeout
+        if not self._event.wait(timeout):
+            # a command that was not sent yet is never sent, the caller sees it fail
+            if self.cancel():
+                raise self._exception
+            if not self._event.isSet():
+                raise ConnectionFailure("Timed out waiting for command <{}>, command was sent".format(self.command.replace('\n',' ').strip()))
+        return self._exception
+
+    def result(self, timeout=None):
+        """
+        Wait for the command to complete and return the response, raises the command's exception on failure
+
+        Parameters:
+        -----------
+        timeout : time in seconds to wait, None uses wait_timeout
+        """
+        exc=self.exception(timeout)
+        if exc is not None:
+            raise exc
+        return self._result
+
+
+class Connection(object):
+    """Class to actually communicate with the radio, NB there should only be one of these per radio"""
+
+    Success=0
+    TimeOut=-1
+    Error=-2
+    MsgEnd='\n'
+    BatchWindow=8
+    IOIdleTime=5.0
+    CommandRetries=3
+    ProbeCommand='CON:0 IDN?\n'
+    Decoder=ResponseDecoder()
+
+    def __init__(self, address, timeout=0.25,enable_trace=False, breaker_failures=None):
+        """
+        Attributes:
+        ----------
+        _debug : turn on print statements
+        __mutexLock : synchronize access to the device
+        __queue : commands waiting for the IO thread
+        __queueCond : synchronize access to the command queue
+        _io_thread : thread that sends queued commands to the radio
+        echo_rtt : round trip estimator, command send to echo received
+        response_rtt : round trip estimator, command send to response received
+        echo_enabled : radio echoes each command before the response
+        radioAddress : (ip, port) tuple
+        radioSocket : socket to write and read messages
+        stats : control plane telemetry, see CommandStats
+        capture : records all traffic to a file when enabled, see CommandCapture
+        breaker : rejects commands while the radio is not responding, see CircuitBreaker
+        primary : connection of a ConnectionPool whose capture and breaker this connection uses, None for its own
+        _probe_thread : thread that probes the radio while the breaker is open
+        _probe_generation : incremented when the connection is opened or closed, stops the probe thread
+        cache_epoch : incremented when cached module query results become stale, see CachedQuery
+        shadow_epoch : incremented when a command fails or is resent, shadow register values become stale
+
+        Parameters:
+        ----------
+        address: tuple (ip, port)
+        timeout: default time in seconds to wait when receiving a message
+        breaker_failures: consecutive failed commands that open the circuit breaker
+        """
+	self._debug=False
+        self.__mutexLock = threading.Lock()
+        self.__queue = collections.deque()
+        self.__queueCond = threading.Condition()
+        self._io_thread = None
+        self.radioAddress = address
+        self.radioSocket=None
+        self.trace_on_comm_failure=enable_trace
+        self.pause=False
+        self.echo_rtt = RttEstimator(timeout/5.0, max_rto=timeout*4.0)
+        self.response_rtt = RttEstimator(timeout, max_rto=timeout)
+        self.echo_enabled=True
+        self._last_command=None
+        self._probe_response=None
+        self.stats = CommandStats()
+        self._echo_wait=None
+        self._response_wait=None
+        self.primary=None
+        self.capture=None
+        self.breaker = CircuitBreaker(consecutive_failures=breaker_failures)
+        self._probe_thread = None
+        self._probe_generation = 0
+        self.cache_epoch = 0
+        self.shadow_epoch = 0
+        self.connect(timeout)
+
+    def set_trace_failure(self, onoff):
+        self.trace_on_comm_failure=onoff
+
+    def connect(self, timeout):
+        """
+        Open a UDP socket connection for communicating to the radio. If the socket was
+        open then close and reset.
+
+        Parameters:
+        ----------
+        timeout : timeout in seconds when receiving messages from the radio
+
+        """
+        self.timeout=timeout
+        self.cache_epoch+=1
+        if self.radioSocket:
+            self.radioSocket.close()
+            self.radioSocket = None
+
+        #generate socket for sending/receiving UDP packets to/from radio
+        try:
+            self.__mutexLock.acquire()
+            if self._debug:
+                self.log_msg("Opening connection to {}".format(self.radioAddress))
+            # start over with the breaker closed, a probe of the old connection stops
+            self._stop_probe()
+            self.radioSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        except:
+            traceback.print_exc()
+            self.radioSocket=None
+        finally:
+            self.__mutexLock.release()
+
+
+    def _reconnect(self):
+        """
+        Perform close/open operation on the socket, does not lock access
+        """
+        self.cache_epoch+=1
+        if self.radioSocket:
+            self.radioSocket.close()
+            self.radioSocket = None
+
+        #generate socket for sending/receiving UDP packets to/from radio
+        try:
+            self.radioSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        except:
+            self.radioSocket=None
+
+
+    def disconnect(self):
+        """
+        Close the socket connection to the radio.
+
+        """
+        try:
+            self.__mutexLock.acquire()
+            if self.radioSocket:
+                self.radioSocket.close()
+                self.radioSocket = None
+            self._stop_probe()
+            if self.primary is None:
+                self._stop_capture()
+        finally:
+            self.radioSocket=None
+            self.__mutexLock.release()
+
+    def invalidate_caches(self):
+        """
+        Mark the cached query results of all modules using this connection as stale
+        """
+        self.cache_epoch+=1
+
+    def set_timeout(self, timeout):
+        """
+        Sets the timeout attribute
+
+        Parameters:
+        -----------
+        timeout - new timeout value
+        """
+        self.__mutexLock.acquire()
+        self.timeout=timeout
+        self.radioSocket.settimeout(timeout)
+        self.echo_rtt.initial_rto=timeout/5.0
+        self.echo_rtt.max_rto=timeout*4.0
+        self.response_rtt.initial_rto=timeout
+        self.response_rtt.max_rto=timeout
+        self.__mutexLock.release()
+
+    def getRttStats(self):
+        """
+        Returns dictionary with the state of the echo and response round trip estimators
+        """
+        return { 'echo' : self.echo_rtt.get_state(),
+                 'response' : self.response_rtt.get_state() }
+
+    def resetRttStats(self):
+        self.echo_rtt.reset()
+        self.response_rtt.reset()
+
+    rtt_stats = property(getRttStats, doc="Echo and response round trip estimator state")
+
+    def getCommandStats(self):
+        """
+        Returns dictionary of control plane statistics, see CommandStats.get_stats
+        """
+        return self.stats.get_stats()
+
+    def getCommandStatsSummary(self):
+        """
+        Returns list of per mnemonic statistics in milliseconds, see CommandStats.get_summary
+        """
+        return self.stats.get_summary()
+
+    def resetCommandStats(self):
+        self.stats.reset()
+
+    command_stats = property(getCommandStats, doc="Per command latency, retry and byte counters")
+
+    def isCircuitOpen(self):
+        """
+        Returns True while commands are being rejected because the radio is not responding
+        """
+        return self.breaker.state != CircuitBreaker.CLOSED
+
+    def getCircuitStats(self):
+        """
+        Returns dictionary with the circuit breaker state, see CircuitBreaker.get_state
+        """
+        return self.breaker.get_state()
+
+    circuit_stats = property(getCircuitStats, doc="Circuit breaker state and counters")
+
+    def _circuit_open_msg(self, command):
+        return "Radio ({}) is not responding, command <{}> rejected".format(self.radioAddress, command.replace('\n',' ').strip())
+
+    def _record_outcome(self, success):
+        """
+        Update the circuit breaker with the outcome of a command, does not lock access
+        """
+        if not success:
+            # a failed set may or may not have been applied by the radio
+            self.shadow_epoch+=1
+        if self.breaker.record(success):
+            self.log_msg("--WARN-- Radio ({}) is not responding, rejecting commands until it recovers".format(self.radioAddress))
+            if self._probe_thread is None:
+                self._probe_thread = threading.Thread(target=self._probe_loop,
+                                                      args=(self._probe_generation,),
+                                                      name="MSDD-PROBE-{0}:{1}".format(*self.radioAddress))
+                self._probe_thread.setDaemon(True)
+                self._probe_thread.start()
+
+    def _stop_probe(self):
+        """
+        Close the circuit breaker and stop the probe thread, does not lock access
+        """
+        self._probe_generation+=1
+        self._probe_thread=None
+        self.breaker.close()
+
+    def _probe_loop(self, generation):
+        """
+        Probe the radio while the circuit breaker is open, exits when the radio responds
+        or the connection is opened or closed (which close the breaker)
+        """
+        while True:
+            time.sleep(self.breaker.probe_interval)
+            success=False
+            self.__mutexLock.acquire()
+            try:
+                if generation != self._probe_generation:
+                    return
+                if self.breaker.state == CircuitBreaker.CLOSED:
+                    # closed by another connection of the pool
+                    self._probe_thread=None
+                    return
+                if self.radioSocket is None:
+                    # keep the breaker open until the connection is re-established
+                    continue
+                self.breaker.begin_probe()
+                try:
+                    self._drain(check_echo=False)
+                    self._sendStringCommand(self.ProbeCommand, self.timeout, self.echo_rtt.rto(), measure_rtt=False)
+                    success=True
+                except Exception, e:
+                    if self._debug:
+                        self.log_msg("--DEBUG-- Probe of radio ({}) failed, {}".format(self.radioAddress, e))
+                self.breaker.probe_result(success)
+                if success:
+                    self.log_msg("--INFO-- Radio ({}) is responding, accepting commands".format(self.radioAddress))
+                    self._probe_thread=None
+                    return
+            finally:
+                self.__mutexLock.release()
+
+    def start_capture(self, filename):
+        """
+        Record all traffic between the connection and the radio to a file, any
+        current capture is closed.
+
+        Parameters:
+        -----------
+        filename : capture file to create
+        """
+        if self.primary is not None:
+            return self.primary.start_capture(filename)
+        self.__mutexLock.acquire()
+        try:
+            self._stop_capture()
+            self.capture=CommandCapture(filename, self.radioAddress)
+        finally:
+            self.__mutexLock.release()
+
+    def stop_capture(self):
+        """
+        Close the current capture file
+
+        Returns:
+        --------
+        number of records written
+        """
+        if self.primary is not None:
+            return self.primary.stop_capture()
+        self.__mutexLock.acquire()
+        try:
+            return self._stop_capture()
+        finally:
+            self.__mutexLock.release()
+
+    def _stop_capture(self):
+        records=0
+        if self.capture:
+            records=self.capture.records
+            self.capture.close()
+            self.capture=None
+        return records
+
+    def getCapture(self):
+        if self.primary is not None:
+            return self.primary.capture
+        return self._capture
+
+    def setCapture(self, capture):
+        if self.primary is not None:
+            self.primary.capture=capture
+        else:
+            self._capture=capture
+
+    capture = property(getCapture, setCapture, doc="Current CommandCapture, pooled connections use the primary's")
+
+    def getBreaker(self):
+        if self.primary is not None:
+            return self.primary.breaker
+        return self._breaker
+
+    def setBreaker(self, breaker):
+        if self.primary is not None:
+            self.primary.breaker=breaker
+        else:
+            self._breaker=breaker
+
+    breaker = property(getBreaker, setBreaker, doc="CircuitBreaker of the radio, pooled connections use the primary's")
+
+    def _sendto(self, msg):
+        """
+        Send a message to the radio, does not lock access
+        """
+        self.radioSocket.sendto(msg, self.radioAddress)
+        self.stats.bytes_sent+=len(msg)
+        capture=self.capture
+        if capture:
+            capture.record(CommandCapture.Send, msg)
+
+    def _recv(self):
+        """
+        Receive a message from the radio, does not lock access
+        """
+        msg=self.radioSocket.recv(65535)
+        self.stats.bytes_received+=len(msg)
+        capture=self.capture
+        if capture:
+            capture.record(CommandCapture.Recv, msg)
+        return msg
+        
+    def flush(self, retries=None):
+        self.__mutexLock.acquire()
+        try:
+            self._flush(retries)
+        finally:
+            self.__mutexLock.release()
+            return
+
+    def _flush(self, retries=None):
+        ret=False
+        if retries is None: retries=1
+        self._sendto("\n")
+        while retries != 0:
+            self.radioSocket.settimeout(self.timeout/10.0)
+            rmsg=self._recv()
+            if len(rmsg) > 0 : ret=True
+            retries-=1
+        return ret
+
+    def set_echo_mode(self, enabled):
+        """
+        Sets if the radio echoes commands. When echo is disabled commands use a single response
+        path and only commands that expect output will wait on the radio.  Any messages
+        waiting on the socket are discarded.
+
+        Parameters:
+        -----------
+        enabled : radio will echo commands
+        """
+        self.__mutexLock.acquire()
+        try:
+            # allow any outstanding messages to arrive
+            time.sleep(self.echo_rtt.rto())
+            self._drain(check_echo=False)
+            self.echo_enabled=enabled
+        finally:
+            self.__mutexLock.release()
+
+    def _drain(self, check_echo=True):
+        """
+        Discard any messages waiting on the socket, does not lock access. If echo is disabled and
+        the last command is echoed back then the radio does not support it, revert to echo mode.
+
+        Parameters:
+        -----------
+        check_echo : look for echoed commands, disable when the echo state is being changed
+        """
+        count=0
+        while self.radioSocket:
+            _iready,_oready,_eready = select.select([self.radioSocket],[],[],0)
+            if _iready == None or len(_iready) == 0:
+                break
+            msg = self._recv()
+            msg = self.Decoder.clean(msg).strip()
+            count+=1
+            if len(msg) == 0:
+                continue
+            if check_echo and not self.echo_enabled and self._last_command is not None:
+                if msg == self._last_command:
+                    self.log_msg("--WARN-- Radio ({}) echoed command <{}> with echo disabled, reverting to echo mode".format(self.radioAddress,msg))
+                    self.echo_enabled=True
+                else:
+                    self.log_msg("--WARN-- Unexpected output received \"{}\" after command:{} radio {}".format(msg,self._last_command,self.radioAddress))
+            elif self._debug:
+                self.log_msg("--DEBUG-- Discarding message from radio <{}>".format(msg))
+        return count
+
+    def log_msg(self,msg):
+        print timestamp_msg(msg)
+
+    def sendStringCommand(self, command, check_for_output=True, expect_output=True):
+        """
+        Sends command to the radio and return response, the command is queued to the
+        connection's IO thread and the calling thread waits for the result.
+
+        Parameters:
+        -----------
+        command : command string to send to radio
+        check_for_output : check for output after command echo is processed
+        expect_output : when checking for output that we expected reply message
+                        if not, then raise CommandException
+
+        Returns:
+        --------
+        resp : response string from radio
+        """
+        if threading.current_thread() is self._io_thread:
+            # called from a completion callback, send from this thread
+            self.__mutexLock.acquire()
+            try:
+                return self._sendStringCommandRetry(command, check_for_output, expect_output)
+            finally:
+                self.__mutexLock.release()
+        return self.submitCommand(command, check_for_output, expect_output).result()
+
+    def _sendStringCommandRetry(self, command, check_for_output=True, expect_output=True):
+        """
+        Sends command to the radio and return response, retrying the send/echo sequence
+        when the radio is not responsive. Caller must hold the connection lock.
+
+        Parameters:
+        -----------
+        command : command string to send to radio
+        check_for_output : check for output after command echo is processed
+        expect_output : when checking for output that we expected reply message
+                        if not, then raise CommandException
+
+        Returns:
+        --------
+        resp : response string from radio
+        """
+        _timeout=self.timeout                 # configured timeout, upper limit when waiting for a response
+        _echo_timeout=self.echo_rtt.rto()     # estimated wait for echo response
+        _debug=self._debug                    # turn on debug messages
+
+        _cmd=command.replace('\n',' ').strip()   # remove newlines for debug messaging
+        retries=self.CommandRetries              # retries controls send/echo sequence if timeout occurs
+        returnMsg=None
+
+        if not self.breaker.allow():
+            raise CircuitOpen(self._circuit_open_msg(command))
+
+        # telemetry for this command
+        _start=time.time()
+        _sent=self.stats.bytes_sent
+        _received=self.stats.bytes_received
+        _resends=0
+        _failed=False
+        _error=False
+        self._echo_wait=None
+        self._response_wait=None
+        try:
+            #
+            # performing retry method for badly behaving radios
+            #
+            while retries > 0:
+                try:  
+                    
+                    if self._debug:
+                        self.log_msg("--SEND-- cmd <{}> radio ({}) timeout({}) echo({}) check({}) expect({}) retries({}) orig debug({}) ".format(_cmd,self.radioAddress,_timeout,_echo_timeout,check_for_output, expect_output,retries,_debug))                        
+                    returnMsg = self._sendStringCommand(command, _timeout, _echo_timeout, check_for_output, expect_output,
+                                                        measure_rtt=(retries == self.CommandRetries))
+                    return returnMsg
+                except (TransmitFailure, EchoFailure) as e :
+                    
+                    #
+                    # Radio is not responding to commands increase timeout and try again
+                    #
+                    
+                    #
+                    # turn on debug messages for diagnostic purposes
+                    #
+                    self._debug=True
+
+                    #
+                    # back off the estimated echo timeout for send/recv sequence of a command
+                    #
+                    self.echo_rtt.backoff()
+                    _echo_timeout=self.echo_rtt.rto()
+                    retries-=1 
+
+                    _e_msg="Echo"
+                    if type(e) == TransmitFailure : _e_msg = "Transmit"
+                    
+                    if self._debug:
+                       self.log_msg("--WARN-- {} Error, Radio not responsive, cmd <{}> radio ({}) timeout ({}) echo({}) check({}) expect({}) retries({}) ".format(_e_msg, _cmd,self.radioAddress,_timeout,_echo_timeout,check_for_output, expect_output,retries))
+                    # allow any late messages to arrive before flushing
+                    time.sleep(_echo_timeout)
+                    try:
+                        self._flush()
+                    except socket.timeout:
+                        pass
+                    # discard the rest of the late echo/response so the resend is not answered by them
+                    self._drain(check_echo=False)
+                    self.shadow_epoch+=1
+                    if retries == 0:
+                        _failed=True
+                        self.log_msg("--WARN-- {} Error, Radio not responsive, (cmd failure <{}> radio ({}) check({}) expect({}) ex({}))".format(_e_msg,_cmd,self.radioAddress,check_for_output, expect_output,type(e)))
+                        raise ConnectionFailure("Command IO ({}) failure, cmd <{}> radio ({})".format(_e_msg,_cmd,self.radioAddress))
+                    _resends+=1
+            
+        except socket.timeout as e :
+            if expect_output:
+                _failed=True
+                if self._debug:
+                    self.log_msg("Socket timed out, processing cmd <{}> radio ({}) may not be responsive. (check:{} expect:{})".format(_cmd,self.radioAddress,check_for_output,expect_output))
+                raise ConnectionFailure(self._except_msg)
+        except socket.error as e :
+            _failed=True
+            self.log_msg("Socket error, cmd {} radio({}) may not be responsive, reconnect".format(_cmd,self.radioAddress))
+            self._reconnect()
+            raise e
+        except CommandException:
+            _error=True
+            raise
+        finally:
+            # reset initial values for timeout and debug
+            self._debug=_debug
+            self.stats.record(command_mnemonic(_cmd), time.time()-_start,
+                              self._echo_wait, self._response_wait,
+                              self.stats.bytes_sent-_sent, self.stats.bytes_received-_received,
+                              _resends, _failed, _error)
+            self._record_outcome(not _failed)
+            
+        return returnMsg
+
+
+    
+    def _sendStringCommand(self, command, timeout, echo_timeout, check_for_output=True, expect_output=True, measure_rtt=True):
+        """Sends command to the radio and process response
+
+        Parameters:
+        -----------
+        command : command string to send to radio
+        timeout : maximum time to wait for a response
+        echo_timeout : time to wait for the command echo
+        check_for_output : check for output after command echo is processed
+        expect_output : when checking for output that we expected reply message
+                        if not, then raise CommandException
+        measure_rtt : update round trip estimators, not used for retransmitted commands
+
+        Returns:
+        --------
+        resp : response string from radio
+        """
+        if not self.echo_enabled:
+            return self._sendStringCommandNoEcho(command, timeout, check_for_output, expect_output, measure_rtt)
+
+        self._except_msg=""
+        _cmd=command.replace('\n',' ').strip()
+        _timeout=timeout
+
+        if self._debug:
+            self.log_msg("--DEBUG-- Sending to radio:{0} command <{1}> timeout:{2} check:{3} expect:{4}".format(self.radioAddress,_cmd,timeout,check_for_output,expect_output))
 
         # set exception message
         self._except_msg="Socket timed out receiving echo for command <{}> radio ({})".format( _cmd,self.radioAddress)
         self.radioSocket.settimeout(_timeout)
         try:
-            self.radioSocket.sendto(command, self.radioAddress)
+            _send_time=time.time()
+            self._sendto(command)
+        except socket.timeout:
+            raise TransmitFailure
+
+        # process echo of command, should happen right away
+        _expect_output=True
+        try:
+            _stime=time.time()
+            _iready,_oready,_eready = select.select([self.radioSocket],[],[],echo_timeout)
+            _etime=time.time()
+            if self._debug:
+                self.log_msg("--DEBUG--  ECHO select wait {:.7f} timeout:{} msg:{})".format(_etime-_stime,echo_timeout,_cmd))
+            if _iready == None or len(_iready) == 0:
+                raise socket.timeout
+
+            _stime=time.time()
+            echoMsg = self._recv()
+            _etime=time.time()
+            self._echo_wait=_etime-_send_time
+            if measure_rtt:
+                self.echo_rtt.update(_etime-_send_time)
+            if self._debug:            
+                self.log_msg("--DEBUG--  ECHO recv time {:.7f}  msg:{})".format(_etime-_stime,_cmd))
+        except socket.timeout:
+                raise EchoFailure
+
+        # setup for exceptions when processing response messages
+        _expect_output = expect_output
+        self._except_msg = "Socket timed out({}) when reading results for command <{}> radio ({})".format(timeout,_cmd,self.radioAddress)
+
+        if self._debug:
+            resp = self.Decoder.clean(echoMsg)
+            self.log_msg("--DEBUG-- Echo from radio <{0}> (check for output={1})".format(resp,check_for_output))
+
+        # early return, do not look for error conditions or response messages
+        if not check_for_output:
+            return ""
+
+        # wait for the estimated response time, if we don't expect anything then no need
+        # to wait any longer than that, otherwise continue waiting up to the full timeout
+        _timeout=min(self.response_rtt.rto(), timeout)
+        if not expect_output: 
+            _timeout=max(_timeout-(time.time()-_send_time), self.response_rtt.min_rto)
+        
+        _stime=time.time()
+        _iready,_oready,_eready = select.select([self.radioSocket],[],[],_timeout)
+        if (_iready == None or len(_iready) == 0) and expect_output and _timeout < timeout:
+            self.response_rtt.backoff()
+            _iready,_oready,_eready = select.select([self.radioSocket],[],[],timeout-_timeout)
+        _etime=time.time()
+        if self._debug:
+            self.log_msg("--DEBUG-- RESP select wait {:.7f} timeout:{} msg:{})".format(_etime-_stime,
+                                                                                       _timeout,
+                                                                                       _cmd))
+        if _iready == None or len(_iready) == 0:
+                raise socket.timeout
+
+        _stime=time.time()
+        returnMsg = self._recv()
+        _etime=time.time()
+        self._response_wait=_etime-_send_time
+        if measure_rtt and expect_output:
+            self.response_rtt.update(_etime-_send_time)
+        if self._debug:        
+            self.log_msg("--DEBUG-- RESP recv time {:.7f} msg:{})".format(_etime-_stime,_cmd))
+                
+        self._except_msg=""
+        # clean up return message
+        returnMsg = self.Decoder.clean(returnMsg)
+        if self._debug:
+            self.log_msg("--DEBUG-- Response from command : {} (check for output:{}) radio {})".format(returnMsg,check_for_output,self.radioAddress))
+
+        # check for unexpected output
+        if not expect_output and len(returnMsg) > 0:
+            err_str =  "Unexpected output received \"{}\" from command:{} radio {}".format(returnMsg,_cmd,self.radioAddress)
+            if self._debug:
+                print err_str
+            # send newlines to reset command processing
+            self._flush()
+            raise CommandException(err_str)
+
+        return returnMsg
+
+    def submitCommand(self, command, check_for_output=True, expect_output=True):
+        """
+        Queue a command for the connection's IO thread and return immediately
+
+        Parameters:
+        -----------
+        command : command string to send to radio
+        check_for_output : check for output after command echo is processed
+        expect_output : when checking for output that we expected reply message
+                        if not, then raise CommandException
+
+        Returns:
+        --------
+        future : CommandFuture that completes with the response string from radio
+        """
+        return self.submitBatch([command], check_for_output, expect_output)[0]
+
+    def submitBatch(self, commands, check_for_output=True, expect_output=True):
+        """
+        Queue a group of commands for the connection's IO thread and return immediately,
+        commands queued together are pipelined to the radio.
+
+        Parameters:
+        -----------
+        commands : list of command strings to send to radio
+        check_for_output : check for output after command echo is processed
+        expect_output : single value or list of values (one per command), when checking
+                        for output that we expected reply message, if not, then raise CommandException
+
+        Returns:
+        --------
+        futures : list of CommandFuture objects, in the same order as commands
+        """
+        if type(expect_output) not in (list, tuple):
+            expect_output = [ expect_output ] * len(commands)
+        # wait on a command at most as long as it and the commands queued ahead of it can
+        # take to fail every retry, so a stalled IO thread does not block callers forever
+        command_time=self.get_command_timeout()
+        self.__queueCond.acquire()
+        try:
+            queued=len(self.__queue)
+        finally:
+            self.__queueCond.release()
+        futures=[ CommandFuture(cmd, check_for_output, expect, (queued+idx+1)*command_time, self._cancel_future)
+                  for idx, (cmd, expect) in enumerate(zip(commands, expect_output)) ]
+        if len(futures) == 0:
+            return futures
+
+        # radio is known to be down, fail right away
+        if not self.breaker.allow(len(futures)):
+            for future in futures:
+                future.set_exception(CircuitOpen(self._circuit_open_msg(future.command)))
+            return futures
+
+        self.__queueCond.acquire()
+        try:
+            self.__queue.extend(futures)
+            if self._io_thread is None:
+                self._io_thread = threading.Thread(target=self._io_loop,
+                                                   name="MSDD-IO-{0}:{1}".format(*self.radioAddress))
+                self._io_thread.setDaemon(True)
+                self._io_thread.start()
+            self.__queueCond.notify()
+        finally:
+            self.__queueCond.release()
+        return futures
+
+    def _cancel_future(self, future):
+        """
+        Remove a cancelled command from the queue, the IO thread skips it if already pulled
+        """
+        self.__queueCond.acquire()
+        try:
+            try:
+                self.__queue.remove(future)
+            except ValueError:
+                pass
+        finally:
+            self.__queueCond.release()
+
+    def get_command_timeout(self):
+        """
+        Returns:
+        --------
+        longest time in seconds a command can take to fail, every send/echo retry waiting the
+        maximum echo and response timeouts before the late messages are flushed
+        """
+        return (2.0*self.echo_rtt.max_rto + 1.1*self.timeout) * self.CommandRetries
+
+    def sendCommandBatch(self, commands, check_for_output=True, expect_output=True):
+        """
+        Sends a group of commands to the radio as a pipelined burst and returns the
+        responses in the same order as the commands.
+
+        Parameters:
+        -----------
+        commands : list of command strings to send to radio
+        check_for_output : check for output after command echo is processed
+        expect_output : single value or list of values (one per command), when checking
+                        for output that we expected reply message, if not, then raise CommandException
+
+        Returns:
+        --------
+        resp : list of response strings from radio
+        """
+        if threading.current_thread() is self._io_thread:
+            return [ self.sendStringCommand(cmd, check_for_output, expect) for cmd, expect in
+                     zip(commands, expect_output if type(expect_output) in (list, tuple) else [expect_output]*len(commands)) ]
+
+        futures = self.submitBatch(commands, check_for_output, expect_output)
+        results=[]
+        unexpected=[]
+        for future in futures:
+            try:
+                results.append(future.result())
+            except CommandException, e:
+                results.append(None)
+                unexpected.append(str(e))
+
+        if len(unexpected) > 0:
+            raise CommandException("; ".join(unexpected))
+
+        return results
+
+    def _io_loop(self):
+        """
+        IO thread that owns the radio socket, pulls queued commands and pipelines them
+        to the radio. The thread exits after IOIdleTime seconds without any work and is
+        restarted by the next submitted command.
+        """
+        while True:
+            self.__queueCond.acquire()
+            try:
+                if len(self.__queue) == 0:
+                    self.__queueCond.wait(self.IOIdleTime)
+                if len(self.__queue) == 0:
+                    self._io_thread=None
+                    return
+                # pull as many commands as possible that share the same output checking
+                batch=[ self.__queue.popleft() ]
+                while len(self.__queue) > 0 and \
+                      self.__queue[0].check_for_output == batch[0].check_for_output:
+                    batch.append(self.__queue.popleft())
+            finally:
+                self.__queueCond.release()
+
+            try:
+                self._process_batch(batch)
+            except Exception, e:
+                if self._debug:
+                    traceback.print_exc()
+                for future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _process_batch(self, batch):
+        """
+        Send a batch of queued commands to the radio and complete each command's future. The
+        futures are completed after the connection lock is released, their callbacks may send
+        commands
+        """
+        completions=[]
+        # commands cancelled by a caller that timed out are not sent
+        batch=[ future for future in batch if future.set_running() ]
+        if len(batch) == 0:
+            return
+        try:
+            self._send_batch(batch, completions)
+        finally:
+            for future, result, exc in completions:
+                if exc is not None:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+
+    def _send_batch(self, batch, completions):
+        """
+        Send a batch of queued commands to the radio, appends (future, result, exception) to
+        completions for each command
+        """
+        self.__mutexLock.acquire()            # synchronize access to the radio
+        try:
+            if self.radioSocket is None:
+                for future in batch:
+                    completions.append((future, None, ConnectionFailure("No connection to radio ({})".format(self.radioAddress))))
+                return
+
+            # radio stopped responding while these commands were queued
+            if not self.breaker.allow(len(batch)):
+                for future in batch:
+                    completions.append((future, None, CircuitOpen(self._circuit_open_msg(future.command))))
+                return
+
+            results=[ None ] * len(batch)
+            unexpected={}
+            if len(batch) > 1:
+                try:
+                    if self.echo_enabled:
+                        results, _unexpected = self._sendCommandBatch([ f.command for f in batch ],
+                                                                      self.timeout,
+                                                                      self.echo_rtt.rto(),
+                                                                      batch[0].check_for_output,
+                                                                      [ f.expect_output for f in batch ],
+                                                                      self.BatchWindow)
+                        unexpected=dict(_unexpected)
+                    elif batch[0].check_for_output and False not in [ f.expect_output for f in batch ]:
+                        # without echoes only queries can be matched to their responses
+                        results = self._sendCommandBatchNoEcho([ f.command for f in batch ],
+                                                               self.timeout,
+                                                               self.BatchWindow)
+                except socket.error as e :
+                    self.log_msg("Socket error, batch of {} commands radio({}) may not be responsive, reconnect".format(len(batch),self.radioAddress))
+                    self._reconnect()
+                    for future in batch:
+                        completions.append((future, None, e))
+                    return
+
+            for idx, future in enumerate(batch):
+                if unexpected.has_key(idx):
+                    completions.append((future, None, CommandException("Unexpected output received \"{}\" from command:{} radio {}".format(unexpected[idx],
+                                                                                                                           future.command.replace('\n',' ').strip(),
+                                                                                                                           self.radioAddress))))
+                elif results[idx] is not None:
+                    completions.append((future, results[idx], None))
+                else:
+                    # single command or could not be resolved from the batch
+                    try:
+                        completions.append((future, self._sendStringCommandRetry(future.command,
+                                                                                 future.check_for_output,
+                                                                                 future.expect_output), None))
+                    except Exception, e:
+                        completions.append((future, None, e))
+        finally:
+            self.__mutexLock.release()
+
+    def _sendStringCommandNoEcho(self, command, timeout, check_for_output=True, expect_output=True, measure_rtt=True):
+        """Sends command to the radio with echo disabled and process response
+
+        Parameters:
+        -----------
+        command : command string to send to radio
+        timeout : maximum time to wait for a response
+        check_for_output : check for output after command is sent
+        expect_output : when checking for output that we expected reply message, if not
+                        then raise CommandException, see _confirmCommandNoEcho
+        measure_rtt : update round trip estimators, not used for retransmitted commands
+
+        Returns:
+        --------
+        resp : response string from radio
+        """
+        self._except_msg=""
+        _cmd=command.replace('\n',' ').strip()
+
+        if self._debug:
+            self.log_msg("--DEBUG-- Sending to radio:{0} command <{1}> timeout:{2} check:{3} expect:{4} (no echo)".format(self.radioAddress,_cmd,timeout,check_for_output,expect_output))
+
+        # discard output left over from previous commands
+        self._drain()
+        if self.echo_enabled:
+            return self._sendStringCommand(command, timeout, self.echo_rtt.rto(), check_for_output, expect_output, False)
+
+        self.radioSocket.settimeout(timeout)
+        try:
+            _send_time=time.time()
+            self._sendto(command)
+            self._last_command=_cmd
         except socket.timeout:
             raise TransmitFailure
 
-        # process echo of command, should happen right away
-        _expect_output=True
-        try:
+        # nothing will be returned, no need to wait
+        if not check_for_output:
+            return ""
+
+        self._except_msg = "Socket timed out({}) when reading results for command <{}> radio ({})".format(timeout,_cmd,self.radioAddress)
+        if not expect_output:
+            return self._confirmCommandNoEcho(_cmd, timeout)
+        while True:
+            _timeout=min(self.response_rtt.rto(), timeout)
             _stime=time.time()
-            _iready,_oready,_eready = select.select([self.radioSocket],[],[],echo_timeout)
+            _iready,_oready,_eready = select.select([self.radioSocket],[],[],_timeout)
+            if (_iready == None or len(_iready) == 0) and _timeout < timeout:
+                self.response_rtt.backoff()
+                _iready,_oready,_eready = select.select([self.radioSocket],[],[],timeout-_timeout)
             _etime=time.time()
             if self._debug:
-                self.log_msg("--DEBUG--  ECHO select wait {:.7f} timeout:{} msg:{})".format(_etime-_stime,echo_timeout,_cmd))
+                self.log_msg("--DEBUG-- RESP select wait {:.7f} timeout:{} msg:{})".format(_etime-_stime,
+                                                                                           _timeout,
+                                                                                           _cmd))
             if _iready == None or len(_iready) == 0:
                 raise socket.timeout
 
-            _stime=time.time()
-            echoMsg = self.radioSocket.recv(65535)
-            _etime=time.time()
-            if self._debug:            
-                self.log_msg("--DEBUG--  ECHO recv time {:.7f}  msg:{})".format(_etime-_stime,_cmd))
-        except socket.timeout:
-                raise EchoFailure
+            returnMsg = self._recv()
+            returnMsg = self.Decoder.clean(returnMsg)
+            if returnMsg.strip() != _cmd:
+                break
 
-        # setup for exceptions when processing response messages
-        _expect_output = expect_output
-        self._except_msg = "Socket timed out({}) when reading results for command <{}> radio ({})".format(timeout,_cmd,self.radioAddress)
+            # radio is still echoing commands, fall back to echo mode and wait for the response
+            self.log_msg("--WARN-- Radio ({}) echoed command <{}> with echo disabled, reverting to echo mode".format(self.radioAddress,_cmd))
+            self.echo_enabled=True
+            measure_rtt=False
 
+        self._response_wait=time.time()-_send_time
+        if measure_rtt:
+            self.response_rtt.update(self._response_wait)
+        self._except_msg=""
         if self._debug:
-            resp = re.sub(r'[^\x00-\x7F]+',' ', str(echoMsg))
-            resp = resp.replace('\n',' ')
-            self.log_msg("--DEBUG-- Echo from radio <{0}> (check for output={1})".format(resp,check_for_output))
+            self.log_msg("--DEBUG-- Response from command : {} (check for output:{}) radio {})".format(returnMsg,check_for_output,self.radioAddress))
+        return returnMsg
 
-        # early return, do not look for error conditions or response messages
-        if not check_for_output:
+    def _waitMessageNoEcho(self, timeout):
+        """
+        Returns the next message from the radio, raises socket.timeout if none arrives within
+        timeout. Does not lock access
+        """
+        _iready,_oready,_eready = select.select([self.radioSocket],[],[],timeout)
+        if _iready == None or len(_iready) == 0:
+            raise socket.timeout
+        return self.Decoder.clean(self._recv()).strip()
+
+    def _confirmCommandNoEcho(self, _cmd, timeout):
+        """
+        Without echoes the radio only answers a set command when it rejects it. Follow the
+        command with the probe query, output received before the probe's response is the
+        command's error and raises CommandException. Does not lock access
+        """
+        if self._probe_response is None:
+            # learn the probe's response from the radio, it does not change
+            self._sendto(self.ProbeCommand)
+            self._probe_response=self._waitMessageNoEcho(timeout)
+        _send_time=time.time()
+        self._sendto(self.ProbeCommand)
+        returnMsg=self._waitMessageNoEcho(timeout)
+        self._response_wait=time.time()-_send_time
+        if returnMsg == self._probe_response:
+            self._except_msg=""
             return ""
 
-        # if we don't expect anything then no need to wait the entire time..
-        _timeout=timeout
-        if not expect_output: 
-            _timeout=echo_timeout/4.0
-        
-        _stime=time.time()
-        _iready,_oready,_eready = select.select([self.radioSocket],[],[],_timeout)
-        _etime=time.time()
-        if self._debug:
-            self.log_msg("--DEBUG-- RESP select wait {:.7f} timeout:{} msg:{})".format(_etime-_stime,
-                                                                                       _timeout,
-                                                                                       _cmd))
-        if _iready == None or len(_iready) == 0:
-                raise socket.timeout
+        if returnMsg == _cmd:
+            # radio is still echoing commands, fall back to echo mode and discard the echoes
+            self.log_msg("--WARN-- Radio ({}) echoed command <{}> with echo disabled, reverting to echo mode".format(self.radioAddress,_cmd))
+            self.echo_enabled=True
+            time.sleep(self.echo_rtt.rto())
+            self._drain(check_echo=False)
+            return ""
 
-        _stime=time.time()
-        returnMsg = self.radioSocket.recv(65535)
-        _etime=time.time()
-        if self._debug:        
-            self.log_msg("--DEBUG-- RESP recv time {:.7f} msg:{})".format(_etime-_stime,_cmd))
-                
+        # discard the probe's response
+        try:
+            self._waitMessageNoEcho(timeout)
+        except socket.timeout:
+            pass
         self._except_msg=""
-        # clean up return message
-        returnMsg = re.sub(r'[^\x00-\x7F]+',' ', str(returnMsg))
-        returnMsg = returnMsg.replace('\n',' ').rstrip()
+        err_str =  "Unexpected output received \"{}\" from command:{} radio {}".format(returnMsg,_cmd,self.radioAddress)
         if self._debug:
-            self.log_msg("--DEBUG-- Response from command : {} (check for output:{}) radio {})".format(returnMsg,check_for_output,self.radioAddress))
+            print err_str
+        raise CommandException(err_str)
 
-        # check for unexpected output
-        if not expect_output and len(returnMsg) > 0:
-            err_str =  "Unexpected output received \"{}\" from command:{} radio {}".format(returnMsg,_cmd,self.radioAddress)
+    def _sendCommandBatchNoEcho(self, commands, timeout, window):
+        """
+        Perform pipelined send of query commands with echo disabled, responses are
+        matched to commands in the order they were sent. Does not lock access
+
+        Returns:
+        --------
+        results : list of responses, None for any command that could not be resolved
+        """
+        _cmds=[ c.replace('\n',' ').strip() for c in commands ]
+        results=[ None ] * len(commands)
+        sent=0
+        received=0
+        _send_times=[ None ] * len(commands)
+        _resp_times=[ None ] * len(commands)
+        _received=[ 0 ] * len(commands)
+
+        if self._debug:
+            self.log_msg("--DEBUG-- Sending batch to radio:{0} commands <{1}> timeout:{2} window:{3} (no echo)".format(self.radioAddress,"; ".join(_cmds),timeout,window))
+
+        self._drain()
+        if self.echo_enabled:
+            return results
+
+        self.radioSocket.settimeout(timeout)
+        while received < len(commands):
+            try:
+                while sent < len(commands) and (sent - received) < window:
+                    _send_times[sent]=time.time()
+                    self._sendto(commands[sent])
+                    self._last_command=_cmds[sent]
+                    sent+=1
+            except socket.timeout:
+                break
+
+            _iready,_oready,_eready = select.select([self.radioSocket],[],[],timeout)
+            if _iready == None or len(_iready) == 0:
+                break
+            resp = self._recv()
+            resp = self.Decoder.clean(resp)
+            if resp.strip() == _cmds[received]:
+                # radio is still echoing commands, responses can not be matched
+                self.log_msg("--WARN-- Radio ({}) echoed command <{}> with echo disabled, reverting to echo mode".format(self.radioAddress,_cmds[received]))
+                self.echo_enabled=True
+                results=[ None ] * len(commands)
+                break
+            results[received]=resp
+            _resp_times[received]=time.time()
+            _received[received]=len(resp)
+            received+=1
+
+        self._record_batch(_cmds, results, _send_times, None, _resp_times, _received, received == len(commands))
+        if received < len(commands):
+            # allow any outstanding messages to arrive and discard them
+            time.sleep(self.response_rtt.rto())
+            self._drain()
+
+        return results
+
+    def _sendCommandBatch(self, commands, timeout, echo_timeout, check_for_output, expect_output, window):
+        """
+        Perform pipelined send of commands and demultiplex echos and responses, does not lock access
+
+        Returns:
+        --------
+        results : list of responses, None for any command that could not be resolved
+        unexpected : list of (index, response) for commands that returned unexpected output
+        """
+        _cmds=[ c.replace('\n',' ').strip() for c in commands ]
+        results=[ None ] * len(commands)
+        unexpected=[]
+        sent=0            # number of commands transmitted
+        current=-1        # last command that an echo was received for
+        in_sync=True
+        _send_times=[ None ] * len(commands)
+        _echo_times=[ None ] * len(commands)
+        _resp_times=[ None ] * len(commands)
+        _received=[ 0 ] * len(commands)
+
+        if self._debug:
+            self.log_msg("--DEBUG-- Sending batch to radio:{0} commands <{1}> timeout:{2} window:{3}".format(self.radioAddress,"; ".join(_cmds),timeout,window))
+
+        self.radioSocket.settimeout(timeout)
+        while True:
+            # keep the pipeline full
+            try:
+                while sent < len(commands) and (sent - current - 1) < window:
+                    _send_times[sent]=time.time()
+                    self._sendto(commands[sent])
+                    sent+=1
+            except socket.timeout:
+                in_sync=False
+                break
+
+            if current == len(commands) - 1:
+                if not check_for_output or results[current] is not None:
+                    break
+                # if we don't expect anything then no need to wait the entire time..
+                _timeout = timeout
+                if not expect_output[current]:
+                    _timeout = echo_timeout/4.0
+            else:
+                _timeout = timeout
+
+            _stime=time.time()
+            _iready,_oready,_eready = select.select([self.radioSocket],[],[],_timeout)
+            if _iready == None or len(_iready) == 0:
+                if current == len(commands) - 1 and not expect_output[current]:
+                    results[current]=""
+                else:
+                    in_sync = False
+                break
+            msg = self._recv()
             if self._debug:
-                print err_str
+                self.log_msg("--DEBUG-- BATCH recv wait {:.7f} msg:{})".format(time.time()-_stime,_cmds[max(current,0)]))
+
+            resp = self.Decoder.clean(msg)
+
+            # echo of the next command in the pipeline
+            if current+1 < sent and resp.strip() == _cmds[current+1]:
+                current+=1
+                _echo_times[current]=time.time()
+                _received[current]+=len(msg)
+                if not check_for_output or not expect_output[current]:
+                    results[current]=""
+                continue
+
+            # stale message from a previous command or we are not checking for output
+            if current < 0 or not check_for_output:
+                continue
+
+            # response for the current command, more than one means we lost track of the radio
+            if results[current] is not None and (expect_output[current] or len(results[current]) > 0):
+                results[current]=None
+                in_sync=False
+                break
+
+            results[current]=resp
+            _resp_times[current]=time.time()
+            _received[current]+=len(msg)
+            if not expect_output[current] and len(resp) > 0:
+                unexpected.append((current, resp))
+
+        if self._debug:
+            self.log_msg("--DEBUG-- Batch complete, resolved {} of {} commands radio {}".format(len([ r for r in results if r is not None ]), len(commands), self.radioAddress))
+
+        self._record_batch(_cmds, results, _send_times, _echo_times, _resp_times, _received, in_sync,
+                           [ idx for idx, resp in unexpected ])
+        if not in_sync or len(unexpected) > 0:
             # send newlines to reset command processing
-            self._flush()
-            raise CommandException(err_str)
+            try:
+                self._flush()
+            except socket.timeout:
+                pass
 
-        return returnMsg
+        return results, unexpected
+
+    def _record_batch(self, cmds, results, send_times, echo_times, resp_times, received, in_sync, errors=[]):
+        """
+        Add telemetry for the resolved commands of a batch, unresolved commands are
+        recorded when they are resent
+        """
+        self.stats.batches+=1
+        if not in_sync:
+            self.stats.batch_resyncs+=1
+        if results.count(None) < len(results):
+            self._record_outcome(True)
+        _now=time.time()
+        for idx, resp in enumerate(results):
+            if resp is None:
+                continue
+            _echo_wait=None
+            if echo_times and echo_times[idx]:
+                _echo_wait=echo_times[idx]-send_times[idx]
+            _response_wait=None
+            if resp_times[idx]:
+                _response_wait=resp_times[idx]-send_times[idx]
+            _done=resp_times[idx] or (echo_times and echo_times[idx]) or _now
+            self.stats.record(command_mnemonic(cmds[idx]), _done-send_times[idx],
+                              _echo_wait, _response_wait,
+                              len(cmds[idx])+1, received[idx],
+                              error=(idx in errors))
+
+
+class ConnectionPool(object):
+    """
+    Set of connections to the same radio, each with its own socket, lock and IO thread.
+    The first connection is the primary and is used by the console, stream router and other
+    chassis wide modules. Module groups (e.g. the tuners of one receiver) are assigned a
+    connection with assign(), a module always uses the same connection so its commands stay
+    in order while groups on different connections are controlled in parallel. The radio
+    must accept concurrent clients on separate source ports.
+
+    The pooled connections read the circuit breaker and capture from the primary, so a
+    capture started or stopped on the primary covers every connection. Command statistics
+    are kept per connection and combined by getCommandStats.
+    """
+
+    def __init__(self, primary, size=1):
+        """
+        Parameters:
+        ----------
+        primary : connection used to set up the radio
+        size : total number of connections, including the primary
+        """
+        self._lock = threading.Lock()
+        self.primary = primary
+        self.connections = [ primary ]
+        self._groups = {}
+        for n in range(1, max(1, size)):
+            conn = Connection(primary.radioAddress, primary.timeout, primary.trace_on_comm_failure)
+            conn._debug = primary._debug
+            conn.echo_enabled = primary.echo_enabled
+            conn.primary = primary
+            self.connections.append(conn)
+
+    def __len__(self):
+        return len(self.connections)
+
+    def get(self, group):
+        """
+        Returns the connection for a module group, new groups are assigned round robin
+        """
+        if len(self.connections) == 1:
+            return self.primary
+        self._lock.acquire()
+        try:
+            idx = self._groups.get(group)
+            if idx is None:
+                idx = self._groups[group] = len(self._groups) % len(self.connections)
+            return self.connections[idx]
+        finally:
+            self._lock.release()
+
+    def assign(self, module, group):
+        """
+        Send all commands for a module over the connection of its group
+        """
+        connection = self.get(group)
+        module.connection = connection
+        return connection
+
+    def get_assignments(self):
+        """
+        Returns dictionary of module group to connection index
+        """
+        self._lock.acquire()
+        try:
+            return dict(self._groups)
+        finally:
+            self._lock.release()
+
+    def set_timeout(self, timeout):
+        for conn in self.connections:
+            conn.set_timeout(timeout)
+
+    def disconnect(self):
+        for conn in self.connections:
+            conn.disconnect()
+
+    def invalidate_caches(self):
+        for conn in self.connections:
+            conn.invalidate_caches()
+
+    def getCommandStats(self):
+        """
+        Returns CommandStats.get_stats for the pool
+        """
+        return self._combined_stats().get_stats()
+
+    def getCommandStatsSummary(self):
+        """
+        Returns CommandStats.get_summary for the pool
+        """
+        return self._combined_stats().get_summary()
+
+    def resetCommandStats(self):
+        for conn in self.connections:
+            conn.resetCommandStats()
+
+    def _combined_stats(self):
+        if len(self.connections) == 1:
+            return self.primary.stats
+        stats = CommandStats()
+        stats.start_time = time.time()
+        for conn in self.connections:
+            stats.merge(conn.stats)
+        return stats
+
+    command_stats = property(getCommandStats, doc="Per command latency, retry and byte counters for all connections")
 
 
 class baseModule(object):
@@ -481,9 +2646,11 @@ class baseModule(object):
     mapping_version : if gen1 or gen2 mapping is used ( index into MOD_MAP_NAME
     update_mapping_version : sets the module name and full_reg_name
     full_reg_name : full module registration name e.g. RCV:1
+    query_cache : results of the getters declared with cached_query
 
     """
     MOD_NAME_MAPPING={1:None,2:None}
+    Decoder=ResponseDecoder()
     
     def __init__(self, connection, channel_number=0, mapping_version=2):
         """
@@ -495,40 +2662,225 @@ class baseModule(object):
         mapping_version : naming convention used to
         """
         self.connection = connection
+        self.query_cache = QueryCache()
         self.channel_number = channel_number
         self.mapping_version = mapping_version
         self.update_mapping_version(self.mapping_version)
         self.full_reg_name = str(self.module_name) + ":" + str(self.channel_number)
         self._debug=False
 
-    def log_msg(self,msg):
-        print timestamp_msg(msg)
-        
-    def get_full_reg_name(self):
+    def log_msg(self,msg):
+        print timestamp_msg(msg)
+        
+    def get_full_reg_name(self):
+        """
+        Return module instance as identified by the radio, usually module:channel_number
+        """
+        return self.full_reg_name
+
+    def channel_id(self):
+        return self.full_reg_name
+
+    def get_channel_number(self):
+        return self.channel_number
+
+    def get_module_name(self, mapping_version):
+        if not self.MOD_NAME_MAPPING.has_key(int(mapping_version)):
+            raise NotImplementedError, "MODULE NAME CORRESPONDING TO VERSION " + str(mapping_version) + "DOES NOT EXIST"
+        if self.MOD_NAME_MAPPING[int(mapping_version)] == None:
+            raise NotImplementedError, "MODULE NAME CORRESPONDING TO VERSION " + str(mapping_version) + " IS EMPTY!"
+        return self.MOD_NAME_MAPPING[int(mapping_version)]    
+
+    def update_mapping_version(self, mapping_version):
+        self.module_name = self.get_module_name(mapping_version)
+        self.full_reg_name = str(self.module_name) + ":" + str(self.channel_number)
+
+    def invalidate_caches(self, mnemonic=None):
+        """
+        Clear the cached query results of this module, or only those invalidated by a set command mnemonic
+        """
+        self.query_cache.invalidate(mnemonic)
+
+    def getQueryCacheStats(self):
+        """
+        Returns list of hit/miss counters for the cached queries of this module, see QueryCache.get_stats
+        """
+        return self.query_cache.get_stats()
+
+    def _query_id(self, query):
+        for klass in type(self).__mro__:
+            if klass.__dict__.get(query.__name__) is query:
+                return klass.__name__ + '.' + query.__name__
+        return query.__name__
+
+    def _find_query(self, query_id):
+        klass_name, name = None, query_id
+        if '.' in query_id:
+            klass_name, name = query_id.rsplit('.',1)
+        for klass in type(self).__mro__:
+            query=klass.__dict__.get(name)
+            if isinstance(query, CachedQuery) and klass_name in (None, klass.__name__):
+                return query
+        return None
+
+    def export_query_cache(self):
+        """
+        Returns list of (query id, args, value) of the cached STATIC results of this module
+        that do not depend on the module settings, see CapabilityCache
+        """
+        entries=[]
+        for key, value in self.query_cache.get_entries(CachedQuery.STATIC):
+            query=key[0]
+            if query.invalidated_by or len(key) > 2:
+                continue
+            entries.append((self._query_id(query), key[1], value))
+        return entries
+
+    def import_query_cache(self, entries):
+        """
+        Store results from export_query_cache in the query cache, returns the number of
+        results used
+        """
+        count=0
+        for query_id, args, value in entries:
+            query=self._find_query(query_id)
+            if query is None or query.policy != CachedQuery.STATIC:
+                continue
+            self.query_cache.store((query, tuple(args)), value, query.epoch(self), self.query_cache.get_version(query))
+            count+=1
+        return count
+
+    def cached_query_batch(self, getter, command, args_list, parse):
+        """
+        Call a cached_query getter that sends the query "command arg" for each arg in
+        args_list.  The args that are not cached are queried as a single pipelined batch,
+        parse converts a response to the getter result, and the results are stored in
+        the getter's cache.
+
+        Returns:
+        --------
+        dictionary of arg to result, args the radio did not answer are left out
+        """
+        query=getter.im_func
+        results={}
+        missing=[]
+        for arg in args_list:
+            key=(query, (arg,))
+            epoch=query.epoch(self)
+            found, value, version = self.query_cache.lookup(key, query, epoch)
+            if found:
+                results[arg]=value
+            else:
+                missing.append((key, arg, epoch, version))
+        if len(missing) == 0:
+            return results
+        commands=self.make_batch_commands([ (command, arg) for key, arg, epoch, version in missing ], True)
+        futures=self.connection.submitBatch(commands)
+        for (key, arg, epoch, version), future in zip(missing, futures):
+            try:
+                value=parse(future.result())
+            except Exception, e:
+                if self._debug:
+                    self.log_msg("cached_query_batch, no result for {} {} {}".format(command, arg, e))
+                continue
+            self.query_cache.store(key, value, epoch, version)
+            results[arg]=value
+        return results
+
+    def cached_queries_batch(self, queries):
+        """
+        Call cached getters without arguments, queries is a list of (getter, command, parse).
+        The getters that are not cached are queried as a single pipelined batch, parse converts
+        a response to the getter result, and the results are stored in the getters' caches.
+
+        Returns:
+        --------
+        dictionary of command to result, commands the radio did not answer are left out
+        """
+        results={}
+        missing=[]
+        for getter, command, parse in queries:
+            query=getter.im_func
+            key=(query, ())
+            epoch=query.epoch(self)
+            found, value, version = self.query_cache.lookup(key, query, epoch)
+            if found:
+                results[command]=value
+            else:
+                missing.append((key, command, parse, epoch, version))
+        if len(missing) == 0:
+            return results
+        commands=self.make_batch_commands([ command for key, command, parse, epoch, version in missing ], True)
+        futures=self.connection.submitBatch(commands)
+        for (key, command, parse, epoch, version), future in zip(missing, futures):
+            try:
+                value=parse(future.result())
+            except Exception, e:
+                if self._debug:
+                    self.log_msg("cached_queries_batch, no result for {} {}".format(command, e))
+                continue
+            self.query_cache.store(key, value, epoch, version)
+            results[command]=value
+        return results
+
+    def peek_cached_query(self, getter, *args):
         """
-        Return module instance as identified by the radio, usually module:channel_number
+        Returns (found, value) of the cached result of a getter, the radio is not queried
         """
-        return self.full_reg_name
+        query=getter.im_func
+        return self.query_cache.peek((query, args), query, query.epoch(self))
 
-    def channel_id(self):
-        return self.full_reg_name
+    def store_cached_query(self, getter, value, *args):
+        """
+        Store value as the cached result of a getter, used for registers that are set but
+        can not be read back
+        """
+        query=getter.im_func
+        key=(query, args)
+        self.query_cache.store(key, value, query.epoch(self), self.query_cache.get_version(query))
 
-    def get_channel_number(self):
-        return self.channel_number
+    def refresh(self):
+        """
+        Discard the shadow register values of this module, the next get queries the radio
+        """
+        self.query_cache.invalidate(policy=CachedQuery.SHADOW)
 
-    def get_module_name(self, mapping_version):
-        if not self.MOD_NAME_MAPPING.has_key(int(mapping_version)):
-            raise NotImplementedError, "MODULE NAME CORRESPONDING TO VERSION " + str(mapping_version) + "DOES NOT EXIST"
-        if self.MOD_NAME_MAPPING[int(mapping_version)] == None:
-            raise NotImplementedError, "MODULE NAME CORRESPONDING TO VERSION " + str(mapping_version) + " IS EMPTY!"
-        return self.MOD_NAME_MAPPING[int(mapping_version)]    
+    def reconcile_shadow(self):
+        """
+        Re-read the registers that have a shadow value from the radio and update the shadow values
 
-    def update_mapping_version(self, mapping_version):
-        self.module_name = self.get_module_name(mapping_version)
-        self.full_reg_name = str(self.module_name) + ":" + str(self.channel_number)
+        Returns:
+        --------
+        list of (query name, shadow value, radio value) for the registers that differed
+        """
+        mismatches=[]
+        for key, value in self.query_cache.get_entries(CachedQuery.SHADOW):
+            query, args = key[0], key[1]
+            kwargs = dict(key[2]) if len(key) > 2 else {}
+            version = self.query_cache.get_version(query)
+            epoch = query.epoch(self)
+            actual = query.fget(self, *args, **kwargs)
+            if actual != value:
+                mismatches.append((query.__name__, value, actual))
+            self.query_cache.store(key, actual, epoch, version)
+        return mismatches
+
+    def _invalidate_for_command(self, command_str):
+        """
+        Clear the cached results invalidated by a set command, command_str may hold several
+        commands separated by ; (e.g. ENB 0; IPP 239.1.1.1:8800;)
+        """
+        for command in str(command_str).split(';'):
+            tokens=command.split(None,1)
+            if tokens:
+                self.query_cache.invalidate(tokens[0])
 
     def send_custom_command(self,command_str, check_for_output=True):
-        res = self.connection.sendStringCommand(str(command_str),check_for_output=check_for_output)
+        try:
+            res = self.connection.sendStringCommand(str(command_str),check_for_output=check_for_output)
+        finally:
+            if '?' not in command_mnemonic(str(command_str)):
+                self.query_cache.invalidate()
         return res
 
     def make_command(self,command, args = "", query=None ):
@@ -555,9 +2907,12 @@ class baseModule(object):
     def send_set_command(self,command_str, arg1_str="", check_for_output=True, expect_output=False):
         command=self.make_command(command_str,arg1_str)
         res=None
-        res = self.connection.sendStringCommand(command,
-                                                check_for_output=check_for_output,
-                                                expect_output=expect_output)
+        try:
+            res = self.connection.sendStringCommand(command,
+                                                    check_for_output=check_for_output,
+                                                    expect_output=expect_output)
+        finally:
+            self._invalidate_for_command(command_str)
 
         if self._debug:
             self.log_msg("send_set_command (completed) command {} response {} ".format(command.replace('\n',' '),
@@ -568,6 +2923,74 @@ class baseModule(object):
 
         return res
 
+    def make_batch_commands(self, command_list, query=None):
+        """
+        Create the command strings for a batch request
+
+        Parameters:
+        ----------
+        command_list : list of command strings or (command, args) tuples
+        query : make query commands
+        """
+        commands=[]
+        for item in command_list:
+            if type(item) in (list, tuple):
+                commands.append(self.make_command(item[0], str(item[1]), query))
+            else:
+                commands.append(self.make_command(item, "", query))
+        return commands
+
+    def send_query_batch(self, command_list, check_for_output=True):
+        """
+        Send a group of query commands to this module as a single pipelined batch
+
+        Parameters:
+        ----------
+        command_list : list of command strings or (command, args) tuples
+
+        Returns:
+        --------
+        list of response strings, in the same order as command_list
+        """
+        commands=self.make_batch_commands(command_list,True)
+        res = self.connection.sendCommandBatch(commands,
+                                               check_for_output=check_for_output)
+        if self._debug:
+            self.log_msg( "send_query_batch (completed) commands {} response {}".format([ c.replace('\n',' ') for c in commands ],
+                                                                                       res))
+        if self.connection.pause:
+            time.sleep(.008)
+        return res
+
+    def send_set_batch(self, command_list, check_for_output=True, expect_output=False):
+        """
+        Send a group of set commands to this module as a single pipelined batch
+
+        Parameters:
+        ----------
+        command_list : list of command strings or (command, args) tuples
+
+        Returns:
+        --------
+        list of response strings, in the same order as command_list
+        """
+        commands=self.make_batch_commands(command_list)
+        try:
+            res = self.connection.sendCommandBatch(commands,
+                                                   check_for_output=check_for_output,
+                                                   expect_output=expect_output)
+        finally:
+            for item in command_list:
+                if type(item) in (list, tuple):
+                    item=item[0]
+                self._invalidate_for_command(item)
+        if self._debug:
+            self.log_msg( "send_set_batch (completed) commands {} response {}".format([ c.replace('\n',' ') for c in commands ],
+                                                                                     res))
+        if self.connection.pause:
+            time.sleep(.008)
+        return res
+
     def parseResponse(self, resp, items = -1, sep=','):
         """Parses a string response from the radio and returns #items elements
 
@@ -578,38 +3001,40 @@ class baseModule(object):
                 response message ( -1 == don't care)
         sep : split text of last token on separator character
         """
-        #strip trailing newline, split on spaces and take last element, then split on commas
-        resp = re.sub(r'[^\x00-\x7F]+',' ', str(resp))
-        resp = str(resp).strip()
-        resp = resp.rstrip()
-        resp_split_ws = resp.split()
-
-        # check for error condition
-        if re.search(r'.* ERR .*',resp):
-            err_str = "Error condition returned, message " + resp
+        try:
+            retVal_list = self.Decoder.values(resp, items, sep)
+        except CommandException, e:
             if self._debug:
-                print err_str
-            raise CommandException(err_str)
-
-        # check for minimum number of arguments
-        if len(resp_split_ws) < 2:
-            raise CommandException("Invalid response detected: " + str(resp))
-
-        retVal_list=[]
-        retVal = resp_split_ws[-1]
-        retVal_list = retVal.rsplit(sep,items)
+                print e
+            raise
         if self._debug:
-            print "parseResponse  response ", resp, " retval(split ws) ",  retVal, " return list ", retVal_list
-        if items >= 0 and len(retVal_list) != items:
-            raise CommandException("Could not parse reponse message for item check " + str(items) + " response \"" + str(resp) + "\" AS DESIRED.")
+            print "parseResponse  response ", resp, " return list ", retVal_list
         return retVal_list
 
+    def parseInt(self, resp):
+        """Returns the value of a single value response as an int"""
+        return self.Decoder.int_value(resp)
+
+    def parseFloat(self, resp):
+        """Returns the value of a single value response as a float"""
+        return self.Decoder.float_value(resp)
+
+    def parseBool(self, resp):
+        """Returns True if the response value (first ':' separated item) is 1"""
+        return self.Decoder.bool_value(resp)
+
+    def parseRange(self, resp, rtype=float):
+        """Returns [min, max, step] from a min:max:step response"""
+        return self.Decoder.range_value(resp, rtype)
+
+    def parseList(self, resp, rtype=None, sep=','):
+        """Returns the values of a comma separated response"""
+        return self.Decoder.list_value(resp, rtype, sep)
+
     def parseResponseSpaceOnly(self, resp, items = -1):
         """Parses a string response from the radio and returns #items elements"""
         #strip trailing newline, split on spaces 
-        resp = re.sub(r'[^\x00-\x7F]+',' ', str(resp))
-        resp = str(resp).strip()
-        resp = resp.rstrip()
+        resp = self.Decoder.clean(resp).strip()
         resp_split_ws = resp.split()
         if self._debug:
             print "parseResponseSpaceOnly  response ", resp, " return list ", resp_split_ws
@@ -669,32 +3094,7 @@ class baseModule(object):
 
     
     def get_value_valid(self,value,tolerance_per, min_val, max_val, step_val=1,closest_ceil=False):
-        if step_val <= 0:
-            step_val = 0.25
-        valid = False
-        try:
-            next_highest_valid = max(min_val,min(max_val,math.ceil((value-min_val)/step_val) * step_val+min_val))
-            val = next_highest_valid
-            max_tolerance_val = value + value*(tolerance_per/100.0)
-            max_valid_val = math.ceil((max_tolerance_val-min_val)/step_val) * step_val+min_val
-            iterate = (val <= max_val and max_valid_val >= min_val)
-            while iterate:
-                if val > max_val:
-                    break
-                if val > max_valid_val:
-                    break
-                if val >= value and val <= max_val and val >= min_val:
-                    valid = True
-                    break            
-                val += step_val
-            if not valid and closest_ceil:
-                return next_highest_valid
-        except TypeError:
-            raise InvalidValue("Missing min/max values, Requested Value was %s" %value)
-        if not valid:
-            raise InvalidValue("Valid value not found! Requested Value was %s (max/min) %s/%s" % (value,max_val,min_val))
-        
-        return val
+        return get_value_valid_range(value, tolerance_per, min_val, max_val, step_val, closest_ceil)
 
     def get_indexed_value(self, _get_index, _get_values_list, rtype=None):
         if callable(_get_index) :
@@ -781,7 +3181,7 @@ class baseModule(object):
 
     def getEnable(self):
         resp = self.send_query_command("ENB")
-        return (int(self.parseResponse(resp, -1,':')[0]) == 1)
+        return self.parseBool(resp)
 
     def setEnable(self, enable):
         return self.setter_with_validation(enable, self._setEnable, self.getEnable)
@@ -792,19 +3192,41 @@ class baseModule(object):
 
 
 class baseIPPModule(baseModule):
-    def __init__(self, connection, channel_number=0, mapping_version=2, multi_interface=False):
+    def __init__(self, connection, channel_number=0, mapping_version=2, multi_interface=False, query_interface=True):
+        """
+        query_interface : query IPP to determine the interface addressing, when False
+                          call query_interfaces for a group of modules
+        """
         super(baseIPPModule,self).__init__(connection, channel_number,mapping_version)
         self._interface=None
         self._multi_interface=multi_interface
-        try:
-            connection=self.getIPP()
-            if self._multi_interface:    # provide default interface to 0 it we have more than one
-                self._interface=0
-            if len(connection) == 3:     # check current IPP state to see if we are already assigned interface
-                self._interface=int(connection[0])
-                
-        except:
-            pass
+        if query_interface:
+            try:
+                self._setInterface(self.getIPP())
+            except:
+                pass
+
+    def _setInterface(self, connection):
+        if self._multi_interface:    # provide default interface to 0 it we have more than one
+            self._interface=0
+        if len(connection) == 3:     # check current IPP state to see if we are already assigned interface
+            self._interface=int(connection[0])
+
+    @staticmethod
+    def query_interfaces(modules):
+        """
+        Determine the interface addressing of a group of modules that share a connection,
+        the IPP queries are sent as a single pipelined batch
+        """
+        if len(modules) == 0:
+            return
+        commands=[ mod.make_command("IPP", "", True) for mod in modules ]
+        futures=modules[0].connection.submitBatch(commands)
+        for mod, future in zip(modules, futures):
+            try:
+                mod._setInterface(mod._parseIPP(future.result()))
+            except:
+                pass
 
     def _formatIPPargs(self,ip_address, port, interface):
         ipp_args = str(ip_address).strip() + ":" + str(port).strip()
@@ -833,8 +3255,9 @@ class baseIPPModule(baseModule):
         self.validateIPP(ipp_args)
         return True
 
-    def validateIPP(self,ipp_args):
-	ipp_resp=self.getIPP()
+    def validateIPP(self,ipp_args,ipp_resp=None):
+        if ipp_resp is None:
+            ipp_resp=self.getIPP()
         ipp_set = ipp_args.split(":")
         if self._debug:
             print "baseIPPModule, validateIPP ipp_args: ", ipp_args, " result: ", ipp_resp
@@ -858,9 +3281,13 @@ class baseIPPModule(baseModule):
             print "baseIPPModule, setIPP args: ", ipp_args
         self.send_set_command("IPP", ipp_args)
 
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('IPP',))
     def getIPP(self):
         """ Gets the  IP and UDP port setting for the module"""
         resp = self.send_query_command("IPP")
+        return self._parseIPP(resp)
+
+    def _parseIPP(self, resp):
 	response=[]
         try:
             response = self.parseResponse(resp, 3,':')
@@ -905,7 +3332,7 @@ class ConsoleModule(baseIPPModule):
     ConsoleModule supports the command set from the console module of the MSDD receivver
 
     """
-    def __init__(self, connection, channel_number=0, mapping_version=2, multi_interface=False):
+    def __init__(self, connection, channel_number=0, mapping_version=2, multi_interface=False, query_interface=True):
         """
         Create an instance of the ConsoleModule class
 
@@ -915,7 +3342,7 @@ class ConsoleModule(baseIPPModule):
         channel_number : channel id of the module
         mapping_version : what version of firmware mapping is used
         """
-        super(ConsoleModule,self).__init__(connection, channel_number, mapping_version, multi_interface)
+        super(ConsoleModule,self).__init__(connection, channel_number, mapping_version, multi_interface, query_interface)
 
     def cmdPing(self):
         try:
@@ -933,14 +3360,14 @@ class ConsoleModule(baseIPPModule):
     def setIPP(self,ipp_args):
         raise CommandException("Cannot set ip address for console")        
     
+    @cached_query()
     def getID(self):
         """Queries the radio for ID info, (Model,SN?,Load) """
         resp = self.send_query_command("IDN")
         return self.parseResponse(resp)
 
     def getIDString(self):
-        resp = self.send_query_command("IDN")
-        return ' '.join(self.parseResponse(resp))
+        return ' '.join(self.getID())
 
     def getSoftwarePartNumber(self):
         return self.getID()[2];
@@ -958,97 +3385,179 @@ class ConsoleModule(baseIPPModule):
     def getEcho(self):
         """Gets the echo response of the radio, boolean on/off"""
         resp = self.send_query_command("ECH")
-        return int(self.parseResponse(resp, 1)[0]) == 1
+        return self.parseInt(resp) == 1
+
+    def resetEcho(self):
+        """Turns on the echo response of the radio without waiting on the radio, used when the echo state is unknown"""
+        self.connection.set_echo_mode(False)
+        self.send_set_command("ECH","1",check_for_output=False)
+        self.connection.set_echo_mode(True)
+
+    def setEcholessMode(self, enable):
+        """
+        Disables the echo response of the radio so the connection can use a single response
+        path for each command. Falls back to echo mode if the radio does not support it.
+
+        Returns True if echoless mode is active
+        """
+        if not enable:
+            if not self.connection.echo_enabled:
+                self.resetEcho()
+            return False
+
+        if not self.connection.echo_enabled:
+            return True
+
+        try:
+            # radio may stop echoing before the command is echoed, send without waiting
+            self.connection.set_echo_mode(False)
+            self.send_set_command("ECH","0",check_for_output=False)
+            self.connection.set_echo_mode(False)
+            if self.getEcho():
+                raise CommandException("Radio did not disable echo")
+        except:
+            if self._debug:
+                traceback.print_exc()
+            self.resetEcho()
+        return not self.connection.echo_enabled
+
+    def getEcholessMode(self):
+        return not self.connection.echo_enabled
     
+    @cached_query(CachedQuery.TTL, ttl=0.5)
     def getCpuLoad(self):
         """Gets CPU load in percent, updated every 500ms """
         resp = self.send_query_command("CPL")
-        return float(self.parseResponse(resp, 1)[0])
+        return self.parseFloat(resp)
     
+    @cached_query()
     def getCfg(self, config_type):
         resp = self.send_query_command("CFG",str(config_type))
         return self.parseResponse(resp, 1)
 
+    def getCfgList(self, config_types):
+        """Returns dictionary of config_type to parsed values, queried as a single batch"""
+        resps = self.send_query_batch([ ("CFG",str(config_type)) for config_type in config_types ])
+        return dict(zip(config_types, [ self.parseResponse(resp, 1) for resp in resps ]))
+
+    # converts the parsed CFG response of a config type to the value returned by its
+    # accessor, types not listed return the first field as a string
+    CFG_VALUE_PARSERS={
+        'MIN_FREQ'            : lambda v: float(v[0])*1e6,
+        'MAX_FREQ'            : lambda v: float(v[0])*1e6,
+        'DSP_REF'             : lambda v: float(v[0]),
+        'ADC_CLK'             : lambda v: float(v[0]),
+        'IF_PORTS'            : lambda v: int(v[0]),
+        'BIT_SADC'            : lambda v: int(v[0]) == 1,
+        'ETHR_PORTS'          : lambda v: int(v[0]),
+        'CPU_FREQ'            : lambda v: float(v[0]),
+        'DSP_BRD_TYPE'        : lambda v: int(v[0]),
+        '1PPS_TERM'           : lambda v: int(v[0]) == 0,
+        '1PPS_VOLTAGE'        : lambda v: float(v[0]),
+        'FPGA_WBDDC_CHANNELS' : lambda v: int(v[0]),
+        'FPGA_NBDDC_CHANNELS' : lambda v: int(v[0]),
+    }
+
+    @classmethod
+    def parseCfgValue(cls, config_type, value):
+        """Returns the typed value of config_type from its parsed CFG response"""
+        parse = cls.CFG_VALUE_PARSERS.get(config_type)
+        if parse is None:
+            return value[0]
+        return parse(value)
+
+    def getCfgValue(self, config_type):
+        return self.parseCfgValue(config_type, self.getCfg(config_type))
+
+    def getCfgValues(self, config_types):
+        """
+        Returns dictionary of config_type to the typed values returned by the accessors, the
+        config types that are not cached are queried as a single batch
+        """
+        cfg = self.cached_query_batch(self.getCfg, "CFG", config_types, lambda resp: self.parseResponse(resp, 1))
+        return dict([ (config_type, self.parseCfgValue(config_type, value)) for config_type, value in cfg.items() ])
+
     def getModel(self):
-        return self.getCfg('MODEL')[0]
+        return self.getCfgValue('MODEL')
 
     def getSerial(self):
-        return self.getCfg('SERIAL')[0]
+        return self.getCfgValue('SERIAL')
 
     def getMinFreq_Hz(self):
-        return float(self.getCfg('MIN_FREQ')[0]) *1e6
+        return self.getCfgValue('MIN_FREQ')
 
     def getMaxFreq_Hz(self):
-        return float(self.getCfg('MAX_FREQ')[0])*1e6
+        return self.getCfgValue('MAX_FREQ')
 
     def getDspRef_Hz(self):
-        return float(self.getCfg('DSP_REF')[0])
+        return self.getCfgValue('DSP_REF')
 
     def getAdcClk_Hz(self):
-        return float(self.getCfg('ADC_CLK')[0])
+        return self.getCfgValue('ADC_CLK')
 
     def getRFBoardType(self):
-        return self.getCfg('RF_BRD_TYPE')[0]
+        return self.getCfgValue('RF_BRD_TYPE')
 
     def getNumIFPorts(self):
-        return int(self.getCfg('IF_PORTS')[0])
+        return self.getCfgValue('IF_PORTS')
 
     def getHasBitAdc(self):
-        return (int(self.getCfg('BIT_SADC')[0]) == 1)
+        return self.getCfgValue('BIT_SADC')
 
     def getNumEthPorts(self):
-        return int(self.getCfg('ETHR_PORTS')[0])
+        return self.getCfgValue('ETHR_PORTS')
 
     def getCpuType(self):
-        return self.getCfg('CPU_TYPE')[0]
+        return self.getCfgValue('CPU_TYPE')
 
     def getCpuFreq(self):
-        return float(self.getCfg('CPU_FREQ')[0])
+        return self.getCfgValue('CPU_FREQ')
 
     def getFpgaType(self):
-        return self.getCfg('FPGA_TYPE')[0]
+        return self.getCfgValue('FPGA_TYPE')
 
     def getDspBoardType(self):
-        return int(self.getCfg('DSP_BRD_TYPE')[0])
+        return self.getCfgValue('DSP_BRD_TYPE')
 
     def get1PPSTerm(self):
-        return (int(self.getCfg('1PPS_TERM')[0]) == 0)
+        return self.getCfgValue('1PPS_TERM')
 
     def get1PPSVoltage(self):
-        return float(self.getCfg('1PPS_VOLTAGE')[0])
+        return self.getCfgValue('1PPS_VOLTAGE')
 
     def getNumFpgaWBDDCChannels(self):
-        return int(self.getCfg('FPGA_WBDDC_CHANNELS')[0])
+        return self.getCfgValue('FPGA_WBDDC_CHANNELS')
 
     def getNumFpgaNBDDCChannels(self):
-        return int(self.getCfg('FPGA_NBDDC_CHANNELS')[0])
+        return self.getCfgValue('FPGA_NBDDC_CHANNELS')
 
     def getFilenameApp(self):
-        return self.getCfg('FILE_NAME_APP')[0]
+        return self.getCfgValue('FILE_NAME_APP')
 
     def getFilenameFpga(self):
-        return self.getCfg('FILE_NAME_FPGA')[0]
+        return self.getCfgValue('FILE_NAME_FPGA')
 
     def getFilenameBatch(self):
-        return self.getCfg('FILE_NAME_BATCH')[0]
+        return self.getCfgValue('FILE_NAME_BATCH')
 
     def getFilenameBoot(self):
-        return self.getCfg('FILE_NAME_BOOT')[0]
+        return self.getCfgValue('FILE_NAME_BOOT')
 
     def getFilenameLoader(self):
-        return self.getCfg('FILE_NAME_LOADER')[0]
+        return self.getCfgValue('FILE_NAME_LOADER')
 
     def getFilenameConfig(self):
-        return self.getCfg('FILE_NAME_CONFIG')[0]
+        return self.getCfgValue('FILE_NAME_CONFIG')
 
     def getFilenameCal(self):
-        return self.getCfg('FILE_NAME_CAL')[0]
+        return self.getCfgValue('FILE_NAME_CAL')
 
     """Accessable properties"""    
     ID = property(getID, doc="Model/Serial/Load Number")
     address = property(getIPPString, doc="Address of console management port")
     sw_part_number = property(getSoftwarePartNumber, doc="Software Part Number ")
     echo = property(getEcho,setEcho, doc="Echo Status")
+    echoless_mode = property(getEcholessMode,setEcholessMode, doc="Connection is using echoless mode")
     cpu_load = property(getCpuLoad, doc="CPU Load")
     model = property(getModel,doc="Model name, example MSDD3000-PPS")
     serial = property(getSerial,doc="MSDD serial number")
@@ -1081,8 +3590,8 @@ class ConsoleModule(baseIPPModule):
 class LOGModule(baseIPPModule):
     MOD_NAME_MAPPING={1:"LOG",2:"LOG"}
 
-    def __init__(self, connection, channel_number=0, mapping_version=2, multi_interface=False):
-        super(LOGModule,self).__init__(connection, channel_number, mapping_version, multi_interface)
+    def __init__(self, connection, channel_number=0, mapping_version=2, multi_interface=False, query_interface=True):
+        super(LOGModule,self).__init__(connection, channel_number, mapping_version, multi_interface, query_interface)
 
     # Logging Module commands
     def getIPPString(self):
@@ -1093,11 +3602,12 @@ class LOGModule(baseIPPModule):
 
     def getMask(self):
         resp = self.send_query_command("MSK")
-        return int(self.parseResponse(resp, 1)[0])
+        return self.parseInt(resp)
 
     def getMaskReadable(self):
         return self.process_bit_mask(self.getMask, self.getMaskList)
 
+    @cached_query()
     def getMaskList(self):
         resp = self.send_query_command("MSKL")
         return self.parseResponse(resp)
@@ -1112,7 +3622,7 @@ class LOGModule(baseIPPModule):
 
     def getEnable(self):
         resp = self.send_query_command("ENB")
-        return (int(self.parseResponse(resp, -1,':')[0]) == 1)
+        return self.parseBool(resp)
 
     def setEnable(self, enable):
         return self.setter_with_validation(enable, self._setEnable, self.getEnable)
@@ -1135,6 +3645,7 @@ class BoardModule(baseModule):
         resp = self.send_query_command("MTR")
         return self.parseResponse(resp)
 
+    @cached_query()
     def getMeterList(self):
         resp = self.send_query_command("MTRL")
         return self.parseResponse(resp)
@@ -1144,7 +3655,7 @@ class BoardModule(baseModule):
 
     def getBIT(self):
         resp = self.send_query_command("BIT")
-        return int(self.parseResponse(resp, 1)[0]) 
+        return self.parseInt(resp) 
 
     def getBITStr(self,bit=None):
         if bit is None:
@@ -1152,6 +3663,7 @@ class BoardModule(baseModule):
         else:
             return self.process_bit_mask( bit, self.getBITList )
 
+    @cached_query()
     def getBITList(self):
         resp = self.send_query_command("BITL")
         return self.parseResponse(resp)
@@ -1161,8 +3673,9 @@ class BoardModule(baseModule):
 
     def getExternalRef(self):
         resp = self.send_query_command("EXR")
-        return int(self.parseResponse(resp, 1)[0]) 
+        return self.parseInt(resp) 
 
+    @cached_query()
     def getExternalRefList(self):
         resp = self.send_query_command("EXRL")
         return self.parseResponse(resp,3,':')
@@ -1193,10 +3706,6 @@ class BoardModule(baseModule):
 class NetModule(baseModule):
     MOD_NAME_MAPPING={1:"NET",2:"NET"}
         
-    def __init__(self, connection, channel_number=1, mapping_version=2):
-        baseModule.__init__(self, connection, channel_number, mapping_version)
-        self._bit_rate=None
-
     def _setIpAddress(self, ip_address):
         # save off enable state of network module
         _enb=self.getEnable()
@@ -1216,19 +3725,19 @@ class NetModule(baseModule):
     def setIpAddress(self, ip_address):
         return self.setter_with_validation(str(ip_address), self._setIpAddress, self.getIpAddress)
     
+    @cached_query()
     def getMacAddr(self):
         resp = self.send_query_command("MAC")
         return self.parseResponse(resp,1)[0] 
 
     def getEnable(self):
         resp = self.send_query_command("ENB")
-        return (int(self.parseResponse(resp, -1,':')[0]) == 1)   
+        return self.parseBool(resp)   
 
+    @cached_query()
     def getBitRate(self):
-        if not self._bit_rate:
-            resp = self.send_query_command("BRT")
-            self._bit_rate = float(self.parseResponse(resp, 1)[0]) 
-        return self._bit_rate
+        resp = self.send_query_command("BRT")
+        return self.parseFloat(resp)
 
     # property access to set/get methods
     ip_address = property(getIpAddress, setIpAddress, doc="")
@@ -1240,26 +3749,20 @@ class RcvBaseModule(baseModule):
     """Interface for the MSDD RCV module"""
     MOD_NAME_MAPPING={1:"RCV",2:"RCV"}
     
-    def __init__(self, connection, channel_number=0, mapping_version=2):
-        baseModule.__init__(self, connection, channel_number, mapping_version)
-        self._frequency_list=None
-        self._attenuation_list=None
-        self._gain_list=None
-    
     def _setFrequency_Hz(self, freq_hz):
         # frequency command take mhz as units
         freqMHz=freq_hz/1e6
         self.send_set_command("FRQ ",str(freqMHz))
 
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('FRQ',))
     def getFrequency_Hz(self):
         resp = self.send_query_command("FRQ")
-        return float(self.parseResponse(resp, 1)[0])*1e6   
+        return self.parseFloat(resp)*1e6   
 
+    @cached_query()
     def getFrequencyList(self):
-        if self._frequency_list is None:
-            resp = self.send_query_command("FRQL")
-            self._frequency_list=self.parseResponse(resp, 3,':')
-        return self._frequency_list
+        resp = self.send_query_command("FRQL")
+        return self.parseResponse(resp, 3,':')
 
     def getFrequencyListStr(self):
         rl = self.getFrequencyList()
@@ -1279,14 +3782,14 @@ class RcvBaseModule(baseModule):
     
     def _setAttenuation(self, attn):
         self.send_set_command("ATN",str(attn))
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('ATN',))
     def getAttenuation(self):
         resp = self.send_query_command("ATN")
-        return float(self.parseResponse(resp, 1)[0])    
+        return self.parseFloat(resp)    
+    @cached_query()
     def getAttenuationList(self):
-        if self._attenuation_list is None:
-            resp = self.send_query_command("ATNL")
-            self._attenuation_list=self.parseResponse(resp, 3,':')
-        return self._attenuation_list
+        resp = self.send_query_command("ATNL")
+        return self.parseResponse(resp, 3,':')
     def getAttenuationListStr(self):
         rl = self.getAttenuationList()
         return self.create_range_string(float(rl[0]), float(rl[1]), float(rl[2]))
@@ -1301,14 +3804,14 @@ class RcvBaseModule(baseModule):
     
     def _setGain(self, gain):
         self.send_set_command("GAI",str(gain))
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('GAI',))
     def getGain(self):
         resp = self.send_query_command("GAI")
-        return float(self.parseResponse(resp, 1)[0])    
+        return self.parseFloat(resp)    
+    @cached_query()
     def getGainList(self):
-        if self._gain_list is None:
-            resp = self.send_query_command("GAIL")
-            self._gain_list= self.parseResponse(resp, 3,':')
-        return self._gain_list
+        resp = self.send_query_command("GAIL")
+        return self.parseResponse(resp, 3,':')
     def getGainListStr(self):
         rl = self.getGainList()
         return self.create_range_string(float(rl[0]), float(rl[1]), float(rl[2]))
@@ -1326,7 +3829,8 @@ class RcvBaseModule(baseModule):
     
     def getBIT(self):
         resp = self.send_query_command("BIT")
-        return int(self.parseResponse(resp, 1)[0])        
+        return self.parseInt(resp)        
+    @cached_query()
     def getBITList(self):
         resp = self.send_query_command("BITL")
         return self.parseResponse(resp)
@@ -1337,6 +3841,7 @@ class RcvBaseModule(baseModule):
     def getADM(self):
         resp = self.send_query_command("ADM")
         return self.parseResponse(resp)        
+    @cached_query()
     def getADMList(self):
         resp = self.send_query_command("ADML")
         return self.parseResponse(resp) 
@@ -1353,6 +3858,7 @@ class RcvBaseModule(baseModule):
     def getMTR(self):
         resp = self.send_query_command("MTR")
         return self.parseResponse(resp)
+    @cached_query()
     def getMTRList(self):
         resp = self.send_query_command("MTRL")
         return self.parseResponse(resp)
@@ -1378,7 +3884,8 @@ class RcvBaseModule(baseModule):
         self.send_set_command("EXR ",str(ref))
     def getExternalRef(self):
         resp = self.send_query_command("EXR")
-        return int(self.parseResponse(resp, 1)[0])
+        return self.parseInt(resp)
+    @cached_query()
     def getExternalRefList(self):
         resp = self.send_query_command("EXRL")
         return self.parseResponse(resp, 3,':')
@@ -1453,17 +3960,14 @@ class RS422_RcvModule(RcvBaseModule):
 
     def getBandwidth_Hz(self):
         resp = self.send_query_command("BWC")
-        pos = int(self.parseResponse(resp,1)[0])
+        pos = self.parseInt(resp)
         rl = self.getBandwidthList_Hz()
         return rl[pos]
     
+    @cached_query()
     def getBandwidthList_Hz(self):
         resp = self.send_query_command("BWCL")
-        respList = self.parseResponse(resp)
-        hz_List = []
-        for i in range(0,len(respList)):
-            hz_List.append(float(respList[i])*1e3)
-        return hz_List
+        return [ bw*1e3 for bw in self.parseList(resp, float) ]
 
     def getBandwidthListStr(self):
         res_list = self.getBandwidthList_Hz()
@@ -1477,7 +3981,8 @@ class RS422_RcvModule(RcvBaseModule):
         self.send_set_command("MSM",str(mode))
     def getLoMode(self):
         resp = self.send_query_command("MSM")
-        return int(self.parseResponse(resp, 1)[0])  
+        return self.parseInt(resp)  
+    @cached_query()
     def getLoModeList(self):
         resp = self.send_query_command("MSML")
         return self.parseResponse(resp)
@@ -1533,7 +4038,7 @@ class TODModule(baseModule):
         """Get Built In Test results    N.B. 0-4 are errors, all else are OK"""
         resp = self.send_query_command("BIT")
         # RESOLVE,
-        #return int(self.parseResponse(resp,1)[0])
+        #return self.parseInt(resp)
         return int(self.parseResponse(resp)[0])
 
     def getBITList(self):
@@ -1555,7 +4060,7 @@ class TODModule(baseModule):
     def getTime(self):
         """Get Time of Day in [secconds,ns]"""
         resp = self.send_query_command("GET")
-        return float(self.parseResponse(resp, 1)[0]) 
+        return self.parseFloat(resp) 
     
     def _setMode(self, mode):
         """set TOD Module mode (0=Sim, 1=1PPS, 2=IRIG-B)"""
@@ -1564,11 +4069,12 @@ class TODModule(baseModule):
     def getMode(self):
         """Get TOD Module mode (0=Sim, 1=1PPS, 2=IRIG-B)"""
         resp = self.send_query_command("MOD")
-        return int(self.parseResponse(resp, 1)[0]) 
+        return self.parseInt(resp) 
 
     def getModeStr(self):
         return self.get_indexed_value(self.getMode, self.getModeList, rtype=str)
 
+    @cached_query()
     def getModeList(self):
         resp = self.send_query_command("MODL")
         return self.parseResponse(resp)
@@ -1596,6 +4102,7 @@ class TODModule(baseModule):
         resp = self.send_query_command("MTR")
         return self.parseResponse(resp) 
 
+    @cached_query()
     def getMeterList(self):
         resp = self.send_query_command("MTRL")
         return self.parseResponse(resp)   
@@ -1613,6 +4120,7 @@ class TODModule(baseModule):
     def setPPSVolt(self, voltage):
         return self.setter_with_validation(float(voltage), self._setPPSVolt, self.getPPSVolt)    
 
+    @cached_query()
     def getPPSVoltageLimits(self):
         resp = self.send_query_command("VOLL")
         return self.parseResponse(resp)
@@ -1658,6 +4166,7 @@ class TODModule(baseModule):
     def setToy(self, toy):
         return self.setter_with_validation(int(toy), self._setToy, self.getToy)    
 
+    @cached_query()
     def getToyList(self):
         resp = self.send_query_command("TOYL")
         return self.parseResponse(resp)
@@ -1693,28 +4202,25 @@ class DDCBaseModule(baseModule):
     def __init__(self, connection, channel_number=0, mapping_version=2):
         baseModule.__init__(self, connection, channel_number, mapping_version)
         self.rf_offset_hz = 0
-        self._input_sample_rate=None
-        self._bw_hz_list=None
-        self._decimation_by_position=None
-        self._decimation_list=None
-        self._frequency_list=None
-        self._sample_rate_list=None
-        self._gain_list=None
-        self._attenuation_list=None
 
     def updateRFFrequencyOffset(self,rf_offset_hz):
         self.rf_offset_hz = float(rf_offset_hz)
     def _setFrequency_Hz(self, freq):
         freq_offset = freq - self.rf_offset_hz
         self.send_set_command("FRQ ",str(freq_offset))
-    def getFrequency_Hz(self):
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('FRQ',))
+    def _getFrequency_Hz(self):
         resp = self.send_query_command("FRQ")
-        return float(self.parseResponse(resp, 1)[0])+self.rf_offset_hz
+        return self.parseFloat(resp)
+    def getFrequency_Hz(self):
+        return self._getFrequency_Hz()+self.rf_offset_hz
+    @cached_query()
+    def _getFrequencyList(self):
+        resp = self.send_query_command("FRQL")
+        return self.parseResponse(resp, 3,':')
     def getFrequencyList(self):
-        if self._frequency_list is None:
-            resp = self.send_query_command("FRQL")
-            self._frequency_list=self.parseResponse(resp, 3,':')
-        return [float(self._frequency_list[0])+self.rf_offset_hz,float(self._frequency_list[1])+self.rf_offset_hz,float(self._frequency_list[2])]
+        frequency_list=self._getFrequencyList()
+        return [float(frequency_list[0])+self.rf_offset_hz,float(frequency_list[1])+self.rf_offset_hz,float(frequency_list[2])]
     def getMinFrequency_Hz(self):
         return float(self.getFrequencyList()[0])
     def getMaxFrequency_Hz(self):
@@ -1757,10 +4263,9 @@ class DDCBaseModule(baseModule):
     def getBandwidth_Hz(self):
         return self.getSampleRate()
 
+    @cached_query()
     def getBandwidthList_Hz(self):
-        if self._bw_hz_list is None:
-            self._bw_hz_list=self._getBandwidthList_Hz()
-        return self._bw_hz_list[:]
+        return self._getBandwidthList_Hz()
 
     def getBandwidthListStr(self):
         return self.create_csv(self.getBandwidthList_Hz())
@@ -1817,14 +4322,14 @@ class DDCBaseModule(baseModule):
         return float(isr / dec)
 
     def getSampleRateList(self, isr_override=None):
-        sr_list = []
         isr = isr_override
         if isr == None:
             isr = self.getInputSampleRate()
-        dec_list = self.getDecimationList()
-        for dec in dec_list:
-            sr_list.append(isr/dec)
-        return sr_list
+        return self._getSampleRateList(isr)
+
+    @cached_query()
+    def _getSampleRateList(self, isr):
+        return [ isr/dec for dec in self.getDecimationList() ]
 
     def getSampleRateListStr(self):
         srl = self.getSampleRateList()
@@ -1847,7 +4352,7 @@ class DDCBaseModule(baseModule):
 
     def getInputSampleRate(self):
         resp = self.send_query_command("ISR")
-        return float(self.parseResponse(resp, 1)[0])
+        return self.parseFloat(resp)
     
     def _setDecimation(self, dec):
         _dec = dec
@@ -1869,12 +4374,13 @@ class DDCBaseModule(baseModule):
         self.send_set_command("DEC",str(_dec))
 
 
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('DEC',))
     def _getDecimation(self):
         """
         perform DEC command on against module
         """
         resp = self.send_query_command("DEC")
-        return float(self.parseResponse(resp, 1)[0])
+        return self.parseFloat(resp)
         
     def getDecimation(self):
         dec = self._getDecimation()
@@ -1892,12 +4398,11 @@ class DDCBaseModule(baseModule):
             print "_isDecimationByPosition ", len(dlist) != 3
         return len(dlist) != 3  # min:max:step
     
+    @cached_query()
     def isDecimationByPosition(self):
-        if self._decimation_by_position is None:
-            decl_resp=self._getDecimationList()
-            self._decimation_by_position = self._isDecimationByPosition(decl_resp)
-        return self._decimation_by_position
+        return self._isDecimationByPosition(self._getDecimationList())
 
+    @cached_query()
     def _getDecimationList(self):
         return self.send_query_command("DECL")
 
@@ -1916,17 +4421,12 @@ class DDCBaseModule(baseModule):
                     val+=step
             return avail_dec
         else:
-            rl = self.parseResponse(resp);
-            for dec in rl:
-                avail_dec.append(float(dec))
+            avail_dec = self.parseList(resp, float)
         return avail_dec
 
+    @cached_query()
     def getDecimationList(self):
-        if self._decimation_list is None:
-            resp = self._getDecimationList()
-            self._decimation_by_position = self._isDecimationByPosition(resp)
-            self._decimation_list = self._processDecimationList(resp)
-        return self._decimation_list
+        return self._processDecimationList(self._getDecimationList())
 
     def getDecimationListStr(self):
         res_list = self.getDecimationList()
@@ -1937,14 +4437,14 @@ class DDCBaseModule(baseModule):
     
     def _setAttenuation(self, attn):
         self.send_set_command("ATN",str(attn))
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('ATN',))
     def getAttenuation(self):
         resp = self.send_query_command("ATN")
-        return float(self.parseResponse(resp, 1)[0])    
+        return self.parseFloat(resp)    
+    @cached_query()
     def getAttenuationList(self):
-        if self._attenuation_list is None:
-            resp = self.send_query_command("ATNL")
-            self._attenuation_list = self.parseResponse(resp, 3,':')
-        return self._attenuation_list
+        resp = self.send_query_command("ATNL")
+        return self.parseResponse(resp, 3,':')
     def getAttenuationListStr(self):
         rl = self.getAttenuationList()
         return self.create_range_string(float(rl[0]), float(rl[1]), float(rl[2]))
@@ -1960,14 +4460,14 @@ class DDCBaseModule(baseModule):
     
     def _setGain(self, gain):
         self.send_set_command("GAI",str(gain),check_for_output=True, expect_output=False)
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('GAI',))
     def getGain(self):
         resp = self.send_query_command("GAI")
-        return float(self.parseResponse(resp, 1)[0])    
+        return self.parseFloat(resp)    
+    @cached_query()
     def getGainList(self):
-        if self._gain_list is None:
-            resp = self.send_query_command("GAIL")
-            self._gain_list= self.parseResponse(resp, 3,':')
-        return self._gain_list
+        resp = self.send_query_command("GAIL")
+        return self.parseResponse(resp, 3,':')
     def getGainListStr(self):
         rl = self.getGainList()
         return self.create_range_string(float(rl[0]), float(rl[1]), float(rl[2]))
@@ -1985,13 +4485,14 @@ class DDCBaseModule(baseModule):
     
     def getBIT(self):
         resp = self.send_query_command("BIT")
-        return int(self.parseResponse(resp, 1)[0])        
+        return self.parseInt(resp)        
 
     def getBITStr(self,bit=None):
         if bit is None:
             bit=self.getBIT
         return self.process_bit_mask( bit, self.getBITList )
 
+    @cached_query()
     def getBITList(self):
         resp = self.send_query_command("BITL")
         return self.parseResponse(resp)
@@ -2002,10 +4503,12 @@ class DDCBaseModule(baseModule):
         if block_xfer_size > 0:
             arg+=":" + str(block_xfer_size)
         self.send_set_command("ENB",str(arg))
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('ENB',))
     def getEnable(self):
         resp = self.send_query_command("ENB")
-        return (int(self.parseResponse(resp, -1,':')[0]) == 1)
+        return self.parseBool(resp)
 
+    @cached_query()
     def getEnableBlockLimits(self):
         resp = self.send_query_command("ENBL")
         return self.parseResponse(resp, 3,':')
@@ -2073,10 +4576,9 @@ class WBDDCModule(DDCBaseModule):
     def __init__(self, connection, channel_number=0, mapping_version=2):
         super(WBDDCModule,self).__init__(connection, channel_number, mapping_version)
 
+    @cached_query()
     def getInputSampleRate(self):
-        if self._input_sample_rate is None:
-            self._input_sample_rate=super(WBDDCModule,self).getInputSampleRate()
-        return self._input_sample_rate
+        return super(WBDDCModule,self).getInputSampleRate()
 
     def setSampleRate(self, sample_rate):
         if self._debug:
@@ -2088,10 +4590,9 @@ class WBDDCModule(DDCBaseModule):
     def getSampleRate(self):
         return super(WBDDCModule,self).getSampleRate()
 
+    @cached_query()
     def getSampleRateList(self, isr_override=None):
-        if self._sample_rate_list is None:
-            self._sample_rate_list=super(WBDDCModule,self).getSampleRateList(isr_override)
-        return self._sample_rate_list
+        return super(WBDDCModule,self).getSampleRateList(isr_override)
 
     def getSampleRateListStr(self):
         srl = self.getSampleRateList()
@@ -2174,14 +4675,14 @@ class NBDDCModule(DDCBaseModule):
     def setBandwidth_Hz(self, bandwidth_hz):
         return self.setter_with_validation(float(bandwidth_hz), self._setBandwidth_Hz, self.getBandwidth_Hz)
 
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('BWT','DEC'))
     def getBandwidth_Hz(self):
         resp = self.send_query_command("BWT")
-        return float(self.parseResponse(resp, 1)[0])*1e3    
+        return self.parseFloat(resp)*1e3    
 
+    @cached_query()
     def getBandwidthList_Hz(self):
-        if self._bw_hz_list is None:
-            self._bw_hz_list=self._getBandwidthList_Hz()
-        return self._bw_hz_list[:]
+        return self._getBandwidthList_Hz()
 
     def getBandwidthListStr(self):
         return self.create_csv(self.getBandwidthList_Hz())
@@ -2274,8 +4775,7 @@ class SWDDCModule(DDCBaseModule):
 
     def getBandwidthList_Hz(self):
         # always rebuild list since upstream could reset sample rate on us
-        self._bw_hz_list=self._getBandwidthList_Hz()
-        return self._bw_hz_list[:]
+        return self._getBandwidthList_Hz()
 
     def getBandwidthListStr(self):
         return self.create_csv(self.getBandwidthList_Hz())
@@ -2312,10 +4812,143 @@ class SWDDCModule(DDCBaseModule):
     available_attenuation =  property(getAttenuationListStr, doc="Available Attenuation in min::step::max")
 
     
+class StreamFlowGraph(object):
+    """
+    Copy of the stream router links keyed by full registration name.  A destination has
+    one source and a source can feed several destinations, linking a destination replaces
+    its previous source (same as SRT LNK).  Only the modules that were loaded are known,
+    lookups for other modules return None.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._modules = set()
+        self._destinations = {}
+        self._sources = {}
+        self.loaded = False
+
+    def clear(self):
+        self._lock.acquire()
+        try:
+            self._modules = set()
+            self._destinations = {}
+            self._sources = {}
+            self.loaded = False
+        finally:
+            self._lock.release()
+
+    def load(self, flow_lists):
+        """
+        Replace the graph
+
+        Parameters:
+        -----------
+        flow_lists : dictionary of source to its DSTL list (source, destinations...)
+        """
+        self._lock.acquire()
+        try:
+            self._modules = set(flow_lists.keys())
+            self._destinations = {}
+            self._sources = {}
+            for src, flow_list in flow_lists.items():
+                for dst in flow_list[1:]:
+                    self._link(src, dst)
+            self.loaded = True
+        finally:
+            self._lock.release()
+
+    def _link(self, src, dst):
+        self._unlink(dst)
+        self._destinations.setdefault(src, []).append(dst)
+        self._sources[dst] = src
+
+    def _unlink(self, dst):
+        src = self._sources.pop(dst, None)
+        if src is not None:
+            self._destinations[src].remove(dst)
+
+    def link(self, src, dst):
+        self._lock.acquire()
+        try:
+            if src in self._modules:
+                self._link(src, dst)
+            else:
+                # the other destinations of src are not known, stop answering for dst
+                self._unlink(dst)
+                self._modules.discard(dst)
+        finally:
+            self._lock.release()
+
+    def unlink(self, dst):
+        self._lock.acquire()
+        try:
+            self._unlink(dst)
+        finally:
+            self._lock.release()
+
+    def set_destinations(self, src, destinations):
+        """
+        Replace the destinations of a source, used to resync the graph with the radio
+        """
+        self._lock.acquire()
+        try:
+            for dst in self._destinations.get(src, [])[:]:
+                self._unlink(dst)
+            for dst in destinations:
+                self._link(src, dst)
+            self._modules.add(src)
+        finally:
+            self._lock.release()
+
+    def has_module(self, name):
+        return name in self._modules
+
+    def get_modules(self):
+        return sorted(self._modules)
+
+    def get_destinations(self, src):
+        """
+        Returns list of the destinations of src, or None if src is not in the graph
+        """
+        self._lock.acquire()
+        try:
+            if src not in self._modules:
+                return None
+            return self._destinations.get(src, [])[:]
+        finally:
+            self._lock.release()
+
+    def get_source(self, dst):
+        """
+        Returns the source of dst, empty string if it is not linked or None if dst
+        is not in the graph
+        """
+        self._lock.acquire()
+        try:
+            if dst not in self._modules:
+                return None
+            return self._sources.get(dst, "")
+        finally:
+            self._lock.release()
+
+    def __len__(self):
+        return len(self._sources)
+
+
 class StreamRouterModule(baseModule):
     MOD_NAME_MAPPING={1:"SRT",2:"SRT"}
+
+    def __init__(self, connection, channel_number=0, mapping_version=2, verify_flow_graph=False):
+        """
+        verify_flow_graph : also query the radio for each flow lookup answered from the
+                            flow graph, differences are logged and the graph is corrected
+        """
+        super(StreamRouterModule,self).__init__(connection, channel_number, mapping_version)
+        self.flow_graph = StreamFlowGraph()
+        self.verify_flow_graph = verify_flow_graph
+        self.flow_graph_mismatches = 0
     
 
+    @cached_query()
     def getModuleList(self):
         resp = self.send_query_command("MODL")
         return self.parseResponse(resp)
@@ -2324,21 +4957,123 @@ class StreamRouterModule(baseModule):
         res_list = self.getModuleList()
         return self.create_csv(res_list)
     
-    def getModulesFlowListByDestination(self,full_reg_name):
+    def _queryFlowListByDestination(self,full_reg_name):
         resp = self.send_query_command("SRCL",str(full_reg_name))
         return self.parseResponse(resp)
-    
-    def getModulesFlowListBySource(self,full_reg_name):
+
+    def _queryFlowListBySource(self,full_reg_name):
         resp = self.send_query_command("DSTL",str(full_reg_name))
         if self._debug:
             print "getModulesFlowListBySource ", full_reg_name, " result: ", resp
-        return self.parseResponse(resp)    
+        return self.parseResponse(resp)
+
+    def _flowGraphMismatch(self, command, full_reg_name, graph_list, radio_list):
+        self.flow_graph_mismatches += 1
+        self.log_msg("Stream flow graph differs from radio, {} {} graph {} radio {}".format(command,
+                                                                                         full_reg_name,
+                                                                                         graph_list,
+                                                                                         radio_list))
+
+    def getModulesFlowListByDestination(self,full_reg_name):
+        """
+        Returns list of the module followed by its source, answered from the flow graph when
+        the module is in the graph
+        """
+        src = self.flow_graph.get_source(full_reg_name)
+        if src is None:
+            return self._queryFlowListByDestination(full_reg_name)
+        flow_list = [ full_reg_name ] + ([ src ] if src else [])
+        if self.verify_flow_graph:
+            radio_list = self._queryFlowListByDestination(full_reg_name)
+            if radio_list != flow_list:
+                self._flowGraphMismatch("SRCL", full_reg_name, flow_list, radio_list)
+                if len(radio_list) > 1:
+                    self.flow_graph.link(radio_list[1], full_reg_name)
+                else:
+                    self.flow_graph.unlink(full_reg_name)
+                flow_list = radio_list
+        return flow_list
+    
+    def getModulesFlowListBySource(self,full_reg_name):
+        """
+        Returns list of the module followed by its destinations, answered from the flow graph
+        when the module is in the graph
+        """
+        destinations = self.flow_graph.get_destinations(full_reg_name)
+        if destinations is None:
+            return self._queryFlowListBySource(full_reg_name)
+        flow_list = [ full_reg_name ] + destinations
+        if self.verify_flow_graph:
+            radio_list = self._queryFlowListBySource(full_reg_name)
+            if sorted(radio_list) != sorted(flow_list):
+                self._flowGraphMismatch("DSTL", full_reg_name, flow_list, radio_list)
+                self.flow_graph.set_destinations(full_reg_name, radio_list[1:])
+                flow_list = radio_list
+        return flow_list
+
+    def loadFlowGraph(self, full_reg_names):
+        """
+        Load the flow graph with the destinations of each module, queried as a single batch.
+        Modules the radio did not answer for are left out of the graph and their lookups
+        query the radio.
+
+        Returns:
+        --------
+        number of links in the graph
+        """
+        commands=self.make_batch_commands([ ("DSTL", name) for name in full_reg_names ], True)
+        futures=self.connection.submitBatch(commands)
+        flow_lists={}
+        for name, future in zip(full_reg_names, futures):
+            try:
+                flow_lists[name]=self.parseResponse(future.result())
+            except Exception, e:
+                if self._debug:
+                    self.log_msg("loadFlowGraph, no result for {} {}".format(name, e))
+        self.flow_graph.load(flow_lists)
+        return len(self.flow_graph)
+
+    def verifyFlowGraph(self):
+        """
+        Query the destinations of every module in the flow graph and correct the graph
+        where the radio differs
+
+        Returns:
+        --------
+        list of (module, graph destinations, radio destinations) that differed
+        """
+        mismatches=[]
+        names=self.flow_graph.get_modules()
+        commands=self.make_batch_commands([ ("DSTL", name) for name in names ], True)
+        futures=self.connection.submitBatch(commands)
+        for name, future in zip(names, futures):
+            try:
+                radio_list=self.parseResponse(future.result())
+            except Exception:
+                continue
+            destinations=self.flow_graph.get_destinations(name)
+            if sorted(radio_list[1:]) != sorted(destinations):
+                self._flowGraphMismatch("DSTL", name, [ name ] + destinations, radio_list)
+                mismatches.append((name, destinations, radio_list[1:]))
+        # apply after comparing all modules, a destination moves between sources
+        for name, destinations, radio_destinations in mismatches:
+            self.flow_graph.set_destinations(name, radio_destinations)
+        return mismatches
+
+    def refresh(self):
+        """
+        Discard the shadow register values and load the flow graph from the radio again
+        """
+        super(StreamRouterModule,self).refresh()
+        if self.flow_graph.loaded:
+            self.loadFlowGraph(self.flow_graph.get_modules())
     
     def linkModules(self,source_reg_name,destination_reg_name):
         link_str = str(source_reg_name) + " " + str(destination_reg_name)
         if self._debug:
             print "Link Modules ", link_str
         self.send_set_command("LNK",link_str)
+        self.flow_graph.link(source_reg_name, destination_reg_name)
         dest_lst = self.getModulesFlowListBySource(source_reg_name)
         for dest in dest_lst:
             if dest == source_reg_name:
@@ -2347,15 +5082,19 @@ class StreamRouterModule(baseModule):
         
     def unlinkModule(self,reg_name):
         self.send_set_command("UNL",str(reg_name))
+        self.flow_graph.unlink(reg_name)
         src_lst = self.getModulesFlowListByDestination(reg_name)
         return (len(src_lst) == 0)
 
-    def getChannelLimits(self,module_name):
+    @cached_query()
+    def _getChannelLimits(self,module_name):
+        resp = self.send_query_command("RCL",str(module_name))
+        return self.parseResponse(resp)
+
+    def _channelRange(self, channel_limits):
         ret_val = []
         try:
             min_max_lst = []
-            resp = self.send_query_command("RCL",str(module_name))
-            channel_limits = self.parseResponse(resp)
             for limit_id in channel_limits:
                 channel_numnber=0
                 try:
@@ -2369,17 +5108,55 @@ class StreamRouterModule(baseModule):
            ret_val=[]
         return ret_val
 
+    def getChannelLimits(self,module_name):
+        try:
+            return self._channelRange(self._getChannelLimits(module_name))
+        except:
+            return []
+
+    def getChannelLimitsList(self, module_names):
+        """
+        Returns dictionary of registration name to list of channels, the channel limits that
+        are not cached are queried as a single batch
+        """
+        limits=self.cached_query_batch(self._getChannelLimits, "RCL", module_names, self.parseResponse)
+        return dict([ (name, self._channelRange(channel_limits)) for name, channel_limits in limits.items() ])
+
+    def _parseInstallName(self, resp):
+        return str(self.parseResponse(resp, sep=':')[0])
+
+    @cached_query()
     def getInstallName(self,reg_module):
         resp = self.send_query_command("INA",str(reg_module))
-        return str(self.parseResponse(resp, sep=':')[0])
+        return self._parseInstallName(resp)
+
+    def getInstallNames(self, reg_modules):
+        """
+        Returns dictionary of module:channel to install name, the names that are not cached
+        are queried as a single batch
+        """
+        return self.cached_query_batch(self.getInstallName, "INA", reg_modules, self._parseInstallName)
     
+    def _parseRegistrationName(self, resp):
+        return str(self.parseResponse(resp, 1)[0])
+
+    @cached_query()
     def getRegistrationName(self,installed_module):
         resp = self.send_query_command("RNA",str(installed_module))
-        return str(self.parseResponse(resp, 1)[0])
+        return self._parseRegistrationName(resp)
+
+    def getRegistrationNames(self, installed_modules):
+        """
+        Returns dictionary of installed module to registration name, the names that are not
+        cached are queried as a single batch
+        """
+        return self.cached_query_batch(self.getRegistrationName, "RNA", installed_modules, self._parseRegistrationName)
     
     def registerModule(self,reg_name, install_name, starting_channel, num_channels):
         reg_str = str(reg_name) + " " + str(install_name) + " " + str(starting_channel) + " " + str(num_channels)
         self.send_set_command("REG",reg_str)
+        # module registration changed, query the names and channels again
+        self.invalidate_caches()
             
     modules = property(getModuleList,doc="")
     modules_readable = property(getModuleListStr,doc="")
@@ -2395,7 +5172,8 @@ class FFTModule(baseModule):
         self.send_set_command("ENB",str(arg))
     def getEnable(self):
         resp = self.send_query_command("ENB")
-        return (int(self.parseResponse(resp, -1,':')[0]) == 1)    
+        return self.parseBool(resp)    
+    @cached_query()
     def getEnableSetsLimits(self):
         resp = self.send_query_command("ENBL")
         return self.parseResponse(resp, 3,':')
@@ -2413,14 +5191,15 @@ class FFTModule(baseModule):
         self.send_set_command("AVG",str(num_avg))
     def getAverage(self):
         resp = self.send_query_command("AVG")
-        return int(self.parseResponse(resp, 1)[0])    
+        return self.parseInt(resp)    
+    @cached_query()
     def getAverageList(self):
         resp = self.send_query_command("AVGL")
         return self.parseResponse(resp, 3,':')
     def getAverageListStr(self):
         resp = self.send_query_command("AVGL")
-        rl = self.parseResponse(resp, 3,':')
-        return self.create_range_string(int(rl[0]), int(rl[1]), int(rl[2]))
+        rl = self.parseRange(resp, int)
+        return self.create_range_string(*rl)
     def getMinAverage(self):
         return int(self.getAverageList()[0])
     def getMaxAverage(self):
@@ -2438,14 +5217,15 @@ class FFTModule(baseModule):
         self.send_set_command("RAT",str(rate))
     def getFFTRate(self):
         resp = self.send_query_command("RAT")
-        return float(self.parseResponse(resp, 1)[0])    
+        return self.parseFloat(resp)    
+    @cached_query(invalidated_by=('PNT','AVG','BIN'))
     def getFFTRateList(self):
         resp = self.send_query_command("RATL")
         return self.parseResponse(resp, 3,':')
     def getFFTRateListStr(self):
         resp = self.send_query_command("RATL")
-        rl = self.parseResponse(resp, 3,':')
-        return self.create_range_string(float(rl[0]), float(rl[1]), float(rl[2]))
+        rl = self.parseRange(resp)
+        return self.create_range_string(*rl)
     def getMinFFTRate(self):
         return float(self.getFFTRateList()[0])
     def getMaxFFTRate(self):
@@ -2466,9 +5246,10 @@ class FFTModule(baseModule):
         self.send_set_command("PNT ",str(fftPos))
     def getFFTSize(self):
         resp = self.send_query_command("PNT")
-        pos = int(self.parseResponse(resp, 1)[0])
+        pos = self.parseInt(resp)
         rl = self.getFFTSizeList()
         return int(rl[pos])
+    @cached_query()
     def getFFTSizeList(self):
         resp = self.send_query_command("PNTL")
         return self.parseResponse(resp)
@@ -2482,14 +5263,15 @@ class FFTModule(baseModule):
         self.send_set_command("BIN",str(bin_size))
     def getBinSize(self):
         resp = self.send_query_command("BIN")
-        return int(self.parseResponse(resp, 1)[0])    
+        return self.parseInt(resp)    
+    @cached_query(invalidated_by=('PNT',))
     def getBinSizeList(self):
         resp = self.send_query_command("BINL")
         return self.parseResponse(resp, 3,':')
     def getBinSizeListStr(self):
         resp = self.send_query_command("BINL")
-        rl = self.parseResponse(resp, 3,':')
-        return self.create_range_string(int(rl[0]), int(rl[1]), int(rl[2]))
+        rl = self.parseRange(resp, int)
+        return self.create_range_string(*rl)
     def getMinBinSize(self):
         return int(self.getBinSizeList()[0])
     def getMaxBinSize(self):
@@ -2504,11 +5286,12 @@ class FFTModule(baseModule):
         self.send_set_command("WND",str(window_type_number))
     def getWindowType(self):
         resp = self.send_query_command("WND")
-        return int(self.parseResponse(resp, 1)[0])
+        return self.parseInt(resp)
     def getWindowTypeString(self):
         pos = self.getWindowType()
         rl = self.getWindowTypeList()
         return str(rl[pos])
+    @cached_query()
     def getWindowTypeList(self):
         resp = self.send_query_command("WNDL")
         return self.parseResponse(resp)
@@ -2537,11 +5320,12 @@ class FFTModule(baseModule):
         return self.setPeakMode(pos)
     def getPeakMode(self):
         resp = self.send_query_command("PMD")
-        return int(self.parseResponse(resp, 1)[0])
+        return self.parseInt(resp)
     def getPeakModeString(self):
         pos = self.getPeakMode()
         rl = self.getPeakModeList()
         return str(rl[pos])
+    @cached_query()
     def getPeakModeList(self):
         resp = self.send_query_command("PMDL")
         return self.parseResponse(resp)
@@ -2563,14 +5347,15 @@ class FFTModule(baseModule):
         self.send_set_command("PDR",str(rate))
     def getPeakDecayRate(self):
         resp = self.send_query_command("PDR")
-        return float(self.parseResponse(resp, 1)[0])    
+        return self.parseFloat(resp)    
+    @cached_query()
     def getPeakDecayRateList(self):
         resp = self.send_query_command("PDRL")
         return self.parseResponse(resp, 3,':')
     def getPeakDecayRateListStr(self):
         resp = self.send_query_command("PDRL")
-        rl = self.parseResponse(resp, 3,':')
-        return self.create_range_string(float(rl[0]), float(rl[1]), float(rl[2]))
+        rl = self.parseRange(resp)
+        return self.create_range_string(*rl)
     def getMinPeakDecayRate(self):
         return float(self.getPeakDecayRateList()[0])
     def getMaxPeakDecayRate(self):
@@ -2582,7 +5367,7 @@ class FFTModule(baseModule):
 
     def getInputSampleRate(self):
         resp = self.send_query_command("ISR")
-        return float(self.parseResponse(resp, 1)[0]) 
+        return self.parseFloat(resp) 
     
     
     def _setTippingThresholds(self, up_threshold=10, down_threshold=2):
@@ -2639,7 +5424,8 @@ class SpectralScanModule(baseModule):
         self.send_set_command("ENB",str(arg))
     def getEnable(self):
         resp = self.send_query_command("ENB")
-        return (int(self.parseResponse(resp, -1,':')[0]) == 1)    
+        return self.parseBool(resp)    
+    @cached_query()
     def getEnableSetsLimits(self):
         resp = self.send_query_command("ENBL")
         return self.parseResponse(resp, 3,':')
@@ -2657,14 +5443,15 @@ class SpectralScanModule(baseModule):
         self.send_set_command("AVG",str(num_avg))
     def getAverage(self):
         resp = self.send_query_command("AVG")
-        return int(self.parseResponse(resp, 1)[0])    
+        return self.parseInt(resp)    
+    @cached_query()
     def getAverageList(self):
         resp = self.send_query_command("AVGL")
         return self.parseResponse(resp, 3,':')
     def getAverageListStr(self):
         resp = self.send_query_command("AVGL")
-        rl = self.parseResponse(resp, 3,':')
-        return self.create_range_string(int(rl[0]), int(rl[1]), int(rl[2]))
+        rl = self.parseRange(resp, int)
+        return self.create_range_string(*rl)
     def getMinAverage(self):
         return int(self.getAverageList()[0])
     def getMaxAverage(self):
@@ -2682,14 +5469,15 @@ class SpectralScanModule(baseModule):
         self.send_set_command("RAT",str(rate))
     def getFFTRate(self):
         resp = self.send_query_command("RAT")
-        return float(self.parseResponse(resp, 1)[0])    
+        return self.parseFloat(resp)    
+    @cached_query(invalidated_by=('PNT','AVG','BIN'))
     def getFFTRateList(self):
         resp = self.send_query_command("RATL")
         return self.parseResponse(resp, 3,':')
     def getFFTRateListStr(self):
         resp = self.send_query_command("RATL")
-        rl = self.parseResponse(resp, 3,':')
-        return self.create_range_string(float(rl[0]), float(rl[1]), float(rl[2]))
+        rl = self.parseRange(resp)
+        return self.create_range_string(*rl)
     def getMinFFTRate(self):
         return float(self.getFFTRateList()[0])
     def getMaxFFTRate(self):
@@ -2710,9 +5498,10 @@ class SpectralScanModule(baseModule):
         self.send_set_command("PNT ",str(fftPos))
     def getFFTSize(self):
         resp = self.send_query_command("PNT")
-        pos = int(self.parseResponse(resp, 1)[0])
+        pos = self.parseInt(resp)
         rl = self.getFFTSizeList()
         return int(rl[pos])
+    @cached_query()
     def getFFTSizeList(self):
         resp = self.send_query_command("PNTL")
         return self.parseResponse(resp)
@@ -2726,14 +5515,15 @@ class SpectralScanModule(baseModule):
         self.send_set_command("BIN",str(bin_size))
     def getBinSize(self):
         resp = self.send_query_command("BIN")
-        return int(self.parseResponse(resp, 1)[0])    
+        return self.parseInt(resp)    
+    @cached_query(invalidated_by=('PNT',))
     def getBinSizeList(self):
         resp = self.send_query_command("BINL")
         return self.parseResponse(resp, 3,':')
     def getBinSizeListStr(self):
         resp = self.send_query_command("BINL")
-        rl = self.parseResponse(resp, 3,':')
-        return self.create_range_string(int(rl[0]), int(rl[1]), int(rl[2]))
+        rl = self.parseRange(resp, int)
+        return self.create_range_string(*rl)
     def getMinBinSize(self):
         return int(self.getBinSizeList()[0])
     def getMaxBinSize(self):
@@ -2750,7 +5540,7 @@ class SpectralScanModule(baseModule):
         self.send_set_command("WND",str(window_type_number))
     def getWindowType(self):
         resp = self.send_query_command("WND")
-        return int(self.parseResponse(resp, 1)[0])
+        return self.parseInt(resp)
     def getWindowTypeString(self):
         pos = self.getWindowType()-1
         rl = self.getWindowTypeList()
@@ -2759,6 +5549,7 @@ class SpectralScanModule(baseModule):
         else:
             rv = ""
         return rv
+    @cached_query()
     def getWindowTypeList(self):
         resp = self.send_query_command("WNDL")
         return self.parseResponse(resp)
@@ -2787,11 +5578,12 @@ class SpectralScanModule(baseModule):
         return self.setPeakMode(pos)
     def getPeakMode(self):
         resp = self.send_query_command("PMD")
-        return int(self.parseResponse(resp, 1)[0])
+        return self.parseInt(resp)
     def getPeakModeString(self):
         pos = self.getPeakMode()
         rl = self.getPeakModeList()
         return str(rl[pos])
+    @cached_query()
     def getPeakModeList(self):
         resp = self.send_query_command("PMDL")
         return self.parseResponse(resp)
@@ -2813,14 +5605,15 @@ class SpectralScanModule(baseModule):
         self.send_set_command("PDR",str(rate))
     def getPeakDecayRate(self):
         resp = self.send_query_command("PDR")
-        return float(self.parseResponse(resp, 1)[0])    
+        return self.parseFloat(resp)    
+    @cached_query()
     def getPeakDecayRateList(self):
         resp = self.send_query_command("PDRL")
         return self.parseResponse(resp, 3,':')
     def getPeakDecayRateListStr(self):
         resp = self.send_query_command("PDRL")
-        rl = self.parseResponse(resp, 3,':')
-        return self.create_range_string(float(rl[0]), float(rl[1]), float(rl[2]))
+        rl = self.parseRange(resp)
+        return self.create_range_string(*rl)
     def getMinPeakDecayRate(self):
         return float(self.getPeakDecayRateList()[0])
     def getMaxPeakDecayRate(self):
@@ -2832,7 +5625,7 @@ class SpectralScanModule(baseModule):
 
     def getInputSampleRate(self):
         resp = self.send_query_command("ISR")
-        return float(self.parseResponse(resp, 1)[0]) 
+        return self.parseFloat(resp) 
     
     
     def _setFrequencies(self, min_freq=30000000.0, max_freq=3000000000.0):
@@ -2951,54 +5744,117 @@ class OUTModule(baseIPPModule):
     PROTOCOL_UDP_RAW=3
     PROTOCOL_UDP_SDDSA=4
 
-    def __init__(self, connection, channel_number=0, mapping_version=2, multi_interface=False):
-        super(OUTModule,self).__init__(connection, channel_number, mapping_version, multi_interface)
-        self._enable_block_limits=None
-        self._packet_rate_limits=None
-        self._packet_length_limits=None
-        self._protocol_list=None
-        self._endianess_list=None
-        self._gain_limits=None
+    def __init__(self, connection, channel_number=0, mapping_version=2, multi_interface=False, query_interface=True):
+        super(OUTModule,self).__init__(connection, channel_number, mapping_version, multi_interface, query_interface)
         self._protocol_name=''
         self._info=OUTModule.Info()
 
 
+    def _configRegisters(self):
+        """
+        Returns list of (mnemonic, getter, parse, type) of the registers set by configure, in
+        the order they are sent.  parse converts a query response to the getter result, None
+        when the register is not read back.
+        """
+        return [ ('ENB', self.getEnable, self.parseBool, bool),
+                 ('IPP', self.getIPP, self._parseIPP, str),
+                 ('POL', self.getOutputProtocol, self.parseInt, int),
+                 ('VLANEN', self.getEnableVlanTagging, lambda resp: self.parseInt(resp) == 1, bool),
+                 ('VLANTCI', self.getVlanTci, self.parseInt, int),
+                 ('CDR', self.getCDR, self.parseFloat, float),
+                 ('CCR', self.getCCR, None, int),
+                 ('END', self.getOutputEndianess, self.parseInt, int),
+                 ('TSOFS', self.getTimestampOff, self.parseInt, int),
+                 ('MFP', self.getMFP, self.parseInt, int) ]
+
+    def _configArg(self, value):
+        if type(value) == bool:
+            return "1" if value else "0"
+        return "{}".format(value)
+
+    def configure(self, settings, verify=True, prefetch=()):
+        """
+        Apply output settings as a transaction.  The settings are compared with the shadow
+        values of the registers, the registers that differ (or have no shadow value) are sent
+        as a single set command and read back as a single batch.
+
+        Parameters:
+        -----------
+        settings : dictionary of register mnemonic (ENB, IPP, POL, VLANEN, VLANTCI, CDR, CCR,
+                   END, TSOFS, MFP) to value, IPP is the argument from _formatIPPargs
+        verify : read back the registers that were set, raises InvalidValue if one differs
+        prefetch : list of (getter, command, parse) for other cached getters to read in the
+                   same batch
+
+        Returns:
+        --------
+        list of the mnemonics that were set
+        """
+        changed=[]
+        for mnemonic, getter, parse, rtype in self._configRegisters():
+            if not settings.has_key(mnemonic):
+                continue
+            value=settings[mnemonic]
+            found, current = self.peek_cached_query(getter)
+            if found:
+                if mnemonic == 'IPP':
+                    try:
+                        self.validateIPP(value, current)
+                        continue
+                    except InvalidValue:
+                        pass
+                elif current == rtype(value):
+                    continue
+            changed.append((mnemonic, getter, parse, rtype, value))
+
+        if self._debug:
+            print "OUTModule, configure changed ", [ item[0] for item in changed ]
+
+        queries=list(prefetch)
+        if changed:
+            cmd=" ".join([ "{} {};".format(mnemonic, self._configArg(value))
+                           for mnemonic, getter, parse, rtype, value in changed ])
+            self.send_set_command(cmd)
+            queries=[ (getter, mnemonic, parse) for mnemonic, getter, parse, rtype, value in changed
+                      if verify and parse is not None ] + queries
+        results=self.cached_queries_batch(queries)
+
+        for mnemonic, getter, parse, rtype, value in changed:
+            if parse is None or not verify:
+                # trust the set, the register is not read back
+                if mnemonic == 'IPP':
+                    self.store_cached_query(getter, str(value).split(':'))
+                else:
+                    self.store_cached_query(getter, rtype(value))
+            elif mnemonic == 'IPP':
+                self.validateIPP(value, results.get(mnemonic))
+            elif results.has_key(mnemonic) and results[mnemonic] != rtype(value):
+                raise InvalidValue("Set " + mnemonic + " to " + self._configArg(value) + " failed")
+        return [ item[0] for item in changed ]
+
     def _configureModule(self, enable, ipp, pol,
                         vlan, vlan_enable,
                         endianess, time_offset, flush_opt,
-                        proto_opts="" ):
-
-        # concatenate commands for quicker processing
-        _enable_arg="0"
-        if enable: _enable_arg="1"
-        _ipp="IPP {};".format(ipp)
-        _pol="POL {};".format(pol)
-        _vlan_enable=0
-        if vlan_enable: _vlan_enable=1
-        _vlan="VLANEN {}; VLANTCI {};".format(_vlan_enable,vlan)
+                        proto_opts={} ):
 
         if type(endianess) == str:
             endianess=self.getOutputEndianessIndex(endianess)
-            
-        cmd="ENB {}; {} {} {} {} END {}; TSOFS {}; MFP {};".format(
-            _enable_arg, _ipp, _pol, _vlan, proto_opts, endianess, time_offset, flush_opt)
-        self.send_set_command(cmd)
 
-        
-        
-    def configureVita49(self, enable, interface, ip_address, port,
-                         vlan, vlan_enable,
-                         endianess, time_offset, flush_opt, context_interval):
-        ipp=self._formatIPPargs(ip_address,port,interface)
-        proto_opts="CDR {}; CCR 1;".format(context_interval)
-        self._protocol_name='UDP_VITA49'
-        pol=self.getOutputProtocolNumberFromString("UDP_VITA49")        
-        self._configureModule(enable, ipp, pol,
-                            vlan, vlan_enable,
-                            endianess, time_offset, flush_opt,
-                            proto_opts)
-        self.validateIPP(ipp)
-        
+        settings={ 'ENB' : bool(enable),
+                   'IPP' : ipp,
+                   'POL' : pol,
+                   'VLANEN' : bool(vlan_enable),
+                   'VLANTCI' : vlan,
+                   'END' : endianess,
+                   'TSOFS' : time_offset,
+                   'MFP' : flush_opt }
+        settings.update(proto_opts)
+        # read the output format for getInfo in the same batch
+        prefetch=[ (self.getOutputSamplesPerFrame, "LEN", self.parseInt),
+                   (self._getOutputDataWidth, "DWT", self.parseInt) ]
+        return self.configure(settings, prefetch=prefetch)
+
+    def _updateInfo(self, ip_address, port, vlan, vlan_enable, endianess, time_offset):
         self._info.ip_address=ip_address
         self._info.port=port
         self._info.protocol=self._protocol_name
@@ -3011,6 +5867,19 @@ class OUTModule(baseIPPModule):
         self._info.data_width=self.data_width
         self._info.input_sample_rate=self.input_sample_rate
         self._info.interface=self.getIPP_Interface()
+        
+    def configureVita49(self, enable, interface, ip_address, port,
+                         vlan, vlan_enable,
+                         endianess, time_offset, flush_opt, context_interval):
+        ipp=self._formatIPPargs(ip_address,port,interface)
+        proto_opts={ 'CDR' : context_interval, 'CCR' : 1 }
+        self._protocol_name='UDP_VITA49'
+        pol=self.getOutputProtocolNumberFromString("UDP_VITA49")        
+        self._configureModule(enable, ipp, pol,
+                            vlan, vlan_enable,
+                            endianess, time_offset, flush_opt,
+                            proto_opts)
+        self._updateInfo(ip_address, port, vlan, vlan_enable, endianess, time_offset)
 
     def configureSDDS(self, enable, interface, ip_address, port, 
                        protocol, vlan, vlan_enable,
@@ -3023,20 +5892,7 @@ class OUTModule(baseIPPModule):
         self._configureModule(enable, ipp, protocol,
                             vlan, vlan_enable,
                             endianess, time_offset, flush_opt)
-        self.validateIPP(ipp)
-
-        self._info.ip_address=ip_address
-        self._info.port=port
-        self._info.protocol=self._protocol_name
-        self._info.vlan=vlan
-        self._info.vlan_enabled=vlan_enable
-        self._info.endianess=endianess
-        self._info.channel_number = self.channel_id()
-        self._info.timestamp_offsest=time_offset
-        self._info.samples_per_frame=self.samples_per_frame
-        self._info.data_width=self.data_width
-        self._info.input_sample_rate=self.input_sample_rate
-        self._info.interface=self.getIPP_Interface()
+        self._updateInfo(ip_address, port, vlan, vlan_enable, endianess, time_offset)
 
     def getInfo(self):
         return self._info
@@ -3053,12 +5909,13 @@ class OUTModule(baseIPPModule):
             print " OUTModule, setEnable ENB :", str(enable_arg)
         self.send_set_command("ENB",str(enable_arg))
 
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('ENB',))
     def getEnable(self):
 	try:
             resp = self.send_query_command("ENB")
             if self._debug:
                 print "OUTModule,  getEnable resp ", resp
-            return (int(self.parseResponse(resp, -1,':')[0]) == 1)
+            return self.parseBool(resp)
         except Exception, e:
             print e
             raise e
@@ -3066,11 +5923,10 @@ class OUTModule(baseIPPModule):
     def setEnable(self, enable):
         return self.setter_with_validation(enable, self._setEnable, self.getEnable)
 
+    @cached_query()
     def getEnableBlockLimits(self):
-        if self._enable_block_limits is None:
-            resp = self.send_query_command("ENBL")
-            self._enable_block_limits=self.parseResponse(resp, 3,':')
-        return self._enable_block_limits
+        resp = self.send_query_command("ENBL")
+        return self.parseResponse(resp, 3,':')
 
     def getMinEnableBlockSize(self):
         return int(self.getEnableBlockLimits()[0])
@@ -3083,7 +5939,7 @@ class OUTModule(baseIPPModule):
     
     def getBIT(self):
         resp = self.send_query_command("BIT")
-        return int(self.parseResponse(resp, 1)[0])
+        return self.parseInt(resp)
 
     def getBITStr(self,bit=None):
         if bit is None:
@@ -3091,6 +5947,7 @@ class OUTModule(baseIPPModule):
         else:
             return self.process_bit_mask( bit, self.getBITList )
 
+    @cached_query()
     def getBITList(self):
         resp = self.send_query_command("BITL")
         return self.parseResponse(resp)
@@ -3099,12 +5956,11 @@ class OUTModule(baseIPPModule):
         self.send_set_command("RAT",str(rat))
     def getUdpPacketRate(self):
         resp = self.send_query_command("RAT")
-        return float(self.parseResponse(resp, 1)[0])
+        return self.parseFloat(resp)
+    @cached_query(invalidated_by=('LEN','DWT'))
     def getUdpPacketRateLimits(self):
-        if self._packet_rate_limits is None:
-            resp = self.send_query_command("RATL")
-            self._packet_rate_limits=self.parseResponse(resp, 3,':')
-        return self._packet_rate_limits
+        resp = self.send_query_command("RATL")
+        return self.parseResponse(resp, 3,':')
     def getMinUdpPacketRate(self):
         return float(self.getUdpPacketRateLimits()[0])
     def getMaxUdpPacketRate(self):
@@ -3116,12 +5972,14 @@ class OUTModule(baseIPPModule):
     
     def _setOutputDataWidth(self, dwt):
         self.send_set_command("DWT",str(dwt))
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('DWT',))
     def _getOutputDataWidth(self):
         resp = self.send_query_command("DWT")
-        return int(self.parseResponse(resp, 1)[0])    
+        return self.parseInt(resp)    
     def getOutputDataWidth(self):
         return self.get_indexed_value(self._getOutputDataWidth, self.getOutputDataWidthList, rtype=int)
 
+    @cached_query()
     def getOutputDataWidthList(self):
         resp = self.send_query_command("DWTL")
         return self.parseResponse(resp)
@@ -3130,14 +5988,14 @@ class OUTModule(baseIPPModule):
     
     def _setOutputSamplesPerFrame(self, olen):
         self.send_set_command("LEN",str(olen))
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('LEN',))
     def getOutputSamplesPerFrame(self):
         resp = self.send_query_command("LEN")
-        return int(self.parseResponse(resp, 1)[0])    
+        return self.parseInt(resp)    
+    @cached_query()
     def getOutputSamplesPerFrameLimits(self):
-        if self._packet_length_limits is None:
-            resp = self.send_query_command("LENL")
-            self._packet_length_limits=self.parseResponse(resp, 3,':')
-        return self._packet_length_limits
+        resp = self.send_query_command("LENL")
+        return self.parseResponse(resp, 3,':')
     def getMinOutputSamplesPerFrame(self):
         return int(self.getOutputSamplesPerFrameLimits()[0])
     def getMaxOutputSamplesPerFrame(self):
@@ -3160,18 +6018,18 @@ class OUTModule(baseIPPModule):
     def _setOutputProtocol(self, proto):
         self.send_set_command("POL",str(proto))
 
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('POL',))
     def getOutputProtocol(self):
         resp = self.send_query_command("POL")
-        return int(self.parseResponse(resp, 1)[0])
+        return self.parseInt(resp)
 
     def getOutputProtocolStr(self):
         return self.get_indexed_value( self.getOutputProtocol, self.getOutputProtocolList, rtype=str)
     
+    @cached_query()
     def getOutputProtocolList(self):
-        if self._protocol_list is None:
-            resp = self.send_query_command("POLL")
-            self._protocol_list=self.parseResponse(resp)
-        return self._protocol_list
+        resp = self.send_query_command("POLL")
+        return self.parseResponse(resp)
     
     def getOutputProtocolNumberFromString(self,protocol):
         try:
@@ -3187,15 +6045,15 @@ class OUTModule(baseIPPModule):
     def _setOutputEndianess(self, end):
         self.send_set_command("END",str(end))
 
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('END',))
     def getOutputEndianess(self):
         resp = self.send_query_command("END")
-        return int(self.parseResponse(resp, 1)[0])    
+        return self.parseInt(resp)    
 
+    @cached_query()
     def getOutputEndianessList(self):
-        if self._endianess_list is None:
-            resp = self.send_query_command("ENDL")
-            self._endianess_list=self.parseResponse(resp)
-        return self._endianess_list
+        resp = self.send_query_command("ENDL")
+        return self.parseResponse(resp)
     def getOutputEndianessStr(self):
         return self.get_indexed_value( self.getOutputEndianess, self.getOutputEndianessList, rtype=str)
 
@@ -3215,27 +6073,27 @@ class OUTModule(baseIPPModule):
         self.send_set_command("PKT",str(add))
     def getAdditionalPktAlloc(self):
         resp = self.send_query_command("PKT")
-        return int(self.parseResponse(resp, 1)[0])    
+        return self.parseInt(resp)    
+    @cached_query()
     def getAdditionalPktAllocMax(self):
         resp = self.send_query_command("PKTL")
-        return int(self.parseResponse(resp, 1)[0]) 
+        return self.parseInt(resp) 
     def setAdditionalPktAlloc(self, add):
         self._setAdditionalPktAlloc(int(add))
     
     def getInputSampleRate(self):
         resp = self.send_query_command("ISR")
-        return float(self.parseResponse(resp, 1)[0]) 
+        return self.parseFloat(resp) 
     
     def _setGain(self, gain):
         self.send_set_command("GAI",str(gain))
     def getGain(self):
         resp = self.send_query_command("GAI")
-        return float(self.parseResponse(resp, 1)[0])    
+        return self.parseFloat(resp)    
+    @cached_query()
     def getGainLimits(self):
-        if self._gain_limits is None:
-            resp = self.send_query_command("GAIL")
-            self._gain_limits=self.parseResponse(resp, 3,':')
-        return self._gain_limits
+        resp = self.send_query_command("GAIL")
+        return self.parseResponse(resp, 3,':')
     def getGainLimitsStr(self):
         rl = self.getGainLimits()
         return self.create_range_string(float(rl[0]), float(rl[1]), float(rl[2]))
@@ -3252,17 +6110,19 @@ class OUTModule(baseIPPModule):
         arg="0" 
         if enable: arg="1"
         self.send_set_command("VLANEN",arg)
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('VLANEN',))
     def getEnableVlanTagging(self):
         resp = self.send_query_command("VLANEN")
-        return (int(self.parseResponse(resp, 1)[0]) == 1)
+        return (self.parseInt(resp) == 1)
     def setEnableVlanTagging(self, enable):
         return self.setter_with_validation(enable, self._setEnableVlanTagging, self.getEnableVlanTagging)   
     
     def _setVlanTci(self, tci):
         self.send_set_command("VLANTCI",str(tci))
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('VLANTCI',))
     def getVlanTci(self):
         resp = self.send_query_command("VLANTCI")
-        return int(self.parseResponse(resp, 1)[0])
+        return self.parseInt(resp)
     def setVlanTci(self, tci):
         return self.setter_with_validation(int(tci), self._setVlanTci, self.getVlanTci)   
     
@@ -3270,13 +6130,14 @@ class OUTModule(baseIPPModule):
         self.send_set_command("TSREF",str(ref))
     def getTimestampRef(self):
         resp = self.send_query_command("TSREF")
-        return int(self.parseResponse(resp, 1)[0])
+        return self.parseInt(resp)
     def setTimestampRef(self, ref):
         return self.setter_with_validation(int(ref), self._setTimestampRef, self.getTimestampRef)   
     
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('TSOFS',))
     def getTimestampOff(self):
         resp = self.send_query_command("TSOFS")
-        return int(self.parseResponse(resp, 1)[0])
+        return self.parseInt(resp)
     def _setTimestampOff(self, offset):
         self.send_set_command("TSOFS",str(offset))
     def setTimestampOff(self, offset):
@@ -3285,9 +6146,11 @@ class OUTModule(baseIPPModule):
     
     def _setMFP(self, mfp):
         self.send_set_command("MFP",str(mfp))
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('MFP',))
     def getMFP(self):
         resp = self.send_query_command("MFP")
-        return int(self.parseResponse(resp, 1)[0])
+        return self.parseInt(resp)
+    @cached_query()
     def getMFPLimits(self):
         resp = self.send_query_command("MFPL")
         return self.parseResponse(resp)
@@ -3295,9 +6158,11 @@ class OUTModule(baseIPPModule):
         self.in_range( int(mfp), self.getMFPLimits()[0])
         return self.setter_with_validation(int(mfp), self._setMFP, self.getMFP)   
     
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('CDR',))
     def getCDR(self):
         resp = self.send_query_command("CDR")
-        return float(self.parseResponse(resp, 1)[0])
+        return self.parseFloat(resp)
+    @cached_query()
     def getCDRLimits(self):
         resp = self.send_query_command("CDRL")
         return self.parseResponse(resp)
@@ -3306,9 +6171,11 @@ class OUTModule(baseIPPModule):
     def setCDR(self,cdr):
         return self.setter_with_validation(float(cdr), self._setCDR, self.getCDR)        
 
+    @cached_query(CachedQuery.SHADOW, invalidated_by=('CCR',))
     def getCCR(self):
         resp = self.send_query_command("CCR")
         return int(self.parseResponseSpaceOnly(resp, 4)[2]) 
+    @cached_query()
     def getCCRLimits(self):
         resp = self.send_query_command("CCRL")
         return self.parseResponse(resp)
@@ -3359,53 +6226,782 @@ class OUTModule(baseIPPModule):
 #end class OUTModule
 
 
-class object_container(object):
-    def __init__(self):
-        self.used_objects = []
-        self.free_objects = []
-    def put_object(self, obj):
-        if self.used_objects.count(obj) > 0:
-            self.used_objects.remove(obj)
-        self.free_objects.append(obj)
+class CapabilityTable(object):
+    """
+    Sample rate and bandwidth capabilities of an rx_channel for one input sample rate.
+    The table is not changed after it is built, when the input rate of the channel's
+    digital tuner changes a new table is built.
+
+    sample_rates : sorted tuple of supported sample rates
+    bandwidths : sorted tuple of supported bandwidths
+    input_rate : input sample rate of the digital tuner when the table was built
+    """
+    def __init__(self, srates, bw_rates, input_rate=None):
+        # sample rate -> ( analog bw, hw ddc sample rate, sw ddc sample rate, bandwidth )
+        self._srates=dict(srates)
+        # bandwidth -> ( analog bw, hw ddc bandwidth, sw ddc bandwidth, sample rate )
+        self._bw_rates=dict(bw_rates)
+        self.sample_rates=tuple(sorted(self._srates))
+        self.bandwidths=tuple(sorted(self._bw_rates))
+        self.input_rate=input_rate
+
+    def get_sample_rate_settings(self, srate):
+        return self._srates.get(srate)
+
+    def get_bandwidth_settings(self, bw):
+        return self._bw_rates.get(bw)
+
+    def get_valid_sample_rate(self, srate, srate_tolerance=None, return_max=None):
+        return get_value_valid_sorted(srate, srate_tolerance, self.sample_rates, return_max)
+
+    def get_valid_bandwidth(self, bw, bw_tolerance=None, return_max=None):
+        return get_value_valid_sorted(bw, bw_tolerance, self.bandwidths, return_max)
+
+    def get_bandwidth_for_sample_rate(self, srate):
+        settings=self._srates.get(srate)
+        if settings:
+            return settings[3]
+        return None
+
+    def get_sample_rate_for_bandwidth(self, bw):
+        settings=self._bw_rates.get(bw)
+        if settings:
+            return settings[3]
+        return None
+
+    def __len__(self):
+        return len(self._srates) + len(self._bw_rates)
+
+
+class TunerIndex(object):
+    """
+    Index of tuners by tuner type and by the frequency range each tuner can tune to, used
+    to find the candidate tuners for an allocation without trying every tuner.
+
+    For each tuner type the frequency ranges are kept sorted by their minimum frequency, a
+    search takes the ranges that start at or below the frequency and keeps the ones that end
+    at or above it. A tuner's range is read from its rx_channel when first needed and again
+    after invalidate, the range of a DDC moves with the frequency of its parent.
+
+    The index has its own lock: searches run under the allocation maps while the status
+    poller and the tuner settings invalidate ranges holding only the tracking lock. Ranges
+    are read from the radio without the lock, a range read across an invalidate is not stored.
+    """
+    def __init__(self, tuners=()):
+        self._lock=threading.Lock()
+        self._version=0           # bumped by invalidate and reset
+        self.reset(tuners)
+
+    def reset(self, tuners=()):
+        """
+        Index tuners, a list of (tuner number, tuner types, rx_channel)
+        """
+        self._lock.acquire()
+        try:
+            self._version+=1
+            self._types={}            # tuner type -> sorted list of tuner numbers
+            self._tuner_types={}      # tuner number -> tuner types
+            self._rx_channels={}      # tuner number -> rx_channel
+            self._ranges={}           # tuner number -> (min, max) frequency or None if unknown
+            self._intervals={}        # tuner type -> (minimums, [ (min, max, tuner number) ], unknown tuners)
+            self.searches=0
+            self.range_reads=0
+            for tuner_num, tuner_types, rx_channel in tuners:
+                self._rx_channels[tuner_num]=rx_channel
+                self._tuner_types[tuner_num]=tuple(tuner_types)
+                for tuner_type in tuner_types:
+                    self._types.setdefault(tuner_type, []).append(tuner_num)
+            for tuner_nums in self._types.itervalues():
+                tuner_nums.sort()
+        finally:
+            self._lock.release()
+
+    def invalidate(self, tuner_nums=None):
+        """
+        Read the frequency range of the tuners again on the next search, None for all tuners
+        """
+        self._lock.acquire()
+        try:
+            self._version+=1
+            if tuner_nums is None:
+                self._ranges.clear()
+                self._intervals.clear()
+                return
+            for tuner_num in tuner_nums:
+                if self._ranges.pop(tuner_num, False) is False:
+                    continue
+                for tuner_type in self._tuner_types.get(tuner_num, ()):
+                    self._intervals.pop(tuner_type, None)
+        finally:
+            self._lock.release()
+
+    def get_tuners(self, tuner_type):
+        """
+        Returns the tuner numbers that support tuner_type, in tuner order
+        """
+        self._lock.acquire()
+        try:
+            return list(self._types.get(tuner_type, ()))
+        finally:
+            self._lock.release()
+
+    def get_range(self, tuner_num):
+        """
+        Returns the (min, max) frequency range of the tuner or None if it could not be read
+        """
+        self._lock.acquire()
+        try:
+            if tuner_num in self._ranges:
+                return self._ranges[tuner_num]
+            version=self._version
+            rx_channel=self._rx_channels.get(tuner_num)
+            self.range_reads += 1
+        finally:
+            self._lock.release()
+        freq_range=self._read_range(rx_channel)
+        self._lock.acquire()
+        try:
+            if self._version == version:
+                self._ranges[tuner_num]=freq_range
+        finally:
+            self._lock.release()
+        return freq_range
+
+    def find(self, tuner_type, frequency, tolerance_perc=.01):
+        """
+        Returns the tuner numbers of tuner_type whose frequency range includes frequency, in
+        tuner order. Tuners with an unknown range are always returned.
+
+        Parameters:
+        -----------
+        tuner_type : tuner type to search
+        frequency : frequency in hz
+        tolerance_perc : a frequency this close below the minimum is tuned to the minimum
+        """
+        self._lock.acquire()
+        try:
+            self.searches += 1
+            intervals=self._intervals.get(tuner_type)
+        finally:
+            self._lock.release()
+        if intervals is None:
+            intervals=self._build_intervals(tuner_type)
+        minimums, ranges, unknown = intervals
+        end=bisect.bisect_right(minimums, frequency + abs(frequency)*tolerance_perc/100.0)
+        found=[ tuner_num for lo, hi, tuner_num in ranges[:end] if hi >= frequency ]
+        if unknown:
+            found.extend(unknown)
+        found.sort()
+        return found
+
+    def _read_range(self, rx_channel):
+        try:
+            return rx_channel.get_frequency_range()
+        except Exception:
+            return None
+
+    def _build_intervals(self, tuner_type):
+        self._lock.acquire()
+        try:
+            version=self._version
+            tuner_ranges=[ (tuner_num, self._ranges.get(tuner_num, False), self._rx_channels[tuner_num])
+                           for tuner_num in self._types.get(tuner_type, ()) ]
+            self.range_reads += len([ x for x in tuner_ranges if x[1] is False ])
+        finally:
+            self._lock.release()
+
+        read={}
+        ranges=[]
+        unknown=[]
+        for tuner_num, freq_range, rx_channel in tuner_ranges:
+            if freq_range is False:
+                freq_range=read[tuner_num]=self._read_range(rx_channel)
+            if freq_range is None:
+                unknown.append(tuner_num)
+            else:
+                ranges.append((freq_range[0], freq_range[1], tuner_num))
+        ranges.sort()
+        intervals=([ x[0] for x in ranges ], ranges, unknown)
+
+        self._lock.acquire()
+        try:
+            if self._version == version:
+                self._ranges.update(read)
+                self._intervals[tuner_type]=intervals
+        finally:
+            self._lock.release()
+        return intervals
+
+    def get_stats(self):
+        """
+        Returns a dictionary with the number of indexed tuners, searches and range reads
+        """
+        self._lock.acquire()
+        try:
+            return { 'tuners' : len(self._rx_channels),
+                     'types' : len(self._types),
+                     'searches' : self.searches,
+                     'range_reads' : self.range_reads }
+        finally:
+            self._lock.release()
+
+    def __len__(self):
+        return len(self._rx_channels)
+
+
+class LazyModule(object):
+    """
+    Stands in for a module object until the module is used.  The registration name and
+    channel number are answered by the proxy, the first access to any other attribute creates
+    the module, module_class(connection, channel_number, mapping_version, *args, **kwargs),
+    and forwards to it.  on_create is called with the new module.
+    """
+    def __init__(self, module_class, connection, channel_number=0, mapping_version=2,
+                 args=(), kwargs={}, on_create=None):
+        module_name = module_class.MOD_NAME_MAPPING.get(int(mapping_version))
+        if module_name is None:
+            raise NotImplementedError, "MODULE NAME CORRESPONDING TO VERSION " + str(mapping_version) + " DOES NOT EXIST"
+        d = self.__dict__
+        d['module_class'] = module_class
+        d['channel_number'] = channel_number
+        d['mapping_version'] = mapping_version
+        d['module_name'] = module_name
+        d['full_reg_name'] = str(module_name) + ":" + str(channel_number)
+        d['_connection'] = connection
+        d['_args'] = args
+        d['_kwargs'] = dict(kwargs)
+        d['_on_create'] = on_create
+        d['_module'] = None
+        d['_lock'] = threading.Lock()
+
+    def get_full_reg_name(self):
+        return self.full_reg_name
+
+    def channel_id(self):
+        return self.full_reg_name
+
+    def get_channel_number(self):
+        return self.channel_number
+
+    def created_module(self):
+        """
+        Returns the module or None if it has not been created
+        """
+        return self._module
+
+    def get_module(self):
+        """
+        Returns the module, creating it on first use
+        """
+        module = self._module
+        if module is None:
+            self._lock.acquire()
+            try:
+                if self._module is None:
+                    module = self.module_class(self._connection, self.channel_number, self.mapping_version,
+                                               *self._args, **self._kwargs)
+                    if self._on_create:
+                        self._on_create(module)
+                    self.__dict__['_module'] = module
+                module = self._module
+            finally:
+                self._lock.release()
+        return module
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.get_module(), name)
+
+    def __setattr__(self, name, value):
+        if name == 'connection':
+            # connection pool assignment does not need the module
+            self._lock.acquire()
+            try:
+                if self._module is None:
+                    self.__dict__['_connection'] = value
+                    return
+            finally:
+                self._lock.release()
+        setattr(self.get_module(), name, value)
+
+
+class object_container(object):
+    """
+    Pool of free and used objects.  Free objects are handed out in the order they were
+    put in the pool, all operations are O(1) and thread safe.
+
+    The free and used objects are kept in dictionaries of object to sequence number, the
+    free queue holds (sequence, object) and entries whose sequence no longer matches the
+    free dictionary (the object was taken by get_object(obj) or mark_as_used) are skipped.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._free = {}
+        self._used = {}
+        self._queue = collections.deque()
+        self._seq = 0
+        self.allocations = 0
+        self.exhausted = 0
+        self.peak_used = 0
+
+    def put_object(self, obj):
+        self._lock.acquire()
+        try:
+            self._used.pop(obj, None)
+            if obj in self._free:
+                return
+            self._seq += 1
+            self._free[obj] = self._seq
+            self._queue.append((self._seq, obj))
+            if len(self._queue) > 2*len(self._free) + 16:
+                self._queue = collections.deque(sorted([ (seq, o) for o, seq in self._free.iteritems() ]))
+        finally:
+            self._lock.release()
+
+    def is_used(self, obj):
+        if obj == None:
+            return False
+        return obj in self._used
+        
+    def mark_as_used(self, obj):
+        if obj == None:
+            return
+        self._lock.acquire()
+        try:
+            if self._free.pop(obj, None) is None:
+                return
+            self._use(obj)
+        finally:
+            self._lock.release()
+
+    def _use(self, obj):
+        self._seq += 1
+        self._used[obj] = self._seq
+        self.allocations += 1
+        if len(self._used) > self.peak_used:
+            self.peak_used = len(self._used)
+
+    def get_used_objects(self):
+        """
+        Returns list of the used objects in the order they were taken
+        """
+        self._lock.acquire()
+        try:
+            return [ obj for seq, obj in sorted([ (seq, o) for o, seq in self._used.iteritems() ]) ]
+        finally:
+            self._lock.release()
+
+    def get_free_objects(self):
+        """
+        Returns list of the free objects in the order they will be handed out
+        """
+        self._lock.acquire()
+        try:
+            return [ obj for seq, obj in sorted([ (seq, o) for o, seq in self._free.iteritems() ]) ]
+        finally:
+            self._lock.release()
+          
+    def get_object(self, obj=None):
+        """
+        Take obj, or the object that has been free the longest when obj is None, from the
+        free objects.  Returns None if it is not free.
+        """
+        self._lock.acquire()
+        try:
+            if obj != None:
+                if self._free.pop(obj, None) is None:
+                    return None
+            else:
+                obj = None
+                while self._queue:
+                    seq, candidate = self._queue.popleft()
+                    if self._free.get(candidate) == seq:
+                        del self._free[candidate]
+                        obj = candidate
+                        break
+                if obj is None:
+                    self.exhausted += 1
+                    return None
+            self._use(obj)
+            return obj
+        finally:
+            self._lock.release()
+
+    def get_stats(self):
+        """
+        Returns dictionary of the pool occupancy: free, used, total, peak_used, allocations
+        and exhausted (requests made while no object was free)
+        """
+        self._lock.acquire()
+        try:
+            return { 'free' : len(self._free),
+                     'used' : len(self._used),
+                     'total' : len(self._free) + len(self._used),
+                     'peak_used' : self.peak_used,
+                     'allocations' : self.allocations,
+                     'exhausted' : self.exhausted }
+        finally:
+            self._lock.release()
+
+    def __len__(self):
+        return len(self._free) + len(self._used)
+
+
+class LockOrderError(Exception):
+    pass
+
+
+class LockOrder(object):
+    """
+    Levels of the ordered locks of the MSDD devices. A thread takes locks in increasing
+    (level, key) order and may skip levels, locks of the same level are ordered by their key
+    (the tuner locks by tuner number).
+
+    BULK_ALLOCATION - one group allocation or deallocation at a time
+    ALLOCATIONS     - allocation maps (read/write): allocation ids and tuner allocation
+                      state. Held for write by allocations, deallocations and to store
+                      refreshed tuner status, for read by the tuner settings
+    TUNER           - settings and frontend_tuner_status entry of one tuner, taken while
+                      holding ALLOCATIONS for read (a writer owns every tuner), or alone by an
+                      allocation tuning its claimed tuner and by tuner status reads
+    RESOURCES       - resources shared by the receivers of a radio: output, software DDC and
+                      FFT module pools, stream router links and network output rate
+    STATUS          - msdd_status, CPU load and time of day
+    TRACKING        - dirty tuner tracking, claimed tuners and status snapshots, never held while
+                      waiting on the radio
+
+    The internal locks of the connection, query caches, object pools and tuner index are
+    below every level, they are never held while taking an ordered lock.
+    """
+    BULK_ALLOCATION=10
+    ALLOCATIONS=20
+    TUNER=30
+    RESOURCES=40
+    STATUS=50
+    TRACKING=60
+
+
+class LockMonitor(object):
+    """
+    Debug deadlock detector for OrderedLock and ReadWriteLock. When enabled, the locks each
+    thread holds are tracked and the monitor reports:
+      - lock order violations, a thread taking a lock that is not ordered after every lock
+        it holds (see LockOrder)
+      - waits longer than wait_timeout, with the threads holding the lock and the locks they hold
+
+    Attributes:
+    ----------
+    enabled : track held locks and report, adds a dictionary update to each acquire and
+              blocked threads poll for the lock
+    wait_timeout : seconds a thread waits for a lock before the wait is reported
+    strict : raise LockOrderError on an order violation instead of only reporting it
+    report : callable receiving each report message, reports are printed to stderr when None
+    violations : number of lock order violations
+    long_waits : number of waits longer than wait_timeout
+    """
+    def __init__(self, enabled=False, wait_timeout=5.0):
+        self._lock=threading.Lock()
+        self._held={}               # thread to locks held, in the order acquired
+        self.enabled=enabled
+        self.wait_timeout=wait_timeout
+        self.strict=False
+        self.report=None
+        self.violations=0
+        self.long_waits=0
+
+    def _report(self, msg):
+        if self.report:
+            try:
+                self.report(msg)
+                return
+            except:
+                pass
+        print >>sys.stderr, msg
+
+    def get_held(self, thread=None):
+        """
+        Returns list of the locks held by thread (default the calling thread), in the order acquired
+        """
+        if thread is None:
+            thread=threading.current_thread()
+        self._lock.acquire()
+        try:
+            return list(self._held.get(thread, ()))
+        finally:
+            self._lock.release()
+
+    def check_order(self, lock):
+        """
+        Called before the calling thread waits for lock, reports taking lock while holding a
+        lock ordered at or after it
+        """
+        later=[ x for x in self.get_held() if x is not lock and x.order >= lock.order ]
+        if not later:
+            return
+        self._lock.acquire()
+        try:
+            self.violations+=1
+        finally:
+            self._lock.release()
+        msg="Lock order violation, thread {} taking {} while holding {}\n{}".format(threading.current_thread().name,
+                                                                                   lock,
+                                                                                   ", ".join([ str(x) for x in later ]),
+                                                                                   "".join(traceback.format_stack()[:-2]))
+        self._report(msg)
+        if self.strict:
+            raise LockOrderError(msg)
+
+    def waiting(self, lock, waited):
+        """
+        Called when the calling thread has waited waited seconds for lock, reports the threads
+        holding lock and the locks they hold
+        """
+        me=threading.current_thread()
+        holders=[]
+        self._lock.acquire()
+        try:
+            self.long_waits+=1
+            for thread, locks in self._held.items():
+                if thread is not me and lock in locks:
+                    holders.append("{} holding [{}]".format(thread.name, ", ".join([ str(x) for x in locks ])))
+            mine=self._held.get(me, ())
+        finally:
+            self._lock.release()
+        self._report("Possible deadlock, thread {} waited {:.1f} seconds for {} while holding [{}], held by: {}".format(me.name,
+                                                                                                               waited,
+                                                                                                               lock,
+                                                                                                               ", ".join([ str(x) for x in mine ]),
+                                                                                                               "; ".join(holders) or "unknown"))
+
+    def acquired(self, lock):
+        thread=threading.current_thread()
+        self._lock.acquire()
+        try:
+            self._held.setdefault(thread, []).append(lock)
+        finally:
+            self._lock.release()
+
+    def released(self, lock):
+        thread=threading.current_thread()
+        self._lock.acquire()
+        try:
+            locks=self._held.get(thread)
+            if not locks:
+                return
+            for idx in range(len(locks)-1, -1, -1):
+                if locks[idx] is lock:
+                    del locks[idx]
+                    break
+            if not locks:
+                del self._held[thread]
+        finally:
+            self._lock.release()
+
+    def get_stats(self):
+        self._lock.acquire()
+        try:
+            return { 'enabled' : self.enabled,
+                     'violations' : self.violations,
+                     'long_waits' : self.long_waits,
+                     'threads' : len(self._held) }
+        finally:
+            self._lock.release()
+
+# lock monitor of the process, enabled by the advanced::lock_debug property of the devices
+lock_monitor=LockMonitor()
+
+
+class OrderedLock(object):
+    """
+    threading.Lock with a position (level, key) in the lock order, see LockOrder. The order
+    is checked by the LockMonitor when it is enabled.
+    """
+    def __init__(self, name, level, key=0, monitor=None):
+        self._lock=threading.Lock()
+        self.name=name
+        self.order=(level, key)
+        self.monitor=monitor
+        if monitor is None:
+            self.monitor=lock_monitor
+
+    def acquire(self, blocking=True):
+        monitor=self.monitor
+        if not monitor.enabled:
+            return self._lock.acquire(blocking)
+        monitor.check_order(self)
+        if not self._lock.acquire(False):
+            if not blocking:
+                return False
+            # poll so a long wait can be reported
+            _stime=time.time()
+            reported=False
+            delay=0.0005
+            while not self._lock.acquire(False):
+                if not reported and time.time()-_stime > monitor.wait_timeout:
+                    monitor.waiting(self, time.time()-_stime)
+                    reported=True
+                time.sleep(delay)
+                delay=min(delay*2, 0.05)
+        monitor.acquired(self)
+        return True
+
+    def release(self):
+        self.monitor.released(self)
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __str__(self):
+        return "{}({}:{})".format(self.name, self.order[0], self.order[1])
+
+
+class ReadWriteLock(object):
+    """
+    Lock with shared (read) and exclusive (write) holders at one level of the lock order.
+    Waiting writers are served before new readers so readers can not starve them.
+
+    acquire and release take the lock for write so it can replace a threading.Lock. The thread
+    holding the write lock can take it again and can take the read lock. A thread holding
+    only the read lock can not take the write lock (it would wait on itself), acquire raises
+    LockOrderError instead of blocking.
+    """
+    def __init__(self, name, level, monitor=None):
+        self._cond=threading.Condition(threading.Lock())
+        self._readers={}            # thread to read count
+        self._writer=None
+        self._writes=0
+        self._waiting_writers=0
+        self.name=name
+        self.order=(level, 0)
+        self.monitor=monitor
+        if monitor is None:
+            self.monitor=lock_monitor
+
+    def _wait(self, ready, enabled):
+        _stime=time.time()
+        reported=False
+        while not ready():
+            if not enabled:
+                self._cond.wait()
+                continue
+            self._cond.wait(0.05)
+            if not reported and time.time()-_stime > self.monitor.wait_timeout:
+                self.monitor.waiting(self, time.time()-_stime)
+                reported=True
+
+    def acquire(self, blocking=True):
+        """
+        Take the lock for write
+        """
+        me=threading.current_thread()
+        enabled=self.monitor.enabled
+        self._cond.acquire()
+        try:
+            if self._writer is me:
+                self._writes+=1
+                return True
+            ready=lambda : self._writer is None and len(self._readers) == 0
+            if not ready():
+                if not blocking:
+                    return False
+                if self._readers.has_key(me):
+                    raise LockOrderError("Thread {} holds {} for read and can not take it for write".format(me.name, self))
+            if enabled:
+                self.monitor.check_order(self)
+            self._waiting_writers+=1
+            try:
+                self._wait(ready, enabled)
+            finally:
+                self._waiting_writers-=1
+            self._writer=me
+            self._writes=1
+        finally:
+            self._cond.release()
+        if enabled:
+            self.monitor.acquired(self)
+        return True
+
+    def release(self):
+        """
+        Release the lock held for write
+        """
+        self._cond.acquire()
+        try:
+            if self._writer is not threading.current_thread():
+                raise RuntimeError("release of {} not held for write".format(self))
+            self._writes-=1
+            if self._writes > 0:
+                return
+            self._writer=None
+            self._cond.notify_all()
+        finally:
+            self._cond.release()
+        self.monitor.released(self)
+
+    def acquire_read(self, blocking=True):
+        """
+        Take the lock for read
+        """
+        me=threading.current_thread()
+        enabled=self.monitor.enabled
+        self._cond.acquire()
+        try:
+            count=self._readers.get(me, 0)
+            if count or self._writer is me:
+                # nested read, or read while holding the lock for write
+                self._readers[me]=count+1
+                return True
+            ready=lambda : self._writer is None and self._waiting_writers == 0
+            if not ready() and not blocking:
+                return False
+            if enabled:
+                self.monitor.check_order(self)
+            self._wait(ready, enabled)
+            self._readers[me]=1
+        finally:
+            self._cond.release()
+        if enabled:
+            self.monitor.acquired(self)
+        return True
+
+    def release_read(self):
+        """
+        Release the lock held for read
+        """
+        me=threading.current_thread()
+        self._cond.acquire()
+        try:
+            count=self._readers.get(me, 0)
+            if count <= 0:
+                raise RuntimeError("release of {} not held for read".format(self))
+            if count > 1:
+                self._readers[me]=count-1
+                return
+            del self._readers[me]
+            if self._writer is me:
+                return
+            self._cond.notify_all()
+        finally:
+            self._cond.release()
+        self.monitor.released(self)
 
-    def is_used(self, obj):
-        if obj == None:
-            return False
+    def get_state(self):
+        """
+        Returns (writer thread name or None, number of reader threads, number of waiting writers)
+        """
+        self._cond.acquire()
         try:
-            idx=self.used_objects.index(obj)
-            return True
-        except:
-            return False
-        
-    def mark_as_used(self, obj):
-        if obj == None:
-            return
-        if self.free_objects.count(obj) <= 0:
-            return 
-        self.free_objects.remove(obj)
-        self.used_objects.append(obj)
+            writer=None
+            if self._writer:
+                writer=self._writer.name
+            return (writer, len(self._readers), self._waiting_writers)
+        finally:
+            self._cond.release()
 
-    def get_used_objects(self):
-        return self.used_objects[:]
-          
-    def get_object(self, obj=None):
-        #ensure that free array is not empty
-        if len(self.free_objects) <= 0:
-            return None
-        
-        # if obj is defined, then remove that specific object or return None. If not defined, then pull any from the list
-        if obj != None:
-            if self.free_objects.count(obj) <= 0:
-                return None
-            self.free_objects.remove(obj)  
-        else:
-            obj = self.free_objects.pop(0)
-            
-        # add to used list  
-        self.used_objects.append(obj)
-        return obj
-        
-            
+    def __str__(self):
+        return "{}({}:{})".format(self.name, self.order[0], self.order[1])
 
 
 class MSDDRadio:
@@ -3468,8 +7064,7 @@ class MSDDRadio:
             self.rx_parent_object = None
             self.rx_child_objects=[]
             self._debug=False
-            self._srates={}
-            self._bw_rates={}
+            self._capabilities=None
             self.fft_channel=None
             
             # cache for status info for quicker response and less radio IO
@@ -3584,9 +7179,8 @@ class MSDDRadio:
                 status.available_gain = self.analog_rx_object.object.available_gain
                 status.input_sample_rate = self.digital_rx_object.object.input_sample_rate
                 status.sample_rate = self.getSampleRate()
-                status.available_sample_rate = create_csv(self.getSampleRateLimits())
                 status.bandwidth = self.getBandwidth_Hz()
-                status.available_bandwidth = create_csv(self.getBandwidthLimits())
+                self._set_available_limits(status)
                 status.center_frequency = self.getFrequency_Hz()
                 status.available_frequency = self.analog_rx_object.object.available_frequency_hz
                 status.ddc_gain = self.digital_rx_object.object.gain
@@ -3596,6 +7190,7 @@ class MSDDRadio:
                 self._analog_digital_status.center_frequency = self.getFrequency_Hz()
                 self._analog_digital_status.sample_rate = self.getSampleRate()
                 self._analog_digital_status.bandwidth = self.getBandwidth_Hz()
+                self._set_available_limits(self._analog_digital_status)
 
             return self._analog_digital_status
 
@@ -3611,9 +7206,8 @@ class MSDDRadio:
                 status.available_gain = self.digital_rx_object.object.available_gain
                 status.input_sample_rate = self.digital_rx_object.object.input_sample_rate
                 status.sample_rate = self.getSampleRate()
-                status.available_sample_rate = create_csv(self.getSampleRateLimits())
                 status.bandwidth = self.getBandwidth_Hz()
-                status.available_bandwidth = create_csv(self.getBandwidthLimits())
+                self._set_available_limits(status)
                 status.center_frequency = self.getFrequency_Hz()
                 status.available_frequency = self.digital_rx_object.object.available_frequency_hz
                 status.ddc_gain = self.digital_rx_object.object.gain
@@ -3623,11 +7217,26 @@ class MSDDRadio:
                 self._digital_status.center_frequency = self.getFrequency_Hz()
                 self._digital_status.sample_rate = self.getSampleRate()
                 self._digital_status.bandwidth = self.getBandwidth_Hz()
+                self._set_available_limits(self._digital_status)
 
             return self._digital_status
 
             return status
 
+        def _set_available_limits(self, status):
+            """
+            Fill in the available sample rates and bandwidths of a status from the capability
+            table.  Reading the status does not build the table, the lists stay empty until
+            the table is built by the first allocation on the channel.
+            """
+            caps=self._capabilities
+            if caps is None:
+                status.available_sample_rate = ""
+                status.available_bandwidth = ""
+            else:
+                status.available_sample_rate = create_csv(caps.sample_rates)
+                status.available_bandwidth = create_csv(caps.bandwidths)
+
         def getStatus(self):
             if self.is_analog() and not self.is_digital():
                 return self._get_analog_status()
@@ -3792,6 +7401,19 @@ class MSDDRadio:
             if self.digital_rx_object:
                 return self.digital_rx_object.object.get_valid_frequency(if_freq_hz)
 
+        def get_frequency_range(self):
+            """
+            Returns the (minimum, maximum) frequency in hz that get_valid_frequency checks against,
+            the range of a digital tuner moves with the frequency of its parent
+            """
+            if self.analog_rx_object:
+                mod=self.analog_rx_object.object
+            elif self.digital_rx_object:
+                mod=self.digital_rx_object.object
+            else:
+                return None
+            return (mod.min_frequency_hz, mod.max_frequency_hz)
+
         def getFrequency_Hz(self):
             if self.analog_rx_object:
                 return self.analog_rx_object.object.getFrequency_Hz()
@@ -3820,56 +7442,91 @@ class MSDDRadio:
 
             if self.digital_rx_object is None: return success
 
-            # get sample rate cache..
-            self._get_sample_rates()
-
             #  grab sample rate for the input rate
-            if srate in self._srates:
-                if self.digital_rx_object and self._srates[srate][1]:
-                    success=self.digital_rx_object.object.setSampleRate(self._srates[srate][1])
-                if self.swddc_object and self._srates[srate][2]:
-                    success&=self.swddc_object.object.setSampleRate(self._srates[srate][2])
+            settings=self.get_capabilities().get_sample_rate_settings(srate)
+            if settings:
+                if self.digital_rx_object and settings[1]:
+                    success=self.digital_rx_object.object.setSampleRate(settings[1])
+                if self.swddc_object and settings[2]:
+                    success&=self.swddc_object.object.setSampleRate(settings[2])
+                self._invalidate_child_capabilities()
 
             return success
 
         def getSampleRateLimits(self):
-            srates=self._get_sample_rates().keys()
-            srates.sort()
-            return srates
+            return list(self.get_capabilities().sample_rates)
 
-        def _get_sample_rates(self):
-            if len(self._srates) == 0:
-                srates={}
+        def get_capabilities(self):
+            """
+            Returns the CapabilityTable for this channel, the table is built on first use
+            and again after invalidate_capabilities
+            """
+            caps=self._capabilities
+            if caps is None:
+                caps=self._build_capabilities()
+                self._capabilities=caps
+            return caps
+
+        def invalidate_capabilities(self):
+            """
+            Discard the capability tables for this channel and its child channels
+            """
+            self._capabilities=None
+            self._invalidate_child_capabilities()
+
+        def _invalidate_child_capabilities(self):
+            # our digital tuner feeds the digital tuners of the child channels
+            for child in self.rx_child_objects:
+                child.invalidate_capabilities()
+
+        def _build_capabilities(self):
+            input_rate=None
+            current_srate=None
+            if self.digital_rx_object:
                 try:
-                    if self.digital_rx_object:
-                        hw_ddc_srates = self.digital_rx_object.object.getSampleRateList()
-                        hw_ddc_bw_rates = self.digital_rx_object.object.getBandwidthList_Hz()
-                        # fill out bw list if shorter than srates
-                        if len(hw_ddc_bw_rates) < len(hw_ddc_srates):
-                            hw_ddc_bw_rates = hw_ddc_bw_rates + [ hw_ddc_bw_rates[-1] ]*(len(hw_ddc_srates)-len(hw_ddc_bw_rates))
-                        for n, hw_ddc_srate in zip(range(len(hw_ddc_srates)), hw_ddc_srates):
-                            self.digital_rx_object.object.setSampleRate(hw_ddc_srate)
-                            if self.swddc_object:
-                                sw_ddc_srates = self.swddc_object.object.getSampleRateList()
-                                sw_ddc_bw_rates = self.swddc_object.object.getBandwidthList_Hz()
-                                for i, sw_ddc_srate in zip(range(len(sw_ddc_srates)), sw_ddc_srates):
-                                    bw=min(sw_ddc_bw_rates[i],hw_ddc_bw_rates[n])
-                                    srates[sw_ddc_srate] = ( None, hw_ddc_srate, sw_ddc_srate, bw )
-                            else:
-                                if n >= len(hw_ddc_bw_rates): n=-1
-                                srates[ hw_ddc_srate ] = ( None, hw_ddc_srate, None, hw_ddc_bw_rates[n])
+                    input_rate=self.digital_rx_object.object.getInputSampleRate()
+                    if self.swddc_object:
+                        current_srate=self.digital_rx_object.object.getSampleRate()
+                except:
+                    traceback.print_exc()
+            srates=self._get_sample_rates()
+            bw_rates=self._get_bandwidths()
+            # building the tables steps the digital tuner through its sample rates for the swddc lists
+            if current_srate:
+                try:
+                    self.digital_rx_object.object.setSampleRate(current_srate)
                 except:
                     traceback.print_exc()
-                    srates={}
+            return CapabilityTable(srates, bw_rates, input_rate)
 
-                self._srates=srates
-            return self._srates
+        def _get_sample_rates(self):
+            srates={}
+            try:
+                if self.digital_rx_object:
+                    hw_ddc_srates = self.digital_rx_object.object.getSampleRateList()
+                    hw_ddc_bw_rates = self.digital_rx_object.object.getBandwidthList_Hz()
+                    # fill out bw list if shorter than srates
+                    if len(hw_ddc_bw_rates) < len(hw_ddc_srates):
+                        hw_ddc_bw_rates = hw_ddc_bw_rates + [ hw_ddc_bw_rates[-1] ]*(len(hw_ddc_srates)-len(hw_ddc_bw_rates))
+                    for n, hw_ddc_srate in zip(range(len(hw_ddc_srates)), hw_ddc_srates):
+                        if self.swddc_object:
+                            self.digital_rx_object.object.setSampleRate(hw_ddc_srate)
+                            sw_ddc_srates = self.swddc_object.object.getSampleRateList()
+                            sw_ddc_bw_rates = self.swddc_object.object.getBandwidthList_Hz()
+                            for i, sw_ddc_srate in zip(range(len(sw_ddc_srates)), sw_ddc_srates):
+                                bw=min(sw_ddc_bw_rates[i],hw_ddc_bw_rates[n])
+                                srates[sw_ddc_srate] = ( None, hw_ddc_srate, sw_ddc_srate, bw )
+                        else:
+                            if n >= len(hw_ddc_bw_rates): n=-1
+                            srates[ hw_ddc_srate ] = ( None, hw_ddc_srate, None, hw_ddc_bw_rates[n])
+            except:
+                traceback.print_exc()
+                srates={}
+            return srates
 
 
         def validate_sample_rate(self, srate):
-            srates=self.getSampleRateLimits()
-            srates.sort()
-            return check_value_from_values(srate, srates)
+            return check_value_from_values(srate, self.getSampleRateLimits())
 
         def get_valid_sample_rate(self, srate=None, srate_tolerance=None, return_max=None ):
             """
@@ -3877,12 +7534,10 @@ class MSDDRadio:
             an actual sample rate supported between srate to (srate + (srate*(srate_tolerance/100))) or None
             if srate == None or  <= 0.0 return lowest possible sample rate
             """
-            valid_sr=None
-            srates=self._get_sample_rates().keys()
-            srates.sort()
+            caps=self.get_capabilities()
             if self._debug:
-                print "get_valid_sample_rate, digital rx check srate ", srate, " srate_tol ", srate_tolerance, " sample rates ", srates
-            valid_sr=get_value_valid_list( srate, srate_tolerance, srates, return_max )
+                print "get_valid_sample_rate, digital rx check srate ", srate, " srate_tol ", srate_tolerance, " sample rates ", caps.sample_rates
+            valid_sr=caps.get_valid_sample_rate( srate, srate_tolerance, return_max )
             if self._debug:
                 print "get_valid_sample_rate, digital rx check srate ", srate, " valid sample rate", valid_sr
             return valid_sr
@@ -3896,65 +7551,60 @@ class MSDDRadio:
 
         def setBandwidth_Hz(self, bw_hz ):
             if bw_hz is None: return False
-            self._get_bandwidths()
             success=False
-            if bw_hz in self._bw_rates:
+            settings=self.get_capabilities().get_bandwidth_settings(bw_hz)
+            if settings:
                 success=True
-                if self.analog_rx_object and self._bw_rates[bw_hz][0]:
-                    success&=self.analog_rx_object.object.setBandwidth_Hz(self._bw_rates[bw_hz][0])
-                if self.digital_rx_object and self._bw_rates[bw_hz][1]:
-                    success&=self.digital_rx_object.object.setBandwidth_Hz(self._bw_rates[bw_hz][1])
-                if self.swddc_object and self._bw_rates[bw_hz][2]:
-                    success&=self.swddc_object.object.setBandwidth_Hz(self._bw_rates[bw_hz][2])
+                if self.analog_rx_object and settings[0]:
+                    success&=self.analog_rx_object.object.setBandwidth_Hz(settings[0])
+                if self.digital_rx_object and settings[1]:
+                    success&=self.digital_rx_object.object.setBandwidth_Hz(settings[1])
+                if self.swddc_object and settings[2]:
+                    success&=self.swddc_object.object.setBandwidth_Hz(settings[2])
+                self._invalidate_child_capabilities()
             return success
 
         def getBandwidthLimits(self):
-            bw_rates=self._get_bandwidths().keys()
-            bw_rates.sort()
-            return bw_rates
+            return list(self.get_capabilities().bandwidths)
 
         def _get_bandwidths(self):
-            if len(self._bw_rates) == 0:
-                bw_rates={}
-                try:
-                    analog_bws=[None]
-                    if self.analog_rx_object:
-                        analog_bws = self.analog_rx_object.object.getBandwidthList_Hz()
-                    for analog_bw in analog_bws:
-                        if analog_bw:
-                            self.analog_rx_object.object.setBandwidth_Hz(analog_bw)
-                        if self.digital_rx_object:
-                            # get sample rate and bandwidth list from hw ddc module
-                            hw_ddc_srates = self.digital_rx_object.object.getSampleRateList()
-                            hw_ddc_bw_rates = self.digital_rx_object.object.getBandwidthList_Hz()
-                            # fill out bw list if shorter than srates
-                            if len(hw_ddc_bw_rates) < len(hw_ddc_srates):
-                                hw_ddc_bw_rates = hw_ddc_bw_rates + [ hw_ddc_bw_rates[-1] ]*(len(hw_ddc_srates)-len(hw_ddc_bw_rates))
-                            for n, hw_ddc_bw in zip(range(len(hw_ddc_bw_rates)), hw_ddc_bw_rates):
+            bw_rates={}
+            try:
+                analog_bws=[None]
+                if self.analog_rx_object:
+                    analog_bws = self.analog_rx_object.object.getBandwidthList_Hz()
+                for analog_bw in analog_bws:
+                    if analog_bw:
+                        self.analog_rx_object.object.setBandwidth_Hz(analog_bw)
+                    if self.digital_rx_object:
+                        # get sample rate and bandwidth list from hw ddc module
+                        hw_ddc_srates = self.digital_rx_object.object.getSampleRateList()
+                        hw_ddc_bw_rates = self.digital_rx_object.object.getBandwidthList_Hz()
+                        # fill out bw list if shorter than srates
+                        if len(hw_ddc_bw_rates) < len(hw_ddc_srates):
+                            hw_ddc_bw_rates = hw_ddc_bw_rates + [ hw_ddc_bw_rates[-1] ]*(len(hw_ddc_srates)-len(hw_ddc_bw_rates))
+                        for n, hw_ddc_bw in zip(range(len(hw_ddc_bw_rates)), hw_ddc_bw_rates):
+                            if self.swddc_object:
                                 self.digital_rx_object.object.setSampleRate(hw_ddc_srates[n])
-                                if self.swddc_object:
-                                    sw_ddc_rates = self.swddc_object.object.getSampleRateList()
-                                    sw_ddc_bw_rates = self.swddc_object.object.getBandwidthList_Hz()
-                                    for i, sw_ddc_bw in zip(range(len(sw_ddc_bw_rates)), sw_ddc_bw_rates):
-                                        # choose lowest possible value for srate/bw pair
-                                        srate=min( hw_ddc_srates[n], sw_ddc_rates[i])
-                                        bw=min(hw_ddc_bw, sw_ddc_bw)
-                                        bw_rates[bw] = ( analog_bw, hw_ddc_bw, sw_ddc_bw, srate)
-                                else:
-                                    if n>= len(hw_ddc_srates) : n = -1
-                                    bw_rates[ hw_ddc_bw ] = ( analog_bw, hw_ddc_bw, None, hw_ddc_srates[n])
-                        else:
-                            if analog_bw:
-                                bw_rates[analog_bw] = ( analog_bw, None, None, None)
-                except:
-                    bw_rates={}
-
-                self._bw_rates=bw_rates
-            return self._bw_rates
+                                sw_ddc_rates = self.swddc_object.object.getSampleRateList()
+                                sw_ddc_bw_rates = self.swddc_object.object.getBandwidthList_Hz()
+                                for i, sw_ddc_bw in zip(range(len(sw_ddc_bw_rates)), sw_ddc_bw_rates):
+                                    # choose lowest possible value for srate/bw pair
+                                    srate=min( hw_ddc_srates[n], sw_ddc_rates[i])
+                                    bw=min(hw_ddc_bw, sw_ddc_bw)
+                                    bw_rates[bw] = ( analog_bw, hw_ddc_bw, sw_ddc_bw, srate)
+                            else:
+                                if n>= len(hw_ddc_srates) : n = -1
+                                bw_rates[ hw_ddc_bw ] = ( analog_bw, hw_ddc_bw, None, hw_ddc_srates[n])
+                    else:
+                        if analog_bw:
+                            bw_rates[analog_bw] = ( analog_bw, None, None, None)
+            except:
+                bw_rates={}
+            return bw_rates
 
         def validate_bandwidth(self, bw_hz):
-            bw_list = self.getBandwidthLimits()
-            return check_value_from_values(bw_hz, bw_list)
+            return check_value_from_values(bw_hz, self.getBandwidthLimits())
 
         def get_valid_bandwidth(self, bw_hz=None, bw_tolerance=None, return_max=None):
             """
@@ -3962,12 +7612,10 @@ class MSDDRadio:
             an actual bandwidth supported between bw_hz to (bw_hz + (bw_hz*bw_tolerance/100))) or None
             if bw_hz == None or  <= 0.0 return lowest possible bw_hz
             """
-            valid_bw=None
-            bw_rates=self._get_bandwidths().keys()
-            bw_rates.sort()
+            caps=self.get_capabilities()
             if self._debug:
-                print "get_valid_bandwidth, digital rx check bw ", bw_hz, " bw_tol ", bw_tolerance, " bandwidths ", bw_rates
-            valid_bw=get_value_valid_list( bw_hz, bw_tolerance, bw_rates, return_max )
+                print "get_valid_bandwidth, digital rx check bw ", bw_hz, " bw_tol ", bw_tolerance, " bandwidths ", caps.bandwidths
+            valid_bw=caps.get_valid_bandwidth( bw_hz, bw_tolerance, return_max )
             if self._debug:
                 print "get_valid_bandwidth, digital rx check bw ", bw_hz, " valid bandwidth", valid_bw
             return valid_bw
@@ -3980,11 +7628,7 @@ class MSDDRadio:
             -----------
             srate : sample rate in hz to use for the look up
             """
-            if not len(self._srates): self._get_sample_rates()
-            if srate in self._srates:
-                # the sample rate cache contains the bandwidth setting for a sample rate
-                return self._srates[srate][3]
-            return None
+            return self.get_capabilities().get_bandwidth_for_sample_rate(srate)
 
         def get_sample_rate_for_bandwidth(self, bw ):
             """
@@ -3994,11 +7638,7 @@ class MSDDRadio:
             -----------
             bw : bandwidth in hz to use for the look up
             """
-            if not len(self._bw_rates): x=self._get_bandwidths()
-            if bw in self._bw_rates:
-                # the bandwidth cache contains the sample rate for a specifc bandwidth
-                return self._bw_rates[bw][3]
-            return None
+            return self.get_capabilities().get_sample_rate_for_bandwidth(bw)
 
     class secondary_channel_module(rx_channel):
         """
@@ -4063,74 +7703,52 @@ class MSDDRadio:
                 ret=self.output_object.object.setEnable(enable)
             return ret
 
-        def _get_bandwidths(self):
+        def get_capabilities(self):
             """
-            Get the current set of bandwidths supported by this channel. Since
-            we are secondary channel, then we are tied the parent's current bandwidth
+            Since we are secondary channel, then we are tied to the primary's current sample
+            rate, the table is rebuilt when that rate changes
             """
-            bw_list=[]
-            if self.digital_rx_object:
-                bw_list=self.digital_rx_object.object.getBandwidthList_Hz()[:]
-            return bw_list
-
-        def valid_bandwidth(self, bw_hz):
-            bw_list=self._get_bandwidths()
-            return check_value_from_values(bw_hz, bw_list)
-
-        def get_valid_bandwidth(self, bw_hz=None, bw_tolerance=None, return_max=None):
+            parent_srate=None
+            if self.digital_rx_object and self.primary_channel:
+                parent_srate=self.primary_channel.object.getSampleRate()
+            caps=self._capabilities
+            if caps is None or caps.input_rate != parent_srate:
+                caps=self._build_capabilities(parent_srate)
+                self._capabilities=caps
+            return caps
+
+        def _build_capabilities(self, parent_srate=None):
             """
-            # grab primary's sample rate.. apply swddc decimations
+            grab primary's sample rate.. apply my decimations
             """
-            valid_bw=None
-            bw_list=self._get_bandwidths()
-            if self._debug:
-                print "get_valid_bandwidth,  check bw ", bw_hz, " bw_tol ", bw_tolerance, " bw_list ", bw_list
-            valid_bw = get_value_valid_list( bw_hz, bw_tolerance, bw_list, return_max )
-            return valid_bw
+            srates={}
+            bw_rates={}
+            if parent_srate:
+                dec_list=self.digital_rx_object.object.getDecimationList()
+                if self._debug:
+                    print "get_capabilities, swddc decimation list ", dec_list
+                srate_list=[ parent_srate/x for x in dec_list ]
+                bw_list=self.digital_rx_object.object.getBandwidthList_Hz()
+                for n, srate in enumerate(srate_list):
+                    bw=None
+                    if n < len(bw_list): bw=bw_list[n]
+                    srates[srate]=( None, None, srate, bw )
+                for n, bw in enumerate(bw_list):
+                    srate=None
+                    if n < len(srate_list): srate=srate_list[n]
+                    bw_rates[bw]=( None, None, bw, srate )
+            return CapabilityTable(srates, bw_rates, parent_srate)
+
+        def valid_bandwidth(self, bw_hz):
+            return self.validate_bandwidth(bw_hz)
 
         def setBandwidth_Hz(self, bw ):
             if self.digital_rx_object:
                 return self.digital_rx_object.object.setBandwidth_Hz(bw)
             return False
 
-        def getBandwidthLimits(self):
-            bw_list=self._get_bandwidths()
-            bw_list.sort()
-            return bw_list
-
-        def _get_sample_rates(self):
-            """
-            Get the current set of sample rates supported by this channel. Since
-            we are secondary channel, then we are tied the parent's current sample rate
-            """
-            srate_list=[]
-            if self.digital_rx_object:
-                srate_list=self.digital_rx_object.object.getSampleRateList()[:]
-            return srate_list
-
         def valid_sample_rate(self, srate):
-            srate_list=self._get_sample_rates()[:]
-            return check_value_from_values(srate, srate_list)
-
-        def get_valid_sample_rate(self, srate=None, srate_tolerance=None, return_max=None ):
-            """
-            # grab primary's sample rate.. apply my decimations
-            """
-            valid_sr=None
-            if self.digital_rx_object and self.primary_channel:
-                parent_srate = self.primary_channel.object.getSampleRate()
-                dec_list  = self.digital_rx_object.object.getDecimationList()
-                if self._debug:
-                    print "get_valid_sample_rate, swddc decimation list ", dec_list
-                srate_list = [ parent_srate/x for x in dec_list ]
-                valid_sr = get_value_valid_list( srate, srate_tolerance, srate_list, return_max )
-
-            return valid_sr
-
-        def getSampleRateLimits(self):
-            srate_list=self._get_sample_rates()
-            srate_list.sort()
-            return srate_list
+            return self.validate_sample_rate(srate)
 
         def getSampleRate(self):
             if self.digital_rx_object:
@@ -4202,18 +7820,29 @@ class MSDDRadio:
                  udp_timeout=0.5,
                  enable_fft_channels=False,
                  connection_debug=False,
-                 radio_debug=False
+                 radio_debug=False,
+                 echoless_mode=False,
+                 capture_file=None,
+                 control_sockets=1,
+                 shadow_reconcile_interval=0,
+                 capability_cache_file=None,
+                 startup_profile=None,
+                 verify_flow_graph=False,
+                 breaker_failures=None
     ):
 
-        start_time_total = time.time()
 
         #Set up sockets
         self.radioAddress = (address, int(port))
         # for initial setup we want IO requests to process fast so choose smaller value 
         _timeout=min(udp_timeout,0.5)
-        self.connection = Connection(self.radioAddress,_timeout)
+        self.connection = Connection(self.radioAddress,_timeout,breaker_failures=breaker_failures)
         self.connection._debug=connection_debug
+        self.startup_timing = StartupTiming(self.connection.stats)
+        if capture_file:
+            self.connection.start_capture(capture_file)
         self.enable_fft_channels=enable_fft_channels
+        self.startup_profile=self.get_startup_profile(startup_profile, enable_fft_channels)
         
         #Available Module lists (sorted by installation name)
         self.console_modules = []                           #CON
@@ -4236,9 +7865,30 @@ class MSDDRadio:
 	self._debug=radio_debug
         
         #setup the basic modules    
+        self.startup_timing.start("connect")
         self.console = ConsoleModule(self.connection)       #CON
+        if echoless_mode:
+            # radio may have been left with echo disabled by the last echoless session
+            self.console.resetEcho()
         self.console.echo=True
-        self.stream_router = StreamRouterModule(self.connection)   #SRT
+        if echoless_mode:
+            self.console.echoless_mode=True
+        self.stream_router = StreamRouterModule(self.connection, verify_flow_graph=verify_flow_graph)   #SRT
+
+        # identify the radio and its firmware before using a capability cache
+        self.msdd_id = self.console.ID
+        self.firmware_id = self.get_firmware_id()
+        self.startup_timing.stop()
+        self.capability_cache = None
+        cached_modules = {}
+        self._cached_modules = cached_modules
+        if capability_cache_file:
+            self.startup_timing.start("capability cache")
+            self.capability_cache = CapabilityCache(capability_cache_file)
+            cached_modules = self.capability_cache.load(self.get_radio_identity())
+            self._cached_modules = cached_modules
+            self.import_capability_cache([ self.console, self.stream_router ], cached_modules)
+            self.startup_timing.stop(modules=len(cached_modules))
         
         # Determine mapping version
         mapping_version = 2
@@ -4247,38 +7897,22 @@ class MSDDRadio:
         if m:
             mapping_version = int(m.group(1))
 
-        start_time=time.time()
+        self.startup_timing.start("module discovery")
         # create map of module type to instances, Key: module type, Value: list of all corresponding module instances
-        mod_count=0
-        self.registered_modules={}
-        if self._debug:
-            print "MSDD Application Modules ", self.stream_router.modules
-        for module in self.stream_router.modules:
-            try:
-                reg_name = self.stream_router.getRegistrationName(module)
-                if self.registered_modules.has_key(module):
-                    continue
-                ch_list = self.stream_router.getChannelLimits(reg_name)
-                if self._debug:
-                    print "Module ", reg_name, " channels ", ch_list
-                for channel in ch_list:
-                    mod_count+=1
-                    reg_full = str(reg_name) + ':' + str(channel)
-                    inst_name = self.stream_router.getInstallName(reg_full)
-                    self.registered_modules.setdefault(module,[]).append(self.registered_module(reg_name,inst_name,channel))
-            except:
-               pass
-
-        print "(duration:{:.4f} MSDD Registered module count {} {}".format((time.time()-start_time), mod_count, self.radioAddress)
-        self.msdd_id = self.console.ID
+        self.registered_modules=self.discover_modules()
+        mod_count=sum([ len(x) for x in self.registered_modules.values() ])
+        self.startup_timing.stop(modules=mod_count)
         if self._debug:
             print "Completed building registered module lists for ", self.msdd_id
                 
-        start_time=time.time()
+        self.startup_timing.start("module objects")
         self.fft_object_container = object_container()
         self.spectral_scan_object_container = object_container()
         self.output_object_container = object_container()
         self.swddc_object_container = object_container()
+        # held by the devices of the receivers of this radio while they take modules from the
+        # pools, link them in the stream router and check the network output rate
+        self.resource_lock = OrderedLock("radio resources", LockOrder.RESOURCES)
         
         self.fft_channels_container = object_container()
         self.fft_channels = []
@@ -4297,6 +7931,7 @@ class MSDDRadio:
             self.network_modules.append(obj_mod)
 
         for inst_name,reg_mod_list in self.registered_modules.items():
+            family = self.get_module_family(inst_name)
             for reg_mod in reg_mod_list:
                 try:
                     obj_mod = None
@@ -4304,74 +7939,74 @@ class MSDDRadio:
                         print "MSDD Module type: ", str(reg_mod.installation_name),   \
                         " channel ID: " +  str(reg_mod.registration_name) + ':' +str(reg_mod.channel_number)
                     if inst_name == "CON":
-                        obj= ConsoleModule(self.connection,reg_mod.channel_number,mapping_version)
+                        obj= self._create_module(family,ConsoleModule,reg_mod.channel_number,mapping_version,query_interface=False)
                         obj_mod = self.object_module(reg_mod,obj)
                         self.console_modules.append(obj_mod)
                         break #Do not need more than one console module
                     elif inst_name == "SRT":
-                        obj= StreamRouterModule(self.connection,reg_mod.channel_number,mapping_version)
+                        obj= self._create_module(family,StreamRouterModule,reg_mod.channel_number,mapping_version)
                         obj_mod = self.object_module(reg_mod,obj)
                         self.stream_modules.append(obj_mod)
                     elif inst_name == "BRD":
-                        obj= BoardModule(self.connection,reg_mod.channel_number,mapping_version)
+                        obj= self._create_module(family,BoardModule,reg_mod.channel_number,mapping_version)
                         obj_mod = self.object_module(reg_mod,obj)
                         self.board_modules.append(obj_mod)
                     elif inst_name == "NETWORK":
                         continue
                     elif inst_name == "SWDDCDEC2":
-                        obj= SWDDCModule(self.connection,reg_mod.channel_number,mapping_version)
+                        obj= self._create_module(family,SWDDCModule,reg_mod.channel_number,mapping_version)
                         obj_mod = self.object_module(reg_mod,obj)
                         self.software_ddc_modules.append(obj_mod)
                         self.swddc_object_container.put_object(obj_mod)
                     elif inst_name == "IQB":
-                        obj= IQCircularBufferModule(self.connection,reg_mod.channel_number,mapping_version)
+                        obj= self._create_module(family,IQCircularBufferModule,reg_mod.channel_number,mapping_version)
                         obj_mod = self.object_module(reg_mod,obj)
                         self.iq_circular_buffer_modules.append(obj_mod)
                     elif inst_name == "OUT":
-                        obj= OUTModule(self.connection,reg_mod.channel_number,mapping_version,self.isMultiInterface())
+                        obj= self._create_module(family,OUTModule,reg_mod.channel_number,mapping_version,self.isMultiInterface(),query_interface=False)
                         obj_mod = self.object_module(reg_mod,obj)
                         self.out_modules.append(obj_mod)
                         self.output_object_container.put_object(obj_mod)
                     elif inst_name == "TOD":
-                        obj= TODModule(self.connection,reg_mod.channel_number,mapping_version)
+                        obj= self._create_module(family,TODModule,reg_mod.channel_number,mapping_version)
                         obj_mod = self.object_module(reg_mod,obj)
                         self.tod_modules.append(obj_mod)
                     elif inst_name == "SPC":
-                        obj= SpectralScanModule(self.connection,reg_mod.channel_number,mapping_version)
+                        obj= self._create_module(family,SpectralScanModule,reg_mod.channel_number,mapping_version)
                         obj_mod = self.object_module(reg_mod,obj)
                         self.spectral_scan_modules.append(obj_mod)
                         self.spectral_scan_object_container.put_object(obj_mod)
                     elif inst_name == "FFT":
-                        obj= FFTModule(self.connection,reg_mod.channel_number,mapping_version)
+                        obj= self._create_module(family,FFTModule,reg_mod.channel_number,mapping_version)
                         obj_mod = self.object_module(reg_mod,obj)
                         self.fft_modules.append(obj_mod)
                         self.fft_object_container.put_object(obj_mod)
                     elif inst_name == "LOG":
-                        obj= LOGModule(self.connection,reg_mod.channel_number,mapping_version)
+                        obj= self._create_module(family,LOGModule,reg_mod.channel_number,mapping_version,query_interface=False)
                         obj_mod = self.object_module(reg_mod,obj)
                         self.log_modules.append(obj_mod)
                     elif inst_name == "WBDDC":
-                        obj= WBDDCModule(self.connection,reg_mod.channel_number,mapping_version)
+                        obj= self._create_module(family,WBDDCModule,reg_mod.channel_number,mapping_version)
                         obj_mod = self.object_module(reg_mod,obj)
                         self.wb_ddc_modules.append(obj_mod)
                     elif inst_name == "NBDDC":
-                        obj= NBDDCModule(self.connection,reg_mod.channel_number,mapping_version)
+                        obj= self._create_module(family,NBDDCModule,reg_mod.channel_number,mapping_version)
                         obj_mod = self.object_module(reg_mod,obj)
                         self.nb_ddc_modules.append(obj_mod)
                     elif re.match('MSDR\d{4}', inst_name):
-                        obj= MSDDX000_RcvModule(self.connection,reg_mod.channel_number,mapping_version)
+                        obj= self._create_module(family,MSDDX000_RcvModule,reg_mod.channel_number,mapping_version)
                         obj_mod = self.object_module(reg_mod,obj)
                         self.msdrx000_modules.append(obj_mod)
                     elif inst_name == "MSDR_RS422":
-                        obj= RS422_RcvModule(self.connection,reg_mod.channel_number,mapping_version)
+                        obj= self._create_module(family,RS422_RcvModule,reg_mod.channel_number,mapping_version)
                         obj_mod = self.object_module(reg_mod,obj)
                         self.msdr_rs422_modules.append(obj_mod)
                     elif inst_name == "TFN":
-                        obj= TFNModule(self.connection,reg_mod.channel_number,mapping_version)
+                        obj= self._create_module(family,TFNModule,reg_mod.channel_number,mapping_version)
                         obj_mod = self.object_module(reg_mod,obj)
                         self.tfn_modules.append(obj_mod)
                     elif inst_name == "GPS":
-                        obj= GpsNavModule(self.connection,reg_mod.channel_number,mapping_version)
+                        obj= self._create_module(family,GpsNavModule,reg_mod.channel_number,mapping_version)
                         obj_mod = self.object_module(reg_mod,obj)
                         self.gps_modules.append(obj_mod)
                     
@@ -4381,13 +8016,25 @@ class MSDDRadio:
                 except NotImplementedError:
                     pass
 
-        print "(duration:{:.4f} MSDD Created individual modules for radio {}".format((time.time()-start_time),self.radioAddress)
-
-        start_time=time.time()
+        # lazy modules import their entries when they are created
+        self.import_capability_cache([ obj_mod.object for obj_mod in self.network_modules ] +
+                                     [ obj_mod.object for obj_mod in self.module_dict.values()
+                                       if not isinstance(obj_mod.object, LazyModule) ],
+                                     cached_modules)
+        baseIPPModule.query_interfaces([ obj_mod.object for obj_mod in self.console_modules + self.log_modules + self.out_modules
+                                         if not isinstance(obj_mod.object, LazyModule) ])
+        self.startup_timing.stop(modules=len(self.module_dict),
+                                 lazy=len([ x for x in self.module_dict.values() if isinstance(x.object, LazyModule) ]))
+
+        self.startup_timing.start("flow graph")
+        self.stream_router.loadFlowGraph(sorted(self.module_dict.keys()))
+        self.startup_timing.stop(links=len(self.stream_router.flow_graph))
+
+        self.startup_timing.start("unlink spc modules")
         for mod in self.spectral_scan_modules:
             mod.object._setEnable(False)
             self.stream_router.unlinkModule(mod.channel_id())            
-        print "(duration:{:.4f} MSDD Unlinked SPC modules for radio {}".format((time.time()-start_time),self.radioAddress)
+        self.startup_timing.stop(modules=len(self.spectral_scan_modules))
 
 
         #
@@ -4397,7 +8044,7 @@ class MSDDRadio:
         #
         # generate channels for RCV modules and find its associated WBDDC module
         #
-        start_time=time.time()
+        self.startup_timing.start("rcv channels")
         for mod in self.msdrx000_modules + self.msdr_rs422_modules:
             rx_mod = self.rx_channel(self,mod,len(self.rx_channels),True,self.MSDDRXTYPE_ANALOG_RX)
             rx_mod.analog_rx_object = mod
@@ -4417,12 +8064,12 @@ class MSDDRadio:
             self.output_object_container.mark_as_used(rx_mod.output_object)
             self.save_active_output_modules(rx_mod.output_object)
             self.rx_channels.append(rx_mod)
-        print "(duration:{:.4f} MSDD Finished RCV-WBDDC channels, added {} RX channels for radio {}".format((time.time()-start_time), len(self.rx_channels), self.radioAddress)
+        self.startup_timing.stop(channels=len(self.rx_channels))
 
         #
         # generate channels for NBDDC modules and check for swddc module and output modules
         #
-        start_time=time.time()
+        self.startup_timing.start("nbddc channels")
         for mod in self.nb_ddc_modules:
             rx_mod = self.rx_channel(self,mod,len(self.rx_channels), True, self.MSDDRXTYPE_HW_DDC)
             rx_mod.digital_rx_object = mod
@@ -4443,7 +8090,7 @@ class MSDDRadio:
             self.save_active_output_modules(rx_mod.output_object)
             self.swddc_object_container.mark_as_used(rx_mod.swddc_object)
             self.rx_channels.append(rx_mod)
-        print "(duration:{:.4f} MSDD Finished NBDDC channels, added {}  RX channels for radio {}".format((time.time()-start_time), len(self.nb_ddc_modules), self.radioAddress)
+        self.startup_timing.stop(channels=len(self.nb_ddc_modules))
 
         #
         # Enable FFT (Spectral output) for RX Channels
@@ -4451,7 +8098,7 @@ class MSDDRadio:
         if enable_fft_channels:
             if self._debug:
                 print "MSDD Creating FFT channels ", len(self.fft_modules)
-            start_time=time.time()
+            self.startup_timing.start("fft channels")
             # create fft channels
             for fft_mod in self.fft_modules:
                 fft_mod.object._setEnable(False)
@@ -4475,9 +8122,9 @@ class MSDDRadio:
                 fft_ch=self.fft_channel( fft, output, self.stream_router, link_output )
                 self.fft_channels.append(fft_ch)
                 self.fft_channels_container.put_object(fft_ch)
-            print "(duration:{:.4f} Created {} FFT Channels for radio {}".format((time.time()-start_time), len(self.fft_channels), self.radioAddress)
+            self.startup_timing.stop(channels=len(self.fft_channels))
 
-        start_time=time.time()
+        self.startup_timing.start("reverse lookup")
 
         #
         # Create reverse lookup tables based on msdd channel id values to rx_channel numbers
@@ -4486,9 +8133,9 @@ class MSDDRadio:
             if self._debug:
                 print "update Channel ", rx_channel.msdd_channel_id()
             self.update_rx_channel_mapping( rx_channel, rx_pos)
-        print "(duration:{:.4f} MSDD Build reverse lookup, msdd mod->rx_channel {} {}".format((time.time()-start_time), len(self.msdd_channel_to_rx_channel), self.radioAddress)
+        self.startup_timing.stop(entries=len(self.msdd_channel_to_rx_channel))
 
-        start_time=time.time()
+        self.startup_timing.start("tuner hierarchy")
         # CREATE PARENT CHILD MAPPING FOR TUNERS
         for rx_pos, rx_channel in zip(range(len(self.rx_channels)), self.rx_channels):
             rx_channel.rx_child_objects=[]
@@ -4516,27 +8163,345 @@ class MSDDRadio:
                         # skip over modules that are not part of our lookup index
                         pass
 
-        print "(duration:{:.4f} MSDD Find tuner parent/child relationships for radio {}".format((time.time()-start_time),self.radioAddress)
-        print time.ctime(), "Finished (duration:{:.4f} setting up MSDD {} connection {} RX CHANNELS {} FFT CHANNELS {}".format((time.time()-start_time_total), 
-                                                                                                                               self.msdd_id , 
-                                                                                                                               self.radioAddress, 
-                                                                                                                               len(self.rx_channels), 
-                                                                                                                               len(self.fft_channels))
+        self.startup_timing.stop()
+
+        if self.capability_cache and not self.capability_cache.loaded:
+            self.startup_timing.start("save capability cache")
+            self.save_capability_cache()
+            self.startup_timing.stop()
+
+        #
+        # Spread receiver control traffic over a pool of connections
+        #
+        self.startup_timing.start("connection pool")
+        self.connection_pool = ConnectionPool(self.connection, control_sockets)
+        if len(self.connection_pool) > 1:
+            self.assign_rx_channel_connections()
+        self.startup_timing.stop(connections=len(self.connection_pool),
+                                 groups=len(self.connection_pool.get_assignments()))
+        self.startup_timing.finish()
 
         # we are all done now set the timeout to what the caller requested
-        self.connection.set_timeout(udp_timeout)
+        self.connection_pool.set_timeout(udp_timeout)
+
+        self.shadow_mismatches = 0
+        self._reconcile_event = threading.Event()
+        self._reconcile_thread = None
+        if shadow_reconcile_interval > 0:
+            self.start_shadow_reconcile(shadow_reconcile_interval)
+
+
+    def assign_rx_channel_connections(self):
+        """
+        Bind the modules of each rx_channel to a connection from the pool. rx_channels with the
+        same root parent tuner (i.e. a receiver and its DDCs) share a connection, so commands for
+        a receiver stay in order while different receivers are controlled in parallel.
+        """
+        for rx_chan in self.rx_channels:
+            group = self.get_root_parent(rx_chan).msdd_channel_id()
+            for mod in [ rx_chan.analog_rx_object, rx_chan.digital_rx_object, rx_chan.swddc_object, rx_chan.output_object ]:
+                if mod:
+                    self.connection_pool.assign(mod.object, group)
 
 
     def isMultiInterface(self):
         return len(self.network_modules) > 1
 
 
+    FIRMWARE_CFG=['FILE_NAME_FPGA', 'FILE_NAME_APP', 'FILE_NAME_BATCH']
+
+    def get_firmware_id(self):
+        """
+        Returns the firmware files loaded on the radio, always queries the radio
+        """
+        cfg = self.console.getCfgList(self.FIRMWARE_CFG)
+        return tuple([ cfg[name][0] for name in self.FIRMWARE_CFG ])
+
+    # module families created at startup when startup_profile is 'auto', the
+    # others (OUT, SWDDCDEC2, LOG, IQB, TFN, GPS, ...) are created on first use
+    STARTUP_PROFILE=['CON', 'SRT', 'BRD', 'TOD', 'MSDR', 'MSDR_RS422', 'WBDDC', 'NBDDC', 'SPC']
+
+    def get_startup_profile(self, startup_profile, enable_fft_channels=False):
+        """
+        Returns the list of module families to create at startup, or None to create all
+        of them.
+
+        Parameters:
+        -----------
+        startup_profile : None or empty to create all modules at startup, 'auto' for
+                          STARTUP_PROFILE (plus FFT when FFT channels are enabled), or a
+                          list or comma separated string of module families
+        """
+        if not startup_profile:
+            return None
+        if type(startup_profile) in (str, unicode):
+            if startup_profile.strip().lower() == 'auto':
+                profile = self.STARTUP_PROFILE[:]
+                if enable_fft_channels:
+                    profile.append('FFT')
+                return profile
+            startup_profile = startup_profile.split(',')
+        return [ str(x).strip().upper() for x in startup_profile if str(x).strip() ]
+
+    def get_module_family(self, inst_name):
+        """
+        Returns the module family of an installed module name, MSDRxxxx receivers are MSDR
+        """
+        if re.match('MSDR\d{4}', inst_name):
+            return 'MSDR'
+        return inst_name
+
+    def _create_module(self, family, module_class, channel_number, mapping_version, *args, **kwargs):
+        """
+        Create a module object, or a LazyModule when the family is not in the startup profile
+        """
+        # the console and stream router are always needed
+        if self.startup_profile is None or family in self.startup_profile or family in ('CON', 'SRT'):
+            return module_class(self.connection, channel_number, mapping_version, *args, **kwargs)
+        # lazy modules query their own interface when they are created
+        kwargs.pop('query_interface', None)
+        return LazyModule(module_class, self.connection, channel_number, mapping_version,
+                          args, kwargs, self._module_created)
+
+    def _module_created(self, module):
+        self.import_capability_cache([ module ], self._cached_modules)
+
+    def discover_modules(self):
+        """
+        Query the stream router for the modules registered on the radio. The registration
+        names, channel limits and install names are each queried as one pipelined batch.
+
+        Returns:
+        --------
+        dictionary of module name to list of registered_module
+        """
+        modules=[]
+        for module in self.stream_router.modules:
+            if module not in modules:
+                modules.append(module)
+        if self._debug:
+            print "MSDD Application Modules ", modules
+        reg_names=self.stream_router.getRegistrationNames(modules)
+        module_names=[]
+        for module in modules:
+            if module in reg_names and reg_names[module] not in module_names:
+                module_names.append(reg_names[module])
+        channels=self.stream_router.getChannelLimitsList(module_names)
+        reg_fulls=[]
+        for reg_name in module_names:
+            if self._debug:
+                print "Module ", reg_name, " channels ", channels.get(reg_name)
+            for channel in channels.get(reg_name, []):
+                reg_fulls.append(str(reg_name) + ':' + str(channel))
+        inst_names=self.stream_router.getInstallNames(reg_fulls)
+
+        registered_modules={}
+        for module in modules:
+            reg_name=reg_names.get(module)
+            if reg_name is None:
+                continue
+            for channel in channels.get(reg_name, []):
+                inst_name=inst_names.get(str(reg_name) + ':' + str(channel))
+                if inst_name is None:
+                    continue
+                registered_modules.setdefault(module,[]).append(self.registered_module(reg_name,inst_name,channel))
+        return registered_modules
+
+    def get_startup_timing(self):
+        """
+        Returns list of dictionaries with phase, duration, commands and details for each
+        phase of the startup, see StartupTiming
+        """
+        return [ dict(phase) for phase in self.startup_timing.phases ]
+
+    def get_radio_identity(self):
+        """
+        Returns the identity of the radio used for the capability cache, the
+        (model, serial, software part number) and the firmware files loaded at startup
+        """
+        return tuple(self.msdd_id) + tuple(self.firmware_id)
+
+    def import_capability_cache(self, modules, cached_modules):
+        """
+        Preload the query caches of the modules with the results from a capability cache file
+        """
+        for mod in modules:
+            entries = cached_modules.get(mod.get_full_reg_name())
+            if entries:
+                mod.import_query_cache(entries)
+
+    def save_capability_cache(self):
+        """
+        Write the static query results of all modules to the capability cache file, returns
+        True if the file was written
+        """
+        if self.capability_cache is None:
+            return False
+        modules = {}
+        for mod in self.get_modules():
+            # the console is listed twice, keep one result for each query
+            entries = modules.setdefault(mod.get_full_reg_name(), {})
+            for query_id, args, value in mod.export_query_cache():
+                entries[(query_id, args)] = (query_id, args, value)
+        return self.capability_cache.save(self.get_radio_identity(),
+                                          dict([ (name, entries.values()) for name, entries in modules.items() ]))
+
+    def check_firmware(self):
+        """
+        Compare the firmware files loaded on the radio to the files at startup, the cached
+        query results of all modules are invalidated when they differ.
+
+        Returns True if the firmware changed
+        """
+        firmware_id = self.get_firmware_id()
+        if firmware_id == self.firmware_id:
+            return False
+        print "MSDD firmware changed from {} to {} for radio {}, invalidating cached queries".format(self.firmware_id,
+                                                                                                   firmware_id,
+                                                                                                   self.radioAddress)
+        self.firmware_id = firmware_id
+        self.invalidate_caches()
+        return True
+
+    def invalidate_caches(self):
+        """
+        Mark the cached query results of all modules and the receiver channel
+        sample rate/bandwidth tables as stale
+        """
+        self.connection_pool.invalidate_caches()
+        for rx_channel in self.rx_channels:
+            rx_channel.invalidate_capabilities()
+
+    def get_modules(self):
+        """
+        Returns list of all module objects of the radio, modules that are created on first
+        use are only included once they are created
+        """
+        modules = [ self.console, self.stream_router ]
+        modules += [ obj_mod.object for obj_mod in self.network_modules ]
+        for obj_mod in self.module_dict.values():
+            mod = obj_mod.object
+            if isinstance(mod, LazyModule):
+                mod = mod.created_module()
+            if mod is not None:
+                modules.append(mod)
+        return modules
+
+    def get_pool_stats(self):
+        """
+        Returns dictionary of pool name to the occupancy of the output, software DDC, FFT,
+        spectral scan and FFT channel pools, see object_container.get_stats
+        """
+        return { 'output' : self.output_object_container.get_stats(),
+                 'swddc' : self.swddc_object_container.get_stats(),
+                 'fft' : self.fft_object_container.get_stats(),
+                 'spectral_scan' : self.spectral_scan_object_container.get_stats(),
+                 'fft_channels' : self.fft_channels_container.get_stats() }
+
+    def get_query_cache_stats(self):
+        """
+        Returns list of dictionaries with name, policy, hits, misses and hit_rate of each
+        cached query, combined over all the modules of the radio
+        """
+        totals = {}
+        for mod in self.get_modules():
+            for stat in mod.getQueryCacheStats():
+                total = totals.setdefault((mod.__class__.__name__, stat['name']),
+                                          { 'name' : mod.__class__.__name__ + '.' + stat['name'],
+                                            'policy' : stat['policy'],
+                                            'hits' : 0,
+                                            'misses' : 0 })
+                total['hits'] += stat['hits']
+                total['misses'] += stat['misses']
+        stats = []
+        for key in sorted(totals):
+            total = totals[key]
+            calls = total['hits'] + total['misses']
+            total['hit_rate'] = float(total['hits'])/calls if calls else 0.0
+            stats.append(total)
+        return stats
+
+    def reset_query_cache_stats(self):
+        for mod in self.get_modules():
+            mod.query_cache.reset_stats()
+
+    def refresh(self):
+        """
+        Discard the shadow register values of all modules, the next status update queries the radio
+        """
+        for mod in self.get_modules():
+            mod.refresh()
+
+    def get_status_epoch(self):
+        """
+        Returns a value that changes when the register values known to the controller may no
+        longer match the radio: the caches were invalidated, shadow values were dropped after a
+        failed command, or reconcile_shadow found registers changed outside of the controller
+        """
+        return (tuple([ (conn.cache_epoch, conn.shadow_epoch) for conn in self.connection_pool.connections ]),
+                self.shadow_mismatches)
+
+    def reconcile_shadow(self):
+        """
+        Re-read the shadowed registers of all modules from the radio, registers that were
+        changed outside of this controller are logged and counted in shadow_mismatches
+
+        Returns:
+        --------
+        number of registers that differed from their shadow value
+        """
+        count = 0
+        for mod in self.get_modules():
+            try:
+                mismatches = mod.reconcile_shadow()
+            except (ConnectionFailure, CommandException):
+                # shadow values are dropped on failures, retry on the next pass
+                continue
+            for name, shadow, actual in mismatches:
+                print "MSDD shadow register mismatch {} {} shadow {} radio {} for radio {}".format(mod.get_full_reg_name(),
+                                                                                                name, shadow, actual,
+                                                                                                self.radioAddress)
+            count += len(mismatches)
+        self.shadow_mismatches += count
+        return count
+
+    def start_shadow_reconcile(self, interval):
+        """
+        Start a background thread that calls reconcile_shadow every interval seconds
+        """
+        if self._reconcile_thread:
+            return
+        self._reconcile_event.clear()
+        self._reconcile_thread = threading.Thread(target=self._reconcile_loop,
+                                                  args=(interval,),
+                                                  name="MSDD-RECONCILE-{0}:{1}".format(*self.radioAddress))
+        self._reconcile_thread.setDaemon(True)
+        self._reconcile_thread.start()
+
+    def stop_shadow_reconcile(self):
+        if self._reconcile_thread is None:
+            return
+        self._reconcile_event.set()
+        self._reconcile_thread.join()
+        self._reconcile_thread = None
+
+    def _reconcile_loop(self, interval):
+        while not self._reconcile_event.is_set():
+            self._reconcile_event.wait(interval)
+            if self._reconcile_event.is_set():
+                break
+            try:
+                self.reconcile_shadow()
+            except:
+                traceback.print_exc()
+
+
     #
     # Perform unlinking of SWDDCS to removed load from DSP chip
     #
     def unlink_swddc_modules(self):
         time.sleep(.5)
-        start_time=time.time()
+        self.startup_timing.start("unlink swddc modules")
         for mod in self.software_ddc_modules:
             if self._debug:
                 print "Found a sw_ddc module unlink ", mod.object.full_reg_name, " channel id ", mod.channel_id()
@@ -4548,7 +8513,7 @@ class MSDDRadio:
                 if self._debug:
                     print "found output for swddc ", mod.channel_id(), " output ", output.channel_id()
                 self.stream_router.unlinkModule(output.channel_id())
-        print "(duration:{:.4f} MSDD Cleaning up SWDDC Modules (post) {}".format((time.time()-start_time),self.radioAddress)
+        self.startup_timing.stop(modules=len(self.software_ddc_modules))
 
 
     #
@@ -4583,6 +8548,32 @@ class MSDDRadio:
             self.fullRegName_to_RxChanNum[rx_chan_mod.spectral_scan_object.object.full_reg_name] = position
             self.msdd_channel_to_rx_channel[rx_chan_mod.spectral_scan_object.object.full_reg_name] = rx_chan_mod
 
+    def build_capability_tables(self):
+        """
+        Build the sample rate/bandwidth tables for all the receiver channels, parent
+        channels are built before their children.  The tables are otherwise built on
+        first use by an allocation, building them steps the digital tuners through their
+        decimations and bandwidths on the radio.
+        """
+        for rx_channel in sorted(self.rx_channels, key=self.get_tuner_depth):
+            rx_channel.invalidate_capabilities()
+        for rx_channel in sorted(self.rx_channels, key=self.get_tuner_depth):
+            try:
+                rx_channel.get_capabilities()
+            except:
+                traceback.print_exc()
+
+    def get_tuner_depth(self, rx_chan_mod):
+        """
+        Number of parent tuners above a receiver channel
+        """
+        depth=0
+        parent=rx_chan_mod.rx_parent_object
+        while parent is not None and depth <= len(self.rx_channels):
+            depth+=1
+            parent=parent.rx_parent_object
+        return depth
+
     def add_child_tuner(self, parent, child):
         if child.digital_rx_object == None or parent.digital_rx_object == None:
             return False
@@ -4590,6 +8581,7 @@ class MSDDRadio:
             child.rx_parent_object.rx_child_objects.remove(child)
         child.rx_parent_object = parent
         parent.rx_child_objects.append(child)
+        child.invalidate_capabilities()
         
         child_reg_name = child.digital_rx_object.object.full_reg_name
         parent_reg_name = parent.digital_rx_object.object.full_reg_name
@@ -4701,6 +8693,16 @@ class MSDDRadio:
             return ""
         return ""
 
+    def verify_flow_graph(self):
+        """
+        Compare the stream router flow graph with the links on the radio and correct it
+
+        Returns:
+        --------
+        list of (module, graph destinations, radio destinations) that differed
+        """
+        return self.stream_router.verifyFlowGraph()
+
     def get_timeofday_module(self, idx=0 ):
         ret=None
         try:
@@ -4712,6 +8714,70 @@ class MSDDRadio:
     def get_active_output_modules(self):
         return self.active_output_modules[:]
 
+    def set_output_enables(self, out_modules, enable, verify=True):
+        """
+        Enable/Disable a group of output modules with one pipelined batch of ENB commands for
+        each control connection, and read the modules back as a second batch, instead of a
+        set and read back for each module
+
+        Parameters:
+        -----------
+        out_modules : list of OUTModule objects
+        enable : enable state for all the modules
+        verify : read back ENB, otherwise the shadow value is set to enable
+
+        Returns:
+        --------
+        list of the modules whose enable state was not set
+        """
+        arg="0"
+        if enable: arg="1"
+
+        # modules can be assigned to different control connections, keep module order in each group
+        groups=[]
+        for mod in out_modules:
+            if mod is None:
+                continue
+            for conn, group in groups:
+                if conn is mod.connection:
+                    group.append(mod)
+                    break
+            else:
+                groups.append((mod.connection, [mod]))
+
+        failed=[]
+        pending=[ (group, conn.submitBatch([ mod.make_command("ENB", arg) for mod in group ],
+                                           expect_output=False))
+                  for conn, group in groups ]
+        for group, futures in pending:
+            for mod, future in zip(group, futures):
+                mod._invalidate_for_command("ENB")
+                try:
+                    future.result()
+                    if not verify:
+                        mod.store_cached_query(mod.getEnable, enable)
+                except Exception, e:
+                    if self._debug:
+                        print "set_output_enables, module ", mod.full_reg_name, " failed ", e
+                    failed.append(mod)
+        if not verify:
+            return failed
+
+        pending=[ (group, conn.submitBatch([ mod.make_command("ENB", "", True) for mod in group ]))
+                  for conn, group in groups ]
+        for group, futures in pending:
+            for mod, future in zip(group, futures):
+                try:
+                    value=mod.parseBool(future.result())
+                    mod.store_cached_query(mod.getEnable, value)
+                except Exception, e:
+                    if self._debug:
+                        print "set_output_enables, module ", mod.full_reg_name, " read back failed ", e
+                    value=None
+                if value != enable and mod not in failed:
+                    failed.append(mod)
+        return failed
+
     def get_output_channel_for_module(self,full_reg_name):
         modList = self.stream_router.getModulesFlowListBySource(full_reg_name)
         # trim off first item in list is requested item
@@ -0,0 +1,144 @@
+#!/usr/bin/python
+
+"""
+Micro-benchmarks of the object_container pools that hand out output, software
+DDC, FFT and spectral scan modules.
+
+Compares object_container against the original list based implementation
+(copied below) for pools of increasing size, and checks both hand out the
+objects in the same order for a random sequence of operations.
+
+    ./bench_object_container.py --number=2000
+"""
+import os
+import sys
+import random
+import timeit
+from optparse import OptionParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../python'))
+from msddcontroller import object_container
+
+
+class legacy_object_container(object):
+    def __init__(self):
+        self.used_objects = []
+        self.free_objects = []
+    def put_object(self, obj):
+        if self.used_objects.count(obj) > 0:
+            self.used_objects.remove(obj)
+        self.free_objects.append(obj)
+
+    def is_used(self, obj):
+        if obj == None:
+            return False
+        try:
+            idx=self.used_objects.index(obj)
+            return True
+        except:
+            return False
+
+    def mark_as_used(self, obj):
+        if obj == None:
+            return
+        if self.free_objects.count(obj) <= 0:
+            return
+        self.free_objects.remove(obj)
+        self.used_objects.append(obj)
+
+    def get_used_objects(self):
+        return self.used_objects[:]
+
+    def get_object(self, obj=None):
+        if len(self.free_objects) <= 0:
+            return None
+        if obj != None:
+            if self.free_objects.count(obj) <= 0:
+                return None
+            self.free_objects.remove(obj)
+        else:
+            obj = self.free_objects.pop(0)
+        self.used_objects.append(obj)
+        return obj
+
+
+class Module(object):
+    def __init__(self, n):
+        self.n = n
+
+
+def fill(pool_class, objects):
+    pool = pool_class()
+    for obj in objects:
+        pool.put_object(obj)
+    return pool
+
+
+def check(size, steps):
+    rnd = random.Random(1)
+    objects = [ Module(n) for n in range(size) ]
+    legacy = fill(legacy_object_container, objects)
+    pool = fill(object_container, objects)
+    mismatches = 0
+    for step in range(steps):
+        op = rnd.choice(['get', 'get', 'get_obj', 'put', 'mark', 'is_used'])
+        if op == 'get':
+            a, b = legacy.get_object(), pool.get_object()
+        elif op == 'get_obj':
+            obj = rnd.choice(objects)
+            a, b = legacy.get_object(obj), pool.get_object(obj)
+        elif op == 'put':
+            used = legacy.get_used_objects()
+            if not used:
+                continue
+            obj = rnd.choice(used)
+            a, b = legacy.put_object(obj), pool.put_object(obj)
+        elif op == 'mark':
+            obj = rnd.choice(objects)
+            a, b = legacy.mark_as_used(obj), pool.mark_as_used(obj)
+        else:
+            obj = rnd.choice(objects)
+            a, b = legacy.is_used(obj), pool.is_used(obj)
+        if a is not b or legacy.get_used_objects() != pool.get_used_objects():
+            mismatches += 1
+            print "MISMATCH size", size, "step", step, op
+            break
+    return mismatches
+
+
+def cycle(pool, objects):
+    # allocate every object, check and release them in allocation order
+    for n in range(len(objects)):
+        pool.get_object()
+    for obj in objects:
+        pool.is_used(obj)
+    for obj in objects:
+        pool.put_object(obj)
+
+
+def run(number, sizes):
+    print "{:<10} {:>12} {:>12} {:>8}".format('objects', 'legacy us', 'new us', 'speedup')
+    for size in sizes:
+        objects = [ Module(n) for n in range(size) ]
+        legacy = fill(legacy_object_container, objects)
+        pool = fill(object_container, objects)
+        repeat = max(1, number/size)
+        t_legacy = min(timeit.repeat(lambda: cycle(legacy, objects), number=repeat, repeat=3))
+        t_new = min(timeit.repeat(lambda: cycle(pool, objects), number=repeat, repeat=3))
+        # time for each get/is_used/put of one object
+        ops = float(repeat*size)
+        print "{:<10} {:>12.3f} {:>12.3f} {:>7.2f}x".format(size,
+                                                           t_legacy/ops*1e6,
+                                                           t_new/ops*1e6,
+                                                           t_legacy/t_new)
+
+
+if __name__ == '__main__':
+    parser = OptionParser()
+    parser.add_option("--number", type="int", default=20000, help="object operations for each pool size")
+    parser.add_option("--steps", type="int", default=5000, help="random operations checked for each pool size")
+    (opts, args) = parser.parse_args()
+    sizes = [ 16, 128, 512, 2048 ]
+    if sum([ check(size, opts.steps) for size in sizes ]):
+        sys.exit(1)
+    run(opts.number, sizes)
@@ -0,0 +1,89 @@
+#!/usr/bin/python
+
+"""
+Micro-benchmarks of MSDD response parsing.
+
+Compares the ResponseDecoder used by baseModule against the original
+parseResponse implementation (copied below) for the common getter patterns,
+and checks both return the same values.
+
+    ./bench_response_decoder.py --number=100000
+"""
+import os
+import re
+import sys
+import timeit
+from optparse import OptionParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../python'))
+from msddcontroller import ResponseDecoder, CommandException
+
+
+def legacy_parseResponse(resp, items=-1, sep=','):
+    resp = re.sub(r'[^\x00-\x7F]+',' ', str(resp))
+    resp = str(resp).strip()
+    resp = resp.rstrip()
+    resp_split_ws = resp.split()
+    if re.search(r'.* ERR .*',resp):
+        raise CommandException("Error condition returned, message " + resp)
+    if len(resp_split_ws) < 2:
+        raise CommandException("Invalid response detected: " + str(resp))
+    retVal = resp_split_ws[-1]
+    retVal_list = retVal.rsplit(sep,items)
+    if items >= 0 and len(retVal_list) != items:
+        raise CommandException("Could not parse reponse message for item check " + str(items) + " response \"" + str(resp) + "\" AS DESIRED.")
+    return retVal_list
+
+
+def legacy_clean(msg):
+    msg = re.sub(r'[^\x00-\x7F]+',' ', str(msg))
+    return msg.replace('\n',' ').rstrip()
+
+
+decoder = ResponseDecoder()
+
+# (name, response, legacy parse, decoder parse)
+CASES = [
+    ('float', 'WBDDC:1 FRQ 300.000000\n',
+     lambda r: float(legacy_parseResponse(r, 1)[0]),
+     lambda r: decoder.float_value(r)),
+    ('int', 'NBDDC:12 DEC 40\n',
+     lambda r: int(legacy_parseResponse(r, 1)[0]),
+     lambda r: decoder.int_value(r)),
+    ('bool', 'OUT:3 ENB 1:0\n',
+     lambda r: int(legacy_parseResponse(r, -1, ':')[0]) == 1,
+     lambda r: decoder.bool_value(r)),
+    ('range', 'RCV:1 FRQL 30.000000:6000.000000:0.000001\n',
+     lambda r: [ float(x) for x in legacy_parseResponse(r, 3, ':') ],
+     lambda r: decoder.range_value(r)),
+    ('csv', 'NBDDC:1 BWCL 1300.0,650.0,325.0,162.5,81.25\n',
+     lambda r: [ float(x) for x in legacy_parseResponse(r) ],
+     lambda r: decoder.list_value(r, float)),
+    ('non-ascii', 'CON:0 IDN MSDD-6000\xff\xfe,SIM00002,SIM-6000-R1\n',
+     lambda r: legacy_parseResponse(r),
+     lambda r: decoder.list_value(r)),
+    ('clean', 'SRT:0 SRCL? WBDDC:1 NBDDC:1 NBDDC:2 NBDDC:3 NBDDC:4 NBDDC:5\n',
+     legacy_clean,
+     decoder.clean),
+]
+
+
+def run(number):
+    print "{:<10} {:>12} {:>12} {:>8}".format('case', 'legacy us', 'decoder us', 'speedup')
+    for name, resp, legacy, decode in CASES:
+        if legacy(resp) != decode(resp):
+            print "{:<10} MISMATCH legacy {} decoder {}".format(name, legacy(resp), decode(resp))
+            continue
+        t_legacy = min(timeit.repeat(lambda: legacy(resp), number=number, repeat=3))
+        t_decode = min(timeit.repeat(lambda: decode(resp), number=number, repeat=3))
+        print "{:<10} {:>12.3f} {:>12.3f} {:>7.2f}x".format(name,
+                                                           t_legacy/number*1e6,
+                                                           t_decode/number*1e6,
+                                                           t_legacy/t_decode)
+
+
+if __name__ == '__main__':
+    parser = OptionParser()
+    parser.add_option("--number", type="int", default=100000, help="iterations for each case")
+    (opts, args) = parser.parse_args()
+    run(opts.number)
@@ -0,0 +1,120 @@
+#!/usr/bin/python
+
+"""
+Micro-benchmarks of the TunerIndex used to find the candidate tuners for a
+frontend_tuner_allocation.
+
+Compares TunerIndex.find against checking the type and frequency range of
+every tuner in order (as allocations did before the index), for radios with
+an increasing number of DDCs, and checks both find the same tuners for random
+requests, also after the DDCs of a receiver are retuned.
+
+    ./bench_tuner_index.py --number=2000
+"""
+import os
+import sys
+import random
+import timeit
+from optparse import OptionParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../python'))
+from msddcontroller import TunerIndex
+
+
+class Channel(object):
+    """ rx_channel with a frequency range, DDC ranges follow the receiver frequency """
+    def __init__(self, lo, hi, parent=None):
+        self.lo = lo
+        self.hi = hi
+        self.parent = parent
+        self.offset = 0.0
+    def get_frequency_range(self):
+        if self.parent:
+            return (self.lo+self.parent.offset, self.hi+self.parent.offset)
+        return (self.lo, self.hi)
+
+
+def make_tuners(receivers, ddcs):
+    """
+    receivers RX_DIGITIZER tuners (20 MHz to 6 GHz), each with ddcs DDC tuners that tune
+    +/- 5 MHz of the receiver frequency
+    """
+    tuners = []
+    for r in range(receivers):
+        rx = Channel(20e6, 6e9)
+        tuners.append((len(tuners), ('RX_DIGITIZER',), rx))
+        for d in range(ddcs):
+            tuners.append((len(tuners), ('DDC',), Channel(-5e6, 5e6, rx)))
+    return tuners
+
+
+def linear_find(tuners, tuner_type, frequency):
+    found = []
+    for tuner_num, tuner_types, channel in tuners:
+        if tuner_type not in tuner_types:
+            continue
+        lo, hi = channel.get_frequency_range()
+        if lo <= frequency + abs(frequency)*.01/100.0 and hi >= frequency:
+            found.append(tuner_num)
+    return found
+
+
+def retune(tuners, index, rnd):
+    # move one receiver, its DDC ranges move with it
+    receivers = [ x for x in tuners if x[1] == ('RX_DIGITIZER',) ]
+    tuner_num, tuner_types, rx = rnd.choice(receivers)
+    rx.offset = rnd.choice([ 100e6, 400e6, 1e9, 2.4e9 ])
+    index.invalidate([ t for t, types, ch in tuners if ch is rx or ch.parent is rx ])
+
+
+def check(receivers, ddcs, steps):
+    rnd = random.Random(1)
+    tuners = make_tuners(receivers, ddcs)
+    index = TunerIndex(tuners)
+    for step in range(steps):
+        if rnd.random() < 0.1:
+            retune(tuners, index, rnd)
+        rx_freqs = [ ch.offset for t, types, ch in tuners if types == ('RX_DIGITIZER',) ]
+        freq = rnd.choice(rx_freqs) + rnd.uniform(-6e6, 6e6)
+        tuner_type = rnd.choice(['DDC', 'DDC', 'RX_DIGITIZER'])
+        if linear_find(tuners, tuner_type, freq) != index.find(tuner_type, freq):
+            print "MISMATCH receivers", receivers, "ddcs", ddcs, "step", step, tuner_type, freq
+            return 1
+    return 0
+
+
+def run(number, sizes):
+    print "{:<10} {:<6} {:>12} {:>12} {:>8}".format('receivers', 'ddcs', 'linear us', 'index us', 'speedup')
+    for receivers, ddcs in sizes:
+        tuners = make_tuners(receivers, ddcs)
+        for n in range(receivers):
+            tuners[n*(ddcs+1)][2].offset = 100e6*(n+1)
+        index = TunerIndex(tuners)
+        freqs = [ 100e6*(n+1) + 1e6 for n in range(receivers) ]
+        def linear():
+            for freq in freqs:
+                linear_find(tuners, 'DDC', freq)
+        def indexed():
+            for freq in freqs:
+                index.find('DDC', freq)
+        repeat = max(1, number/len(freqs))
+        t_linear = min(timeit.repeat(linear, number=repeat, repeat=3))
+        t_index = min(timeit.repeat(indexed, number=repeat, repeat=3))
+        # time for each search
+        ops = float(repeat*len(freqs))
+        print "{:<10} {:<6} {:>12.3f} {:>12.3f} {:>7.2f}x".format(receivers,
+                                                                  ddcs,
+                                                                  t_linear/ops*1e6,
+                                                                  t_index/ops*1e6,
+                                                                  t_linear/t_index)
+
+
+if __name__ == '__main__':
+    parser = OptionParser()
+    parser.add_option("--number", type="int", default=2000, help="searches for each radio size")
+    parser.add_option("--steps", type="int", default=2000, help="random searches checked for each radio size")
+    (opts, args) = parser.parse_args()
+    sizes = [ (1, 16), (2, 64), (4, 128), (8, 256) ]
+    if sum([ check(receivers, ddcs, opts.steps) for receivers, ddcs in sizes ]):
+        sys.exit(1)
+    run(opts.number, sizes)
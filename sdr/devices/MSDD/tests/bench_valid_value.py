@@ -0,0 +1,155 @@
+#!/usr/bin/python
+
+"""
+Micro-benchmarks of the valid value solvers used when validating tuner requests.
+
+Compares get_value_valid_range (min:max:step grids, e.g. frequency) and
+get_value_valid_sorted (sorted lists, e.g. sample rates and bandwidths) against
+the original implementations (copied below), and checks both return the same
+values for random requests.
+
+    ./bench_valid_value.py --number=20000
+"""
+import os
+import sys
+import math
+import random
+import timeit
+from optparse import OptionParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../python'))
+from msddcontroller import get_value_valid_range, get_value_valid_list, get_value_valid_sorted, InvalidValue
+
+
+def legacy_get_value_valid(value,tolerance_per, min_val, max_val, step_val=1,closest_ceil=False):
+    if step_val <= 0:
+        step_val = 0.25
+    valid = False
+    try:
+        next_highest_valid = max(min_val,min(max_val,math.ceil((value-min_val)/step_val) * step_val+min_val))
+        val = next_highest_valid
+        max_tolerance_val = value + value*(tolerance_per/100.0)
+        max_valid_val = math.ceil((max_tolerance_val-min_val)/step_val) * step_val+min_val
+        iterate = (val <= max_val and max_valid_val >= min_val)
+        while iterate:
+            if val > max_val:
+                break
+            if val > max_valid_val:
+                break
+            if val >= value and val <= max_val and val >= min_val:
+                valid = True
+                break
+            val += step_val
+        if not valid and closest_ceil:
+            return next_highest_valid
+    except TypeError:
+        raise InvalidValue("Missing min/max values, Requested Value was %s" %value)
+    if not valid:
+        raise InvalidValue("Valid value not found! Requested Value was %s (max/min) %s/%s" % (value,max_val,min_val))
+    return val
+
+
+def legacy_get_value_valid_list(value,value_tolerance_perc, values, return_max=None):
+    sorted_list = sorted(values)
+    idx=0
+    if return_max: idx=-1
+    if value == None or value <= 0.0:
+        if len(sorted_list) > 0:
+            return sorted_list[idx]
+        raise InvalidValue("Valid value not found! Requested Value was %s" %value)
+    max_tolerance_val=None
+    if value_tolerance_perc and value_tolerance_perc > 0.0:
+        max_tolerance_val = value + value*(value_tolerance_perc/100.0)
+    for num in range(0,len(sorted_list)):
+        if sorted_list[num] < value:
+            continue
+        if sorted_list[num] >= value and ( max_tolerance_val is None or sorted_list[num] <= max_tolerance_val):
+            return sorted_list[num]
+        if sorted_list[num] > max_tolerance_val:
+            continue
+    raise InvalidValue("Invalid value, requested value: %s (tolerance:%s%%) not in range: %s " % (value,value_tolerance_perc,','.join([str(x) for x in values])))
+
+
+def outcome(func, *args):
+    try:
+        return func(*args)
+    except InvalidValue:
+        return InvalidValue
+
+
+# (name, args to the solver) grids: value, tolerance, min, max, step, closest_ceil
+GRIDS = [
+    ('rcv frequency', (1234567890.5, 10.0, 30e6, 6e9, 1.0, False)),
+    ('ddc frequency', (-1234567.3, 0.0, -12.5e6, 12.5e6, 0.001, False)),
+    ('gain int', (7, 0, 0, 30, 2, True)),
+    ('above max', (7e9, 0.0, 30e6, 6e9, 1.0, False)),
+]
+
+# (name, list of valid values)
+LISTS = [
+    ('nbddc rates', [ 25e6/x for x in (1000, 500, 250, 125, 64, 32, 16, 8) ]),
+    ('swddc rates 64', [ 25e6/(x+1) for x in range(64) ]),
+    ('rates 1024', [ 100e6/(x+1) for x in range(1024) ]),
+]
+
+
+def check(samples):
+    rnd = random.Random(1)
+    mismatches = 0
+    for name, args in GRIDS:
+        value, tol, min_val, max_val, step, ceil = args
+        span = max_val - min_val
+        for n in range(samples):
+            v = min_val - span*0.1 + rnd.random()*span*1.2
+            if type(step) == int:
+                v = int(v)
+            t = rnd.choice([0.0, 0.001, 1.0, 10.0])
+            a = (v, t, min_val, max_val, step, ceil)
+            if outcome(legacy_get_value_valid, *a) != outcome(get_value_valid_range, *a):
+                mismatches += 1
+                print "MISMATCH grid", name, a
+    for name, values in LISTS:
+        for n in range(samples):
+            v = rnd.choice([None, 0.0] + [ rnd.random()*max(values)*1.1 for x in range(8) ])
+            t = rnd.choice([None, 0.0, 1.0, 20.0])
+            m = rnd.choice([None, True])
+            if outcome(legacy_get_value_valid_list, v, t, values, m) != \
+               outcome(get_value_valid_sorted, v, t, sorted(values), m):
+                mismatches += 1
+                print "MISMATCH list", name, v, t, m
+    return mismatches
+
+
+def run(number):
+    print "{:<22} {:>12} {:>12} {:>8}".format('case', 'legacy us', 'new us', 'speedup')
+    for name, args in GRIDS:
+        legacy = lambda: outcome(legacy_get_value_valid, *args)
+        new = lambda: outcome(get_value_valid_range, *args)
+        report(name, legacy, new, number)
+    for name, values in LISTS:
+        presorted = sorted(values)
+        value = values[len(values)/2]*0.999
+        legacy = lambda: outcome(legacy_get_value_valid_list, value, 1.0, values)
+        new = lambda: outcome(get_value_valid_sorted, value, 1.0, presorted)
+        report(name, legacy, new, number)
+        new = lambda: outcome(get_value_valid_list, value, 1.0, values)
+        report(name + ' unsorted', legacy, new, number)
+
+
+def report(name, legacy, new, number):
+    t_legacy = min(timeit.repeat(legacy, number=number, repeat=3))
+    t_new = min(timeit.repeat(new, number=number, repeat=3))
+    print "{:<22} {:>12.3f} {:>12.3f} {:>7.2f}x".format(name,
+                                                       t_legacy/number*1e6,
+                                                       t_new/number*1e6,
+                                                       t_legacy/t_new)
+
+
+if __name__ == '__main__':
+    parser = OptionParser()
+    parser.add_option("--number", type="int", default=20000, help="iterations for each case")
+    parser.add_option("--samples", type="int", default=2000, help="random requests checked for each case")
+    (opts, args) = parser.parse_args()
+    if check(opts.samples):
+        sys.exit(1)
+    run(opts.number)
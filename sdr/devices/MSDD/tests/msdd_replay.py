@@ -0,0 +1,215 @@
+#!/usr/bin/python
+
+"""
+Replay of a captured MSDD control session.
+
+A capture is recorded by the MSDD connection when advanced::capture_file is set
+on rh.MSDD/rh.MSDD_Controller (or capture_file is passed to MSDDRadio).  The
+replay server listens on a local UDP port and answers each command with the
+echo and response messages that the radio sent during the capture, either
+with the original timing or as fast as possible.  The control code is not
+modified, point it at the replay server instead of the radio.
+
+Commands are matched to the capture in order.  A command that is not the
+next one in the capture is searched for within a lookahead window, skipped
+commands are counted.  Commands that are not found are answered with the
+messages from the first occurrence of that command in the capture.  When the
+first command of the capture is received after the session has started the
+replay rewinds, so a device can be restarted against the same server.
+
+Benchmark MSDDRadio startup from a capture:
+
+    ./msdd_replay.py --bench=20 msdd6000_startup.cap
+
+Serve a capture for rh.MSDD (msdd::ip_address=127.0.0.1, msdd::port=2323):
+
+    ./msdd_replay.py --port=2323 --realtime msdd6000_startup.cap
+"""
+import os
+import sys
+import time
+import socket
+import select
+import threading
+import traceback
+from optparse import OptionParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../python'))
+from msddcontroller import CommandCapture, MSDDRadio, read_capture
+
+
+class MSDDReplay(object):
+
+    def __init__(self, capture_file, address='127.0.0.1', port=0, realtime=False,
+                 lookahead=64, debug=False):
+        self.capture_file = capture_file
+        self.header, self.records = read_capture(capture_file)
+        self.realtime = realtime
+        self.lookahead = lookahead
+        self.debug = debug
+        self._sends = [ idx for idx, rec in enumerate(self.records) if rec[1] == CommandCapture.Send ]
+        self._first = {}
+        for n, idx in enumerate(self._sends):
+            self._first.setdefault(self.records[idx][2], n)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((address, port))
+        self.address, self.port = self.sock.getsockname()
+        self._thread = None
+        self._running = False
+        self.rewind()
+
+    def rewind(self):
+        """
+        Restart the replay at the beginning of the capture and clear the counters
+        """
+        self._next = 0             # index into _sends of the next expected command
+        self.commands_received = 0
+        self.matched = 0
+        self.skipped = 0
+        self.unmatched = 0
+        self.messages_sent = 0
+        self.rewinds = 0
+
+    def responses(self, send_number):
+        """
+        Returns the (delay, message) pairs the radio sent after a command up to the
+        next command in the capture, delay is relative to the command
+        """
+        start = self._sends[send_number]
+        if send_number+1 < len(self._sends):
+            stop = self._sends[send_number+1]
+        else:
+            stop = len(self.records)
+        sent_at = self.records[start][0]
+        return [ (offset - sent_at, msg) for offset, direction, msg in self.records[start+1:stop] ]
+
+    def _match(self, data):
+        """
+        Find the command in the capture, returns the send number or None
+        """
+        last = min(len(self._sends), self._next + self.lookahead)
+        for n in range(self._next, last):
+            if self.records[self._sends[n]][2] == data:
+                self.skipped += n - self._next
+                self._next = n + 1
+                return n
+        # device restarted against the server
+        if self._next > 0 and self._first.get(data) == 0:
+            self.rewinds += 1
+            self._next = 1
+            return 0
+        return None
+
+    def handle_datagram(self, data, peer):
+        received = time.time()
+        self.commands_received += 1
+        n = self._match(data)
+        if n is None:
+            self.unmatched += 1
+            n = self._first.get(data)
+            if self.debug:
+                print "REPLAY unmatched", repr(data), "fallback", n
+            if n is None:
+                return
+            replies = [ (0.0, msg) for delay, msg in self.responses(n) ]
+        else:
+            self.matched += 1
+            replies = self.responses(n)
+        if self.debug:
+            print "REPLAY recv", repr(data), "replies", len(replies)
+        for delay, msg in replies:
+            if self.realtime:
+                wait = received + delay - time.time()
+                if wait > 0:
+                    time.sleep(wait)
+            self.sock.sendto(msg, peer)
+            self.messages_sent += 1
+
+    def serve(self):
+        self._running = True
+        while self._running:
+            _iready, _oready, _eready = select.select([self.sock], [], [], 0.1)
+            if not _iready:
+                continue
+            try:
+                data, peer = self.sock.recvfrom(65535)
+                self.handle_datagram(data, peer)
+            except socket.error:
+                if self._running:
+                    traceback.print_exc()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve, name="MSDDReplay")
+        self._thread.setDaemon(True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.sock.close()
+
+    def get_stats(self):
+        return { 'commands_received' : self.commands_received,
+                 'matched' : self.matched,
+                 'skipped' : self.skipped,
+                 'unmatched' : self.unmatched,
+                 'messages_sent' : self.messages_sent,
+                 'rewinds' : self.rewinds }
+
+
+def benchmark(replay, runs, echoless_mode=False, udp_timeout=0.5):
+    """
+    Create an MSDDRadio against the replay server for each run
+
+    Returns:
+    --------
+    list of startup times in seconds
+    list of replay statistics for each run
+    """
+    times = []
+    stats = []
+    for run in range(runs):
+        replay.rewind()
+        _stime = time.time()
+        radio = MSDDRadio(replay.address, replay.port, udp_timeout=udp_timeout, echoless_mode=echoless_mode)
+        times.append(time.time() - _stime)
+        stats.append(replay.get_stats())
+        radio.connection.disconnect()
+    return times, stats
+
+
+if __name__ == '__main__':
+    parser = OptionParser(usage="%prog [options] capture_file")
+    parser.add_option("--ip", default="127.0.0.1", help="address to bind")
+    parser.add_option("--port", type="int", default=0, help="udp port to bind")
+    parser.add_option("--realtime", action="store_true", default=False, help="reply with the captured timing")
+    parser.add_option("--lookahead", type="int", default=64, help="commands to search ahead when the sequence differs")
+    parser.add_option("--bench", type="int", default=0, metavar="RUNS", help="time MSDDRadio startup RUNS times and exit")
+    parser.add_option("--echoless", action="store_true", default=False, help="benchmark with echoless_mode, must match the capture")
+    parser.add_option("--debug", action="store_true", default=False, help="print traffic")
+    (opts, args) = parser.parse_args()
+    if len(args) != 1:
+        parser.error("capture file is required")
+
+    replay = MSDDReplay(args[0], opts.ip, opts.port, opts.realtime, opts.lookahead, opts.debug)
+    print "MSDD replay of {} ({} records, radio {}:{}) listening on {}:{}".format(args[0],
+                                                                                len(replay.records),
+                                                                                replay.header['address'][0],
+                                                                                replay.header['address'][1],
+                                                                                replay.address, replay.port)
+    if opts.bench > 0:
+        replay.start()
+        times, stats = benchmark(replay, opts.bench, opts.echoless)
+        for run, (t, s) in enumerate(zip(times, stats)):
+            print "run {:3d} startup {:.4f} matched {matched} skipped {skipped} unmatched {unmatched}".format(run, t, **s)
+        print "startup min {:.4f} avg {:.4f} max {:.4f}".format(min(times), sum(times)/len(times), max(times))
+        replay.stop()
+    else:
+        try:
+            replay.serve()
+        except KeyboardInterrupt:
+            pass
+        replay.stop()
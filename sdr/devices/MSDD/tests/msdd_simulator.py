@@ -0,0 +1,592 @@
+#!/usr/bin/python
+
+"""
+UDP simulator for the MSDD console protocol.
+
+Answers the same "MOD:CH CMD? args" console commands as an MSDD radio so the
+control path (msddcontroller.MSDDRadio, rh.MSDD, rh.MSDD_Controller) can be
+exercised without hardware.  The simulator keeps register state for every
+module channel, maintains the stream router (SRT) flow graph, echoes each
+command (unless echo was disabled with ECH 0) and can inject per command
+latency, jitter and datagram loss.  With concurrent_clients each client
+source port is served by its own thread (commands from one client stay in
+order), for exercising MSDDRadio with more than one control socket.
+
+Stand alone:
+
+    ./msdd_simulator.py --port=2323 --model=3000 --latency=0.001 --loss=0.01
+
+From a test script:
+
+    sim=MSDDSimulator(model='6000')
+    sim.start()
+    radio=MSDDRadio('127.0.0.1', sim.port)
+    ...
+    sim.stop()
+"""
+import sys
+import re
+import time
+import random
+import socket
+import select
+import Queue
+import threading
+import traceback
+from optparse import OptionParser
+
+
+# Layouts of the receivers that are simulated, the channel counts mirror
+# the FPGA loads listed in dut.py
+LAYOUTS = {
+    '3000' : { 'idn' : 'MSDD-3000,SIM00001,SIM-3000-R1',
+               'model' : 'MSDD3000',
+               'rcv_inst' : 'MSDR3000',
+               'min_freq_mhz' : 30,
+               'max_freq_mhz' : 3000,
+               'adc_clk' : 98.304e6,
+               'rcv_channels' : 1,
+               'nbddc_per_wbddc' : 5,
+               'wbddc_decl' : '4:4:1',
+               'nbddc_decl' : '5,10,20,40,80',
+               'nbddc_bw_ratio' : 1.3e6/4.9152e6,
+               'swddc_channels' : 0,
+               'fft_channels' : 1,
+               'spc_channels' : 1,
+               'net_channels' : 1,
+               'fpga' : 'MSDD3000_s98_1w5n5b1300',
+    },
+    '6000' : { 'idn' : 'MSDD-6000,SIM00002,SIM-6000-R1',
+               'model' : 'MSDD6000',
+               'rcv_inst' : 'MSDR6000',
+               'min_freq_mhz' : 30,
+               'max_freq_mhz' : 6000,
+               'adc_clk' : 100e6,
+               'rcv_channels' : 2,
+               'nbddc_per_wbddc' : 8,
+               'wbddc_decl' : '4:4:1',
+               'nbddc_decl' : '250,500,1000',
+               'nbddc_bw_ratio' : 0.8,
+               'swddc_channels' : 0,
+               'fft_channels' : 2,
+               'spc_channels' : 1,
+               'net_channels' : 2,
+               'fpga' : 'MSDD6000_s100_2w16n0b80',
+    },
+}
+
+
+class SimError(Exception):
+    pass
+
+
+def fmt_value(value):
+    """Format numeric register values the way the radio does, integers without a fraction"""
+    if type(value) == float:
+        if value == int(value):
+            return str(int(value))
+        return repr(value)
+    return str(value)
+
+
+class SimModule(object):
+    """
+    Register state for a single module channel, e.g. NBDDC:3
+    """
+    def __init__(self, installation_name, registration_name, channel, registers):
+        self.installation_name = installation_name
+        self.registration_name = registration_name
+        self.channel = channel
+        self.registers = dict(registers)
+
+    def full_reg_name(self):
+        return self.registration_name + ':' + str(self.channel)
+
+    def get(self, cmd):
+        if not self.registers.has_key(cmd):
+            raise SimError("UNKNOWN_COMMAND")
+        return self.registers[cmd]
+
+    def set(self, cmd, args):
+        if not self.registers.has_key(cmd) or self.registers.has_key(cmd + '?'):
+            raise SimError("UNKNOWN_COMMAND")
+        self.validate(cmd, args)
+        self.registers[cmd] = args
+
+    def validate(self, cmd, args):
+        """Range check against min:max:step limits (CMDL) when the radio reports them"""
+        limits = self.registers.get(cmd + 'L', None)
+        if limits is None:
+            return
+        try:
+            value = float(args.split(':')[0])
+        except ValueError:
+            return
+        parts = limits.split(':')
+        if len(parts) == 3:
+            _min, _max = float(parts[0]), float(parts[1])
+            if value < _min or value > _max:
+                raise SimError("OUT_OF_RANGE")
+        elif cmd == 'DEC' or cmd == 'POL' or cmd == 'END':
+            # values selected by position
+            if int(value) < 0 or int(value) >= len(limits.split(',')):
+                raise SimError("OUT_OF_RANGE")
+
+
+class MSDDSimulator(object):
+    """
+    Simulated MSDD radio, serves the console protocol on a UDP socket
+
+    Parameters:
+    -----------
+    address : ip address to bind
+    port : udp port to bind, 0 picks a free port (see port attribute)
+    model : layout to simulate, key into LAYOUTS
+    latency : seconds to wait before answering each command
+    jitter : additional uniformly distributed random delay (seconds)
+    loss : probability [0,1] of dropping any one outgoing datagram
+    command_latency : dictionary of mnemonic to latency, overrides latency for that command
+    echo : initial command echo state
+    seed : random seed for reproducible jitter/loss
+    concurrent_clients : serve each client source port from its own thread
+    """
+    def __init__(self, address='127.0.0.1', port=0, model='3000',
+                 latency=0.0, jitter=0.0, loss=0.0,
+                 command_latency=None, echo=True, seed=None, debug=False,
+                 concurrent_clients=False):
+        if not LAYOUTS.has_key(str(model)):
+            raise SimError("Unknown model " + str(model))
+        self.layout = LAYOUTS[str(model)]
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.command_latency = command_latency or {}
+        self.echo = echo
+        self.debug = debug
+        self.concurrent_clients = concurrent_clients
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._client_threads = []
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((address, int(port)))
+        self.address, self.port = self.sock.getsockname()
+        self._thread = None
+        self._running = False
+        self._start_time = time.time()
+        self._time_offset = 0.0
+
+        # counters for tests
+        self.commands_received = 0
+        self.datagrams_dropped = 0
+
+        self.modules = {}
+        self.registrations = []
+        self.links = {}
+        self._build()
+
+    #
+    # layout
+    #
+    def _register(self, installation_name, registration_name, first, count, registers):
+        self.registrations.append((installation_name, registration_name, first, count))
+        for ch in range(first, first+count):
+            mod = SimModule(installation_name, registration_name, ch, registers)
+            self.modules[mod.full_reg_name()] = mod
+
+    def _build(self):
+        lo = self.layout
+        n_rcv = lo['rcv_channels']
+        n_nb = n_rcv * lo['nbddc_per_wbddc']
+        n_fft = lo['fft_channels']
+        n_out = n_rcv + n_nb + lo['swddc_channels'] + n_fft
+        cfg = { 'MODEL' : lo['model'],
+                'SERIAL' : lo['idn'].split(',')[1],
+                'MIN_FREQ' : lo['min_freq_mhz'],
+                'MAX_FREQ' : lo['max_freq_mhz'],
+                'DSP_REF' : 'INTERNAL',
+                'ADC_CLK' : fmt_value(lo['adc_clk']/1e6),
+                'RF_BRD_TYPE' : lo['rcv_inst'],
+                'IF_PORTS' : n_rcv,
+                'BIT_SADC' : 16,
+                'ETHR_PORTS' : lo['net_channels'],
+                'CPU_TYPE' : 'SIM',
+                'CPU_FREQ' : 1000,
+                'FPGA_TYPE' : 'SIM',
+                'DSP_BRD_TYPE' : '1',
+                '1PPS_TERM' : 0,
+                '1PPS_VOLTAGE' : 5,
+                'FPGA_WBDDC_CHANNELS' : n_rcv,
+                'FPGA_NBDDC_CHANNELS' : n_nb,
+                'FPGA_SWDDC_CHANNELS' : lo['swddc_channels'],
+                'FILE_NAME_APP' : lo['model'] + '_APP.bin',
+                'FILE_NAME_BATCH' : lo['model'] + '_Gen2_Map.bat',
+                'FILE_NAME_FPGA' : lo['fpga'],
+                'FILE_NAME_DSP' : lo['model'] + '_DSP.bin',
+                'FILE_NAME_FPGA_BATCH' : lo['fpga'] + '.bat',
+                }
+        self.cfg = dict([ (k, str(v)) for k, v in cfg.items() ])
+
+        ddc_regs = { 'FRQ' : '0', 'ISR?' : '', 'ATN' : '0', 'ATNL' : '0:0:0',
+                     'GAI' : '0', 'GAIL' : '-48:12:1', 'BIT' : '0', 'BITL' : 'PLL_LOCK,OVERFLOW',
+                     'ENB' : '0', 'ENBL' : '0:65536:1', 'DEC' : '0' }
+        out_regs = { 'ENB' : '0:0', 'ENBL' : '0:65536:1', 'IPP' : '0.0.0.0:0',
+                     'BIT' : '0', 'BITL' : 'PKT_OVERFLOW,LINK_DOWN',
+                     'RAT' : '0', 'RATL' : '0:100000:1', 'DWT' : '0', 'DWTL' : '16,8',
+                     'LEN' : '512', 'LENL' : '512:512:0', 'SID' : '0',
+                     'POL' : '0', 'POLL' : 'UDP_SDDS,UDP_SDDSX,UDP_VITA49,UDP_RAW,UDP_SDDSA',
+                     'END' : '1', 'ENDL' : 'BIG,LITTLE', 'PKT' : '0', 'PKTL' : '10',
+                     'ISR?' : '', 'GAI' : '0', 'GAIL' : '0:0:0', 'VLANEN' : '0', 'VLANTCI' : '0',
+                     'TSREF' : '0', 'TSOFS' : '0', 'MFP' : '0', 'MFPL' : '0:63:1',
+                     'CDR' : '0.1', 'CDRL' : '0.01:10:0.01', 'CCR' : '0', 'CCRL' : '0:1:1' }
+        fft_regs = { 'ENB' : '0', 'ENBL' : '0:0:0', 'AVG' : '1', 'AVGL' : '1:1024:1',
+                     'RAT' : '10', 'RATL' : '1:1000:1', 'PNT' : '2', 'PNTL' : '256,512,1024,2048,4096',
+                     'BIN' : '1024', 'BINL' : '16:4096:1', 'WND' : '0', 'WNDL' : 'HANNING,HAMMING,BLACKMAN,RECTANGLE',
+                     'PMD' : '0', 'PMDL' : 'AVERAGE,PEAK_HOLD', 'PDR' : '0', 'PDRL' : '0:10:1',
+                     'ISR?' : '', 'TTHR' : '0', 'TIP' : '0' }
+
+        ipp = "{}:{}".format(self.address, self.port)
+        self._register('CON', 'CON', 0, 1,
+                       { 'IDN?' : '', 'CFG?' : '', 'ECH?' : '', 'CPL' : '35.5', 'IPP' : ipp })
+        self._register('SRT', 'SRT', 0, 1, {})
+        self._register('BRD', 'BRD', 0, 1,
+                       { 'MTR' : '0', 'MTRL' : 'TEMP,VOLTAGE', 'BIT' : '0', 'BITL' : 'PLL_LOCK,OVER_TEMP',
+                         'EXR' : '0', 'EXRL' : '0:1:1', 'RESET' : '0' })
+        self._register('NETWORK', 'NET', 1, lo['net_channels'],
+                       { 'IPP' : self.address, 'MAC' : '00:50:C2:00:00:01', 'ENB' : '1', 'BRT' : '1000' })
+        self._register('TOD', 'TOD', 0, 1,
+                       { 'BIT' : '0', 'BITL' : 'NO_1PPS,NO_REF', 'GET?' : '', 'SET' : '0',
+                         'MOD' : '0', 'MODL' : 'SIM,ONE_PPS,IRIGB,NAV', 'MTR' : '0', 'MTRL' : 'OFFSET',
+                         'VOL' : '5', 'VOLL' : '1:5:1', 'RFA' : '0', 'RTK' : '0', 'SML' : '0',
+                         'TOY' : '0', 'TOYL' : '0,1' })
+        self._register('LOG', 'LOG', 0, 1,
+                       { 'MSK' : '0', 'MSKL' : 'ERROR,WARNING,INFO', 'ENB' : '0', 'IPP' : '0.0.0.0:0' })
+        self._register(lo['rcv_inst'], 'RCV', 1, n_rcv,
+                       { 'FRQ' : fmt_value(float(lo['min_freq_mhz'])*10),
+                         'FRQL' : '{}:{}:0.000001'.format(lo['min_freq_mhz'], lo['max_freq_mhz']),
+                         'ATN' : '0', 'ATNL' : '0:30:1', 'GAI' : '0', 'GAIL' : '0:60:1',
+                         'BIT' : '0', 'BITL' : 'PLL_LOCK,ADC_OVERFLOW', 'ADM' : '0,0,0',
+                         'ADML' : 'SAMPLES,OVERFLOWS,ABS_MAX', 'MTR' : '0', 'MTRL' : 'TEMP',
+                         'EXR' : '0', 'EXRL' : '0:1:1', 'ENB' : '1' })
+        half_isr = lo['adc_clk']/2.0
+        regs = dict(ddc_regs)
+        regs.update({ 'DEC' : lo['wbddc_decl'].split(':')[0], 'DECL' : lo['wbddc_decl'],
+                      'FRQL' : '{}:{}:1'.format(fmt_value(-half_isr), fmt_value(half_isr)), 'ENB' : '1' })
+        self._register('WBDDC', 'WBDDC', 1, n_rcv, regs)
+        regs = dict(ddc_regs)
+        regs.update({ 'DECL' : lo['nbddc_decl'], 'BWT?' : '', 'FRQL' : '-12000000:12000000:1' })
+        self._register('NBDDC', 'NBDDC', 1, n_nb, regs)
+        if lo['swddc_channels']:
+            regs = dict(ddc_regs)
+            regs.update({ 'DECL' : '2:64:2', 'DEC' : '2', 'FRQL' : '-1000000:1000000:1' })
+            self._register('SWDDCDEC2', 'SWDDCDEC2', 1, lo['swddc_channels'], regs)
+        self._register('OUT', 'OUT', 1, n_out, out_regs)
+        self._register('FFT', 'FFT', 1, n_fft, fft_regs)
+        regs = dict(fft_regs)
+        regs.update({ 'FRQ' : '{}:{}'.format(lo['min_freq_mhz'], lo['max_freq_mhz']) })
+        self._register('SPC', 'SPC', 1, lo['spc_channels'], regs)
+
+        # default flow graph, rcv->wbddc->out, wbddc->nbddc->out, wbddc->spc
+        for ch in range(1, n_rcv+1):
+            self.link('RCV:{}'.format(ch), 'WBDDC:{}'.format(ch))
+            self.link('WBDDC:{}'.format(ch), 'OUT:{}'.format(ch))
+            for nb in range(lo['nbddc_per_wbddc']):
+                nb_ch = (ch-1)*lo['nbddc_per_wbddc'] + nb + 1
+                self.link('WBDDC:{}'.format(ch), 'NBDDC:{}'.format(nb_ch))
+                self.link('NBDDC:{}'.format(nb_ch), 'OUT:{}'.format(n_rcv+nb_ch))
+        for ch in range(1, lo['spc_channels']+1):
+            self.link('WBDDC:1', 'SPC:{}'.format(ch))
+
+    #
+    # stream router flow graph
+    #
+    def source_of(self, reg_name):
+        for src, dests in self.links.items():
+            if reg_name in dests:
+                return src
+        return None
+
+    def link(self, src, dst):
+        if not self.modules.has_key(src) or not self.modules.has_key(dst):
+            raise SimError("INVALID_MODULE")
+        self.unlink(dst)
+        self.links.setdefault(src, []).append(dst)
+
+    def unlink(self, dst):
+        src = self.source_of(dst)
+        if src:
+            self.links[src].remove(dst)
+
+    #
+    # derived values
+    #
+    def decimation(self, mod):
+        dec = float(mod.registers['DEC'])
+        decl = mod.registers['DECL']
+        if ':' not in decl:
+            return float(decl.split(',')[int(dec)])
+        return dec
+
+    def input_sample_rate(self, mod):
+        if mod.registration_name == 'WBDDC':
+            return self.layout['adc_clk']
+        src = self.source_of(mod.full_reg_name())
+        if src is None:
+            return 0.0
+        return self.output_sample_rate(self.modules[src])
+
+    def output_sample_rate(self, mod):
+        if mod.registration_name == 'RCV':
+            return self.layout['adc_clk']
+        isr = self.input_sample_rate(mod)
+        if mod.registers.has_key('DECL'):
+            return isr/self.decimation(mod)
+        return isr
+
+    #
+    # command processing
+    #
+    def query(self, mod, cmd, args, peer):
+        if cmd == 'ISR':
+            return fmt_value(self.input_sample_rate(mod))
+        if cmd == 'BWT':
+            return fmt_value(round(self.output_sample_rate(mod)*self.layout['nbddc_bw_ratio']/1e3, 3))
+        if mod.registration_name == 'CON':
+            if cmd == 'IDN': return self.layout['idn']
+            if cmd == 'ECH': return '1' if self.echo else '0'
+            if cmd == 'CFG':
+                key = args.strip().rstrip('?')
+                if not self.cfg.has_key(key):
+                    raise SimError("INVALID_CONFIG_TYPE")
+                return self.cfg[key]
+        if mod.registration_name == 'TOD' and cmd == 'GET':
+            return repr(time.time() + self._time_offset)
+        if mod.registration_name == 'SRT':
+            return self.stream_router_query(cmd, args)
+        return mod.get(cmd)
+
+    def stream_router_query(self, cmd, args):
+        arg = args.strip()
+        if cmd == 'MODL':
+            return ','.join([ r[0] for r in self.registrations ])
+        if cmd == 'RNA':
+            for inst, reg, first, count in self.registrations:
+                if inst == arg: return reg
+            raise SimError("INVALID_MODULE")
+        if cmd == 'RCL':
+            for inst, reg, first, count in self.registrations:
+                if reg == arg: return '{},{}'.format(first, first+count-1)
+            raise SimError("INVALID_MODULE")
+        if cmd == 'INA':
+            if not self.modules.has_key(arg): raise SimError("INVALID_MODULE")
+            return self.modules[arg].installation_name
+        if cmd == 'DSTL':
+            if not self.modules.has_key(arg): raise SimError("INVALID_MODULE")
+            return ','.join([arg] + self.links.get(arg, []))
+        if cmd == 'SRCL':
+            if not self.modules.has_key(arg): raise SimError("INVALID_MODULE")
+            src = self.source_of(arg)
+            return ','.join([arg] + ([src] if src else []))
+        raise SimError("UNKNOWN_COMMAND")
+
+    def set(self, mod, cmd, args):
+        if mod.registration_name == 'SRT':
+            if cmd == 'LNK':
+                src_dst = args.split()
+                if len(src_dst) != 2: raise SimError("INVALID_ARGUMENT")
+                self.link(src_dst[0], src_dst[1])
+            elif cmd == 'UNL':
+                self.unlink(args.strip())
+            elif cmd != 'REG':
+                raise SimError("UNKNOWN_COMMAND")
+            return
+        if mod.registration_name == 'CON':
+            if cmd == 'ECH':
+                self.echo = (args.strip() == '1')
+                return
+            if cmd == 'CFG':
+                return
+        if mod.registration_name == 'TOD' and cmd == 'SET':
+            self._time_offset = float(args) - time.time()
+        if mod.registration_name == 'RCV' and cmd == 'FRQ':
+            # setting the rf frequency resets the adc meters
+            mod.registers['ADM'] = '0,0,0'
+        mod.set(cmd, args.strip())
+
+    def execute(self, line, peer):
+        """
+        Execute one console line, returns the response message or None for set commands
+        """
+        m = re.match(r'\s*([A-Za-z0-9_]+)(:(\d+))?\s+(.*)$', line)
+        if not m:
+            return "ERR 0 INVALID_COMMAND"
+        mod_name = m.group(1).upper()
+        channel = m.group(3)
+        if channel is None:
+            # no channel given, use the first registered channel
+            for inst, reg, first, count in self.registrations:
+                if reg == mod_name:
+                    channel = first
+                    break
+        prefix = "{}:{}".format(mod_name, channel)
+        mod = self.modules.get(prefix, None)
+        body = m.group(4)
+        resp = None
+        for part in [ p.strip() for p in body.split(';') if len(p.strip()) ]:
+            cm = re.match(r'([A-Za-z0-9_]+)(\?)?\s*(.*)$', part)
+            if not cm:
+                return "{} ERR 0 INVALID_COMMAND".format(prefix)
+            cmd = cm.group(1).upper()
+            args = cm.group(3).upper()
+            try:
+                if mod is None:
+                    raise SimError("INVALID_MODULE")
+                if cm.group(2):
+                    value = self.query(mod, cmd, args, peer)
+                    if len(args):
+                        resp = "{} {} {} {}".format(prefix, cmd, args, value)
+                    else:
+                        resp = "{} {} {}".format(prefix, cmd, value)
+                else:
+                    self.set(mod, cmd, args)
+            except SimError, e:
+                return "{} {} ERR 1 {}".format(prefix, cmd, str(e))
+            except (ValueError, IndexError), e:
+                return "{} {} ERR 2 INVALID_ARGUMENT".format(prefix, cmd)
+        return resp
+
+    #
+    # transport
+    #
+    def _delay(self, line):
+        m = re.match(r'\s*\S+\s+([A-Za-z0-9_]+)', line)
+        latency = self.latency
+        if m:
+            latency = self.command_latency.get(m.group(1).upper(), latency)
+        if self.jitter > 0:
+            with self._lock:
+                latency += self._random.uniform(0, self.jitter)
+        if latency > 0:
+            time.sleep(latency)
+
+    def _send(self, msg, peer):
+        if self.loss > 0 and self._dropped():
+            if self.debug:
+                print "SIM drop  ", msg.strip()
+            return
+        if self.debug:
+            print "SIM send  ", msg.strip()
+        self.sock.sendto(msg, peer)
+
+    def _dropped(self):
+        with self._lock:
+            if self._random.random() < self.loss:
+                self.datagrams_dropped += 1
+                return True
+        return False
+
+    def handle_datagram(self, data, peer):
+        for line in data.split('\n'):
+            if len(line.strip()) == 0:
+                continue
+            if self.debug:
+                print "SIM recv  ", line.strip()
+            self._delay(line)
+            with self._lock:
+                self.commands_received += 1
+                echo = self.echo
+                resp = self.execute(line, peer)
+            if echo:
+                self._send(line + '\n', peer)
+            if resp:
+                self._send(resp + '\n', peer)
+
+    def serve(self):
+        self._running = True
+        while self._running:
+            _iready, _oready, _eready = select.select([self.sock], [], [], 0.1)
+            if not _iready:
+                continue
+            try:
+                data, peer = self.sock.recvfrom(65535)
+                if self.concurrent_clients:
+                    self._client_queue(peer).put(data)
+                else:
+                    self.handle_datagram(data, peer)
+            except socket.error:
+                if self._running:
+                    traceback.print_exc()
+
+    def _client_queue(self, peer):
+        q = self._clients.get(peer)
+        if q is None:
+            q = self._clients[peer] = Queue.Queue()
+            t = threading.Thread(target=self._client_loop, args=(q, peer), name="MSDDSimulator-{}:{}".format(*peer))
+            t.setDaemon(True)
+            t.start()
+            self._client_threads.append(t)
+        return q
+
+    def _client_loop(self, q, peer):
+        # blocking get, a get with timeout polls and delays each command
+        while True:
+            data = q.get()
+            if data is None:
+                break
+            self.handle_datagram(data, peer)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve, name="MSDDSimulator")
+        self._thread.setDaemon(True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        for q in self._clients.values():
+            q.put(None)
+        for t in self._client_threads:
+            t.join()
+        self._client_threads = []
+        self._clients = {}
+        self.sock.close()
+
+
+def parse_command_latency(values):
+    ret = {}
+    for v in values or []:
+        cmd, latency = v.split('=')
+        ret[cmd.strip().upper()] = float(latency)
+    return ret
+
+
+if __name__ == '__main__':
+    parser = OptionParser()
+    parser.add_option("--ip", default="127.0.0.1", help="address to bind")
+    parser.add_option("--port", type="int", default=23, help="udp port to bind")
+    parser.add_option("--model", default="3000", choices=sorted(LAYOUTS.keys()), help="MSDD layout to simulate")
+    parser.add_option("--latency", type="float", default=0.0, help="delay in seconds before each command is answered")
+    parser.add_option("--jitter", type="float", default=0.0, help="random additional delay in seconds")
+    parser.add_option("--loss", type="float", default=0.0, help="probability of dropping an outgoing datagram")
+    parser.add_option("--cmd-latency", action="append", dest="cmd_latency", metavar="CMD=SECONDS",
+                      help="latency override for a command mnemonic, e.g. FRQ=0.05")
+    parser.add_option("--no-echo", action="store_false", dest="echo", default=True, help="start with command echo disabled")
+    parser.add_option("--seed", type="int", default=None, help="random seed for jitter/loss")
+    parser.add_option("--debug", action="store_true", default=False, help="print traffic")
+    parser.add_option("--concurrent", action="store_true", default=False, help="serve each client port from its own thread")
+    (opts, args) = parser.parse_args()
+
+    sim = MSDDSimulator(opts.ip, opts.port, opts.model,
+                        opts.latency, opts.jitter, opts.loss,
+                        parse_command_latency(opts.cmd_latency),
+                        opts.echo, opts.seed, opts.debug,
+                        opts.concurrent)
+    print "MSDD simulator ({}) listening on {}:{}".format(sim.layout['model'], sim.address, sim.port)
+    try:
+        sim.serve()
+    except KeyboardInterrupt:
+        pass
+    sim.stop()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+#
+# This file is protected by Copyright. Please refer to the COPYRIGHT file
+# distributed with this source distribution.
+#
+# This file is part of REDHAWK rh.MSDD.
+#
+# REDHAWK rh.MSDD is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option) any
+# later version.
+#
+# REDHAWK rh.MSDD is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see http://www.gnu.org/licenses/.
+#
+#
+# Tests of allocateCapacity and deallocateCapacity requests with several
+# FRONTEND::tuner_allocation structures (handled as one group by rh.MSDD) against a
+# simulated MSDD-6000 (msdd_simulator.py), no radio is required
+#
+#   ./test_bulk_allocation.py
+#   ./test_bulk_allocation.py --debug=debug BulkAllocationTests.testGroupRollback
+#
+
+import sys
+import traceback
+import ossie.utils.testing
+from ossie.utils import sb, uuid
+from ossie.cf import CF
+from ossie import properties
+from msdd_simulator import MSDDSimulator
+
+DEBUG_LEVEL = 3
+
+def get_debug_level( debug ):
+    _rlookup = { 'FATAL' :  0,
+                 'ERROR' : 1,
+                 'WARN' : 2,
+                 'INFO' : 3,
+                 'DEBUG' : 4,
+                 'TRACE' : 5 }
+    return _rlookup[debug.upper()]
+
+
+class BulkAllocationTests(ossie.utils.testing.RHTestCase):
+    # Path to the SPD file, relative to this file. This must be set in order to
+    # launch the device.
+    SPD_FILE = '../MSDD.spd.xml'
+
+    def setUp(self):
+        self.sim = MSDDSimulator(model='6000').start()
+
+        configure = {
+                'DEBUG_LEVEL': DEBUG_LEVEL,
+                "msdd" : {
+                    "msdd::ip_address": "127.0.0.1",
+                    "msdd::port": str(self.sim.port),
+                },
+                "advanced":{
+                    "advanced::enable_fft_channels" : False
+                },
+                "time_of_day": {
+                    "time_of_day::mode": "SIM",
+                },
+        }
+        self.comp = sb.launch(self.spd_file, impl=self.impl, properties=configure)
+        self.comp.start()
+
+    def tearDown(self):
+        # Clean up all sandbox artifacts created during test
+        sb.release()
+        self.sim.stop()
+
+    def testGroupAllocation(self):
+        group = [ self._generateAlloc(cf=100e6),
+                  self._generateAlloc(cf=200e6),
+                  self._generateAlloc(tuner_type='DDC', cf=100e6) ]
+        self.assertTrue(self.comp.allocateCapacity(self._request(group)))
+        allocated = self._getAllocatedIds()
+        for alloc in group:
+            self.assertTrue(alloc['FRONTEND::tuner_allocation::allocation_id'] in allocated)
+
+        self.comp.deallocateCapacity(self._request(group))
+        self.assertEqual(self._getAllocatedIds(), [])
+        self.assertEqual(self.comp.ref._get_usageState(), CF.Device.IDLE)
+
+    def testGroupRollback(self):
+        # the receivers are allocated before the DDC, which no DDC of the radio can provide
+        group = [ self._generateAlloc(cf=100e6),
+                  self._generateAlloc(cf=200e6) ]
+        failing = self._generateAlloc(tuner_type='DDC', cf=100e6, sr=1e12)
+        failing['FRONTEND::tuner_allocation::sample_rate_tolerance'] = 0.0
+
+        self.assertFalse(self.comp.allocateCapacity(self._request(group + [ failing ])))
+
+        # the receivers allocated for the group were released
+        self.assertEqual(self._getAllocatedIds(), [])
+        self.assertEqual(self.comp.ref._get_usageState(), CF.Device.IDLE)
+
+        # and their allocation ids and tuners can be allocated again
+        self.assertTrue(self.comp.allocateCapacity(self._request(group)))
+        self.assertEqual(len(self._getAllocatedIds()), len(group))
+        self.comp.deallocateCapacity(self._request(group))
+        self.assertEqual(self._getAllocatedIds(), [])
+
+    def testGroupRejectedBeforeTuning(self):
+        # a duplicated allocation id rejects the group before any tuner is allocated
+        alloc = self._generateAlloc(cf=100e6)
+        self.assertRaises(CF.Device.InvalidCapacity, self.comp.allocateCapacity, self._request([ alloc, alloc ]))
+        self.assertEqual(self._getAllocatedIds(), [])
+
+    def _getAllocatedIds(self):
+        allocated = []
+        for status in self.comp.frontend_tuner_status:
+            allocation_ids = status.allocation_id_csv.queryValue()
+            if allocation_ids:
+                allocated.extend(allocation_ids.split(','))
+        return sorted(allocated)
+
+    def _request(self, allocations):
+        request = []
+        for alloc in allocations:
+            request.extend(properties.props_from_dict({ 'FRONTEND::tuner_allocation' : alloc }))
+        return request
+
+    def _generateAlloc(self, tuner_type='RX_DIGITIZER', cf=100e6, sr=0, bw=0):
+        return { 'FRONTEND::tuner_allocation::tuner_type': tuner_type,
+                 'FRONTEND::tuner_allocation::allocation_id': str(uuid.uuid4()),
+                 'FRONTEND::tuner_allocation::center_frequency': float(cf),
+                 'FRONTEND::tuner_allocation::bandwidth': float(bw),
+                 'FRONTEND::tuner_allocation::bandwidth_tolerance': 100.0,
+                 'FRONTEND::tuner_allocation::sample_rate': float(sr),
+                 'FRONTEND::tuner_allocation::sample_rate_tolerance': 100.0,
+                 'FRONTEND::tuner_allocation::device_control': True,
+                 'FRONTEND::tuner_allocation::group_id': '',
+                 'FRONTEND::tuner_allocation::rf_flow_id': '' }
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--debug', default='info', help="debug level, fatal, error, warn, info, debug, trace" )
+
+    try:
+        args, remaining_args = parser.parse_known_args()
+        DEBUG_LEVEL=get_debug_level(args.debug)
+    except SystemExit:
+        raise SystemExit
+    except:
+        traceback.print_exc()
+        pass
+
+    sys.argv[1:] = remaining_args
+    ossie.utils.testing.main() # By default tests all implementations
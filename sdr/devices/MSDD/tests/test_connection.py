@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+#
+# This file is protected by Copyright. Please refer to the COPYRIGHT file
+# distributed with this source distribution.
+#
+# This file is part of REDHAWK rh.MSDD.
+#
+# REDHAWK rh.MSDD is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option) any
+# later version.
+#
+# REDHAWK rh.MSDD is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see http://www.gnu.org/licenses/.
+#
+#
+# Unit tests of the radio Connection (queued commands and pipelined batches, echo
+# retries, echoless sets and the circuit breaker) against msdd_simulator.py, no radio or
+# REDHAWK installation is required
+#
+#   ./test_connection.py
+#   ./test_connection.py -v CircuitBreakerTest
+#
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'python'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from msddcontroller import Connection, ConnectionPool, CircuitBreaker, CircuitOpen, CommandException, ConnectionFailure, read_capture
+from msdd_simulator import MSDDSimulator
+
+
+class FaultySimulator(MSDDSimulator):
+    """
+    Simulator that drops chosen datagrams, or every datagram while muted
+    """
+    def __init__(self, **kwargs):
+        MSDDSimulator.__init__(self, **kwargs)
+        self.drop=[]
+        self.muted=False
+
+    def _send(self, msg, peer):
+        if self.muted:
+            return
+        if msg in self.drop:
+            self.drop.remove(msg)
+            return
+        MSDDSimulator._send(self, msg, peer)
+
+
+class ConnectionTestCase(unittest.TestCase):
+    Timeout=0.2
+
+    def setUp(self):
+        self.sim = FaultySimulator(model='3000').start()
+        self.connection = Connection(('127.0.0.1', self.sim.port), timeout=self.Timeout)
+        self.connection.log_msg = lambda msg : None
+
+    def tearDown(self):
+        self.connection.disconnect()
+        self.sim.stop()
+
+    def get_stats(self, mnemonic):
+        return self.connection.getCommandStats()['commands'].get(mnemonic, {})
+
+
+class CommandTest(ConnectionTestCase):
+
+    def test_batch_in_order(self):
+        commands = [ 'WBDDC:1 FRQ {0}\n'.format(n*1000) for n in range(4) ] + [ 'WBDDC:1 FRQ?\n' ]
+        futures = self.connection.submitBatch(commands, expect_output=[False]*4 + [True])
+        self.assertEqual(len(futures), len(commands))
+        results = [ future.result() for future in futures ]
+        self.assertEqual(results[-1].split()[-1], '3000')
+        self.assertEqual(self.sim.modules['WBDDC:1'].registers['FRQ'], '3000')
+
+        commands = [ 'NBDDC:{0} FRQ?\n'.format(n) for n in range(1, 6) ]
+        responses = self.connection.sendCommandBatch(commands)
+        self.assertEqual([ x.split()[0] for x in responses ], [ 'NBDDC:{0}'.format(n) for n in range(1, 6) ])
+        self.assertTrue(self.connection.getCommandStats()['batches'] >= 1)
+
+    def test_future_callback(self):
+        done = []
+        future = self.connection.submitCommand('CON:0 IDN?\n')
+        future.add_done_callback(done.append)
+        self.assertTrue(future.result().startswith('CON:0 IDN MSDD-3000'))
+        self.assertEqual(done, [ future ])
+
+    def test_timed_out_command_not_sent(self):
+        self.sim.command_latency = { 'IDN' : 0.5 }
+        slow = self.connection.submitCommand('CON:0 IDN?\n')
+        time.sleep(0.05)
+        queued = self.connection.submitCommand('WBDDC:1 FRQ 5000\n', expect_output=False)
+        self.assertRaises(ConnectionFailure, queued.result, 0.1)
+        self.assertTrue(queued.cancelled())
+        slow.result()
+        time.sleep(0.2)
+        self.assertEqual(self.sim.modules['WBDDC:1'].registers['FRQ'], '0')
+
+
+class EchoTest(ConnectionTestCase):
+
+    def test_dropped_echo_resent(self):
+        # learn the round trip time, the echo timeout adapts to the radio
+        for n in range(10):
+            self.connection.sendStringCommand('WBDDC:1 FRQ?\n')
+        self.assertTrue(self.connection.echo_rtt.rto() < self.Timeout/5.0)
+
+        self.sim.drop.append('WBDDC:1 FRQ 2000\n')
+        self.connection.sendStringCommand('WBDDC:1 FRQ 2000\n', True, False)
+        self.assertEqual(self.sim.drop, [])
+        self.assertEqual(self.sim.modules['WBDDC:1'].registers['FRQ'], '2000')
+        self.assertTrue(self.get_stats('FRQ')['retries'] >= 1)
+        self.assertEqual(self.connection.sendStringCommand('WBDDC:1 FRQ?\n').split()[-1], '2000')
+
+    def test_echoless_set_error(self):
+        self.sim.echo = False
+        self.connection.set_echo_mode(False)
+        self.connection.sendStringCommand('WBDDC:1 FRQ 3000\n', True, False)
+        self.assertEqual(self.sim.modules['WBDDC:1'].registers['FRQ'], '3000')
+
+        # the radio's error is reported to the set that caused it, not to the next command
+        self.assertRaises(CommandException, self.connection.sendStringCommand, 'XYZ:1 FRQ 1000\n', True, False)
+        self.assertEqual(self.connection.sendStringCommand('WBDDC:1 FRQ?\n').split()[-1], '3000')
+        self.assertFalse(self.connection.echo_enabled)
+
+
+class CircuitBreakerTest(ConnectionTestCase):
+    Timeout=0.05
+
+    def setUp(self):
+        ConnectionTestCase.setUp(self)
+        self.connection.breaker = CircuitBreaker(probe_interval=0.1, consecutive_failures=2)
+
+    def wait_state(self, state, timeout=5.0):
+        _stime = time.time()
+        while self.connection.breaker.state != state and time.time()-_stime < timeout:
+            time.sleep(0.005)
+        return self.connection.breaker.state
+
+    def test_open_half_open_closed(self):
+        self.sim.muted = True
+        for n in range(2):
+            self.assertRaises(ConnectionFailure, self.connection.sendStringCommand, 'CON:0 IDN?\n')
+        self.assertEqual(self.connection.breaker.state, CircuitBreaker.OPEN)
+        self.assertTrue(self.connection.isCircuitOpen())
+
+        # commands are rejected without waiting on the radio
+        _stime = time.time()
+        self.assertRaises(CircuitOpen, self.connection.sendStringCommand, 'WBDDC:1 FRQ?\n')
+        self.assertTrue(time.time()-_stime < self.Timeout)
+        self.assertTrue(self.connection.breaker.rejected >= 1)
+
+        # failed probes reopen the breaker and back off
+        _stime = time.time()
+        while self.connection.breaker.probes < 2 and time.time()-_stime < 5.0:
+            time.sleep(0.01)
+        self.assertTrue(self.connection.breaker.probe_interval > 0.1)
+        self.assertEqual(self.wait_state(CircuitBreaker.OPEN), CircuitBreaker.OPEN)
+
+        # a slow answer to the next probe shows the breaker half-open, the answer closes it
+        self.sim.command_latency = { 'IDN' : 0.1 }
+        self.sim.muted = False
+        self.assertEqual(self.wait_state(CircuitBreaker.HALF_OPEN), CircuitBreaker.HALF_OPEN)
+        self.assertEqual(self.wait_state(CircuitBreaker.CLOSED), CircuitBreaker.CLOSED)
+        self.assertFalse(self.connection.isCircuitOpen())
+        self.assertEqual(self.connection.sendStringCommand('CON:0 IDN?\n').split()[0], 'CON:0')
+
+
+class ConnectionPoolTest(ConnectionTestCase):
+
+    def setUp(self):
+        ConnectionTestCase.setUp(self)
+        self.pool = ConnectionPool(self.connection, size=2)
+        self.pooled = self.pool.connections[1]
+        self.pooled.log_msg = lambda msg : None
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.pool.disconnect()
+        ConnectionTestCase.tearDown(self)
+        shutil.rmtree(self.directory)
+
+    def test_capture_follows_primary(self):
+        first = os.path.join(self.directory, 'first.cap')
+        second = os.path.join(self.directory, 'second.cap')
+        self.connection.start_capture(first)
+        self.pooled.sendStringCommand('WBDDC:1 FRQ?\n')
+        self.connection.start_capture(second)
+        self.pooled.sendStringCommand('NBDDC:1 FRQ?\n')
+        self.assertTrue(self.connection.stop_capture() > 0)
+        self.pooled.sendStringCommand('NBDDC:2 FRQ?\n')
+
+        messages = lambda filename : [ x[2] for x in read_capture(filename)[1] ]
+        self.assertTrue('WBDDC:1 FRQ?\n' in messages(first))
+        self.assertFalse('NBDDC:1 FRQ?\n' in messages(first))
+        self.assertTrue('NBDDC:1 FRQ?\n' in messages(second))
+        self.assertFalse('NBDDC:2 FRQ?\n' in messages(second))
+
+    def test_breaker_follows_primary(self):
+        self.connection.breaker = CircuitBreaker(consecutive_failures=2)
+        self.assertTrue(self.pooled.breaker is self.connection.breaker)
+        self.pooled.breaker.record(False)
+        self.pooled.breaker.record(False)
+        self.assertTrue(self.connection.isCircuitOpen())
+        self.assertRaises(CircuitOpen, self.pooled.sendStringCommand, 'CON:0 IDN?\n')
+        # reconnecting the primary closes the breaker of the pool
+        self.connection.connect(self.Timeout)
+        self.assertFalse(self.pooled.isCircuitOpen())
+        self.assertEqual(self.pooled.sendStringCommand('CON:0 IDN?\n').split()[0], 'CON:0')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python
+#
+# This file is protected by Copyright. Please refer to the COPYRIGHT file
+# distributed with this source distribution.
+#
+# This file is part of REDHAWK rh.MSDD.
+#
+# REDHAWK rh.MSDD is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option) any
+# later version.
+#
+# REDHAWK rh.MSDD is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see http://www.gnu.org/licenses/.
+#
+#
+# Unit tests of the device locks (ReadWriteLock, OrderedLock and LockMonitor), of the
+# TunerIndex searched and invalidated from different threads and of tuning independent
+# tuners at the same time against msdd_simulator.py, no radio or REDHAWK installation
+# is required
+#
+#   ./test_locks.py
+#   ./test_locks.py -v ConcurrentTuningTest
+#
+import os
+import sys
+import time
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'python'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from msddcontroller import LockOrder, LockOrderError, LockMonitor, OrderedLock, ReadWriteLock, TunerIndex, MSDDRadio
+from msdd_simulator import MSDDSimulator
+
+
+def run_thread(target, *args):
+    thread = threading.Thread(target=target, args=args)
+    thread.setDaemon(True)
+    thread.start()
+    return thread
+
+
+class ReadWriteLockTest(unittest.TestCase):
+
+    def setUp(self):
+        self.reports = []
+        self.monitor = LockMonitor(enabled=True, wait_timeout=5.0)
+        self.monitor.report = self.reports.append
+        self.maps = ReadWriteLock("allocation maps", LockOrder.ALLOCATIONS, monitor=self.monitor)
+
+    def test_writer_preference(self):
+        # a waiting writer is served before readers that arrive after it
+        order = []
+        self.maps.acquire_read()
+        writer_waiting = threading.Event()
+        def writer():
+            writer_waiting.set()
+            self.maps.acquire()
+            order.append('writer')
+            time.sleep(0.05)
+            self.maps.release()
+        def reader():
+            self.maps.acquire_read()
+            order.append('reader')
+            self.maps.release_read()
+        writer_thread = run_thread(writer)
+        writer_waiting.wait(1.0)
+        time.sleep(0.05)
+        reader_thread = run_thread(reader)
+        time.sleep(0.05)
+        self.assertEqual(order, [])
+        self.maps.release_read()
+        writer_thread.join(2.0)
+        reader_thread.join(2.0)
+        self.assertEqual(order, ['writer', 'reader'])
+
+    def test_new_reader_waits_for_waiting_writer(self):
+        self.maps.acquire_read()
+        writer_thread = run_thread(lambda : (self.maps.acquire(), self.maps.release()))
+        time.sleep(0.05)
+        result = []
+        run_thread(lambda : result.append(self.maps.acquire_read(False))).join(1.0)
+        self.assertEqual(result, [False])
+        self.maps.release_read()
+        writer_thread.join(2.0)
+        self.assertFalse(writer_thread.isAlive())
+
+    def test_read_within_write(self):
+        self.maps.acquire()
+        self.assertTrue(self.maps.acquire())
+        self.assertTrue(self.maps.acquire_read())
+        self.maps.release_read()
+        self.maps.release()
+        # still held for write after the nested holds are released
+        result = []
+        run_thread(lambda : result.append(self.maps.acquire_read(False))).join(1.0)
+        self.assertEqual(result, [False])
+        self.maps.release()
+        result = []
+        def writer():
+            result.append(self.maps.acquire(False))
+            self.maps.release()
+        run_thread(writer).join(1.0)
+        self.assertEqual(result, [True])
+        self.assertEqual(self.monitor.violations, 0)
+
+    def test_read_to_write_raises(self):
+        self.maps.acquire_read()
+        try:
+            self.assertRaises(LockOrderError, self.maps.acquire)
+            self.assertFalse(self.maps.acquire(False))
+        finally:
+            self.maps.release_read()
+        self.assertTrue(self.maps.acquire(False))
+        self.maps.release()
+
+    def test_readers_share(self):
+        self.maps.acquire_read()
+        result = []
+        def reader():
+            result.append(self.maps.acquire_read(False))
+            self.maps.release_read()
+        run_thread(reader).join(1.0)
+        self.maps.release_read()
+        self.assertEqual(result, [True])
+
+
+class LockOrderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.reports = []
+        self.monitor = LockMonitor(enabled=True, wait_timeout=0.2)
+        self.monitor.report = self.reports.append
+        self.maps = ReadWriteLock("allocation maps", LockOrder.ALLOCATIONS, monitor=self.monitor)
+        self.tuners = [ OrderedLock("tuner {0}".format(n), LockOrder.TUNER, n, monitor=self.monitor) for n in range(4) ]
+
+    def test_order_followed(self):
+        self.maps.acquire_read()
+        self.tuners[1].acquire()
+        self.tuners[3].acquire()
+        self.assertEqual(self.monitor.get_held(), [ self.maps, self.tuners[1], self.tuners[3] ])
+        self.tuners[3].release()
+        self.tuners[1].release()
+        self.maps.release_read()
+        self.assertEqual(self.monitor.violations, 0)
+        self.assertEqual(self.monitor.get_held(), [])
+        self.assertEqual(self.reports, [])
+
+    def test_order_violation_reported(self):
+        self.tuners[3].acquire()
+        self.tuners[1].acquire()
+        self.tuners[1].release()
+        self.tuners[3].release()
+        self.assertEqual(self.monitor.violations, 1)
+        self.assertEqual(len(self.reports), 1)
+        self.assertTrue(self.reports[0].startswith("Lock order violation"))
+        self.assertTrue("tuner 3" in self.reports[0].splitlines()[0])
+
+    def test_maps_after_tuner_reported(self):
+        self.tuners[0].acquire()
+        try:
+            self.maps.acquire()
+            self.maps.release()
+        finally:
+            self.tuners[0].release()
+        self.assertEqual(self.monitor.violations, 1)
+
+    def test_strict_order_violation_raises(self):
+        self.monitor.strict = True
+        self.tuners[2].acquire()
+        try:
+            self.assertRaises(LockOrderError, self.tuners[0].acquire)
+        finally:
+            self.tuners[2].release()
+        self.assertEqual(self.monitor.get_held(), [])
+
+    def test_long_wait_reported(self):
+        held = threading.Event()
+        def holder():
+            self.tuners[0].acquire()
+            held.set()
+            time.sleep(0.5)
+            self.tuners[0].release()
+        thread = run_thread(holder)
+        held.wait(1.0)
+        self.tuners[0].acquire()
+        self.tuners[0].release()
+        thread.join(1.0)
+        self.assertEqual(self.monitor.long_waits, 1)
+        self.assertTrue(self.reports[-1].startswith("Possible deadlock"))
+
+
+class FakeChannel(object):
+    """
+    rx_channel whose frequency range read waits on the gate event while it is cleared, and
+    returns the range from before the wait
+    """
+    def __init__(self, freq_range):
+        self.freq_range = freq_range
+        self.gate = threading.Event()
+        self.gate.set()
+        self.reading = threading.Event()
+
+    def get_frequency_range(self):
+        freq_range = self.freq_range
+        self.reading.set()
+        self.gate.wait(5.0)
+        return freq_range
+
+
+class TunerIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.channels = [ FakeChannel((n*100e6, (n+1)*100e6)) for n in range(4) ]
+        self.index = TunerIndex([ (n, ['DDC'], chan) for n, chan in enumerate(self.channels) ])
+
+    def test_invalidate_during_read(self):
+        self.assertEqual(self.index.find('DDC', 150e6), [1])
+        self.index.invalidate([1])
+        self.channels[1].gate.clear()
+        self.channels[1].reading.clear()
+        found = []
+        thread = run_thread(lambda : found.append(self.index.find('DDC', 150e6)))
+        self.assertTrue(self.channels[1].reading.wait(1.0))
+
+        # the tuner is retuned while its old range is read, invalidate does not wait on the read
+        self.channels[1].freq_range = (300e6, 400e6)
+        _stime = time.time()
+        self.index.invalidate([1])
+        self.assertTrue(time.time()-_stime < 0.5)
+        self.channels[1].gate.set()
+        thread.join(5.0)
+        self.assertEqual(found, [[1]])
+
+        # the range read across the invalidate was not kept
+        self.assertEqual(self.index.find('DDC', 150e6), [])
+        self.assertEqual(self.index.find('DDC', 350e6), [1, 3])
+        self.assertEqual(self.index.get_range(1), (300e6, 400e6))
+
+    def test_concurrent_find_and_invalidate(self):
+        errors = []
+        stop = threading.Event()
+        def search():
+            try:
+                while not stop.isSet():
+                    self.index.find('DDC', 150e6)
+                    self.index.get_range(2)
+            except Exception, e:
+                errors.append(e)
+        threads = [ run_thread(search) for n in range(3) ]
+        for n in range(2000):
+            self.index.invalidate([n%4])
+            if n%100 == 0:
+                self.index.invalidate()
+        stop.set()
+        for thread in threads:
+            thread.join(5.0)
+        self.assertEqual(errors, [])
+        self.assertEqual(self.index.find('DDC', 150e6), [1])
+
+
+class ConcurrentTuningTest(unittest.TestCase):
+    """
+    Allocations on tuners of different receivers, each holding only the lock of its claimed
+    tuner while it tunes, as MSDD_i does, against a simulated MSDD-6000 that takes Latency
+    seconds to answer each command
+    """
+    Latency=0.02
+
+    def setUp(self):
+        self.sim = MSDDSimulator(model='6000', latency=self.Latency, concurrent_clients=True).start()
+        self.radio = MSDDRadio('127.0.0.1', self.sim.port, udp_timeout=1.0, control_sockets=2)
+        self.maps = ReadWriteLock("allocation maps", LockOrder.ALLOCATIONS, monitor=LockMonitor())
+        self.tuner_locks = [ OrderedLock("tuner {0}".format(n), LockOrder.TUNER, n, monitor=self.maps.monitor)
+                             for n in range(len(self.radio.rx_channels)) ]
+
+    def tearDown(self):
+        self.radio.connection_pool.disconnect()
+        self.sim.stop()
+
+    def get_independent_tuners(self):
+        """
+        Returns the tuner numbers of a DDC of each receiver
+        """
+        tuners = {}
+        for tuner_num, rx_chan in enumerate(self.radio.rx_channels):
+            root = self.radio.get_root_parent(rx_chan)
+            if rx_chan.is_digital_only() and not tuners.has_key(root):
+                tuners[root] = tuner_num
+        return sorted(tuners.values())
+
+    def allocate(self, tuner_num, frequencies, results, held=None):
+        # claim the tuner holding the allocation maps, then tune holding only the tuner lock
+        self.maps.acquire()
+        self.maps.release()
+        self.tuner_locks[tuner_num].acquire()
+        try:
+            _stime = time.time()
+            rx_chan = self.radio.rx_channels[tuner_num]
+            for frequency in frequencies:
+                results.setdefault(tuner_num, []).append(rx_chan.setFrequency_Hz(rx_chan.get_valid_frequency(frequency)))
+            if held is not None:
+                held[tuner_num] = (_stime, time.time())
+        finally:
+            self.tuner_locks[tuner_num].release()
+
+    def test_independent_tuners(self):
+        tuners = self.get_independent_tuners()[:2]
+        self.assertEqual(len(tuners), 2)
+        # the receivers are controlled through different control sockets
+        connections = [ self.radio.rx_channels[n].digital_rx_object.object.connection for n in tuners ]
+        self.assertFalse(connections[0] is connections[1])
+        frequencies = [ 0.5e6*n for n in range(1, 9) ]
+
+        # one allocation alone
+        results = {}
+        _stime = time.time()
+        self.allocate(tuners[0], frequencies, results)
+        single = time.time()-_stime
+
+        # two allocations at the same time
+        results = {}
+        held = {}
+        _stime = time.time()
+        threads = [ run_thread(self.allocate, tuner_num, [ x*(n+1) for x in frequencies ], results, held)
+                    for n, tuner_num in enumerate(tuners) ]
+        for thread in threads:
+            thread.join(10.0)
+        elapsed = time.time()-_stime
+
+        self.assertEqual(sorted(results.keys()), tuners)
+        for tuner_num in tuners:
+            self.assertEqual(results[tuner_num], [True]*len(frequencies))
+        for n, tuner_num in enumerate(tuners):
+            self.assertAlmostEqual(self.radio.rx_channels[tuner_num].getFrequency_Hz(), frequencies[-1]*(n+1), places=0)
+        # each allocation tuned while the other held its tuner lock
+        self.assertTrue(held[tuners[0]][0] < held[tuners[1]][1] and held[tuners[1]][0] < held[tuners[0]][1],
+                        "tuner locks held one after the other: {0}".format(held))
+        # and the commands of the two tuners overlap instead of running one after the other
+        self.assertTrue(elapsed < 1.75*single,
+                        "two allocations took {0:.3f} seconds, one took {1:.3f} seconds".format(elapsed, single))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -23,6 +23,9 @@ from MSDD.msddcontroller import InvalidValue
 from MSDD.msddcontroller import CommandException
 from MSDD.msddcontroller import MSDDRadio
 from MSDD.msddcontroller import create_csv
+from MSDD.msddcontroller import LockOrder
+from MSDD.msddcontroller import OrderedLock
+from MSDD.msddcontroller import lock_monitor
 from MSDD.time_helpers import TimeOfDay
 from dynamiccomponent import DynamicComponent
 
@@ -130,10 +133,14 @@ class MSDD_Controller_i(MSDD_Controller_base,DynamicComponent):
         """
         self.MSDD = None
         self.msdd_console = None
+        self.msdd_lock=OrderedLock("msdd status", LockOrder.STATUS)
+        self.set_lock_debug(self.advanced.lock_debug)
+        self.addPropertyChangeListener("advanced",self.advanced_changed)
         self.msdd_status=MSDD_Controller_base.MsddStatus()
         self.interval_update_msdd_status = 60
         self.update_msdd_status_mark = time.time()
         self.output_protocol='sdds'                     # set sdds as output stream protocol
+        self.setPropertyQueryImpl("control_plane_stats",self.get_control_plane_stats)
 
         # dup required exec params to pass child MSDD 
         eparams=self._makeExecParams()
@@ -284,6 +291,8 @@ class MSDD_Controller_i(MSDD_Controller_base,DynamicComponent):
     def disconnect_from_msdd(self):
         if self.MSDD != None:
             self.msdd_status.connected=False
+            self.MSDD.stop_shadow_reconcile()
+            self.MSDD.connection.stop_capture()
         self.MSDD=None
 
     def connect_to_msdd(self):
@@ -295,7 +304,19 @@ class MSDD_Controller_i(MSDD_Controller_base,DynamicComponent):
                                   self.msdd.port,
                                   udp_timeout=min(0.2,self.msdd.timeout),
                                   enable_fft_channels=self.advanced.enable_fft_channels,
+                                  echoless_mode=self.advanced.echoless_mode,
+                                  capture_file=self.advanced.capture_file,
+                                  control_sockets=self.advanced.control_sockets,
+                                  shadow_reconcile_interval=self.advanced.shadow_reconcile_interval,
+                                  capability_cache_file=self.advanced.capability_cache_file,
+                                  startup_profile=self.advanced.startup_profile,
+                                  breaker_failures=self.advanced.breaker_failures,
                                   radio_debug=False)
+            timing=self.MSDD.startup_timing
+            self.info_msg("Finished setting up radio, duration {0:.4f} s, {1} rx channels",
+                          timing.get_total(),
+                          len(self.MSDD.rx_channels))
+            self.debug_msg("Startup phases:\n{0}", timing.format())
 
             rate_failure = None
             for net_mods in self.MSDD.network_modules:
@@ -376,6 +397,14 @@ class MSDD_Controller_i(MSDD_Controller_base,DynamicComponent):
         """
         self.msdd_status.ntp_running = is_running
 
+    def get_control_plane_stats(self):
+        """
+        Query callback for control_plane_stats, collects the current telemetry from the radio connection
+        """
+        if self.MSDD == None:
+            return []
+        return [ MSDD_Controller_base.ControlPlaneStats(**row) for row in self.MSDD.connection_pool.getCommandStatsSummary() ]
+
     def determine_output_protocol(self, default_proto='sdds'):
         """
         Determine time configuration method based on output protocol.
@@ -446,6 +475,22 @@ class MSDD_Controller_i(MSDD_Controller_base,DynamicComponent):
     
         return True
         
+    def advanced_changed(self, propid, oldval, newval):
+        self.advanced = newval
+        self.set_lock_debug(self.advanced.lock_debug)
+
+    def set_lock_debug(self, enable):
+        """
+        Enable the lock order checks and long wait reports of the lock monitor shared with
+        the receiver devices
+        """
+        if enable:
+            lock_monitor.report=self.report_lock_debug
+        lock_monitor.enabled=enable
+
+    def report_lock_debug(self, msg):
+        self.warn_msg("{0}", msg)
+
     def process(self):
         #
         # if time_helper has completed initial check and 
@@ -319,6 +319,78 @@ class MSDD_Controller_base(CF__POA.AggregatePlainDevice, Device, AggregateDevice
                                                          defvalue=1000.0
                                                          )
         
+            echoless_mode = simple_property(
+                                            id_="advanced::echoless_mode",
+                                            
+                                            name="echoless_mode",
+                                            type_="boolean",
+                                            defvalue=False
+                                            )
+        
+            capture_file = simple_property(
+                                           id_="advanced::capture_file",
+                                           
+                                           name="capture_file",
+                                           type_="string",
+                                           defvalue=""
+                                           )
+        
+            control_sockets = simple_property(
+                                              id_="advanced::control_sockets",
+                                              
+                                              name="control_sockets",
+                                              type_="ushort",
+                                              defvalue=1
+                                              )
+        
+            shadow_reconcile_interval = simple_property(
+                                                        id_="advanced::shadow_reconcile_interval",
+                                                        
+                                                        name="shadow_reconcile_interval",
+                                                        type_="double",
+                                                        defvalue=0.0
+                                                        )
+        
+            capability_cache_file = simple_property(
+                                                    id_="advanced::capability_cache_file",
+                                                    
+                                                    name="capability_cache_file",
+                                                    type_="string",
+                                                    defvalue=""
+                                                    )
+        
+            startup_profile = simple_property(
+                                              id_="advanced::startup_profile",
+                                              
+                                              name="startup_profile",
+                                              type_="string",
+                                              defvalue=""
+                                              )
+        
+            status_poll_interval = simple_property(
+                                                   id_="advanced::status_poll_interval",
+                                                   
+                                                   name="status_poll_interval",
+                                                   type_="double",
+                                                   defvalue=0.0
+                                                   )
+        
+            lock_debug = simple_property(
+                                         id_="advanced::lock_debug",
+                                         
+                                         name="lock_debug",
+                                         type_="boolean",
+                                         defvalue=False
+                                         )
+        
+            breaker_failures = simple_property(
+                                               id_="advanced::breaker_failures",
+                                               
+                                               name="breaker_failures",
+                                               type_="ushort",
+                                               defvalue=4
+                                               )
+        
             def __init__(self, **kw):
                 """Construct an initialized instance of this struct definition"""
                 for classattr in type(self).__dict__.itervalues():
@@ -337,6 +409,15 @@ class MSDD_Controller_base(CF__POA.AggregatePlainDevice, Device, AggregateDevice
                 d["max_cpu_load"] = self.max_cpu_load
                 d["max_nic_percentage"] = self.max_nic_percentage
                 d["minimum_connected_nic_rate"] = self.minimum_connected_nic_rate
+                d["echoless_mode"] = self.echoless_mode
+                d["capture_file"] = self.capture_file
+                d["control_sockets"] = self.control_sockets
+                d["shadow_reconcile_interval"] = self.shadow_reconcile_interval
+                d["capability_cache_file"] = self.capability_cache_file
+                d["startup_profile"] = self.startup_profile
+                d["status_poll_interval"] = self.status_poll_interval
+                d["lock_debug"] = self.lock_debug
+                d["breaker_failures"] = self.breaker_failures
                 return str(d)
         
             @classmethod
@@ -348,7 +429,7 @@ class MSDD_Controller_base(CF__POA.AggregatePlainDevice, Device, AggregateDevice
                 return True
         
             def getMembers(self):
-                return [("rcvr_mode",self.rcvr_mode),("wb_ddc_mode",self.wb_ddc_mode),("hw_ddc_mode",self.hw_ddc_mode),("enable_fft_channels",self.enable_fft_channels),("max_cpu_load",self.max_cpu_load),("max_nic_percentage",self.max_nic_percentage),("minimum_connected_nic_rate",self.minimum_connected_nic_rate)]
+                return [("rcvr_mode",self.rcvr_mode),("wb_ddc_mode",self.wb_ddc_mode),("hw_ddc_mode",self.hw_ddc_mode),("enable_fft_channels",self.enable_fft_channels),("max_cpu_load",self.max_cpu_load),("max_nic_percentage",self.max_nic_percentage),("minimum_connected_nic_rate",self.minimum_connected_nic_rate),("echoless_mode",self.echoless_mode),("capture_file",self.capture_file),("control_sockets",self.control_sockets),("shadow_reconcile_interval",self.shadow_reconcile_interval),("capability_cache_file",self.capability_cache_file),("startup_profile",self.startup_profile),("status_poll_interval",self.status_poll_interval),("lock_debug",self.lock_debug),("breaker_failures",self.breaker_failures)]
 
         advanced = struct_property(id_="advanced",
                                    name="advanced",
@@ -1402,6 +1483,174 @@ class MSDD_Controller_base(CF__POA.AggregatePlainDevice, Device, AggregateDevice
                                               mode="readonly",
                                               description="""Define the output configuration for each FFT channel.""")
 
+        class ControlPlaneStats(object):
+            mnemonic = simple_property(
+                                       id_="control_plane_stats::mnemonic",
+                                       
+                                       name="mnemonic",
+                                       type_="string",
+                                       defvalue=""
+                                       )
+        
+            count = simple_property(
+                                    id_="control_plane_stats::count",
+                                    
+                                    name="count",
+                                    type_="ulong",
+                                    defvalue=0
+                                    )
+        
+            timeouts = simple_property(
+                                       id_="control_plane_stats::timeouts",
+                                       
+                                       name="timeouts",
+                                       type_="ulong",
+                                       defvalue=0
+                                       )
+        
+            retries = simple_property(
+                                      id_="control_plane_stats::retries",
+                                      
+                                      name="retries",
+                                      type_="ulong",
+                                      defvalue=0
+                                      )
+        
+            errors = simple_property(
+                                     id_="control_plane_stats::errors",
+                                     
+                                     name="errors",
+                                     type_="ulong",
+                                     defvalue=0
+                                     )
+        
+            latency_avg_ms = simple_property(
+                                             id_="control_plane_stats::latency_avg_ms",
+                                             
+                                             name="latency_avg_ms",
+                                             type_="double",
+                                             defvalue=0.0
+                                             )
+        
+            latency_min_ms = simple_property(
+                                             id_="control_plane_stats::latency_min_ms",
+                                             
+                                             name="latency_min_ms",
+                                             type_="double",
+                                             defvalue=0.0
+                                             )
+        
+            latency_max_ms = simple_property(
+                                             id_="control_plane_stats::latency_max_ms",
+                                             
+                                             name="latency_max_ms",
+                                             type_="double",
+                                             defvalue=0.0
+                                             )
+        
+            latency_p95_ms = simple_property(
+                                             id_="control_plane_stats::latency_p95_ms",
+                                             
+                                             name="latency_p95_ms",
+                                             type_="double",
+                                             defvalue=0.0
+                                             )
+        
+            echo_wait_avg_ms = simple_property(
+                                               id_="control_plane_stats::echo_wait_avg_ms",
+                                               
+                                               name="echo_wait_avg_ms",
+                                               type_="double",
+                                               defvalue=0.0
+                                               )
+        
+            response_wait_avg_ms = simple_property(
+                                                   id_="control_plane_stats::response_wait_avg_ms",
+                                                   
+                                                   name="response_wait_avg_ms",
+                                                   type_="double",
+                                                   defvalue=0.0
+                                                   )
+        
+            bytes_sent = simple_property(
+                                         id_="control_plane_stats::bytes_sent",
+                                         
+                                         name="bytes_sent",
+                                         type_="ulonglong",
+                                         defvalue=0
+                                         )
+        
+            bytes_received = simple_property(
+                                             id_="control_plane_stats::bytes_received",
+                                             
+                                             name="bytes_received",
+                                             type_="ulonglong",
+                                             defvalue=0
+                                             )
+        
+            latency_histogram = simple_property(
+                                                id_="control_plane_stats::latency_histogram",
+                                                
+                                                name="latency_histogram",
+                                                type_="string",
+                                                defvalue=""
+                                                )
+        
+            def __init__(self, mnemonic="", count=0, timeouts=0, retries=0, errors=0, latency_avg_ms=0.0, latency_min_ms=0.0, latency_max_ms=0.0, latency_p95_ms=0.0, echo_wait_avg_ms=0.0, response_wait_avg_ms=0.0, bytes_sent=0, bytes_received=0, latency_histogram=""):
+                self.mnemonic = mnemonic
+                self.count = count
+                self.timeouts = timeouts
+                self.retries = retries
+                self.errors = errors
+                self.latency_avg_ms = latency_avg_ms
+                self.latency_min_ms = latency_min_ms
+                self.latency_max_ms = latency_max_ms
+                self.latency_p95_ms = latency_p95_ms
+                self.echo_wait_avg_ms = echo_wait_avg_ms
+                self.response_wait_avg_ms = response_wait_avg_ms
+                self.bytes_sent = bytes_sent
+                self.bytes_received = bytes_received
+                self.latency_histogram = latency_histogram
+        
+            def __str__(self):
+                """Return a string representation of this structure"""
+                d = {}
+                d["mnemonic"] = self.mnemonic
+                d["count"] = self.count
+                d["timeouts"] = self.timeouts
+                d["retries"] = self.retries
+                d["errors"] = self.errors
+                d["latency_avg_ms"] = self.latency_avg_ms
+                d["latency_min_ms"] = self.latency_min_ms
+                d["latency_max_ms"] = self.latency_max_ms
+                d["latency_p95_ms"] = self.latency_p95_ms
+                d["echo_wait_avg_ms"] = self.echo_wait_avg_ms
+                d["response_wait_avg_ms"] = self.response_wait_avg_ms
+                d["bytes_sent"] = self.bytes_sent
+                d["bytes_received"] = self.bytes_received
+                d["latency_histogram"] = self.latency_histogram
+                return str(d)
+        
+            @classmethod
+            def getId(cls):
+                return "control_plane_stats::command_stats"
+        
+            @classmethod
+            def isStruct(cls):
+                return True
+        
+            def getMembers(self):
+                return [("mnemonic",self.mnemonic),("count",self.count),("timeouts",self.timeouts),("retries",self.retries),("errors",self.errors),("latency_avg_ms",self.latency_avg_ms),("latency_min_ms",self.latency_min_ms),("latency_max_ms",self.latency_max_ms),("latency_p95_ms",self.latency_p95_ms),("echo_wait_avg_ms",self.echo_wait_avg_ms),("response_wait_avg_ms",self.response_wait_avg_ms),("bytes_sent",self.bytes_sent),("bytes_received",self.bytes_received),("latency_histogram",self.latency_histogram)]
+
+        control_plane_stats = structseq_property(id_="control_plane_stats",
+                                                 name="control_plane_stats",
+                                                 structdef=ControlPlaneStats,
+                                                 defvalue=[],
+                                                 configurationkind=("property",),
+                                                 mode="readonly",
+                                                 description="""Control plane telemetry for the connection to the radio, one entry per command mnemonic. The first entry (mnemonic TOTAL) holds the counters for the entire connection. Latency is measured from the first send of a command until it completes.""")
+
+
 
 
 